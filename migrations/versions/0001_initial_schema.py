@@ -0,0 +1,101 @@
+"""Initial schema (tables as first created by init_db).
+
+Databases created with ``Base.metadata.create_all`` before migrations existed
+are stamped at this revision by ``src.database.migrate.upgrade_to_head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+task_status = sa.Enum("PENDING", "IN_PROGRESS", "COMPLETED", "CANCELLED", name="taskstatus")
+task_priority = sa.Enum("LOW", "MEDIUM", "HIGH", "URGENT", name="taskpriority")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("phone_number", sa.String(20), nullable=False),
+        sa.Column("name", sa.String(100)),
+        sa.Column("notion_token", sa.String(200), nullable=True),
+        sa.Column("notion_database_id", sa.String(200), nullable=True),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_phone_number", "users", ["phone_number"], unique=True)
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("color", sa.String(7)),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"])
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", task_status, nullable=False),
+        sa.Column("priority", task_priority, nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("notion_id", sa.String(200), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+    op.create_index("ix_tasks_notion_id", "tasks", ["notion_id"], unique=True)
+
+    op.create_table(
+        "reminders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("scheduled_time", sa.DateTime(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("sent", sa.Boolean()),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_reminders_id", "reminders", ["id"])
+
+    op.create_table(
+        "conversation_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("phone_number", sa.String(20), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_conversation_history_id", "conversation_history", ["id"])
+    op.create_index("ix_conversation_history_phone_number", "conversation_history", ["phone_number"])
+
+
+def downgrade() -> None:
+    op.drop_table("conversation_history")
+    op.drop_table("reminders")
+    op.drop_table("tasks")
+    op.drop_table("categories")
+    op.drop_table("users")
+    task_priority.drop(op.get_bind(), checkfirst=True)
+    task_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,123 @@
+"""Notion sync cursor columns and indexes for the hot queries.
+
+Adds the sync bookkeeping columns (hashes, page ids and the
+``notion_last_edited_at`` cursor), the ``notion_mirrors`` table, the per-user
+uniqueness of ``tasks.notion_id``, and composite/partial indexes for:
+
+* task lists per user and status
+* due-reminder polling (unsent reminders by ``scheduled_time``)
+* category lookup by user and name
+* conversation history per user in time order
+
+Databases created by ``create_all`` after these columns were added to the
+models already have some of them, so every step checks the live schema first.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _columns(table):
+    return {column["name"] for column in _inspector().get_columns(table)}
+
+
+def _indexes(table):
+    return {index["name"]: index for index in _inspector().get_indexes(table)}
+
+
+def _add_missing_columns(table, *columns):
+    existing = _columns(table)
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column)
+
+
+def _create_index(name, table, columns, **kwargs):
+    if name not in _indexes(table):
+        op.create_index(name, table, columns, **kwargs)
+
+
+def upgrade() -> None:
+    _add_missing_columns(
+        "users",
+        sa.Column("notion_hash", sa.String(64), nullable=True),
+        sa.Column("notion_page_id", sa.String(200), nullable=True),
+        sa.Column("onboarding_stage", sa.String(50), nullable=True),
+        sa.Column("notion_synced_at", sa.DateTime(), nullable=True),
+    )
+    _add_missing_columns(
+        "tasks",
+        sa.Column("notion_hash", sa.String(64), nullable=True),
+        sa.Column("notion_last_edited_at", sa.DateTime(), nullable=True),
+        sa.Column("sync_base", sa.JSON(), nullable=True),
+    )
+
+    if "notion_mirrors" not in _inspector().get_table_names():
+        op.create_table(
+            "notion_mirrors",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("source_page_id", sa.String(200), nullable=False),
+            sa.Column("mirror_page_id", sa.String(200), nullable=False),
+            sa.Column("content_hash", sa.String(64), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_notion_mirrors_id", "notion_mirrors", ["id"])
+        op.create_index("ix_notion_mirrors_source_page_id", "notion_mirrors", ["source_page_id"], unique=True)
+
+    # A shared Notion page is mirrored once per assignee: notion_id is unique per user only
+    notion_index = _indexes("tasks").get("ix_tasks_notion_id")
+    if notion_index is not None and notion_index["unique"]:
+        op.drop_index("ix_tasks_notion_id", table_name="tasks")
+        op.create_index("ix_tasks_notion_id", "tasks", ["notion_id"])
+    unique_names = {constraint["name"] for constraint in _inspector().get_unique_constraints("tasks")}
+    if "uq_tasks_user_notion_id" not in unique_names:
+        with op.batch_alter_table("tasks") as batch:
+            batch.create_unique_constraint("uq_tasks_user_notion_id", ["user_id", "notion_id"])
+
+    _create_index("ix_tasks_user_status", "tasks", ["user_id", "status"])
+    _create_index(
+        "ix_reminders_pending_scheduled",
+        "reminders",
+        ["scheduled_time"],
+        postgresql_where=sa.text("sent = false"),
+        sqlite_where=sa.text("sent = 0"),
+    )
+    _create_index("ix_categories_user_name", "categories", ["user_id", "name"])
+    _create_index("ix_conversation_history_user_created", "conversation_history", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversation_history_user_created", table_name="conversation_history")
+    op.drop_index("ix_categories_user_name", table_name="categories")
+    op.drop_index("ix_reminders_pending_scheduled", table_name="reminders")
+    op.drop_index("ix_tasks_user_status", table_name="tasks")
+
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_constraint("uq_tasks_user_notion_id", type_="unique")
+    op.drop_index("ix_tasks_notion_id", table_name="tasks")
+    op.create_index("ix_tasks_notion_id", "tasks", ["notion_id"], unique=True)
+
+    op.drop_table("notion_mirrors")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("sync_base")
+        batch.drop_column("notion_last_edited_at")
+        batch.drop_column("notion_hash")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("notion_synced_at")
+        batch.drop_column("onboarding_stage")
+        batch.drop_column("notion_page_id")
+        batch.drop_column("notion_hash")
@@ -0,0 +1,43 @@
+"""
+One-off backfill of the local Notion mirror index.
+
+Scans the bot's Notion tasks database and records, for every mirror page with
+an ``origin_page_id``, the mapping source page -> mirror page, so the mirroring
+webhook no longer has to query Notion to find existing mirrors.
+
+Usage:
+    python scripts/backfill_notion_mirrors.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.notion_webhook import _ensure_configuration, backfill_mirror_index
+from src.database.session import SessionLocal, init_db
+from src.utils.logger import logger
+
+
+def main():
+    """Backfill the notion_mirrors table."""
+    db = SessionLocal()
+    try:
+        init_db()
+        notion, target_db = _ensure_configuration()
+
+        logger.info(f"Backfilling Notion mirror index from database {target_db}...")
+        changed = backfill_mirror_index(notion, target_db, db)
+
+        print(f"\n✅ Mirror index backfilled: {changed} mapping(s) added or corrected")
+
+    except Exception as e:
+        logger.error(f"Mirror index backfill failed: {e}", exc_info=True)
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
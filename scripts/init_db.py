@@ -15,10 +15,10 @@ def main():
     try:
         logger.info("Starting database initialization...")
 
-        # Create all tables
+        # Upgrade to the latest migration (creates tables on a new database)
         init_db()
 
-        logger.info("Database tables created successfully!")
+        logger.info("Database schema is up to date!")
 
         # Print created tables
         print("\n✅ Database initialized successfully!")
@@ -25,10 +25,10 @@ class CommandMatcher:
                 config = yaml.safe_load(file)
                 return config.get("intents", {})
         except FileNotFoundError:
-            logger.warning(f"Intents config not found: {path}")
+            logger.warning("Intents config not found: %s", path)
             return {}
         except yaml.YAMLError as exc:
-            logger.error(f"Failed to parse intents config: {exc}")
+            logger.error("Failed to parse intents config: %s", exc)
             return {}
 
     def match(self, message: str) -> Optional[Dict[str, Any]]:
@@ -72,7 +72,7 @@ class CommandMatcher:
                             best_confidence = confidence
                         break
                 except re.error as exc:
-                    logger.warning(f"Invalid regex '{pattern}': {exc}")
+                    logger.warning("Invalid regex '%s': %s", pattern, exc)
 
         return best_match
 
@@ -43,10 +43,10 @@ class ConversationManager:
                     first_message['content'] = get_system_prompt(user_name=user_name)
 
             if datetime.now() - last_activity < timedelta(minutes=self.timeout_minutes):
-                logger.debug(f"Existing conversation found for {user_id}")
+                logger.debug("Existing conversation found for %s", user_id)
                 return conv['messages']
             else:
-                logger.info(f"Conversation expired for {user_id}, creating new one")
+                logger.info("Conversation expired for %s, creating new one", user_id)
 
         # Create new conversation with personalized system prompt
         self.conversations[user_id] = {
@@ -56,7 +56,7 @@ class ConversationManager:
             'last_activity': datetime.now()
         }
 
-        logger.info(f"New conversation created for {user_id}")
+        logger.info("New conversation created for %s", user_id)
         return self.conversations[user_id]['messages']
 
     def add_message(self, user_id: str, role: str, content: str):
@@ -84,7 +84,7 @@ class ConversationManager:
         # Update last activity
         self.conversations[user_id]['last_activity'] = datetime.now()
 
-        logger.debug(f"Message added: {role} - {content[:50]}...")
+        logger.debug("Message added: %s - %s...", role, content[:50])
 
     def add_function_result(
         self,
@@ -117,7 +117,7 @@ class ConversationManager:
 
         self.conversations[user_id]['last_activity'] = datetime.now()
 
-        logger.debug(f"Function result added: {function_name}")
+        logger.debug("Function result added: %s", function_name)
 
     def add_tool_call_message(self, user_id: str, tool_call: Dict[str, Any]):
         """
@@ -137,7 +137,7 @@ class ConversationManager:
 
         self.conversations[user_id]['last_activity'] = datetime.now()
 
-        logger.debug(f"Assistant tool call recorded: {tool_call.get('function', {}).get('name')}")
+        logger.debug("Assistant tool call recorded: %s", tool_call.get('function', {}).get('name'))
 
     def clear_conversation(self, user_id: str):
         """
@@ -148,7 +148,7 @@ class ConversationManager:
         """
         if user_id in self.conversations:
             del self.conversations[user_id]
-            logger.info(f"Conversation cleared for {user_id}")
+            logger.info("Conversation cleared for %s", user_id)
 
     def cleanup_expired(self):
         """Remove expired conversations."""
@@ -163,7 +163,7 @@ class ConversationManager:
             del self.conversations[user_id]
 
         if expired:
-            logger.info(f"Removed {len(expired)} expired conversations")
+            logger.info("Removed %s expired conversations", len(expired))
 
 
 # Global instance with extended history for production usage
@@ -0,0 +1,138 @@
+"""Per-message state shared by the functions executed for one request."""
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.database.models import Task, User
+from src.utils.logger import logger
+
+
+class ExecutionContext:
+    """
+    Session, user and lookups of one incoming message.
+
+    The database connection is checked out once, on first use, and kept
+    until ``close()``: the session is bound to that connection, so commits
+    between function calls do not return it to the pool. The user is loaded
+    (or attached, when the caller already has it) once, and lookups such as
+    the user's task list are memoized for the rest of the message.
+    """
+
+    def __init__(
+        self,
+        user_id: Any,
+        session: Optional[Session] = None,
+        user: Optional[User] = None,
+        session_factory: Optional[Callable[..., Session]] = None,
+        engine: Any = None
+    ):
+        """
+        Initialize context.
+
+        Args:
+            user_id: ID of the user the message belongs to
+            session: Existing session to reuse (not closed by this context)
+            user: User already loaded by the caller (attached without a query)
+            session_factory: Session factory (default SessionLocal)
+            engine: Engine the connection is checked out from (default engine)
+        """
+        self.user_id = int(user_id)
+        self._session = session
+        self._owns_session = session is None
+        self._connection = None
+        self._user = user
+        self._user_resolved = False
+        self._lookups: Dict[str, Any] = {}
+        self.session_factory = session_factory
+        self.engine = engine
+
+    @property
+    def session(self) -> Session:
+        """Database session (opened on first access)."""
+        if self._session is None:
+            from src.database.session import SessionLocal, engine
+
+            self._connection = (self.engine or engine).connect()
+            factory = self.session_factory or SessionLocal
+            self._session = factory(bind=self._connection)
+        return self._session
+
+    @property
+    def user(self) -> Optional[User]:
+        """User of the message (one query at most per context)."""
+        if not self._user_resolved:
+            if self._user is not None:
+                # Loaded elsewhere (e.g. the async session): attach without a SELECT
+                self._user = self.session.merge(self._user, load=False)
+            else:
+                self._user = self.session.get(User, self.user_id)
+            self._user_resolved = True
+        return self._user
+
+    def memo(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return a per-message lookup, loading it on first use.
+
+        Args:
+            key: Lookup name
+            loader: Called once to produce the value
+
+        Returns:
+            Memoized value
+        """
+        if key not in self._lookups:
+            self._lookups[key] = loader()
+        return self._lookups[key]
+
+    def invalidate(self, key: Optional[str] = None):
+        """Forget one memoized lookup (or all) after a write that changes it."""
+        if key is None:
+            self._lookups.clear()
+        else:
+            self._lookups.pop(key, None)
+
+    def tasks(self) -> List[Task]:
+        """The user's tasks, as numbered by the task functions."""
+        return self.memo(
+            "tasks",
+            lambda: self.session.query(Task).filter(Task.user_id == self.user_id).all()
+        )
+
+    def rollback(self):
+        """
+        Roll back after a failed function so the next one gets a usable session.
+
+        A failed flush or commit leaves the shared session needing a rollback;
+        without one every later function of the message fails with it.
+        """
+        if self._session is None:
+            return
+        try:
+            self._session.rollback()
+        except Exception as e:
+            logger.error("Error rolling back execution context for user %s: %s", self.user_id, e)
+        self._lookups.clear()
+
+    def close(self):
+        """Close the session and return the connection, if this context opened them."""
+        if not self._owns_session:
+            return
+        try:
+            if self._session is not None:
+                self._session.close()
+            if self._connection is not None:
+                self._connection.close()
+        except Exception as e:
+            logger.error("Error closing execution context for user %s: %s", self.user_id, e)
+        finally:
+            self._session = None
+            self._connection = None
+            self._user = None
+            self._user_resolved = False
+            self._lookups.clear()
+
+    def __enter__(self) -> "ExecutionContext":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
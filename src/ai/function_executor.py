@@ -1,16 +1,58 @@
 """Execute functions called by OpenAI."""
 import json
-from typing import Dict, Any
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional
 
+import pytz
+
+from src.config.settings import settings
 from src.utils.logger import logger
+from src.utils.metrics import function_duration
+from src.utils.tracing import set_attributes, span
+from src.database.session import SessionLocal
+from src.ai.execution_context import ExecutionContext
 from src.integrations.notion_tasks import get_notion_task_reader
 from src.integrations.notion_sync import notion_sync
 
 
+def _outcome(result: Optional[str]) -> str:
+    """Metrics outcome of a function result (JSON with a ``success`` flag)."""
+    try:
+        return "success" if json.loads(result).get("success") else "error"
+    except (TypeError, ValueError, AttributeError):
+        return "error"
+
+
 class FunctionExecutor:
     """Execute functions called by OpenAI."""
 
-    def execute(self, function_name: str, arguments: Dict[str, Any], user_id: str) -> str:
+    # Names dispatched by _dispatch (anything else is reported as "unknown")
+    FUNCTIONS = frozenset({
+        "view_tasks", "create_task", "mark_done", "mark_progress", "view_progress",
+        "get_help", "mark_onboarded", "check_onboarding_status", "get_notion_tasks",
+        "update_notion_task_status", "sync_notion", "set_reminder", "list_reminders",
+        "create_category", "assign_category",
+    })
+
+    @contextmanager
+    def _context(self, user_id: str, context: Optional[ExecutionContext]) -> Iterator[ExecutionContext]:
+        """Use the caller's context, or a private one closed on exit."""
+        if context is not None:
+            yield context
+            return
+
+        with ExecutionContext(user_id, session_factory=SessionLocal) as own_context:
+            yield own_context
+
+    def execute(
+        self,
+        function_name: str,
+        arguments: Dict[str, Any],
+        user_id: str,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """
         Execute function and return result.
 
@@ -18,39 +60,75 @@ class FunctionExecutor:
             function_name: Function name
             arguments: Function arguments
             user_id: User ID
+            context: Per-message context (session, user, lookups) shared with
+                other calls for the same message; a private one is used if None
 
         Returns:
             Function result as JSON string
         """
-        logger.info(f"Executing function: {function_name} with args: {arguments}")
+        logger.info("Executing function: %s", function_name)
+        logger.debug("Function %s arguments: %s", function_name, arguments)
 
+        label = function_name if function_name in self.FUNCTIONS else "unknown"
+        started = time.perf_counter()
+        result = None
+        with span(f"function.{label}", {"function.name": function_name, "user.id": str(user_id)}) as current:
+            try:
+                try:
+                    # Opening a private context parses user_id (int) and may fail too
+                    with self._context(user_id, context) as ctx:
+                        result = self._dispatch(function_name, arguments, user_id, ctx)
+                        if _outcome(result) == "error":
+                            # The functions report failures as JSON; discard what they left pending
+                            ctx.rollback()
+                except Exception as e:
+                    logger.error("Error executing function %s: %s", function_name, e)
+                    result = json.dumps({
+                        "success": False,
+                        "error": str(e)
+                    })
+                return result
+            finally:
+                outcome = _outcome(result)
+                set_attributes(current, {"function.outcome": outcome})
+                function_duration.labels(function=label, outcome=outcome).observe(
+                    time.perf_counter() - started
+                )
+
+    def _dispatch(
+        self,
+        function_name: str,
+        arguments: Dict[str, Any],
+        user_id: str,
+        context: ExecutionContext
+    ) -> str:
         try:
             if function_name == "view_tasks":
-                return self._view_tasks(user_id, arguments)
+                return self._view_tasks(user_id, arguments, context)
 
             elif function_name == "create_task":
-                return self._create_task(user_id, arguments)
+                return self._create_task(user_id, arguments, context)
 
             elif function_name == "mark_done":
-                return self._mark_done(user_id, arguments)
+                return self._mark_done(user_id, arguments, context)
 
             elif function_name == "mark_progress":
-                return self._mark_progress(user_id, arguments)
+                return self._mark_progress(user_id, arguments, context)
 
             elif function_name == "view_progress":
-                return self._view_progress(user_id)
+                return self._view_progress(user_id, context)
 
             elif function_name == "get_help":
                 return self._get_help()
 
             elif function_name == "mark_onboarded":
-                return self._mark_onboarded(user_id, arguments)
+                return self._mark_onboarded(user_id, arguments, context)
 
             elif function_name == "check_onboarding_status":
-                return self._check_onboarding_status(user_id)
+                return self._check_onboarding_status(user_id, context)
 
             elif function_name == "get_notion_tasks":
-                return self._get_notion_tasks(user_id, arguments)
+                return self._get_notion_tasks(user_id, arguments, context)
 
             elif function_name == "update_notion_task_status":
                 return self._update_notion_task_status(user_id, arguments)
@@ -59,16 +137,16 @@ class FunctionExecutor:
                 return self._sync_notion(user_id, arguments)
 
             elif function_name == "set_reminder":
-                return self._set_reminder(user_id, arguments)
+                return self._set_reminder(user_id, arguments, context)
 
             elif function_name == "list_reminders":
-                return self._list_reminders(user_id)
+                return self._list_reminders(user_id, context)
 
             elif function_name == "create_category":
-                return self._create_category(user_id, arguments)
+                return self._create_category(user_id, arguments, context)
 
             elif function_name == "assign_category":
-                return self._assign_category(user_id, arguments)
+                return self._assign_category(user_id, arguments, context)
 
             else:
                 return json.dumps({
@@ -77,28 +155,34 @@ class FunctionExecutor:
                 })
 
         except Exception as e:
-            logger.error(f"Error executing function {function_name}: {e}")
+            logger.error("Error executing function %s: %s", function_name, e)
+            context.rollback()
             return json.dumps({
                 "success": False,
                 "error": str(e)
             })
 
-    def _view_tasks(self, user_id: str, arguments: Dict) -> str:
+    def _view_tasks(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Execute view_tasks with sync from Notion."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import Task, TaskStatus, User
+            from src.database.models import Task, TaskStatus
 
-            db = SessionLocal()
-            try:
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
                 # OPCIÓN A: Sync from Notion to PostgreSQL BEFORE querying
-                user = db.query(User).filter(User.id == int(user_id)).first()
+                user = ctx.user
                 if user:
-                    logger.info(f"Syncing tasks from Notion for user {user_id}")
+                    logger.info("Syncing tasks from Notion for user %s", user_id)
                     synced = notion_sync.sync_from_notion_to_db(user, db)
-                    logger.info(f"Synced {synced} tasks from Notion")
+                    ctx.invalidate("tasks")
+                    logger.info("Synced %s tasks from Notion", synced)
                 else:
-                    logger.warning(f"User {user_id} not found for sync")
+                    logger.warning("User %s not found for sync", user_id)
 
                 # Now query the synced tasks
                 filter_status = arguments.get('filter_status', 'all')
@@ -123,21 +207,23 @@ class FunctionExecutor:
                     "success": True,
                     "data": "\n".join(task_list)
                 })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in view_tasks: {e}")
+            logger.error("Error in view_tasks: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error listing tasks: {str(e)}"
             })
 
-    def _create_task(self, user_id: str, arguments: Dict) -> str:
+    def _create_task(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Execute create_task with optional Notion sync."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import Task, TaskStatus, TaskPriority, User
+            from src.database.models import Task, TaskStatus, TaskPriority
             from datetime import datetime
 
             title = arguments.get('title', '')
@@ -150,9 +236,9 @@ class FunctionExecutor:
                     "error": "Task title is required"
                 })
 
-            db = SessionLocal()
-            try:
-                user = db.query(User).filter(User.id == int(user_id)).first()
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
+                user = ctx.user
 
                 # Create new task
                 task = Task(
@@ -165,6 +251,7 @@ class FunctionExecutor:
                 db.add(task)
                 db.commit()
                 db.refresh(task)
+                ctx.invalidate("tasks")
 
                 # Attempt to sync to Notion (optional - don't fail if Notion sync fails)
                 try:
@@ -173,29 +260,31 @@ class FunctionExecutor:
                         if notion_id:
                             task.notion_id = notion_id
                             db.commit()
-                            logger.info(f"Task {task.id} synced to Notion: {notion_id}")
+                            logger.info("Task %s synced to Notion: %s", task.id, notion_id)
                 except Exception as sync_error:
-                    logger.warning(f"Could not sync task to Notion: {sync_error}")
+                    logger.warning("Could not sync task to Notion: %s", sync_error)
 
                 return json.dumps({
                     "success": True,
                     "data": f"✅ Task '{title}' created successfully!"
                 })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in create_task: {e}")
+            logger.error("Error in create_task: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error creating task: {str(e)}"
             })
 
-    def _mark_done(self, user_id: str, arguments: Dict) -> str:
+    def _mark_done(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Execute mark_done with Notion sync."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import Task, TaskStatus, User
+            from src.database.models import TaskStatus
 
             task_numbers = arguments.get('task_numbers', [])
 
@@ -205,12 +294,12 @@ class FunctionExecutor:
                     "error": "No task numbers provided"
                 })
 
-            db = SessionLocal()
-            try:
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
                 # Get all tasks for user in order
-                tasks = db.query(Task).filter(Task.user_id == int(user_id)).all()
+                tasks = ctx.tasks()
                 results = []
-                user = db.query(User).filter(User.id == int(user_id)).first()
+                user = ctx.user
 
                 for task_num in task_numbers:
                     if 0 < task_num <= len(tasks):
@@ -222,10 +311,11 @@ class FunctionExecutor:
                         # Attempt to sync status change to Notion
                         try:
                             if user and task.notion_id:
-                                notion_sync.update_task_in_notion(task)
-                                logger.info(f"Task {task.id} status synced to Notion")
+                                if notion_sync.update_task_in_notion(task):
+                                    db.commit()  # Persist the pushed digest
+                                logger.info("Task %s status synced to Notion", task.id)
                         except Exception as sync_error:
-                            logger.warning(f"Could not sync task status to Notion: {sync_error}")
+                            logger.warning("Could not sync task status to Notion: %s", sync_error)
                     else:
                         results.append(f"❌ Task {task_num} not found")
 
@@ -233,21 +323,23 @@ class FunctionExecutor:
                     "success": True,
                     "data": "\n".join(results)
                 })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in mark_done: {e}")
+            logger.error("Error in mark_done: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error marking tasks done: {str(e)}"
             })
 
-    def _mark_progress(self, user_id: str, arguments: Dict) -> str:
+    def _mark_progress(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Execute mark_progress with Notion sync."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import Task, TaskStatus, User
+            from src.database.models import TaskStatus
 
             task_numbers = arguments.get('task_numbers', [])
 
@@ -257,12 +349,12 @@ class FunctionExecutor:
                     "error": "No task numbers provided"
                 })
 
-            db = SessionLocal()
-            try:
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
                 # Get all tasks for user in order
-                tasks = db.query(Task).filter(Task.user_id == int(user_id)).all()
+                tasks = ctx.tasks()
                 results = []
-                user = db.query(User).filter(User.id == int(user_id)).first()
+                user = ctx.user
 
                 for task_num in task_numbers:
                     if 0 < task_num <= len(tasks):
@@ -274,10 +366,11 @@ class FunctionExecutor:
                         # Attempt to sync status change to Notion
                         try:
                             if user and task.notion_id:
-                                notion_sync.update_task_in_notion(task)
-                                logger.info(f"Task {task.id} status synced to Notion")
+                                if notion_sync.update_task_in_notion(task):
+                                    db.commit()  # Persist the pushed digest
+                                logger.info("Task %s status synced to Notion", task.id)
                         except Exception as sync_error:
-                            logger.warning(f"Could not sync task status to Notion: {sync_error}")
+                            logger.warning("Could not sync task status to Notion: %s", sync_error)
                     else:
                         results.append(f"❌ Task {task_num} not found")
 
@@ -285,25 +378,21 @@ class FunctionExecutor:
                     "success": True,
                     "data": "\n".join(results)
                 })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in mark_progress: {e}")
+            logger.error("Error in mark_progress: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error marking tasks in progress: {str(e)}"
             })
 
-    def _view_progress(self, user_id: str) -> str:
+    def _view_progress(self, user_id: str, context: Optional[ExecutionContext] = None) -> str:
         """Execute view_progress."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import Task, TaskStatus
+            from src.database.models import TaskStatus
 
-            db = SessionLocal()
-            try:
-                tasks = db.query(Task).filter(Task.user_id == int(user_id)).all()
+            with self._context(user_id, context) as ctx:
+                tasks = ctx.tasks()
 
                 total = len(tasks)
                 completed = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
@@ -322,11 +411,9 @@ class FunctionExecutor:
                         "percentage": round(percentage, 1)
                     }
                 })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in view_progress: {e}")
+            logger.error("Error in view_progress: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error getting progress: {str(e)}"
@@ -358,16 +445,19 @@ Sempre disponível para ajudar! 🚀
             "data": help_text
         })
 
-    def _mark_onboarded(self, user_id: str, arguments: Dict) -> str:
+    def _mark_onboarded(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Mark user as completed onboarding in Notion."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import User
             from src.integrations.notion_users import notion_user_manager
 
-            db = SessionLocal()
-            try:
-                user = db.query(User).filter(User.id == int(user_id)).first()
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
+                user = ctx.user
                 if not user:
                     return json.dumps({
                         "success": False,
@@ -375,9 +465,10 @@ Sempre disponível para ajudar! 🚀
                     })
 
                 # Mark onboarding complete in Notion
-                success = notion_user_manager.mark_onboarding_complete(user.phone_number)
+                success = notion_user_manager.mark_onboarding_complete(user.phone_number, user=user)
 
                 if success:
+                    db.commit()  # Persist page id and onboarding stage
                     return json.dumps({
                         "success": True,
                         "data": "✅ Onboarding completed and recorded in Notion!"
@@ -387,34 +478,31 @@ Sempre disponível para ajudar! 🚀
                         "success": False,
                         "error": "Could not record onboarding in Notion"
                     })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in mark_onboarded: {e}")
+            logger.error("Error in mark_onboarded: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error marking onboarding: {str(e)}"
             })
 
-    def _check_onboarding_status(self, user_id: str) -> str:
-        """Check if user has completed onboarding in Notion."""
+    def _check_onboarding_status(self, user_id: str, context: Optional[ExecutionContext] = None) -> str:
+        """Check if user has completed onboarding (local stage, Notion as fallback)."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import User
             from src.integrations.notion_users import notion_user_manager
 
-            db = SessionLocal()
-            try:
-                user = db.query(User).filter(User.id == int(user_id)).first()
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
+                user = ctx.user
                 if not user:
                     return json.dumps({
                         "success": False,
                         "error": "User not found"
                     })
 
-                # Check onboarding status in Notion
-                is_onboarded = notion_user_manager.get_onboarding_status(user.phone_number)
+                # Local stage when known, Notion otherwise
+                is_onboarded = notion_user_manager.get_onboarding_status(user.phone_number, user=user)
+                db.commit()
 
                 if is_onboarded:
                     return json.dumps({
@@ -426,17 +514,20 @@ Sempre disponível para ajudar! 🚀
                         "success": True,
                         "data": "⏳ You haven't completed onboarding yet. Let's start!"
                     })
-            finally:
-                db.close()
 
         except Exception as e:
-            logger.error(f"Error in check_onboarding_status: {e}")
+            logger.error("Error in check_onboarding_status: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error checking onboarding status: {str(e)}"
             })
 
-    def _get_notion_tasks(self, user_id: str, arguments: Dict) -> str:
+    def _get_notion_tasks(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Get tasks from Notion database for Groq to read and analyze."""
         try:
             # Get format and filters from arguments
@@ -448,18 +539,12 @@ Sempre disponível para ajudar! 🚀
             # Try to resolve user name for personalization filtering
             user_name = None
             try:
-                from src.database.session import SessionLocal
-                from src.database.models import User
-
-                db = SessionLocal()
-                try:
-                    user = db.query(User).filter(User.id == int(user_id)).first()
+                with self._context(user_id, context) as ctx:
+                    user = ctx.user
                     if user and user.name:
                         user_name = user.name.strip()
-                finally:
-                    db.close()
             except Exception as exc:
-                logger.debug(f"Could not resolve user name for Notion filter: {exc}")
+                logger.debug("Could not resolve user name for Notion filter: %s", exc)
 
             # Get tasks based on filter
             if status_filter != 'all':
@@ -583,7 +668,7 @@ Sempre disponível para ajudar! 🚀
                     else:
                         formatted_data = task_reader.format_for_groq(tasks)
 
-            logger.info(f"Retrieved {len(tasks)} tasks from Notion")
+            logger.info("Retrieved %s tasks from Notion", len(tasks))
             return json.dumps({
                 "success": True,
                 "data": formatted_data,
@@ -591,7 +676,7 @@ Sempre disponível para ajudar! 🚀
             })
 
         except Exception as e:
-            logger.error(f"Error in get_notion_tasks: {e}")
+            logger.error("Error in get_notion_tasks: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error retrieving tasks from Notion: {str(e)}"
@@ -629,14 +714,14 @@ Sempre disponível para ajudar! 🚀
             else:
                 progress_msg = ""
 
-            logger.info(f"Updated task {task_id} status to '{new_status}'{progress_msg}")
+            logger.info("Updated task %s status to '%s'%s", task_id, new_status, progress_msg)
             return json.dumps({
                 "success": True,
                 "data": f"✅ Task status updated to '{new_status}'{progress_msg}!"
             })
 
         except Exception as e:
-            logger.error(f"Error in update_notion_task_status: {e}")
+            logger.error("Error in update_notion_task_status: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error updating task status: {str(e)}"
@@ -654,19 +739,24 @@ Sempre disponível para ajudar! 🚀
             if direction in ['both', 'to_notion']:
                 sync_all_tasks()
 
-            logger.info(f"Notion sync completed for direction: {direction}")
+            logger.info("Notion sync completed for direction: %s", direction)
             return json.dumps({
                 "success": True,
                 "data": f"✅ Notion sync completed ({direction} direction)!"
             })
         except Exception as e:
-            logger.error(f"Error in sync_notion: {e}")
+            logger.error("Error in sync_notion: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error syncing with Notion: {str(e)}"
             })
 
-    def _set_reminder(self, user_id: str, arguments: Dict) -> str:
+    def _set_reminder(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Set a reminder for a task based on user request.
 
         This function handles USER-INITIATED reminders (e.g., "remind me in 5 minutes").
@@ -685,14 +775,18 @@ Sempre disponível para ajudar! 🚀
                     "error": "task_number and reminder_datetime are required"
                 })
 
-            # For MVP: store reminder in database
-            from src.database.session import SessionLocal
-            from src.database.models import Task, Reminder
-            from datetime import datetime
+            from src.database.models import Reminder
 
-            db = SessionLocal()
-            try:
-                tasks = db.query(Task).filter(Task.user_id == int(user_id)).all()
+            scheduled_time = self._parse_reminder_datetime(reminder_datetime)
+            if not scheduled_time:
+                return json.dumps({
+                    "success": False,
+                    "error": f"Could not understand reminder time '{reminder_datetime}'"
+                })
+
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
+                tasks = ctx.tasks()
 
                 if task_number > len(tasks):
                     return json.dumps({
@@ -702,11 +796,13 @@ Sempre disponível para ajudar! 🚀
 
                 task = tasks[task_number - 1]
 
-                # Create reminder
+                # Stored as pending; the reminder dispatcher polls and sends it
                 reminder = Reminder(
                     task_id=task.id,
-                    reminder_time=reminder_datetime,
-                    is_sent=False
+                    user_id=int(user_id),
+                    scheduled_time=scheduled_time,
+                    message=arguments.get('message'),
+                    sent=False
                 )
                 db.add(reminder)
                 db.commit()
@@ -715,25 +811,41 @@ Sempre disponível para ajudar! 🚀
                     "success": True,
                     "data": f"✅ Reminder set for '{task.title}' at {reminder_datetime}!"
                 })
-            finally:
-                db.close()
         except Exception as e:
-            logger.error(f"Error in set_reminder: {e}")
+            logger.error("Error in set_reminder: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error setting reminder: {str(e)}"
             })
 
-    def _list_reminders(self, user_id: str) -> str:
+    @staticmethod
+    def _parse_reminder_datetime(value: str) -> Optional[datetime]:
+        """Parse ISO or natural language time into a naive UTC datetime."""
+        from src.utils.helpers import parse_datetime_natural
+
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            parsed = parse_datetime_natural(str(value))
+
+        if not parsed:
+            return None
+
+        # Naive values are in the bot's local timezone
+        if parsed.tzinfo is None:
+            parsed = pytz.timezone(settings.TIMEZONE).localize(parsed)
+
+        return parsed.astimezone(pytz.utc).replace(tzinfo=None)
+
+    def _list_reminders(self, user_id: str, context: Optional[ExecutionContext] = None) -> str:
         """List all reminders for the user."""
         try:
-            from src.database.session import SessionLocal
-            from src.database.models import Task, Reminder
+            from src.database.models import Reminder
 
-            db = SessionLocal()
-            try:
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
                 # Get all tasks for user
-                tasks = db.query(Task).filter(Task.user_id == int(user_id)).all()
+                tasks = ctx.tasks()
                 task_ids = [t.id for t in tasks]
 
                 # Get active reminders
@@ -745,8 +857,8 @@ Sempre disponível para ajudar! 🚀
 
                 reminders = db.query(Reminder).filter(
                     Reminder.task_id.in_(task_ids),
-                    Reminder.is_sent == False
-                ).all()
+                    Reminder.sent == False
+                ).order_by(Reminder.scheduled_time).all()
 
                 if not reminders:
                     return json.dumps({
@@ -754,25 +866,32 @@ Sempre disponível para ajudar! 🚀
                         "data": "No active reminders."
                     })
 
+                # Stored as naive UTC; shown in the bot's local timezone
+                local_tz = pytz.timezone(settings.TIMEZONE)
+                tasks_by_id = {t.id: t for t in tasks}
                 reminder_list = []
                 for reminder in reminders:
-                    task = db.query(Task).filter(Task.id == reminder.task_id).first()
-                    reminder_list.append(f"• {task.title} @ {reminder.reminder_time}")
+                    task = tasks_by_id[reminder.task_id]
+                    local_time = pytz.utc.localize(reminder.scheduled_time).astimezone(local_tz)
+                    reminder_list.append(f"• {task.title} @ {local_time.strftime('%d/%m/%Y %H:%M')}")
 
                 return json.dumps({
                     "success": True,
                     "data": "\n".join(reminder_list) if reminder_list else "No reminders."
                 })
-            finally:
-                db.close()
         except Exception as e:
-            logger.error(f"Error in list_reminders: {e}")
+            logger.error("Error in list_reminders: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error listing reminders: {str(e)}"
             })
 
-    def _create_category(self, user_id: str, arguments: Dict) -> str:
+    def _create_category(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Create a new task category."""
         try:
             name = arguments.get('name')
@@ -785,11 +904,10 @@ Sempre disponível para ajudar! 🚀
                     "error": "Category name is required"
                 })
 
-            from src.database.session import SessionLocal
             from src.database.models import Category
 
-            db = SessionLocal()
-            try:
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
                 # Check if category already exists
                 existing = db.query(Category).filter(
                     Category.user_id == int(user_id),
@@ -816,16 +934,19 @@ Sempre disponível para ajudar! 🚀
                     "success": True,
                     "data": f"✅ Category '{name}' {emoji} created!"
                 })
-            finally:
-                db.close()
         except Exception as e:
-            logger.error(f"Error in create_category: {e}")
+            logger.error("Error in create_category: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error creating category: {str(e)}"
             })
 
-    def _assign_category(self, user_id: str, arguments: Dict) -> str:
+    def _assign_category(
+        self,
+        user_id: str,
+        arguments: Dict,
+        context: Optional[ExecutionContext] = None
+    ) -> str:
         """Assign a category to a task."""
         try:
             task_number = arguments.get('task_number')
@@ -837,13 +958,12 @@ Sempre disponível para ajudar! 🚀
                     "error": "task_number and category_name are required"
                 })
 
-            from src.database.session import SessionLocal
-            from src.database.models import Task, Category
+            from src.database.models import Category
 
-            db = SessionLocal()
-            try:
+            with self._context(user_id, context) as ctx:
+                db = ctx.session
                 # Get task
-                tasks = db.query(Task).filter(Task.user_id == int(user_id)).all()
+                tasks = ctx.tasks()
 
                 if task_number > len(tasks):
                     return json.dumps({
@@ -873,10 +993,8 @@ Sempre disponível para ajudar! 🚀
                     "success": True,
                     "data": f"✅ Task '{task.title}' assigned to '{category_name}' {category.emoji}!"
                 })
-            finally:
-                db.close()
         except Exception as e:
-            logger.error(f"Error in assign_category: {e}")
+            logger.error("Error in assign_category: %s", e)
             return json.dumps({
                 "success": False,
                 "error": f"Error assigning category: {str(e)}"
@@ -48,23 +48,23 @@ class GroqAudioClient:
                         model="whisper-large-v3"
                     )
 
-                logger.info(f"Audio transcribed successfully")
+                logger.info("Audio transcribed successfully")
                 return transcript.text
 
             except RateLimitError as e:
                 wait_time = 2 ** attempt
-                logger.warning(f"Groq rate limit. Waiting {wait_time}s... (attempt {attempt + 1}/{max_retries})")
+                logger.warning("Groq rate limit. Waiting %ss... (attempt %s/%s)", wait_time, attempt + 1, max_retries)
                 time.sleep(wait_time)
                 if attempt == max_retries - 1:
                     raise
 
             except APIConnectionError as e:
-                logger.error(f"Connection error with Groq: {e}")
+                logger.error("Connection error with Groq: %s", e)
                 if attempt == max_retries - 1:
                     raise
 
             except APIError as e:
-                logger.error(f"Groq API error: {e}")
+                logger.error("Groq API error: %s", e)
                 if attempt == max_retries - 1:
                     raise
 
@@ -6,7 +6,10 @@ import time
 from typing import List, Dict, Optional
 from openai import OpenAI, RateLimitError, APIConnectionError, APIError
 
+from src.config.settings import settings
 from src.utils.logger import logger
+from src.utils.metrics import llm_request_duration, llm_retries, observe_llm_usage, timed
+from src.utils.tracing import add_event, set_attributes, span
 from .system_prompt import (
     get_system_prompt,
     get_function_definitions,
@@ -24,7 +27,8 @@ class OpenAIClient:
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment")
 
-        self.client = OpenAI(api_key=api_key)
+        # None falls back to OPENAI_BASE_URL in the environment, then api.openai.com
+        self.client = OpenAI(api_key=api_key, base_url=settings.OPENAI_BASE_URL)
         self.model = MODEL_CONFIG["model"]
         self.temperature = MODEL_CONFIG["temperature"]
         self.max_tokens = MODEL_CONFIG["max_tokens"]
@@ -32,8 +36,8 @@ class OpenAIClient:
         self.frequency_penalty = MODEL_CONFIG["frequency_penalty"]
         self.presence_penalty = MODEL_CONFIG["presence_penalty"]
 
-        logger.info(f"OpenAI Client initialized: model={self.model}, "
-                   f"temp={self.temperature}, tokens={self.max_tokens}")
+        logger.info("OpenAI Client initialized: model=%s, "
+                   "temp=%s, tokens=%s", self.model, self.temperature, self.max_tokens)
 
     def chat_completion(
         self,
@@ -58,6 +62,28 @@ class OpenAIClient:
         Returns:
             Response object with content, function_call, and metadata
         """
+        with span("openai.chat_completion", {"llm.model": self.model}) as current:
+            with timed(llm_request_duration, model=self.model):
+                result = self._chat_completion(
+                    messages, user_id, user_name, functions, function_call, max_retries
+                )
+            set_attributes(current, {
+                "llm.prompt_tokens": result['usage']['prompt_tokens'],
+                "llm.completion_tokens": result['usage']['completion_tokens'],
+                "llm.finish_reason": result['finish_reason'],
+                "llm.function_call": (result['function_call'] or {}).get('name'),
+            })
+            return result
+
+    def _chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        user_id: Optional[str],
+        user_name: Optional[str],
+        functions: Optional[List[Dict]],
+        function_call: Optional[str],
+        max_retries: int
+    ) -> Dict:
         for attempt in range(max_retries):
             try:
                 # Build full message list without duplicating system prompt
@@ -119,8 +145,8 @@ class OpenAIClient:
                     if function_call is not None:
                         kwargs['tool_choice'] = function_call
 
-                logger.debug(f"OpenAI request: {len(messages)} messages, "
-                            f"model={self.model}, user={user_name or user_id}")
+                logger.debug("OpenAI request: %s messages, "
+                            "model=%s, user=%s", len(messages), self.model, user_name or user_id)
 
                 # Call OpenAI API
                 response = self.client.chat.completions.create(**kwargs)
@@ -138,6 +164,7 @@ class OpenAIClient:
                         'total_tokens': response.usage.total_tokens,
                     }
                 }
+                observe_llm_usage(self.model, result['usage'])
 
                 # Handle tool calls (function calling)
                 if hasattr(message, 'tool_calls') and message.tool_calls:
@@ -162,30 +189,36 @@ class OpenAIClient:
                         'arguments': parsed_arguments,
                         'arguments_json': raw_arguments if isinstance(raw_arguments, str) else json.dumps(raw_arguments)
                     }
-                    logger.info(f"OpenAI function call: {tool_call.function.name}")
+                    logger.info("OpenAI function call: %s", tool_call.function.name)
 
-                logger.info(f"OpenAI response: finish_reason={result['finish_reason']}, "
-                           f"tokens={result['usage']['total_tokens']}")
+                logger.info("OpenAI response: finish_reason=%s, "
+                           "tokens=%s", result['finish_reason'], result['usage']['total_tokens'])
 
                 return result
 
             except RateLimitError as e:
                 wait_time = 2 ** attempt  # Exponential backoff
-                logger.warning(f"OpenAI rate limit. Waiting {wait_time}s... "
-                             f"(attempt {attempt + 1}/{max_retries})")
+                logger.warning("OpenAI rate limit. Waiting %ss... "
+                             "(attempt %s/%s)", wait_time, attempt + 1, max_retries)
                 time.sleep(wait_time)
                 if attempt == max_retries - 1:
                     raise
+                llm_retries.labels(model=self.model, reason="rate_limit").inc()
+                add_event("openai.retry", {"reason": "rate_limit", "attempt": attempt + 1})
 
             except APIConnectionError as e:
-                logger.error(f"OpenAI connection error: {e}")
+                logger.error("OpenAI connection error: %s", e)
                 if attempt == max_retries - 1:
                     raise
+                llm_retries.labels(model=self.model, reason="connection").inc()
+                add_event("openai.retry", {"reason": "connection", "attempt": attempt + 1})
 
             except APIError as e:
-                logger.error(f"OpenAI API error: {e}")
+                logger.error("OpenAI API error: %s", e)
                 if attempt == max_retries - 1:
                     raise
+                llm_retries.labels(model=self.model, reason="api_error").inc()
+                add_event("openai.retry", {"reason": "api_error", "attempt": attempt + 1})
 
         # Should not reach here
         raise RuntimeError(f"Failed to get response from OpenAI after {max_retries} attempts")
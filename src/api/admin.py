@@ -0,0 +1,123 @@
+"""Admin diagnostics: sampling profiler, asyncio task dump and event-loop lag.
+
+Every endpoint needs ``Authorization: Bearer <ADMIN_TOKEN>``. Without an
+ADMIN_TOKEN configured they answer 404, as if they did not exist, and they
+are left out of the OpenAPI schema either way.
+"""
+import hmac
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
+
+from src.config.settings import settings
+from src.utils.logger import logger
+from src.utils.loop_watchdog import loop_watchdog
+from src.utils.profiler import ProfilerBusyError, dump_tasks, dump_threads, measure_loop_lag, profile
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Reject requests without the admin bearer token.
+
+    Args:
+        authorization: ``Authorization`` header
+
+    Raises:
+        HTTPException: 404 when no ADMIN_TOKEN is configured, 401 on a wrong token
+    """
+    token = settings.ADMIN_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {token}".encode()):
+        logger.warning("Unauthorized admin request")
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)], include_in_schema=False)
+
+
+def _check_duration(seconds: float) -> None:
+    if seconds > settings.ADMIN_PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be at most {settings.ADMIN_PROFILE_MAX_SECONDS}",
+        )
+
+
+@router.get("/profile")
+async def profile_process(
+    seconds: float = Query(10.0, gt=0),
+    mode: str = Query("wall"),
+    format: str = Query("speedscope"),
+    interval_ms: float = Query(10.0, ge=1.0, le=1000.0),
+) -> Response:
+    """
+    Sample every thread of this worker for a while and return the profile.
+
+    Args:
+        seconds: Profiling duration (at most ADMIN_PROFILE_MAX_SECONDS)
+        mode: ``wall`` (where time goes, waiting included) or ``cpu`` (where CPU goes)
+        format: ``speedscope`` (JSON for speedscope.app) or ``collapsed`` (flamegraph.pl)
+        interval_ms: Sampling interval
+
+    Returns:
+        Profile as a downloadable file
+    """
+    _check_duration(seconds)
+    if format not in ("speedscope", "collapsed"):
+        raise HTTPException(status_code=400, detail="format must be speedscope or collapsed")
+
+    try:
+        profiler = await profile(seconds, mode=mode, interval=interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"pangeia-{mode}-{time.strftime('%Y%m%d-%H%M%S')}"
+    if format == "collapsed":
+        return Response(
+            content=profiler.to_collapsed(),
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.folded"'},
+        )
+    return JSONResponse(
+        content=profiler.to_speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'},
+    )
+
+
+@router.get("/tasks")
+async def asyncio_tasks() -> Dict[str, Any]:
+    """
+    Asyncio tasks of this worker and the stack of every thread.
+
+    Returns:
+        Tasks with the frames they are suspended in and what they await, and
+        thread stacks (a task awaiting ``to_thread`` shows up in a thread)
+    """
+    tasks = dump_tasks()
+    return {"count": len(tasks), "tasks": tasks, "threads": dump_threads()}
+
+
+@router.get("/loop-lag")
+async def loop_lag(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(50.0, ge=1.0, le=1000.0),
+) -> Dict[str, Any]:
+    """
+    Measure event-loop lag for a while.
+
+    Args:
+        seconds: Measurement duration (at most ADMIN_PROFILE_MAX_SECONDS)
+        interval_ms: Timer interval
+
+    Returns:
+        Lag statistics in seconds and the latest blocks caught by the watchdog
+    """
+    _check_duration(seconds)
+    result = await measure_loop_lag(seconds, interval=interval_ms / 1000)
+    result["watchdog"] = {**loop_watchdog.stats(), "recent_blocks": list(loop_watchdog.recent)}
+    return result
@@ -2,11 +2,12 @@
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
 from src.database.session import get_db
 from src.database.models import User
+from src.integrations.user_provisioning import user_provisioner
 
 
 # Pydantic models
@@ -24,6 +25,10 @@ class CollaboratorUpdate(BaseModel):
     is_active: bool = None
 
 
+class ProvisionRequest(BaseModel):
+    phone_numbers: Optional[List[str]] = None
+
+
 class CollaboratorResponse(CollaboratorBase):
     id: int
     is_active: bool
@@ -118,6 +123,24 @@ async def delete_collaborator(phone_number: str, db: Session = Depends(get_db)):
     return {"message": "Colaborador desativado com sucesso"}
 
 
+@router.post("/provision/notion")
+def provision_notion(request: Optional[ProvisionRequest] = None, db: Session = Depends(get_db)):
+    """
+    Cria/atualiza em lote as páginas dos colaboradores no Notion.
+
+    Sem telefones informados, provisiona todos os colaboradores ativos que
+    ainda não têm página no Notion.
+    """
+    user_ids = None
+    if request is not None and request.phone_numbers:
+        rows = db.query(User.id).filter(User.phone_number.in_(request.phone_numbers)).all()
+        user_ids = [row.id for row in rows]
+        if not user_ids:
+            raise HTTPException(status_code=404, detail="Nenhum colaborador encontrado")
+
+    return user_provisioner.provision_many(user_ids)
+
+
 @router.post("/sync/sheets")
 async def sync_from_sheets(db: Session = Depends(get_db)):
     """Sincroniza colaboradores do Google Sheets com o banco."""
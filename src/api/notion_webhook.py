@@ -1,11 +1,17 @@
 """Webhook endpoint to sync tasks from Notion into the WhatsApp bot database."""
 from fastapi import APIRouter, Request, Header, HTTPException
 from notion_client import Client
-from notion_client.errors import APIResponseError
+from notion_client.errors import APIResponseError, APIErrorCode
+from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional, Tuple
 
 from src.config.settings import settings
+from src.database.models import NotionMirror
+from src.database.jobs import job_sessions
+from src.integrations.notion_gateway import NotionGateway, query_all_pages, notion_client_options
+from src.utils.debounce import KeyedDebouncer
 from src.utils.logger import logger
+from src.utils.notion_hash import properties_digest
 
 try:
     from slack_sdk import WebClient
@@ -24,10 +30,15 @@ if WebClient and settings.SLACK_BOT_TOKEN:
         logger.info("Slack client initialized for Notion webhook notifications")
     except Exception as exc:  # pragma: no cover
         slack_client = None
-        logger.error(f"Failed to initialize Slack client: {exc}")
+        logger.error("Failed to initialize Slack client: %s", exc)
+
+
+_notion_client: Optional[NotionGateway] = None
 
 
 def _ensure_configuration():
+    global _notion_client
+
     if not settings.NOTION_API_KEY:
         logger.error("NOTION_API_KEY is not configured")
         raise HTTPException(status_code=500, detail="Notion integration not configured")
@@ -37,7 +48,11 @@ def _ensure_configuration():
         logger.error("No target Notion database configured")
         raise HTTPException(status_code=500, detail="Target Notion database not configured")
 
-    return Client(auth=settings.NOTION_API_KEY), target_db
+    # Reuse one client (and its connection pool) across events
+    if _notion_client is None:
+        _notion_client = NotionGateway(Client(**notion_client_options()))
+
+    return _notion_client, target_db
 
 
 def _extract_title(props: Dict[str, Any]) -> str:
@@ -111,7 +126,12 @@ def _map_status(status_name: Optional[str]) -> Optional[str]:
 
 @router.api_route("/webhook", methods=["POST"])
 async def handle_notion_webhook(request: Request, authorization: str = Header(None)):
-    """Receive Notion automation webhook and mirror the page into the bot's Notion database."""
+    """
+    Receive Notion automation webhook and queue the page for mirroring.
+
+    Events are coalesced per page id: a burst of automation events for the
+    same page results in a single mirror operation after the debounce window.
+    """
     token = settings.NOTION_WEBHOOK_TOKEN
     if token and authorization != f"Bearer {token}":
         logger.warning("Unauthorized Notion webhook attempt")
@@ -127,7 +147,7 @@ async def handle_notion_webhook(request: Request, authorization: str = Header(No
 
     verification_token = payload.get("verification_token")
     if verification_token:
-        logger.warning(f"[Notion Webhook] verification_token received: {verification_token}")
+        logger.warning("[Notion Webhook] verification_token received: %s", verification_token)
 
     page_id = (
         payload.get("page_id")
@@ -139,13 +159,40 @@ async def handle_notion_webhook(request: Request, authorization: str = Header(No
         logger.warning("Notion webhook received without page_id")
         return {"ok": True, "skipped": "missing_page_id"}
 
+    _ensure_configuration()
+
+    scheduled = mirror_debouncer.submit(page_id)
+    return {"ok": True, "queued": page_id, "coalesced": not scheduled}
+
+
+@router.get("/webhook/stats")
+async def notion_webhook_stats() -> Dict[str, Any]:
+    """Throughput and coalescing metrics of the mirroring webhook."""
+    return mirror_debouncer.stats()
+
+
+def mirror_page(page_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    Mirror a source Notion page into the bot's Notion database.
+
+    The mirror page is found through the local ``notion_mirrors`` index; the
+    Notion database is only queried for pages not indexed yet. Updates are
+    skipped when the properties hash matches the last mirrored one.
+
+    Args:
+        page_id: Source page ID
+        db: Database session (a new one is opened if omitted)
+
+    Returns:
+        Result of the mirror operation
+    """
     notion, target_db = _ensure_configuration()
 
     try:
         page = notion.pages.retrieve(page_id=page_id)
     except APIResponseError as exc:
-        logger.error(f"Failed to retrieve Notion page {page_id}: {exc}")
-        raise HTTPException(status_code=400, detail=f"Failed to retrieve Notion page: {exc}") from exc
+        logger.error("Failed to retrieve Notion page %s: %s", page_id, exc)
+        raise
 
     props = page.get("properties", {})
 
@@ -167,16 +214,6 @@ async def handle_notion_webhook(request: Request, authorization: str = Header(No
     project = _extract_select(props, "Project") or _extract_select(props, "Projeto")
     page_url = page.get("url")
 
-    # Look for existing mirror page using origin_page_id rich text field
-    try:
-        existing = notion.databases.query(
-            database_id=target_db,
-            filter={"property": "origin_page_id", "rich_text": {"equals": page_id}}
-        )
-    except APIResponseError as exc:
-        logger.error(f"Failed to query target Notion database: {exc}")
-        raise HTTPException(status_code=400, detail=f"Failed to query target database: {exc}") from exc
-
     def build_properties() -> Dict[str, Any]:
         properties: Dict[str, Any] = {
             "Task": {"title": [{"type": "text", "text": {"content": title}}]},
@@ -210,46 +247,154 @@ async def handle_notion_webhook(request: Request, authorization: str = Header(No
 
         return properties
 
-    properties = build_properties()
-
-    if existing.get("results"):
-        target_page_id = existing["results"][0]["id"]
-        logger.info(f"Updating mirrored Notion task {target_page_id} from source {page_id}")
-        try:
-            notion.pages.update(page_id=target_page_id, properties=properties)
-        except APIResponseError as exc:
-            logger.error(f"Failed to update mirrored Notion page {target_page_id}: {exc}")
-            raise HTTPException(status_code=400, detail=f"Failed to update mirrored page: {exc}") from exc
+    def notify(action: str) -> None:
         _send_slack_notification(
-            action="updated",
+            action=action,
             title=title,
             page_url=page_url,
             status=status_name,
             assignees=assignee_names,
             project=project
         )
+
+    properties = build_properties()
+    content_hash = properties_digest(properties)
+
+    if db is None:
+        with job_sessions.session("notion_mirror") as session:
+            return _apply_mirror(notion, target_db, page_id, properties, content_hash, session, notify)
+    return _apply_mirror(notion, target_db, page_id, properties, content_hash, db, notify)
+
+
+def _find_mirror_remote(notion, target_db: str, page_id: str) -> Optional[str]:
+    """Fallback lookup for source pages not yet in the local index."""
+    try:
+        existing = notion.databases.query(
+            database_id=target_db,
+            filter={"property": "origin_page_id", "rich_text": {"equals": page_id}}
+        )
+    except APIResponseError as exc:
+        logger.error("Failed to query target Notion database: %s", exc)
+        raise
+
+    results = existing.get("results") or []
+    return results[0]["id"] if results else None
+
+
+def _apply_mirror(
+    notion,
+    target_db: str,
+    page_id: str,
+    properties: Dict[str, Any],
+    content_hash: str,
+    db: Session,
+    notify
+) -> Dict[str, Any]:
+    mirror = db.query(NotionMirror).filter(NotionMirror.source_page_id == page_id).first()
+
+    if mirror and mirror.content_hash == content_hash:
+        logger.debug("Mirror of %s is up to date, skipping update", page_id)
+        return {"ok": True, "unchanged": mirror.mirror_page_id}
+
+    if mirror is None:
+        target_page_id = _find_mirror_remote(notion, target_db, page_id)
+        if target_page_id:
+            mirror = NotionMirror(source_page_id=page_id, mirror_page_id=target_page_id)
+            db.add(mirror)
+
+    if mirror:
+        target_page_id = mirror.mirror_page_id
+        logger.info("Updating mirrored Notion task %s from source %s", target_page_id, page_id)
+        try:
+            notion.pages.update(page_id=target_page_id, properties=properties)
+        except APIResponseError as exc:
+            if exc.code != APIErrorCode.ObjectNotFound:
+                logger.error("Failed to update mirrored Notion page %s: %s", target_page_id, exc)
+                raise
+            # Mirror was deleted in Notion: drop the stale mapping and recreate
+            logger.warning("Mirrored Notion page %s no longer exists, recreating", target_page_id)
+            db.delete(mirror)
+            db.flush()
+            mirror = None
+
+    if mirror:
+        mirror.content_hash = content_hash
+        db.commit()
+        notify("updated")
         return {"ok": True, "updated": target_page_id}
 
-    logger.info(f"Creating mirrored Notion task for source {page_id}")
+    logger.info("Creating mirrored Notion task for source %s", page_id)
+    properties = dict(properties)
     properties["origin_page_id"] = {
         "rich_text": [{"type": "text", "text": {"content": page_id}}]
     }
 
     try:
-        notion.pages.create(parent={"database_id": target_db}, properties=properties)
+        created = notion.pages.create(parent={"database_id": target_db}, properties=properties)
     except APIResponseError as exc:
-        logger.error(f"Failed to create mirrored Notion page from {page_id}: {exc}")
-        raise HTTPException(status_code=400, detail=f"Failed to create mirrored page: {exc}") from exc
-    _send_slack_notification(
-        action="created",
-        title=title,
-        page_url=page_url,
-        status=status_name,
-        assignees=assignee_names,
-        project=project
-    )
+        logger.error("Failed to create mirrored Notion page from %s: %s", page_id, exc)
+        raise
+
+    db.add(NotionMirror(
+        source_page_id=page_id,
+        mirror_page_id=created["id"],
+        content_hash=content_hash
+    ))
+    db.commit()
+    notify("created")
 
     return {"ok": True, "created": True}
+
+
+def backfill_mirror_index(notion, target_db: str, db: Session) -> int:
+    """
+    Populate the local mirror index from the mirror pages already in Notion.
+
+    Args:
+        notion: Notion client
+        target_db: Database holding the mirror pages
+        db: Database session
+
+    Returns:
+        Number of mappings added or corrected
+    """
+    known = {m.source_page_id: m for m in db.query(NotionMirror).all()}
+    changed = 0
+
+    for page in query_all_pages(notion, target_db):
+        source_page_id = _extract_rich_text(page.get("properties", {}), "origin_page_id")
+        if not source_page_id:
+            continue
+
+        mirror = known.get(source_page_id)
+        if mirror is None:
+            mirror = NotionMirror(source_page_id=source_page_id, mirror_page_id=page["id"])
+            db.add(mirror)
+            known[source_page_id] = mirror
+            changed += 1
+        elif mirror.mirror_page_id != page["id"]:
+            mirror.mirror_page_id = page["id"]
+            # Unknown content: force the next event to push
+            mirror.content_hash = None
+            changed += 1
+
+    db.commit()
+    return changed
+
+
+def _on_mirror_event(page_id: str, payload: Any = None) -> None:
+    mirror_page(page_id)
+
+
+# Coalesces bursts of automation events per source page
+mirror_debouncer = KeyedDebouncer(
+    _on_mirror_event,
+    window_seconds=settings.NOTION_WEBHOOK_DEBOUNCE_SECONDS,
+    max_wait_seconds=settings.NOTION_WEBHOOK_MAX_WAIT_SECONDS,
+    name="notion_mirror"
+)
+
+
 def _send_slack_notification(
     action: str,
     title: str,
@@ -279,6 +424,6 @@ def _send_slack_notification(
             text=message
         )
     except SlackApiError as exc:  # pragma: no cover
-        logger.error(f"Failed to send Slack notification: {exc.response.get('error')}")
+        logger.error("Failed to send Slack notification: %s", exc.response.get('error'))
     except Exception as exc:  # pragma: no cover
-        logger.error(f"Unexpected Slack error: {exc}")
+        logger.error("Unexpected Slack error: %s", exc)
@@ -1,13 +1,17 @@
 """Webhook handlers for Evolution API - with OpenAI integration."""
+import asyncio
 import json
 import re
 import hmac
 import hashlib
-from fastapi import APIRouter, Request, BackgroundTasks, Depends
+import time
+from fastapi import APIRouter, Request, BackgroundTasks, Response
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional, List
 
-from src.database.session import get_db
+from src.database import async_queries
+from src.database.session import get_async_db_context
+from src.database.jobs import job_sessions
 from src.database.models import User
 from src.utils.logger import logger
 from src.utils.helpers import normalize_phone_number
@@ -18,14 +22,18 @@ from src.config.settings import settings
 from src.ai.openai_client import OpenAIClient
 from src.ai.conversation_manager import conversation_manager
 from src.ai.function_executor import function_executor
+from src.ai.execution_context import ExecutionContext
 
 # Notion integration
-from src.integrations.notion_users import notion_user_manager
+from src.integrations.user_provisioning import user_provisioner
 
 # Command matcher for reliable command detection
 from src.ai.command_matcher import command_matcher
 from src.utils.text_normalizer import TextNormalizer
 from src.utils.message_humanizer import MessageHumanizer
+from src.utils.debounce import KeyedDebouncer
+from src.utils.metrics import CONTENT_TYPE_LATEST, message_stage_duration, render as render_metrics, timed
+from src.utils.tracing import traced
 
 router = APIRouter()
 
@@ -190,7 +198,7 @@ def parse_text_function_call(text: str) -> Optional[Dict]:
                 'arguments': arrow_match.group(2)
             }
         except Exception as e:
-            logger.warning(f"Error parsing arrow-format function call: {e}")
+            logger.warning("Error parsing arrow-format function call: %s", e)
 
     # Try XML format: <function=name>args</function>
     xml_match = re.search(r'<function=(\w+)>(.*?)</function>', text, re.DOTALL)
@@ -201,72 +209,78 @@ def parse_text_function_call(text: str) -> Optional[Dict]:
                 'arguments': xml_match.group(2).strip()
             }
         except Exception as e:
-            logger.warning(f"Error parsing XML-format function call: {e}")
+            logger.warning("Error parsing XML-format function call: %s", e)
 
     return None
 
 
+@traced("process_incoming_message")
 async def process_incoming_message(
     phone_number: str,
     message_text: str,
-    user_name: str,
-    db: Session
+    user_name: str
 ):
     """
     Process incoming WhatsApp message with OpenAI.
 
+    Runs as a background task: it opens its own sessions (async lookup,
+    execution context) instead of using the request's.
+
     Args:
         phone_number: Sender phone number
         message_text: Message content
         user_name: Sender name
-        db: Database session
     """
+    started = time.perf_counter()
+    outcome = "success"
     try:
         # Normalize phone number
         normalized_phone = normalize_phone_number(phone_number)
 
-        # Get or create user
-        user = db.query(User).filter(User.phone_number == normalized_phone).first()
-        is_new_user = False
-        if not user:
-            user = User(
-                phone_number=normalized_phone,
-                name=user_name
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            is_new_user = True
-            logger.info(f"New user created: {normalized_phone}")
-
-            # Sync new user to Notion in background
-            try:
-                notion_user_manager.sync_user_to_notion(user)
-                logger.info(f"User {normalized_phone} synced to Notion")
-            except Exception as e:
-                logger.warning(f"Could not sync user {normalized_phone} to Notion: {e}")
+        # Get or create user (async session: the event loop is not blocked on DB I/O)
+        with timed(message_stage_duration, stage="user_lookup"):
+            async with get_async_db_context() as session:
+                user = await async_queries.get_user_by_phone(session, normalized_phone)
+                is_new_user = False
+                if not user:
+                    user = await async_queries.create_user(session, normalized_phone, user_name)
+                    is_new_user = True
+                    logger.info("New user created: %s", normalized_phone)
+
+                    # Notion page is created in background; the first reply does not wait for it
+                    user_provisioner.enqueue(user.id)
 
         user_id = str(user.id)
 
-        response_payload = await process_with_openai(user_id, message_text, db, user_name=user.name)
+        # One session/connection and one user load shared by every function of this message
+        context = ExecutionContext(user.id, user=user)
+        try:
+            with timed(message_stage_duration, stage="reply"):
+                response_payload = await process_with_openai(
+                    user_id, message_text, user_name=user.name, context=context
+                )
+        finally:
+            await asyncio.to_thread(context.close)
 
         if isinstance(response_payload, dict):
             chunks = response_payload.get("chunks") or [response_payload.get("message", "")]
         else:
             chunks = [response_payload]
 
-        for chunk in chunks:
-            if not chunk:
-                continue
-            evolution_client.send_text_message(
-                phone_number=phone_number,
-                message=chunk
-            )
+        with timed(message_stage_duration, stage="send"):
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                evolution_client.send_text_message(
+                    phone_number=phone_number,
+                    message=chunk
+                )
 
-        logger.info(f"Message processed for user {normalized_phone}")
+        logger.info("Message processed for user %s", normalized_phone)
 
     except Exception as e:
-        logger.error(f"Error processing message: {e}", exc_info=True)
+        outcome = "error"
+        logger.error("Error processing message: %s", e, exc_info=True)
 
         # Send error message to user
         try:
@@ -275,37 +289,64 @@ async def process_incoming_message(
                 message="Desculpe, ocorreu um erro ao processar sua mensagem. Tente novamente mais tarde."
             )
         except Exception as inner_e:
-            logger.error(f"Failed to send error message to {phone_number}: {inner_e}")
+            logger.error("Failed to send error message to %s: %s", phone_number, inner_e)
+
+    finally:
+        message_stage_duration.labels(stage="total", outcome=outcome).observe(time.perf_counter() - started)
+
+
+async def _release_context(context: Optional[ExecutionContext]) -> None:
+    """
+    Return the message's connection to the pool once its functions have run.
+
+    Functions commit their own writes; closing ends the transaction left open
+    by reads, so no connection sits idle in transaction during the next LLM
+    call. A later function call checks out a new one.
+    """
+    if context is not None:
+        await asyncio.to_thread(context.close)
 
 
-async def process_with_openai(user_id: str, message: str, db: Session, user_name: str = None) -> Dict[str, Any]:
+@traced("process_with_openai")
+async def process_with_openai(
+    user_id: str,
+    message: str,
+    user_name: str = None,
+    context: Optional[ExecutionContext] = None
+) -> Dict[str, Any]:
     """
     Process message with OpenAI and execute functions.
 
     Args:
         user_id: User ID
         message: User message
-        db: Database session
         user_name: User's name for personalization
+        context: Per-message execution context passed to the function executor;
+            its connection is released before the follow-up LLM call
 
     Returns:
         Assistant response
     """
     try:
         # === PHASE 1: Try reliable command matching FIRST ===
-        normalized_text = text_normalizer.remove_accents(message)
-        normalized_text = text_normalizer.convert_written_numbers(normalized_text)
-        command_match = command_matcher.match(normalized_text or message)
+        with timed(message_stage_duration, stage="command_match"):
+            normalized_text = text_normalizer.remove_accents(message)
+            normalized_text = text_normalizer.convert_written_numbers(normalized_text)
+            command_match = command_matcher.match(normalized_text or message)
 
         if command_match and command_match.get('confidence') == 'high':
             # Direct function execution for high-confidence matches
-            logger.info(f"Direct command match: {command_match['function']}")
+            logger.info("Direct command match: %s", command_match['function'])
 
-            function_result = function_executor.execute(
+            # Functions mix DB and Notion calls: run them off the event loop
+            function_result = await asyncio.to_thread(
+                function_executor.execute,
                 command_match['function'],
                 command_match['arguments'],
-                user_id
+                user_id,
+                context
             )
+            await _release_context(context)
 
             # Parse function result
             result_data = json.loads(function_result)
@@ -340,7 +381,7 @@ async def process_with_openai(user_id: str, message: str, db: Session, user_name
                 )
             else:
                 # Function failed, fall through to LLM
-                logger.warning(f"Command execution failed: {result_data.get('error')}")
+                logger.warning("Command execution failed: %s", result_data.get('error'))
 
         # === PHASE 2: Use LLM with fallback function call parsing ===
         conversation_manager.add_message(user_id, "user", message)
@@ -348,7 +389,7 @@ async def process_with_openai(user_id: str, message: str, db: Session, user_name
         # Get conversation history with personalization
         messages = conversation_manager.get_or_create_conversation(user_id, user_name)
 
-        logger.info(f"Calling OpenAI for user {user_id} with {len(messages)} messages in history")
+        logger.info("Calling OpenAI for user %s with %s messages in history", user_id, len(messages))
 
         # Call OpenAI with function calling
         # Functions are loaded from system_prompt by default
@@ -378,7 +419,7 @@ async def process_with_openai(user_id: str, message: str, db: Session, user_name
                 try:
                     function_args = json.loads(function_args)
                 except json.JSONDecodeError:
-                    logger.error(f"Failed to parse function args string: {function_args}")
+                    logger.error("Failed to parse function args string: %s", function_args)
                     function_args = {}
 
             if tool_call_id:
@@ -392,7 +433,7 @@ async def process_with_openai(user_id: str, message: str, db: Session, user_name
                     }
                 }
 
-            logger.info(f"OpenAI called function via function_call: {function_name}")
+            logger.info("OpenAI called function via function_call: %s", function_name)
 
         elif response.get('content'):
             # Fallback: Check for text-based function calls
@@ -401,20 +442,23 @@ async def process_with_openai(user_id: str, message: str, db: Session, user_name
                 function_name = text_call['name']
                 try:
                     function_args = json.loads(text_call['arguments'])
-                    logger.info(f"OpenAI called function via text format: {function_name}")
+                    logger.info("OpenAI called function via text format: %s", function_name)
                 except json.JSONDecodeError:
-                    logger.error(f"Failed to parse function args: {text_call['arguments']}")
+                    logger.error("Failed to parse function args: %s", text_call['arguments'])
 
         # Execute function if found
         if function_name and function_args:
             if tool_call_payload:
                 conversation_manager.add_tool_call_message(user_id, tool_call_payload)
 
-            function_result = function_executor.execute(
+            function_result = await asyncio.to_thread(
+                function_executor.execute,
                 function_name,
                 function_args,
-                user_id
+                user_id,
+                context
             )
+            await _release_context(context)
             slack_notified = False
 
             conversation_manager.add_function_result(
@@ -449,7 +493,7 @@ async def process_with_openai(user_id: str, message: str, db: Session, user_name
         )
 
     except Exception as e:
-        logger.error(f"Error processing with OpenAI: {e}", exc_info=True)
+        logger.error("Error processing with OpenAI: %s", e, exc_info=True)
         return _build_response_payload(
             user_id,
             message_humanizer.humanize_error("Tente novamente em instantes."),
@@ -479,8 +523,7 @@ def _build_response_payload(
 @router.post("/webhook/evolution")
 async def evolution_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks
 ) -> Dict[str, Any]:
     """
     Webhook endpoint for Evolution API.
@@ -488,14 +531,13 @@ async def evolution_webhook(
     Args:
         request: FastAPI request
         background_tasks: Background tasks manager
-        db: Database session
 
     Returns:
         Success response
     """
     try:
         payload = await request.json()
-        logger.debug(f"Webhook received: {payload}")
+        logger.debug("Webhook received: %s", payload)
 
         event = payload.get("event")
         data = payload.get("data", {})
@@ -532,19 +574,18 @@ async def evolution_webhook(
             process_incoming_message,
             phone_number=phone_number,
             message_text=message_text,
-            user_name=push_name,
-            db=db
+            user_name=push_name
         )
 
         return {"status": "success", "message": "Processing"}
 
     except Exception as e:
-        logger.error(f"Webhook error: {e}", exc_info=True)
+        logger.error("Webhook error: %s", e, exc_info=True)
         return {"status": "error", "message": str(e)}
 
 
 @router.post("/webhook/notion")
-async def notion_webhook(request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def notion_webhook(request: Request, background_tasks: BackgroundTasks) -> Dict[str, str]:
     """
     Notion webhook handler for task updates.
 
@@ -553,7 +594,6 @@ async def notion_webhook(request: Request, background_tasks: BackgroundTasks, db
     Args:
         request: FastAPI request object
         background_tasks: Background task manager
-        db: Database session
 
     Returns:
         Status response
@@ -577,7 +617,7 @@ async def notion_webhook(request: Request, background_tasks: BackgroundTasks, db
                 logger.warning("Invalid Notion webhook signature")
                 return {"status": "error", "message": "Invalid signature"}
 
-        logger.info(f"Notion webhook received: {data.get('type')}")
+        logger.info("Notion webhook received: %s", data.get('type'))
 
         # Handle Notion events
         if data.get("type") == "ping":
@@ -585,85 +625,107 @@ async def notion_webhook(request: Request, background_tasks: BackgroundTasks, db
             return {"type": "pong"}
 
         if data.get("type") == "page_change":
-            # Task was updated
+            # Task was updated; bursts of edits to one page cause one fetch
             page = data.get("page", {})
             page_id = page.get("id")
 
             if page_id:
-                logger.info(f"Notion page updated: {page_id}")
-                background_tasks.add_task(
-                    process_notion_page_change,
-                    page_id=page_id,
-                    db=db
-                )
+                logger.info("Notion page updated: %s", page_id)
+                notion_page_debouncer.submit(page_id)
 
         elif data.get("type") == "database_change":
             # Database entries changed
             logger.info("Notion database changed")
-            background_tasks.add_task(
-                sync_all_notion_tasks,
-                db=db
-            )
+            notion_database_debouncer.submit("all")
 
         return {"status": "success"}
 
     except Exception as e:
-        logger.error(f"Notion webhook error: {e}", exc_info=True)
+        logger.error("Notion webhook error: %s", e, exc_info=True)
         return {"status": "error", "message": str(e)}
 
 
-async def process_notion_page_change(page_id: str, db: Session) -> None:
+async def process_notion_page_change(page_id: str, db: Optional[Session] = None) -> None:
     """
     Process a single page change from Notion.
 
+    Only the changed page is fetched and only the rows of its assignees are
+    upserted. The blocking Notion/DB work runs in a worker thread.
+
     Args:
         page_id: Notion page ID
-        db: Database session
+        db: Database session (a new one is opened when omitted)
     """
     try:
-        from src.integrations.notion_sync import notion_sync
-
-        logger.info(f"Processing Notion page change: {page_id}")
-        # TODO: Implement single page sync
-        logger.info(f"Page {page_id} processed")
+        logger.info("Processing Notion page change: %s", page_id)
+        synced = await asyncio.to_thread(_sync_notion_page, page_id, db)
+        logger.info("Page %s processed: %s users updated", page_id, len(synced))
 
     except Exception as e:
-        logger.error(f"Error processing Notion page: {e}", exc_info=True)
+        logger.error("Error processing Notion page: %s", e, exc_info=True)
+
 
+def _sync_notion_page(page_id: str, db: Optional[Session] = None) -> Dict[int, int]:
+    from src.integrations.notion_sync import notion_sync
 
-async def sync_all_notion_tasks(db: Session) -> None:
+    if db is not None:
+        return notion_sync.sync_page(page_id, db)
+
+    with job_sessions.session("notion_page_change") as session:
+        return notion_sync.sync_page(page_id, session)
+
+
+async def sync_all_notion_tasks(db: Optional[Session] = None) -> None:
     """
     Sync all tasks from Notion after database change.
 
+    Each Notion database is read once and its pages are distributed to every
+    assigned user, instead of re-querying the database per user.
+
     Args:
-        db: Database session
+        db: Database session (a job session is opened in the worker thread when omitted)
     """
     try:
         from src.integrations.notion_sync import notion_sync
-        from src.database.models import User
 
         logger.info("Syncing all tasks from Notion")
 
-        # Get all users and sync their tasks
-        users = db.query(User).filter(User.is_active == True).all()
-        total_synced = 0
-
-        for user in users:
-            try:
-                synced = notion_sync.sync_from_notion_to_db(user, db)
-                total_synced += synced
-                logger.info(f"Synced {synced} tasks for user {user.name}")
-            except Exception as user_error:
-                logger.warning(f"Error syncing for user {user.id}: {user_error}")
+        if db is not None:
+            synced = await asyncio.to_thread(notion_sync.sync_all_users_from_notion, db)
+        else:
+            synced = await job_sessions.run(notion_sync.sync_all_users_from_notion)
 
-        logger.info(f"Total tasks synced from Notion: {total_synced}")
+        logger.info("Total tasks synced from Notion: %s for %s users", sum(synced.values()), len(synced))
 
     except Exception as e:
-        logger.error(f"Error syncing Notion tasks: {e}", exc_info=True)
+        logger.error("Error syncing Notion tasks: %s", e, exc_info=True)
+
+
+async def _on_page_change(page_id: str, payload: Any = None) -> None:
+    await process_notion_page_change(page_id)
+
+
+async def _on_database_change(key: str, payload: Any = None) -> None:
+    await sync_all_notion_tasks()
+
+
+# Coalesce Notion webhook bursts: one fetch per page, one database pull per burst
+notion_page_debouncer = KeyedDebouncer(
+    _on_page_change,
+    window_seconds=settings.NOTION_WEBHOOK_DEBOUNCE_SECONDS,
+    max_wait_seconds=settings.NOTION_WEBHOOK_MAX_WAIT_SECONDS,
+    name="notion_page_change"
+)
+notion_database_debouncer = KeyedDebouncer(
+    _on_database_change,
+    window_seconds=settings.NOTION_WEBHOOK_DEBOUNCE_SECONDS,
+    max_wait_seconds=settings.NOTION_WEBHOOK_MAX_WAIT_SECONDS,
+    name="notion_database_change"
+)
 
 
 @router.post("/webhook/slack")
-async def slack_webhook(request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def slack_webhook(request: Request, background_tasks: BackgroundTasks) -> Dict[str, str]:
     """
     Slack webhook handler for task updates from Notion.
 
@@ -673,7 +735,6 @@ async def slack_webhook(request: Request, background_tasks: BackgroundTasks, db:
     Args:
         request: FastAPI request object
         background_tasks: Background task manager
-        db: Database session
 
     Returns:
         Status response
@@ -691,7 +752,7 @@ async def slack_webhook(request: Request, background_tasks: BackgroundTasks, db:
             event = data.get("event", {})
             event_type = event.get("type")
 
-            logger.info(f"Slack event received: {event_type}")
+            logger.info("Slack event received: %s", event_type)
 
             # Handle message events from #tasks channel
             if event_type == "message":
@@ -699,7 +760,7 @@ async def slack_webhook(request: Request, background_tasks: BackgroundTasks, db:
                 text = event.get("text", "")
                 user = event.get("user", "")
 
-                logger.info(f"Slack message from {user} in {channel}: {text}")
+                logger.info("Slack message from %s in %s: %s", user, channel, text)
 
                 # Process the message from Slack
                 # Extract task info from Slack message (formatted by Notion automation)
@@ -708,21 +769,20 @@ async def slack_webhook(request: Request, background_tasks: BackgroundTasks, db:
                         process_slack_message,
                         text=text,
                         channel=channel,
-                        user=user,
-                        db=db
+                        user=user
                     )
 
             return {"status": "ok"}
 
-        logger.debug(f"Unhandled Slack webhook data: {data}")
+        logger.debug("Unhandled Slack webhook data: %s", data)
         return {"status": "ignored"}
 
     except Exception as e:
-        logger.error(f"Slack webhook error: {e}", exc_info=True)
+        logger.error("Slack webhook error: %s", e, exc_info=True)
         return {"status": "error", "message": str(e)}
 
 
-async def process_slack_message(text: str, channel: str, user: str, db: Session) -> None:
+async def process_slack_message(text: str, channel: str, user: str, db: Optional[Session] = None) -> None:
     """
     Process message received from Slack webhook.
 
@@ -732,10 +792,10 @@ async def process_slack_message(text: str, channel: str, user: str, db: Session)
         text: Message text from Slack
         channel: Slack channel
         user: Slack user ID
-        db: Database session
+        db: Database session (open one with job_sessions when needed)
     """
     try:
-        logger.info(f"Processing Slack message: {text[:100]}")
+        logger.info("Processing Slack message: %s", text[:100])
 
         # Parse task info from Slack message
         # Expected format from Notion automation:
@@ -746,10 +806,10 @@ async def process_slack_message(text: str, channel: str, user: str, db: Session)
         # 2. Query which users are assigned
         # 3. Send update to their WhatsApp
 
-        logger.info(f"Slack message processed successfully")
+        logger.info("Slack message processed successfully")
 
     except Exception as e:
-        logger.error(f"Error processing Slack message: {e}", exc_info=True)
+        logger.error("Error processing Slack message: %s", e, exc_info=True)
 
 
 @router.get("/health")
@@ -763,6 +823,29 @@ async def health_check() -> Dict[str, str]:
     return {"status": "healthy", "service": "pangeia_agent"}
 
 
+@router.get("/health/db")
+async def database_health() -> Dict[str, Any]:
+    """
+    Connection pool saturation and background job sessions.
+
+    Returns:
+        Pool size, checked-out/overflow connections, acquisition wait times
+        and job session counters
+    """
+    return job_sessions.stats()
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Returns:
+        Stage latency histograms, API/DB call metrics and component counters
+    """
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @router.get("/webhook/test")
 async def test_webhook() -> Dict[str, str]:
     """
@@ -9,6 +9,17 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Connections the whole app may open (all workers, sync + async engines)
+    DB_MAX_CONNECTIONS: int = 40
+    DB_ASYNC_POOL_SHARE: float = 0.25
+    DB_POOL_SIZE: Optional[int] = None  # Per worker; derived from the budget when unset
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER: bool = False  # NullPool, no prepared statements
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+    WEB_CONCURRENCY: int = 1  # uvicorn worker processes
 
     # Evolution API
     EVOLUTION_API_URL: str
@@ -17,17 +28,34 @@ class Settings(BaseSettings):
 
     # Notion API
     NOTION_API_KEY: str
+    NOTION_API_BASE_URL: Optional[str] = None  # e.g. a local stand-in for load tests
     NOTION_DATABASE_ID: str
     NOTION_GROQ_TASKS_DB_ID: Optional[str] = None
     NOTION_USERS_DATABASE_ID: Optional[str] = None
     NOTION_SOURCE_DATABASE_ID: Optional[str] = None
     NOTION_WEBHOOK_TOKEN: Optional[str] = None
     NOTION_WEBHOOK_SECRET: Optional[str] = None
+    NOTION_RATE_LIMIT_PER_SECOND: float = 3.0
+    NOTION_RATE_LIMIT_BURST: int = 3
+    NOTION_MAX_RETRIES: int = 3
+    NOTION_SYNC_WORKERS: int = 4
+    NOTION_PUSH_WORKERS: int = 4
+    NOTION_PUSH_COMMIT_EVERY: int = 50
+    NOTION_SCHEMA_TTL_SECONDS: int = 600
+    NOTION_SCHEMA_FAILURE_TTL_SECONDS: int = 30
+    NOTION_USER_RECONCILE_MINUTES: int = 30
+    USER_PROVISIONING_WORKERS: int = 2
+    USER_PROVISIONING_BULK_WORKERS: int = 4
+    USER_PROVISIONING_MAX_RETRIES: int = 5
+    USER_PROVISIONING_RETRY_BASE_SECONDS: float = 2.0
+    NOTION_WEBHOOK_DEBOUNCE_SECONDS: float = 2.0
+    NOTION_WEBHOOK_MAX_WAIT_SECONDS: float = 10.0
     SLACK_BOT_TOKEN: Optional[str] = None
     SLACK_TASKS_CHANNEL: Optional[str] = None
 
     # OpenAI (PRIMARY - Main LLM for text)
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None  # e.g. a local stand-in for load tests
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_MAX_TOKENS: int = 500
     OPENAI_TEMPERATURE: float = 0.7
@@ -40,14 +68,56 @@ class Settings(BaseSettings):
     APP_PORT: int = 8000
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
+    # Logging pipeline: records are written by a background thread (LOG_ASYNC)
+    LOG_ASYNC: bool = True
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped, never block
+    LOG_SAMPLE_BURST: int = 50  # INFO/DEBUG records per call site per second kept in full
+    LOG_SAMPLE_RATE: float = 0.1  # fraction kept beyond the burst (1.0 disables sampling)
+    LOG_REDACT_PII: bool = True
+
+    # Tracing (OpenTelemetry; exporter "console" prints spans, "otlp" sends them to a collector)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "console"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "pangeia-agent"
+    TRACING_SAMPLE_RATIO: float = 1.0
+
+    # Event-loop watchdog: reports calls that block the loop longer than the threshold
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_THRESHOLD_SECONDS: float = 0.1
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.05  # heartbeat period
+    LOOP_WATCHDOG_LOG_INTERVAL_SECONDS: float = 60.0  # at most one log per blocking function per interval
+
+    # Admin diagnostics (/admin: profiler, asyncio task dump, event-loop lag); off unless ADMIN_TOKEN is set
+    ADMIN_TOKEN: Optional[str] = None
+    ADMIN_PROFILE_MAX_SECONDS: int = 60
 
     # Webhook
     WEBHOOK_SECRET: Optional[str] = None
     WEBHOOK_PATH: str = "/webhook/evolution"
 
+    # Cache ("memory" per process, or "redis" shared through REDIS_URL)
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: Optional[str] = None
+    CACHE_KEY_PREFIX: str = "pangeia"
+    CACHE_DEFAULT_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_NOTION_TTL_SECONDS: int = 120
+    CACHE_RETRY_AFTER_SECONDS: float = 5.0  # backend skipped this long after a connection error
+
     # Timezone
     TIMEZONE: str = "America/Sao_Paulo"
 
+    # Reminders (database polling dispatcher)
+    REMINDER_POLL_INTERVAL_SECONDS: int = 30
+    REMINDER_BATCH_SIZE: int = 200
+    REMINDER_SENDER_WORKERS: int = 8
+    REMINDER_MAX_BATCHES_PER_RUN: int = 50
+
+    # Singleton jobs (nightly Notion sync, user reconciliation)
+    SCHEDULER_LEADER: Optional[bool] = None  # None: elect via advisory lock; true/false: force
+    SCHEDULER_LEADER_CHECK_SECONDS: int = 60
+
     # Agent Configuration
     AGENT_TEMPERATURE: float = 0.7
     AGENT_MAX_ITERATIONS: int = 5
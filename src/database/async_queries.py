@@ -0,0 +1,68 @@
+"""The few queries awaited directly on the event loop (AsyncSession).
+
+Scope is limited to the sender lookup/creation of the WhatsApp webhook and
+the idle check of the reminder poll. Everything else, task functions
+included, uses the sync session from a worker thread.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import Reminder, User
+
+
+async def get_user_by_phone(session: AsyncSession, phone_number: str) -> Optional[User]:
+    """
+    Get a user by normalized phone number.
+
+    Args:
+        session: Async database session
+        phone_number: Normalized phone number
+
+    Returns:
+        User or None
+    """
+    result = await session.execute(
+        select(User).where(User.phone_number == phone_number).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def create_user(session: AsyncSession, phone_number: str, name: Optional[str] = None) -> User:
+    """
+    Create and commit a user.
+
+    Args:
+        session: Async database session
+        phone_number: Normalized phone number
+        name: Display name
+
+    Returns:
+        Persisted user
+    """
+    user = User(phone_number=phone_number, name=name)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+async def count_due_reminders(session: AsyncSession, now: Optional[datetime] = None) -> int:
+    """
+    Number of unsent reminders due at ``now``.
+
+    Args:
+        session: Async database session
+        now: Reference time (UTC); defaults to current time
+
+    Returns:
+        Count of due reminders
+    """
+    now = now or datetime.utcnow()
+    result = await session.execute(
+        select(func.count(Reminder.id))
+        .where(Reminder.sent == False, Reminder.scheduled_time <= now)  # noqa: E712
+    )
+    return int(result.scalar_one())
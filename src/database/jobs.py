@@ -0,0 +1,115 @@
+"""Database sessions for background jobs.
+
+Request-scoped sessions (``Depends(get_db)``) are closed when the response is
+sent, so they must never be handed to ``BackgroundTasks`` or debounced work.
+Background jobs get their own session from this manager instead: opened when
+the job starts, committed or rolled back when it ends, always closed, and
+counted so long-held or leaked job sessions show up in the stats.
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from sqlalchemy.orm import Session
+
+from src.database.session import SessionLocal, engine
+from src.database.pool_metrics import pool_stats
+from src.utils.logger import logger
+
+
+class JobSessionManager:
+    """Scoped sessions for background jobs, with usage counters."""
+
+    # Jobs holding a session longer than this are logged
+    SLOW_JOB_SECONDS = 30.0
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, bind: Any = None):
+        """
+        Initialize manager.
+
+        Args:
+            session_factory: Factory returning a new database session
+            bind: Engine whose pool is reported in stats (default: app engine)
+        """
+        self.session_factory = session_factory
+        self.bind = bind if bind is not None else engine
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.opened = 0
+        self.failed = 0
+        self.held_seconds = 0.0
+
+    @contextmanager
+    def session(self, name: str = "job") -> Iterator[Session]:
+        """
+        Session for one background job (commit on success, rollback on error).
+
+        Args:
+            name: Job name used in logs
+
+        Yields:
+            Database session owned by the job
+        """
+        db = self.session_factory()
+        started = time.monotonic()
+        with self._lock:
+            self.opened += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            db.close()
+            held = time.monotonic() - started
+            with self._lock:
+                self.active -= 1
+                self.held_seconds += held
+            if held > self.SLOW_JOB_SECONDS:
+                logger.warning("Background job %s held a database session for %.1fs", name, held)
+
+    def run_sync(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call ``func(db, *args, **kwargs)`` with a job session.
+
+        Returns:
+            Result of func
+        """
+        with self.session(getattr(func, "__name__", "job")) as db:
+            return func(db, *args, **kwargs)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run blocking ``func(db, *args, **kwargs)`` in a worker thread with its own session.
+
+        The session is created, used and closed in that thread, so the event
+        loop never blocks on it and it never outlives the job.
+
+        Returns:
+            Result of func
+        """
+        return await asyncio.to_thread(self.run_sync, func, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring, including pool saturation."""
+        with self._lock:
+            jobs = {
+                "active": self.active,
+                "max_active": self.max_active,
+                "opened": self.opened,
+                "failed": self.failed,
+                "avg_held_ms": round(self.held_seconds / self.opened * 1000, 3) if self.opened else 0.0,
+            }
+        return {"jobs": jobs, "pool": pool_stats(self.bind)}
+
+
+# Global manager instance
+job_sessions = JobSessionManager()
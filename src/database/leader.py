@@ -0,0 +1,144 @@
+"""Leader election for jobs that must run in one process only.
+
+Every uvicorn worker and replica starts the scheduler. Reminder polling is
+safe everywhere (rows are claimed with locks), but the nightly Notion sync and
+the user reconciliation must run once: N copies would do the same work N
+times and compete for the shared Notion rate limit.
+
+On PostgreSQL the leader is whichever process holds a session-level advisory
+lock. It holds the lock on a dedicated connection, outside the pool budget
+of the worker. When that process dies its connection closes and the lock is
+freed, so the next process that tries takes over. Behind PgBouncer
+(DB_PGBOUNCER) session locks are not pinned to a client, so no process is
+elected; set SCHEDULER_LEADER=true on exactly one process instead. Other
+databases (SQLite in development) run a single process, which always leads.
+"""
+import threading
+from typing import Any, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from src.config.settings import settings
+from src.utils.logger import logger
+
+
+# Distinct from the migration lock in migrations/env.py
+SCHEDULER_LEADER_LOCK_ID = 7_246_319
+
+
+class LeaderLock:
+    """Process-wide leadership backed by a PostgreSQL advisory lock."""
+
+    def __init__(
+        self,
+        lock_id: int = SCHEDULER_LEADER_LOCK_ID,
+        database_url: Optional[str] = None,
+        forced: Optional[bool] = None,
+        pgbouncer: Optional[bool] = None
+    ):
+        """
+        Initialize lock.
+
+        Args:
+            lock_id: Advisory lock key
+            database_url: Database to lock on (default: DATABASE_URL)
+            forced: Fixed answer instead of an election (default: SCHEDULER_LEADER)
+            pgbouncer: Whether connections go through PgBouncer (default: DB_PGBOUNCER)
+        """
+        self.lock_id = lock_id
+        self.database_url = database_url or settings.DATABASE_URL
+        self.forced = settings.SCHEDULER_LEADER if forced is None else forced
+        self.pgbouncer = settings.DB_PGBOUNCER if pgbouncer is None else pgbouncer
+        self._engine: Any = None
+        self._connection: Any = None
+        self._lock = threading.Lock()
+        self._warned = False
+
+    @property
+    def is_leader(self) -> bool:
+        if self.forced is not None:
+            return self.forced
+        return self._connection is not None
+
+    def acquire(self) -> bool:
+        """
+        Become the leader if no other process is, or confirm leadership.
+
+        Safe to call periodically: a leader checks its lock connection is
+        still alive (and steps down if not), others retry the lock.
+
+        Returns:
+            Whether this process is the leader
+        """
+        if self.forced is not None:
+            return self.forced
+
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.execute(text("SELECT 1"))
+                    # End the check's transaction; the session-level lock stays held
+                    self._connection.commit()
+                    return True
+                except Exception as e:
+                    logger.warning("Leader lock connection lost, stepping down: %s", e)
+                    self._drop()
+
+            engine = self._get_engine()
+            if engine.dialect.name != "postgresql":
+                return True
+            if self.pgbouncer:
+                if not self._warned:
+                    self._warned = True
+                    logger.warning(
+                        "Advisory locks are unreliable behind PgBouncer: singleton jobs are disabled "
+                        "here; set SCHEDULER_LEADER=true on one process to run them"
+                    )
+                return False
+
+            connection = None
+            try:
+                connection = engine.connect()
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:id)"), {"id": self.lock_id}
+                ).scalar()
+                connection.commit()
+            except Exception as e:
+                logger.error("Leader election failed: %s", e)
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception as close_error:
+                        logger.warning("Error closing leader lock connection: %s", close_error)
+                return False
+
+            if not acquired:
+                connection.close()
+                return False
+
+            self._connection = connection
+            logger.info("This process is now the scheduler leader")
+            return True
+
+    def release(self):
+        """Give up leadership (the lock goes with the connection)."""
+        with self._lock:
+            self._drop()
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    def _get_engine(self) -> Any:
+        if self._engine is None:
+            # NullPool: the lock connection is never handed to anyone else
+            self._engine = create_engine(self.database_url, poolclass=NullPool)
+        return self._engine
+
+    def _drop(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning("Error closing leader lock connection: %s", e)
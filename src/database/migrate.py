@@ -0,0 +1,63 @@
+"""Alembic schema migrations.
+
+The schema is owned by the revisions in ``migrations/versions``; ``init_db``
+upgrades to the latest one on startup. Databases created with
+``Base.metadata.create_all`` before migrations existed are stamped at the
+initial revision first, so only the later revisions run against them.
+"""
+from pathlib import Path
+from typing import Any, Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+
+from src.utils.logger import logger
+
+
+ROOT = Path(__file__).resolve().parents[2]
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    """Alembic config for the repository's migrations directory."""
+    cfg = Config(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "migrations"))
+    # Keep the application's logging setup (alembic.ini would replace it)
+    cfg.attributes["configure_logging"] = False
+    return cfg
+
+
+def current_revision(bind: Any) -> Optional[str]:
+    """
+    Revision the database is at.
+
+    Args:
+        bind: Engine or connection
+
+    Returns:
+        Revision id, or None for an unversioned database
+    """
+    with bind.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def upgrade_to_head(bind: Any = None) -> None:
+    """
+    Upgrade the database to the latest revision.
+
+    Args:
+        bind: Engine to migrate (default: app engine)
+    """
+    if bind is None:
+        from src.database.session import engine as bind
+
+    cfg = alembic_config()
+    with bind.begin() as connection:
+        cfg.attributes["connection"] = connection
+        inspector = inspect(connection)
+        if not inspector.has_table("alembic_version") and inspector.has_table("users"):
+            logger.info("Unversioned database found, stamping it at revision %s", BASELINE_REVISION)
+            command.stamp(cfg, BASELINE_REVISION)
+        command.upgrade(cfg, "head")
@@ -1,7 +1,7 @@
 """SQLAlchemy database models."""
 from sqlalchemy import (
     Column, Integer, String, DateTime, Boolean,
-    ForeignKey, Text, Enum, Float
+    ForeignKey, Text, Enum, Float, UniqueConstraint, JSON, Index, text
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -35,6 +35,10 @@ class User(Base):
     name = Column(String(100))
     notion_token = Column(String(200), nullable=True)
     notion_database_id = Column(String(200), nullable=True)
+    notion_hash = Column(String(64), nullable=True)  # Digest of profile last written to Notion
+    notion_page_id = Column(String(200), nullable=True)  # Page in the Notion users database
+    onboarding_stage = Column(String(50), nullable=True)  # Mirrors Onboarding_Stage in Notion
+    notion_synced_at = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -51,6 +55,9 @@ class User(Base):
 class Category(Base):
     """Category model for organizing tasks."""
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_user_name", "user_id", "name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -69,6 +76,12 @@ class Category(Base):
 class Task(Base):
     """Task model."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # A shared Notion page can be mirrored as a task for each assignee
+        UniqueConstraint("user_id", "notion_id", name="uq_tasks_user_notion_id"),
+        # Per-user task lists, optionally filtered by status
+        Index("ix_tasks_user_status", "user_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -83,7 +96,10 @@ class Task(Base):
     completed_at = Column(DateTime, nullable=True)
 
     # Notion sync
-    notion_id = Column(String(200), unique=True, nullable=True, index=True)
+    notion_id = Column(String(200), nullable=True, index=True)
+    notion_hash = Column(String(64), nullable=True)  # Digest of properties at last sync
+    notion_last_edited_at = Column(DateTime, nullable=True)  # Notion last_edited_time at last pull
+    sync_base = Column(JSON, nullable=True)  # Field values both sides agreed on (merge base)
     last_synced_at = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -101,6 +117,15 @@ class Task(Base):
 class Reminder(Base):
     """Reminder model for task notifications."""
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Due-reminder polling only ever reads unsent rows
+        Index(
+            "ix_reminders_pending_scheduled",
+            "scheduled_time",
+            postgresql_where=text("sent = false"),
+            sqlite_where=text("sent = 0"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -121,9 +146,28 @@ class Reminder(Base):
         return f"<Reminder for Task {self.task_id} at {self.scheduled_time}>"
 
 
+class NotionMirror(Base):
+    """Mapping of a source Notion page to its mirror in the bot's database."""
+    __tablename__ = "notion_mirrors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_page_id = Column(String(200), unique=True, index=True, nullable=False)
+    mirror_page_id = Column(String(200), nullable=False)
+    content_hash = Column(String(64), nullable=True)  # Hash of last mirrored properties
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<NotionMirror {self.source_page_id} -> {self.mirror_page_id}>"
+
+
 class ConversationHistory(Base):
     """Store conversation history for LangChain memory."""
     __tablename__ = "conversation_history"
+    __table_args__ = (
+        Index("ix_conversation_history_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
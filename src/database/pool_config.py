@@ -0,0 +1,161 @@
+"""Connection pool sizing and engine options derived from settings.
+
+Every uvicorn worker is a separate process with its own sync and async
+engines, so per-process pools must be sized from the total connection budget
+the database (or PgBouncer) allows, divided by the number of workers.
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy.pool import NullPool
+
+from src.database.pool_metrics import MeteredQueuePool
+
+
+class PoolShare:
+    """Pool size and overflow of one engine in one worker."""
+
+    def __init__(self, pool_size: int, max_overflow: int):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+
+    @property
+    def max_connections(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    def __repr__(self):
+        return f"{self.pool_size}+{self.max_overflow}"
+
+
+class PoolLayout:
+    """Connection budget split across workers and the sync/async engines."""
+
+    def __init__(
+        self,
+        max_connections: int,
+        workers: int,
+        async_share: float = 0.25,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None
+    ):
+        """
+        Compute the layout.
+
+        Args:
+            max_connections: Connections the app may open in total (all workers)
+            workers: Worker processes (WEB_CONCURRENCY)
+            async_share: Fraction of a worker's budget for the async engine
+            pool_size: Explicit sync pool size (overrides the derived one)
+            max_overflow: Explicit sync overflow (overrides the derived one)
+        """
+        self.max_connections = max_connections
+        self.workers = max(1, workers)
+        # Each worker needs at least one connection per engine
+        self.per_worker = max(2, max_connections // self.workers)
+
+        async_budget = min(self.per_worker - 1, max(1, round(self.per_worker * async_share)))
+        sync_budget = self.per_worker - async_budget
+
+        self.sync = self._split(sync_budget, pool_size, max_overflow)
+        self.async_ = self._split(async_budget)
+
+    @staticmethod
+    def _split(budget: int, pool_size: Optional[int] = None, max_overflow: Optional[int] = None) -> PoolShare:
+        # Two thirds kept open, the rest as burst overflow
+        size = pool_size if pool_size is not None else max(1, (budget * 2) // 3)
+        overflow = max_overflow if max_overflow is not None else max(0, budget - size)
+        return PoolShare(size, overflow)
+
+    @property
+    def total(self) -> int:
+        """Connections all workers can open at peak."""
+        return self.workers * (self.sync.max_connections + self.async_.max_connections)
+
+    def describe(self) -> str:
+        return (
+            f"workers={self.workers} budget={self.max_connections} per_worker={self.per_worker} "
+            f"sync={self.sync} async={self.async_} peak_total={self.total}"
+        )
+
+
+def pool_layout(config: Any) -> PoolLayout:
+    """
+    Layout configured by settings.
+
+    Args:
+        config: Settings object
+
+    Returns:
+        PoolLayout
+    """
+    return PoolLayout(
+        max_connections=config.DB_MAX_CONNECTIONS,
+        workers=config.WEB_CONCURRENCY,
+        async_share=config.DB_ASYNC_POOL_SHARE,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW
+    )
+
+
+def _driver(url: str) -> str:
+    return url.split("://", 1)[0]
+
+
+def engine_options(config: Any, url: str, share: PoolShare, async_engine: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine / create_async_engine.
+
+    Args:
+        config: Settings object
+        url: Database URL the engine connects to
+        share: Pool share of this engine
+        async_engine: Whether the options are for the async engine
+
+    Returns:
+        Engine keyword arguments
+    """
+    driver = _driver(url)
+    is_sqlite = driver.startswith("sqlite")
+    options: Dict[str, Any] = {"echo": config.DEBUG}
+    connect_args: Dict[str, Any] = {}
+
+    if config.DB_PGBOUNCER and not is_sqlite:
+        # PgBouncer owns the pool; transaction pooling forbids server-side
+        # prepared statements, which asyncpg would otherwise cache per connection
+        options["poolclass"] = NullPool
+        if "asyncpg" in driver:
+            connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    else:
+        if not async_engine:
+            options["poolclass"] = MeteredQueuePool
+        if not (async_engine and is_sqlite):
+            options.update(
+                pool_size=share.pool_size,
+                max_overflow=share.max_overflow,
+                pool_timeout=config.DB_POOL_TIMEOUT,
+                pool_recycle=config.DB_POOL_RECYCLE,
+            )
+        options["pool_pre_ping"] = config.DB_POOL_PRE_PING
+
+    timeout_ms = config.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms and not is_sqlite and not config.DB_PGBOUNCER:
+        if "asyncpg" in driver:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout_ms)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def describe_engine(config: Any, layout: PoolLayout) -> str:
+    """One-line summary of the effective pool configuration (startup log)."""
+    mode = "pgbouncer (NullPool)" if config.DB_PGBOUNCER else "queue pool"
+    timeout = f"{config.DB_STATEMENT_TIMEOUT_MS}ms" if config.DB_STATEMENT_TIMEOUT_MS else "off"
+    if config.DB_PGBOUNCER and config.DB_STATEMENT_TIMEOUT_MS:
+        timeout += " (set it on the database role: PgBouncer rejects startup options)"
+    return (
+        f"Database pool: mode={mode} {layout.describe()} "
+        f"timeout={config.DB_POOL_TIMEOUT}s recycle={config.DB_POOL_RECYCLE}s "
+        f"statement_timeout={timeout}"
+    )
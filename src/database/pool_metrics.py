@@ -0,0 +1,102 @@
+"""Connection pool saturation metrics (checkouts, overflow, wait time)."""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Counters of how long callers wait for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        """
+        Record one connection acquisition.
+
+        Args:
+            seconds: Time spent waiting for the pool
+            timed_out: Whether the pool gave up (pool_timeout reached)
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            # Sub-millisecond acquisitions are served from idle connections
+            if seconds >= 0.001:
+                self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def reset(self):
+        """Clear the counters."""
+        with self._lock:
+            self.checkouts = self.waits = self.timeouts = 0
+            self.wait_seconds = self.max_wait_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            acquisitions = self.checkouts + self.timeouts
+            return {
+                "acquisitions": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_seconds / acquisitions * 1000, 3) if acquisitions else 0.0,
+                "wait_max_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that times every acquisition, including pool_timeout failures."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+def pool_stats(engine: Any) -> Dict[str, Any]:
+    """
+    Saturation of an engine's pool.
+
+    Args:
+        engine: SQLAlchemy Engine
+
+    Returns:
+        Pool size, checked-out and overflow connections, plus wait metrics
+        when the pool is a MeteredQueuePool
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        stats.update(
+            size=size,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+        )
+        capacity = size + max(0, pool._max_overflow)
+        stats["saturation"] = round(stats["checked_out"] / capacity, 4) if capacity > 0 else 0.0
+    if isinstance(pool, MeteredQueuePool):
+        stats.update(pool.metrics.snapshot())
+    return stats
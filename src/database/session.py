@@ -2,20 +2,24 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import contextmanager, asynccontextmanager
+from typing import AsyncGenerator, Generator
 
 from src.config.settings import settings
+from src.database.pool_config import describe_engine, engine_options, pool_layout
+from src.utils.logger import logger
+from src.utils.metrics import instrument_engine
 
 
-# Create database engine
+# Per-worker share of the connection budget (DB_MAX_CONNECTIONS / WEB_CONCURRENCY)
+layout = pool_layout(settings)
+
+# Create database engine (acquisition wait times recorded for pool_stats)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.DEBUG
+    **engine_options(settings, settings.DATABASE_URL, layout.sync)
 )
+instrument_engine(engine, "sync")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -23,6 +27,71 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+# Async stack for the queries in async_queries, created on first use (needs asyncpg/aiosqlite)
+_async_engine = None
+_async_session_factory = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    Map a sync database URL to its async driver.
+
+    postgres(ql):// and postgresql+psycopg2:// use asyncpg, sqlite:// uses
+    aiosqlite. asyncpg takes ``ssl`` instead of libpq's ``sslmode``.
+
+    Args:
+        url: Sync SQLAlchemy URL (DATABASE_URL)
+
+    Returns:
+        Async SQLAlchemy URL
+    """
+    scheme, sep, rest = url.partition("://")
+    driver = scheme.split("+")[0]
+    if driver in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg{sep}{rest.replace('sslmode=', 'ssl=')}"
+    if driver == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+def get_async_engine():
+    """
+    Get the AsyncEngine (created lazily).
+
+    Returns:
+        AsyncEngine bound to DATABASE_URL through the async driver
+    """
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = async_database_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(
+            url, **engine_options(settings, url, layout.async_, async_engine=True)
+        )
+        instrument_engine(_async_engine.sync_engine, "async")
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """
+    Create a new AsyncSession.
+
+    Objects stay usable after commit (``expire_on_commit=False``) since lazy
+    refreshes are not possible outside an await.
+
+    Returns:
+        AsyncSession
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -57,7 +126,60 @@ def get_db_context():
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator:
+    """
+    Get async database session for FastAPI dependency injection.
+
+    Yields:
+        AsyncSession
+    """
+    session = AsyncSessionLocal()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+@asynccontextmanager
+async def get_async_db_context():
+    """
+    Get async database session as context manager.
+
+    Yields:
+        AsyncSession (committed on success, rolled back on error)
+    """
+    session = AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def dispose_async_engine():
+    """Close the async connection pool (application shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+
+
+def log_pool_layout():
+    """Log the effective pool configuration of this worker (startup)."""
+    logger.info(describe_engine(settings, layout))
+    if layout.total > settings.DB_MAX_CONNECTIONS:
+        logger.warning(
+            "Pool peak (%s) exceeds DB_MAX_CONNECTIONS (%s); lower DB_POOL_SIZE/DB_MAX_OVERFLOW or raise the budget",
+            layout.total,
+            settings.DB_MAX_CONNECTIONS
+        )
+
+
 def init_db():
-    """Initialize database tables."""
-    from src.database.models import User, Task, Reminder, Category, ConversationHistory
-    Base.metadata.create_all(bind=engine)
+    """Initialize database tables by upgrading to the latest migration."""
+    from src.database.migrate import upgrade_to_head
+    upgrade_to_head(engine)
@@ -5,6 +5,8 @@ import json
 
 from src.config.settings import settings
 from src.utils.logger import logger
+from src.utils.metrics import evolution_request_duration, timed
+from src.utils.tracing import span
 
 
 class EvolutionAPIClient:
@@ -19,6 +21,18 @@ class EvolutionAPIClient:
             "apikey": self.api_key
         }
 
+    def _send(self, operation: str, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST a send request, recording its latency."""
+        with span(f"evolution.{operation}"), timed(evolution_request_duration, operation=operation):
+            response = requests.post(
+                url,
+                headers=self.headers,
+                json=payload,
+                timeout=30
+            )
+            response.raise_for_status()
+        return response
+
     def send_text_message(
         self,
         phone_number: str,
@@ -42,19 +56,13 @@ class EvolutionAPIClient:
         }
 
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
+            response = self._send("send_text", url, payload)
 
-            logger.info(f"Message sent to {phone_number}")
+            logger.info("Message sent to %s", phone_number)
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error sending message to {phone_number}: {e}")
+            logger.error("Error sending message to %s: %s", phone_number, e)
             raise
 
     def send_media_message(
@@ -88,19 +96,13 @@ class EvolutionAPIClient:
             payload["caption"] = caption
 
         try:
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
+            response = self._send("send_media", url, payload)
 
-            logger.info(f"Media message sent to {phone_number}")
+            logger.info("Media message sent to %s", phone_number)
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error sending media to {phone_number}: {e}")
+            logger.error("Error sending media to %s: %s", phone_number, e)
             raise
 
     def get_instance_status(self) -> Dict[str, Any]:
@@ -122,7 +124,7 @@ class EvolutionAPIClient:
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error getting instance status: {e}")
+            logger.error("Error getting instance status: %s", e)
             raise
 
     def create_instance(self, qrcode: bool = True) -> Dict[str, Any]:
@@ -152,11 +154,11 @@ class EvolutionAPIClient:
             )
             response.raise_for_status()
 
-            logger.info(f"Instance {self.instance_name} created")
+            logger.info("Instance %s created", self.instance_name)
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error creating instance: {e}")
+            logger.error("Error creating instance: %s", e)
             raise
 
     def set_webhook(self, webhook_url: str) -> Dict[str, Any]:
@@ -192,11 +194,11 @@ class EvolutionAPIClient:
             )
             response.raise_for_status()
 
-            logger.info(f"Webhook configured for {self.instance_name}")
+            logger.info("Webhook configured for %s", self.instance_name)
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error setting webhook: {e}")
+            logger.error("Error setting webhook: %s", e)
             raise
 
 
@@ -0,0 +1,231 @@
+"""Rate-limited gateway in front of the Notion API client.
+
+Notion allows an average of ~3 requests per second per integration. Every
+module talks to Notion through ``NotionGateway`` so that all calls made by the
+process (webhooks, executor functions, nightly sync workers) share one token
+bucket and get the same 429 retry behaviour.
+
+The gateway is synchronous: waiting for a token or a Retry-After sleeps the
+calling thread. Async code must call it through ``asyncio.to_thread`` (as the
+webhook handlers and the function executor do); a call made on an event loop
+thread is logged once per endpoint so such a caller is easy to find.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from notion_client import Client
+from notion_client.errors import APIResponseError, APIErrorCode
+
+from src.config.settings import settings
+from src.utils.logger import logger
+from src.utils.metrics import notion_request_duration, notion_retries, timed
+from src.utils.tracing import add_event, span
+
+
+def notion_client_options() -> Dict[str, Any]:
+    """Keyword arguments for ``notion_client.Client`` from settings."""
+    options: Dict[str, Any] = {"auth": settings.NOTION_API_KEY}
+    if settings.NOTION_API_BASE_URL:
+        options["base_url"] = settings.NOTION_API_BASE_URL
+    return options
+
+
+class RateLimiter:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum tokens accumulated while idle
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class _Endpoint:
+    """Proxy for a Notion client endpoint (``databases``, ``pages``...)."""
+
+    def __init__(self, gateway: "NotionGateway", name: str, endpoint: Any):
+        self._gateway = gateway
+        self._name = name
+        self._endpoint = endpoint
+
+    def __getattr__(self, method: str) -> Any:
+        target = getattr(self._endpoint, method)
+        if not callable(target):
+            return target
+
+        def call(*args, **kwargs):
+            return self._gateway.call(f"{self._name}.{method}", target, *args, **kwargs)
+
+        return call
+
+
+class NotionGateway:
+    """Notion client wrapper applying the shared rate limit and 429 retries."""
+
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: Optional[int] = None
+    ):
+        """
+        Initialize gateway.
+
+        Args:
+            client: Underlying ``notion_client.Client`` (created if omitted)
+            rate_limiter: Token bucket; defaults to the process-wide limiter
+            max_retries: Retries for rate-limited responses
+        """
+        self.client = client if client is not None else Client(**notion_client_options())
+        self.rate_limiter = rate_limiter or notion_rate_limiter
+        self.max_retries = settings.NOTION_MAX_RETRIES if max_retries is None else max_retries
+
+    @property
+    def databases(self) -> _Endpoint:
+        return _Endpoint(self, "databases", self.client.databases)
+
+    @property
+    def pages(self) -> _Endpoint:
+        return _Endpoint(self, "pages", self.client.pages)
+
+    @property
+    def users(self) -> _Endpoint:
+        return _Endpoint(self, "users", self.client.users)
+
+    @property
+    def blocks(self) -> _Endpoint:
+        return _Endpoint(self, "blocks", self.client.blocks)
+
+    def call(self, endpoint: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a Notion API call under the rate limit, retrying on HTTP 429.
+
+        Args:
+            endpoint: Endpoint name for logging (e.g. ``databases.query``)
+            func: Bound client method
+
+        Returns:
+            API response
+        """
+        if endpoint not in _loop_warned and _on_event_loop():
+            _loop_warned.add(endpoint)
+            logger.warning(
+                "Notion %s called on the event loop thread: rate-limit waits and retries block every "
+                "other request; call it through asyncio.to_thread",
+                endpoint
+            )
+
+        with span(f"notion.{endpoint}", {"notion.endpoint": endpoint}):
+            with timed(notion_request_duration, endpoint=endpoint):
+                return self._call(endpoint, func, *args, **kwargs)
+
+    def _call(self, endpoint: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                return func(*args, **kwargs)
+            except APIResponseError as e:
+                if e.code != APIErrorCode.RateLimited or attempt >= self.max_retries:
+                    raise
+
+                retry_after = _retry_after_seconds(e) or 2 ** attempt
+                attempt += 1
+                notion_retries.labels(endpoint=endpoint).inc()
+                add_event("notion.rate_limited", {"retry_after": float(retry_after), "attempt": attempt})
+                logger.warning(
+                    "Notion rate limited on %s; retrying in %ss (attempt %s/%s)",
+                    endpoint,
+                    retry_after,
+                    attempt,
+                    self.max_retries
+                )
+                time.sleep(retry_after)
+
+
+# Endpoints already reported as called on an event loop
+_loop_warned = set()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _retry_after_seconds(error: APIResponseError) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def query_all_pages(client: Any, database_id: str, **query: Any) -> List[Dict[str, Any]]:
+    """
+    Query a Notion database following pagination cursors.
+
+    Args:
+        client: Notion client or gateway
+        database_id: Database to query
+        **query: Extra ``databases.query`` arguments (filter, sorts...)
+
+    Returns:
+        All result pages
+    """
+    results: List[Dict[str, Any]] = []
+    cursor = None
+
+    while True:
+        kwargs = dict(query)
+        if cursor:
+            kwargs["start_cursor"] = cursor
+
+        response = client.databases.query(database_id=database_id, **kwargs)
+        results.extend(response.get("results", []))
+
+        cursor = response.get("next_cursor")
+        if response.get("has_more") is not True or not cursor:
+            return results
+
+
+# Shared by every Notion consumer in this process
+notion_rate_limiter = RateLimiter(
+    rate=settings.NOTION_RATE_LIMIT_PER_SECOND,
+    burst=settings.NOTION_RATE_LIMIT_BURST
+)
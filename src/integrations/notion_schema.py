@@ -0,0 +1,242 @@
+"""Per-database resolution of Notion property names for page parsing."""
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.config.settings import settings
+from src.utils.logger import logger
+
+
+# Page-derived schemas kept for databases whose schema cannot be retrieved
+MAX_PAGE_SCHEMAS = 128
+
+
+class CompiledSchema:
+    """
+    Logical field -> concrete property name mapping for one property set.
+
+    Built once per database (or per distinct page shape) so parsing a page is
+    a dictionary lookup per field instead of probing candidate names.
+    """
+
+    def __init__(
+        self,
+        properties: Mapping[str, Mapping[str, Any]],
+        rules: Mapping[str, Sequence[str]],
+        database_id: Optional[str] = None
+    ):
+        """
+        Compile schema.
+
+        Args:
+            properties: Property name -> {"id", "type"} (database or page)
+            rules: Logical field -> candidate property names, by preference
+            database_id: Source database, None for page-derived schemas
+        """
+        self.database_id = database_id
+        self.fields: Dict[str, str] = {}
+        self.types: Dict[str, Optional[str]] = {}
+        self.ids: Dict[str, Optional[str]] = {}
+
+        for field, candidates in rules.items():
+            for name in candidates:
+                prop = properties.get(name)
+                if prop is not None:
+                    self.fields[field] = name
+                    self.types[field] = prop.get("type") if isinstance(prop, Mapping) else None
+                    self.ids[field] = prop.get("id") if isinstance(prop, Mapping) else None
+                    break
+
+        self.missing: List[str] = [field for field in rules if field not in self.fields]
+
+    def extract(self, page_properties: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Pick the resolved property of every field from a page.
+
+        Args:
+            page_properties: The page's ``properties`` object
+
+        Returns:
+            Logical field -> property dict (None when absent)
+        """
+        return {field: page_properties.get(name) for field, name in self.fields.items()}
+
+    def drift(self, page_properties: Mapping[str, Any]) -> List[str]:
+        """
+        Fields whose resolved property is missing from the page or changed type.
+
+        Args:
+            page_properties: The page's ``properties`` object
+
+        Returns:
+            Drifted field names (empty when the page matches)
+        """
+        drifted = []
+        for field, name in self.fields.items():
+            prop = page_properties.get(name)
+            if prop is None:
+                drifted.append(field)
+                continue
+            expected = self.types.get(field)
+            actual = prop.get("type") if isinstance(prop, Mapping) else None
+            if expected and actual and expected != actual:
+                drifted.append(field)
+        return drifted
+
+
+class NotionSchemaResolver:
+    """
+    Resolve and cache compiled schemas per Notion database.
+
+    ``databases.retrieve`` is called at most once per database per TTL; a
+    failed retrieve is only remembered for the much shorter failure TTL. When a
+    page no longer matches its database schema (renamed, deleted or retyped
+    property) the drift is logged, the cached schema is dropped, and the page
+    is parsed with a schema compiled from its own properties.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        rules: Mapping[str, Sequence[str]],
+        ttl_seconds: Optional[float] = None,
+        failure_ttl_seconds: Optional[float] = None,
+        name: str = "notion_schema"
+    ):
+        """
+        Initialize resolver.
+
+        Args:
+            client: Notion client (gateway)
+            rules: Logical field -> candidate property names
+            ttl_seconds: Schema cache lifetime (default NOTION_SCHEMA_TTL_SECONDS)
+            failure_ttl_seconds: How long a failed retrieve is not retried
+                (default NOTION_SCHEMA_FAILURE_TTL_SECONDS)
+            name: Name used in logs
+        """
+        self.client = client
+        self.rules = {field: tuple(candidates) for field, candidates in rules.items()}
+        self.ttl_seconds = settings.NOTION_SCHEMA_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.failure_ttl_seconds = (
+            settings.NOTION_SCHEMA_FAILURE_TTL_SECONDS if failure_ttl_seconds is None else failure_ttl_seconds
+        )
+        self.name = name
+        self._lock = threading.Lock()
+        self._schemas: Dict[str, Tuple[float, Optional[CompiledSchema]]] = {}
+        self._page_schemas: Dict[frozenset, CompiledSchema] = {}
+        self.retrievals = 0
+        self.drift_events = 0
+
+    def get(self, database_id: str) -> Optional[CompiledSchema]:
+        """
+        Compiled schema of a database (cached).
+
+        Args:
+            database_id: Notion database ID
+
+        Returns:
+            CompiledSchema, or None if the schema cannot be retrieved
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._schemas.get(database_id)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        schema = None
+        try:
+            response = self.client.databases.retrieve(database_id=database_id)
+            properties = response.get("properties") if isinstance(response, dict) else None
+            if isinstance(properties, dict):
+                schema = CompiledSchema(properties, self.rules, database_id=database_id)
+                if schema.missing:
+                    logger.warning(
+                        "%s: database %s has no property for %s",
+                        self.name,
+                        database_id,
+                        ', '.join(schema.missing)
+                    )
+        except Exception as e:
+            logger.warning("%s: could not retrieve schema of %s: %s", self.name, database_id, e)
+
+        with self._lock:
+            self.retrievals += 1
+            # Failures are cached briefly so a broken database is not retried per page
+            ttl = self.ttl_seconds if schema is not None else self.failure_ttl_seconds
+            self._schemas[database_id] = (now + ttl, schema)
+        return schema
+
+    def invalidate(self, database_id: Optional[str] = None):
+        """Drop the cached schema of one database (or all)."""
+        with self._lock:
+            if database_id is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(database_id, None)
+
+    def _page_schema(self, page_properties: Mapping[str, Any]) -> CompiledSchema:
+        signature = frozenset(
+            (name, prop.get("type") if isinstance(prop, Mapping) else None)
+            for name, prop in page_properties.items()
+        )
+        with self._lock:
+            schema = self._page_schemas.get(signature)
+            if schema is None:
+                if len(self._page_schemas) >= MAX_PAGE_SCHEMAS:
+                    self._page_schemas.clear()
+                schema = CompiledSchema(page_properties, self.rules)
+                self._page_schemas[signature] = schema
+            return schema
+
+    def for_page(self, page: Mapping[str, Any], database_id: Optional[str] = None) -> CompiledSchema:
+        """
+        Schema to parse a page with.
+
+        Args:
+            page: Notion page object
+            database_id: Page's database (default: the page's parent)
+
+        Returns:
+            CompiledSchema matching the page
+        """
+        page_properties = page.get("properties") or {}
+        database_id = database_id or (page.get("parent") or {}).get("database_id")
+
+        schema = self.get(database_id) if database_id else None
+        if schema is not None:
+            drifted = schema.drift(page_properties)
+            if not drifted:
+                return schema
+
+            self.drift_events += 1
+            logger.warning(
+                "%s: schema drift in database %s (%s), refreshing",
+                self.name,
+                database_id,
+                ', '.join(drifted)
+            )
+            self.invalidate(database_id)
+
+        return self._page_schema(page_properties)
+
+    def extract(self, page: Mapping[str, Any], database_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resolved properties of a page by logical field.
+
+        Args:
+            page: Notion page object
+            database_id: Page's database (default: the page's parent)
+
+        Returns:
+            Logical field -> property dict (None when absent)
+        """
+        return self.for_page(page, database_id).extract(page.get("properties") or {})
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "databases": len(self._schemas),
+            "page_schemas": len(self._page_schemas),
+            "retrievals": self.retrievals,
+            "drift_events": self.drift_events,
+        }
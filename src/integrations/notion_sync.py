@@ -1,20 +1,168 @@
 """Notion API integration for task synchronization."""
+import enum
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from notion_client import Client
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from src.config.settings import settings
+from src.integrations.notion_gateway import NotionGateway, query_all_pages, notion_client_options
+from src.integrations.notion_schema import NotionSchemaResolver
 from src.database.models import Task, User, TaskStatus, TaskPriority
 from src.utils.logger import logger
+from src.utils.notion_hash import properties_digest
+
+
+UPSERT_CHUNK_SIZE = 500
+
+# Task fields exchanged with Notion and merged property by property
+SYNC_FIELDS = ("title", "description", "status", "priority", "due_date")
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_notion_time(value: Any) -> Optional[datetime]:
+    """Parse a Notion timestamp (e.g. last_edited_time) to naive UTC."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return _utc_naive(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+def field_snapshot(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON-safe snapshot of the synced task fields, used as three-way merge base.
+
+    Args:
+        values: Mapping with the SYNC_FIELDS (task data or task attributes)
+
+    Returns:
+        Field name -> comparable value
+    """
+    snapshot = {}
+    for field in SYNC_FIELDS:
+        value = values.get(field)
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = _utc_naive(value).isoformat()
+        snapshot[field] = value
+    return snapshot
+
+
+def _task_snapshot(task: Task) -> Dict[str, Any]:
+    return field_snapshot({field: getattr(task, field) for field in SYNC_FIELDS})
+
+
+def merge_fields(
+    base: Optional[Dict[str, Any]],
+    local: Dict[str, Any],
+    remote: Dict[str, Any],
+    local_wins_conflicts: bool
+) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Three-way merge of field snapshots.
+
+    A field changed on one side only takes that side's value. A field changed
+    on both sides to different values is a conflict, resolved for the side
+    given by ``local_wins_conflicts``. Without a base every difference is a
+    conflict.
+
+    Args:
+        base: Snapshot at the last sync (None if unknown)
+        local: Current local snapshot
+        remote: Current Notion snapshot
+        local_wins_conflicts: Conflict resolution side
+
+    Returns:
+        (field -> "local" or "remote", conflicting fields)
+    """
+    base = base or {}
+    sides: Dict[str, str] = {}
+    conflicts: List[str] = []
+
+    for field in SYNC_FIELDS:
+        local_value, remote_value = local.get(field), remote.get(field)
+        if local_value == remote_value:
+            sides[field] = "remote"
+        elif field in base and local_value == base[field]:
+            sides[field] = "remote"
+        elif field in base and remote_value == base[field]:
+            sides[field] = "local"
+        else:
+            conflicts.append(field)
+            sides[field] = "local" if local_wins_conflicts else "remote"
+
+    return sides, conflicts
+
+
+def _same_notion_id(left: Optional[str], right: Optional[str]) -> bool:
+    """Compare Notion IDs regardless of dashes and case."""
+    if not left or not right:
+        return False
+    return left.replace("-", "").lower() == right.replace("-", "").lower()
+
+
+class AssigneeIndex:
+    """Pages of one Notion database indexed by assignee name."""
+
+    def __init__(self, pages: List[Dict[str, Any]], names_of):
+        """
+        Build the index.
+
+        Args:
+            pages: Notion pages
+            names_of: Callable returning the assignee names of a page
+        """
+        self.pages = pages
+        self.unassigned: List[Dict[str, Any]] = []
+        self.by_assignee: Dict[str, List[Dict[str, Any]]] = {}
+
+        for page in pages:
+            names = {name.lower().strip() for name in names_of(page) if name}
+            if not names:
+                self.unassigned.append(page)
+            for name in names:
+                self.by_assignee.setdefault(name, []).append(page)
+
+    def pages_for(self, user_name: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Pages visible to a user: assigned to them, or with no assignee at all.
+
+        A user matches an assignee when their name is contained in it
+        (e.g. "Ana" matches "Ana Souza"), same as the per-page filter did.
+        Cost is proportional to distinct assignee names, not to pages.
+        """
+        matched = list(self.unassigned)
+        needle = (user_name or "").lower().strip()
+        if not needle:
+            return matched
+
+        seen = set()
+        for name, pages in self.by_assignee.items():
+            if needle not in name:
+                continue
+            for page in pages:
+                if page["id"] not in seen:
+                    seen.add(page["id"])
+                    matched.append(page)
+
+        return matched
 
 
 class NotionSync:
     """Notion synchronization service."""
 
     def __init__(self):
-        self.client = Client(auth=settings.NOTION_API_KEY)
+        self.client = NotionGateway(Client(**notion_client_options()))
         self.default_database_id = settings.NOTION_DATABASE_ID
         # Allow overriding property names via env vars when the Notion DB uses custom labels
         self.title_props = [
@@ -40,20 +188,36 @@ class NotionSync:
             "Due Date",
             "Deadline",
         ]
+        self.assignees_props = [
+            os.getenv("NOTION_ASSIGNEES_PROPERTY") or "Assignees",
+            "Assignee",
+            "Responsável",
+        ]
+        self._schema: Optional[NotionSchemaResolver] = None
+
+    @property
+    def schema(self) -> NotionSchemaResolver:
+        """Property-name resolver bound to the current client."""
+        if self._schema is None or self._schema.client is not self.client:
+            self._schema = NotionSchemaResolver(
+                self.client,
+                {
+                    "title": self.title_props,
+                    "status": self.status_props,
+                    "priority": self.priority_props,
+                    "description": self.description_props,
+                    "due_date": self.due_date_props,
+                    "assignees": self.assignees_props,
+                },
+                name="notion_sync_schema"
+            )
+        return self._schema
 
     def _resolve_database_id(self, user: Optional[User] = None) -> Optional[str]:
         if user and getattr(user, "notion_database_id", None):
             return user.notion_database_id
         return self.default_database_id
 
-    def _get_property(self, props: Dict[str, Any], candidates: List[str]) -> Optional[Dict[str, Any]]:
-        """Return the first non-null Notion property dict matching the candidate list."""
-        for name in candidates:
-            value = props.get(name)
-            if value is not None:
-                return value
-        return None
-
     def _task_to_notion_properties(self, task: Task) -> Dict[str, Any]:
         """
         Convert Task object to Notion properties format.
@@ -124,6 +288,17 @@ class NotionSync:
 
         return properties
 
+    def _task_digest(self, task: Task) -> str:
+        """Digest of the properties this task would be written to Notion with."""
+        return properties_digest(self._task_to_notion_properties(task))
+
+    def _task_data_digest(self, task_data: Dict[str, Any]) -> str:
+        """
+        Digest of task data read from Notion, in the same projection as
+        _task_digest, so both sides of a sync are directly comparable.
+        """
+        return self._task_digest(Task(**task_data))
+
     def _notion_to_task_data(self, notion_page: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert Notion page to Task data.
@@ -134,15 +309,15 @@ class NotionSync:
         Returns:
             Task data dictionary
         """
-        props = notion_page.get("properties", {}) or {}
+        fields = self.schema.extract(notion_page)
 
         # Extract title
-        title_property = self._get_property(props, self.title_props) or {}
+        title_property = fields.get("title") or {}
         title_prop = title_property.get("title", []) if isinstance(title_property, dict) else []
         title = title_prop[0]["text"]["content"] if title_prop else "Untitled"
 
         # Extract status (handle both select and status property types)
-        status_property = self._get_property(props, self.status_props) or {}
+        status_property = fields.get("status") or {}
         status_block = status_property.get("status", {}) or status_property.get("select", {})
         status_name = status_block.get("name", "A Fazer") if isinstance(status_block, dict) else "A Fazer"
         status = {
@@ -153,7 +328,7 @@ class NotionSync:
         }.get(status_name, TaskStatus.PENDING)
 
         # Extract priority
-        priority_property = self._get_property(props, self.priority_props) or {}
+        priority_property = fields.get("priority") or {}
         priority_select = priority_property.get("select", {}) if isinstance(priority_property, dict) else {}
         priority_name = priority_select.get("name", "Média")
         priority = {
@@ -164,19 +339,20 @@ class NotionSync:
         }.get(priority_name, TaskPriority.MEDIUM)
 
         # Extract description
-        description_property = self._get_property(props, self.description_props) or {}
+        description_property = fields.get("description") or {}
         desc_prop = description_property.get("rich_text", []) if isinstance(description_property, dict) else []
         description = desc_prop[0]["text"]["content"] if desc_prop else None
 
         # Extract due date
-        due_date_property = self._get_property(props, self.due_date_props) or {}
+        due_date_property = fields.get("due_date") or {}
         date_prop = due_date_property.get("date") if isinstance(due_date_property, dict) else None
         due_date = None
         if date_prop and date_prop.get("start"):
             try:
-                due_date = datetime.fromisoformat(date_prop["start"].replace("Z", "+00:00"))
+                # Task.due_date is naive UTC, like the digest's date form
+                due_date = _utc_naive(datetime.fromisoformat(date_prop["start"].replace("Z", "+00:00")))
             except ValueError as e:
-                logger.warning(f"Failed to parse date from Notion: {e}")
+                logger.warning("Failed to parse date from Notion: %s", e)
 
         return {
             "title": title,
@@ -211,12 +387,14 @@ class NotionSync:
             )
 
             notion_id = response["id"]
-            logger.info(f"Task {task.id} created in Notion: {notion_id}")
+            task.notion_hash = properties_digest(properties)
+            task.sync_base = _task_snapshot(task)
+            logger.info("Task %s created in Notion: %s", task.id, notion_id)
 
             return notion_id
 
         except Exception as e:
-            logger.error(f"Error creating task in Notion: {e}")
+            logger.error("Error creating task in Notion: %s", e)
             return None
 
     def update_task_in_notion(self, task: Task) -> bool:
@@ -230,7 +408,7 @@ class NotionSync:
             Success status
         """
         if not task.notion_id:
-            logger.warning(f"Task {task.id} has no notion_id")
+            logger.warning("Task %s has no notion_id", task.id)
             return False
 
         try:
@@ -240,21 +418,171 @@ class NotionSync:
                 page_id=task.notion_id,
                 properties=properties
             )
+            task.notion_hash = properties_digest(properties)
+            task.sync_base = _task_snapshot(task)
 
-            logger.info(f"Task {task.id} updated in Notion")
+            logger.info("Task %s updated in Notion", task.id)
             return True
 
         except Exception as e:
-            logger.error(f"Error updating task in Notion: {e}")
+            logger.error("Error updating task in Notion: %s", e)
             return False
 
-    def sync_from_notion_to_db(self, user: User, db: Session) -> int:
+    def fetch_database_pages(self, database_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a Notion database (all pagination cursors).
+
+        The query has no filters to avoid status type mismatches.
+
+        Args:
+            database_id: Notion database ID
+
+        Returns:
+            List of Notion page objects
+        """
+        return query_all_pages(self.client, database_id)
+
+    def _assignee_names(self, page: Dict[str, Any]) -> List[str]:
+        """Names in the page's Assignees (multi-select) property."""
+        assignees_property = self.schema.extract(page).get("assignees") or {}
+        assignees_list = assignees_property.get("multi_select", []) if isinstance(assignees_property, dict) else []
+        return [a.get("name", "") for a in assignees_list if isinstance(a, dict)]
+
+    def build_assignee_index(self, pages: List[Dict[str, Any]]) -> "AssigneeIndex":
+        """
+        Index pages of a database by assignee name.
+
+        Args:
+            pages: Notion pages of one database
+
+        Returns:
+            AssigneeIndex for distributing pages to users
+        """
+        return AssigneeIndex(pages, self._assignee_names)
+
+    def _merge_into_task(
+        self,
+        task: Task,
+        task_data: Dict[str, Any],
+        remote_edited: Optional[datetime]
+    ) -> List[str]:
+        """
+        Merge a changed Notion page into an existing task.
+
+        The version tuple (Notion last_edited_time, local updated_at) breaks
+        conflicts: the later edit wins, and Notion wins ties or when its edit
+        time is unknown, so every cycle resolves the same way.
+
+        Returns:
+            Fields that changed on both sides
+        """
+        local_dirty = task.notion_hash is not None and self._task_digest(task) != task.notion_hash
+        if not local_dirty:
+            sides = {field: "remote" for field in SYNC_FIELDS}
+            conflicts: List[str] = []
+        else:
+            local_wins = (
+                remote_edited is not None
+                and task.updated_at is not None
+                and task.updated_at > remote_edited
+            )
+            sides, conflicts = merge_fields(
+                task.sync_base,
+                _task_snapshot(task),
+                field_snapshot(task_data),
+                local_wins
+            )
+
+        for field, side in sides.items():
+            if side == "remote":
+                setattr(task, field, task_data[field])
+
+        if conflicts:
+            kept = "local" if sides[conflicts[0]] == "local" else "Notion"
+            logger.warning(
+                "Conflict on task %s (%s) for %s: kept %s version",
+                task.id,
+                task.notion_id,
+                ', '.join(conflicts),
+                kept
+            )
+        return conflicts
+
+    def _upsert_tasks(self, user: User, pages: List[Dict[str, Any]], db: Session) -> int:
+        """
+        Create or update the user's tasks from Notion pages (no commit).
+
+        Existing tasks are loaded with one query per chunk instead of one
+        query per page. Pages not edited in Notion since the last pull (same
+        last_edited_time, or same digest) are left untouched; changed pages
+        are three-way merged with local edits against ``sync_base``. Fields
+        where the local edit wins stay dirty and are pushed by the next
+        sync_from_db_to_notion.
+        """
+        if not pages:
+            return 0
+
+        now = datetime.utcnow()
+        notion_ids = [page["id"] for page in pages]
+        existing: Dict[str, Task] = {}
+        for start in range(0, len(notion_ids), UPSERT_CHUNK_SIZE):
+            chunk = notion_ids[start:start + UPSERT_CHUNK_SIZE]
+            for task in db.query(Task).filter(
+                Task.user_id == user.id,
+                Task.notion_id.in_(chunk)
+            ):
+                existing[task.notion_id] = task
+
+        for page in pages:
+            task = existing.get(page["id"])
+            remote_edited = _parse_notion_time(page.get("last_edited_time"))
+
+            if (
+                task is not None
+                and remote_edited is not None
+                and task.notion_last_edited_at is not None
+                and remote_edited <= task.notion_last_edited_at
+            ):
+                continue
+
+            task_data = self._notion_to_task_data(page)
+            remote_hash = self._task_data_digest(task_data)
+
+            if task:
+                if task.notion_hash == remote_hash:
+                    task.notion_last_edited_at = remote_edited
+                    continue
+                self._merge_into_task(task, task_data, remote_edited)
+            else:
+                # Create new task
+                task = Task(
+                    user_id=user.id,
+                    **task_data
+                )
+                db.add(task)
+                existing[page["id"]] = task
+
+            task.notion_hash = remote_hash
+            task.notion_last_edited_at = remote_edited
+            # Base is what Notion holds now: fields kept locally remain local changes
+            task.sync_base = field_snapshot(task_data)
+            task.last_synced_at = now
+
+        return len(pages)
+
+    def sync_from_notion_to_db(
+        self,
+        user: User,
+        db: Session,
+        pages: Optional[List[Dict[str, Any]]] = None
+    ) -> int:
         """
         Sync tasks from Notion to database.
 
         Args:
             user: User object
             db: Database session
+            pages: Pages already fetched from the user's database (skips the query)
 
         Returns:
             Number of tasks synced
@@ -262,74 +590,263 @@ class NotionSync:
         database_id = self._resolve_database_id(user)
         if not database_id:
             logger.warning(
-                f"User {user.id} has no Notion database configured and no global database set"
+                "User %s has no Notion database configured and no global database set", user.id
             )
             return 0
 
-        def _query_database():
-            """Query database without filters to avoid status type mismatches."""
-            # Query without filters - get all tasks (filter by status later if needed)
-            return self.client.databases.query(
-                database_id=database_id
-            )
+        try:
+            if pages is None:
+                pages = self.fetch_database_pages(database_id)
+
+            # Only sync pages assigned to this user (or with no assignees at all)
+            assigned = self.build_assignee_index(pages).pages_for(user.name)
+            synced_count = self._upsert_tasks(user, assigned, db)
+
+            db.commit()
+            logger.info("Synced %s tasks from Notion for user %s", synced_count, user.id)
+
+            return synced_count
+
+        except Exception as e:
+            logger.error("Error syncing from Notion: %s", e)
+            db.rollback()
+            return 0
+
+    def sync_database_to_users(
+        self,
+        database_id: str,
+        users: List[User],
+        db: Session,
+        pages: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[int, int]:
+        """
+        Pull one Notion database and distribute its pages to every matching user.
+
+        The database is read once, indexed by assignee, and each user's
+        matching pages are upserted in the same pass and transaction.
+
+        Args:
+            database_id: Notion database shared by the users
+            users: Users syncing against this database
+            db: Database session
+            pages: Pages already fetched (skips the query)
+
+        Returns:
+            Number of tasks synced per user ID
+        """
+        synced: Dict[int, int] = {}
 
         try:
-            # Query Notion database
-            response = _query_database()
+            if pages is None:
+                pages = self.fetch_database_pages(database_id)
+            index = self.build_assignee_index(pages)
 
-            synced_count = 0
+            for user in users:
+                synced[user.id] = self._upsert_tasks(user, index.pages_for(user.name), db)
 
-            for page in response.get("results", []):
-                notion_id = page["id"]
-                task_data = self._notion_to_task_data(page)
+            db.commit()
+            logger.info(
+                "Synced %s Notion pages from %s into %s tasks for %s users",
+                len(pages),
+                database_id,
+                sum(synced.values()),
+                len(users)
+            )
+            return synced
 
-                # Filter: Only sync if user is in Assignees or Assignee field
-                props = page.get("properties", {}) or {}
-                assignees_property = self._get_property(props, self.assignees_props) or {}
-                assignees_list = assignees_property.get("multi_select", []) if isinstance(assignees_property, dict) else []
-                assignee_names = [a.get("name", "") for a in assignees_list if isinstance(a, dict)]
+        except Exception as e:
+            logger.error("Error syncing database %s from Notion: %s", database_id, e)
+            db.rollback()
+            return {}
 
-                # Check if user.name is in assignees
-                user_name_lower = (user.name or "").lower().strip()
-                is_assigned = any(user_name_lower in name.lower() for name in assignee_names) if user_name_lower else False
+    def sync_all_users_from_notion(self, db: Session) -> Dict[int, int]:
+        """
+        Pull every active user's tasks, reading each Notion database once.
 
-                # Skip if not assigned to this user (unless no assignees at all)
-                if assignee_names and not is_assigned:
-                    logger.debug(f"Skipping task (not assigned to {user.name}): {task_data.get('title')}")
-                    continue
+        Args:
+            db: Database session
+
+        Returns:
+            Number of tasks synced per user ID
+        """
+        users = db.query(User).filter(User.is_active == True).all()  # noqa: E712
+
+        by_database: Dict[str, List[User]] = {}
+        for user in users:
+            database_id = self._resolve_database_id(user)
+            if database_id:
+                by_database.setdefault(database_id, []).append(user)
+
+        synced: Dict[int, int] = {}
+        for database_id, database_users in by_database.items():
+            synced.update(self.sync_database_to_users(database_id, database_users, db))
+
+        return synced
+
+    def sync_page(self, page_id: str, db: Session) -> Dict[int, int]:
+        """
+        Incrementally sync a single changed Notion page.
+
+        Retrieves only that page, resolves the users syncing against its
+        parent database who are assigned to it, and upserts their rows.
+        Archived pages cancel the tasks mirrored from them.
+
+        Args:
+            page_id: Notion page ID
+            db: Database session
 
-                # Check if task exists
-                task = db.query(Task).filter(
-                    Task.notion_id == notion_id,
-                    Task.user_id == user.id
-                ).first()
-
-                if task:
-                    # Update existing task
-                    for key, value in task_data.items():
-                        if key != "notion_id":
-                            setattr(task, key, value)
-                    task.last_synced_at = datetime.utcnow()
-                else:
-                    # Create new task
-                    task = Task(
-                        user_id=user.id,
-                        **task_data
-                    )
-                    task.last_synced_at = datetime.utcnow()
-                    db.add(task)
-
-                synced_count += 1
+        Returns:
+            Number of tasks synced per user ID
+        """
+        page = self.client.pages.retrieve(page_id=page_id)
+        page_id = page.get("id", page_id)
 
+        if page.get("archived") or page.get("in_trash"):
+            cancelled = db.query(Task).filter(Task.notion_id == page_id).update(
+                {Task.status: TaskStatus.CANCELLED, Task.last_synced_at: datetime.utcnow()},
+                synchronize_session=False
+            )
             db.commit()
-            logger.info(f"Synced {synced_count} tasks from Notion for user {user.id}")
+            logger.info("Notion page %s archived; cancelled %s tasks", page_id, cancelled)
+            return {}
 
-            return synced_count
+        parent_database_id = (page.get("parent") or {}).get("database_id")
+        if not parent_database_id:
+            logger.info("Notion page %s is not a database entry; skipping", page_id)
+            return {}
 
-        except Exception as e:
-            logger.error(f"Error syncing from Notion: {e}")
+        users = [
+            user for user in db.query(User).filter(User.is_active == True).all()  # noqa: E712
+            if _same_notion_id(self._resolve_database_id(user), parent_database_id)
+        ]
+
+        index = self.build_assignee_index([page])
+        synced: Dict[int, int] = {}
+
+        try:
+            for user in users:
+                count = self._upsert_tasks(user, index.pages_for(user.name), db)
+                if count:
+                    synced[user.id] = count
+            db.commit()
+        except Exception:
             db.rollback()
-            return 0
+            raise
+
+        logger.info("Notion page %s synced for %s users", page_id, len(synced))
+        return synced
+
+    def _plan_push(self, task: Task) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a task must be written to Notion.
+
+        Returns:
+            Push plan (action, properties, digest) or None if up to date
+        """
+        properties = self._task_to_notion_properties(task)
+        digest = properties_digest(properties)
+
+        if task.notion_id:
+            if digest == task.notion_hash:
+                return None
+            if task.notion_hash is None and task.last_synced_at and task.updated_at <= task.last_synced_at:
+                # Synced before digests existed: record the baseline only
+                task.notion_hash = digest
+                return None
+
+        return {
+            "task": task,
+            "task_id": task.id,
+            "notion_id": task.notion_id,
+            "action": "update" if task.notion_id else "create",
+            "properties": properties,
+            "digest": digest,
+            "snapshot": _task_snapshot(task),
+        }
+
+    def _push_page(self, plan: Dict[str, Any], database_id: str) -> str:
+        """Write one planned page to Notion (worker thread, no ORM access)."""
+        if plan["action"] == "create":
+            response = self.client.pages.create(
+                parent={"database_id": database_id},
+                properties=plan["properties"]
+            )
+            return response["id"]
+
+        self.client.pages.update(page_id=plan["notion_id"], properties=plan["properties"])
+        return plan["notion_id"]
+
+    def push_tasks(
+        self,
+        tasks: List[Task],
+        database_id: str,
+        db: Session,
+        max_workers: Optional[int] = None,
+        commit_every: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Push changed tasks to Notion concurrently.
+
+        Properties are built in the calling thread; only the HTTP calls run in
+        the worker pool, all of them through the shared rate-limited gateway.
+        Results are applied back in the calling thread and committed every
+        ``commit_every`` tasks, so an interrupted run keeps the pages already
+        created.
+
+        Args:
+            tasks: Candidate tasks
+            database_id: Notion database for new pages
+            db: Database session the tasks belong to
+            max_workers: Concurrent requests (default NOTION_PUSH_WORKERS)
+            commit_every: Results applied per commit (default NOTION_PUSH_COMMIT_EVERY)
+
+        Returns:
+            Counts of pushed, skipped and failed tasks, and errors by task id
+        """
+        max_workers = max_workers or settings.NOTION_PUSH_WORKERS
+        commit_every = commit_every or settings.NOTION_PUSH_COMMIT_EVERY
+        result: Dict[str, Any] = {"pushed": 0, "skipped": 0, "failed": 0, "errors": {}}
+
+        plans = []
+        for task in tasks:
+            plan = self._plan_push(task)
+            if plan is None:
+                result["skipped"] += 1
+            else:
+                plans.append(plan)
+
+        if not plans:
+            db.commit()
+            return result
+
+        uncommitted = 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notion-push") as pool:
+            futures = {pool.submit(self._push_page, plan, database_id): plan for plan in plans}
+
+            for future in as_completed(futures):
+                plan = futures[future]
+                try:
+                    notion_id = future.result()
+                except Exception as e:
+                    result["failed"] += 1
+                    result["errors"][plan["task_id"]] = str(e)
+                    logger.error("Error pushing task %s to Notion (%s): %s", plan['task_id'], plan['action'], e)
+                    continue
+
+                task = plan["task"]
+                task.notion_id = notion_id
+                task.notion_hash = plan["digest"]
+                task.sync_base = plan["snapshot"]
+                task.last_synced_at = datetime.utcnow()
+                result["pushed"] += 1
+                uncommitted += 1
+
+                if uncommitted >= commit_every:
+                    db.commit()
+                    uncommitted = 0
+
+        db.commit()
+        return result
 
     def sync_from_db_to_notion(self, user: User, db: Session) -> int:
         """
@@ -344,54 +861,55 @@ class NotionSync:
         """
         database_id = self._resolve_database_id(user)
         if not database_id:
-            logger.warning(f"User {user.id} has no Notion database configured for sync_to_notion")
+            logger.warning("User %s has no Notion database configured for sync_to_notion", user.id)
             return 0
 
         try:
-            # Get tasks that need syncing (no notion_id or updated after last sync)
+            # Tasks are pushed when new or when their digest differs from the last sync
             tasks = db.query(Task).filter(
                 Task.user_id == user.id,
                 Task.status != TaskStatus.CANCELLED
             ).all()
 
-            synced_count = 0
-
-            for task in tasks:
-                if not task.notion_id:
-                    # Create in Notion
-                    notion_id = self.create_task_in_notion(task, database_id)
-                    if notion_id:
-                        task.notion_id = notion_id
-                        task.last_synced_at = datetime.utcnow()
-                        synced_count += 1
-                elif not task.last_synced_at or task.updated_at > task.last_synced_at:
-                    # Update in Notion
-                    if self.update_task_in_notion(task):
-                        task.last_synced_at = datetime.utcnow()
-                        synced_count += 1
-
-            db.commit()
-            logger.info(f"Synced {synced_count} tasks to Notion for user {user.id}")
+            result = self.push_tasks(tasks, database_id, db)
+            logger.info(
+                "Synced %s tasks to Notion for user %s (%s unchanged, %s failed)",
+                result["pushed"],
+                user.id,
+                result["skipped"],
+                result["failed"]
+            )
 
-            return synced_count
+            return result["pushed"]
 
         except Exception as e:
-            logger.error(f"Error syncing to Notion: {e}")
+            logger.error("Error syncing to Notion: %s", e)
             db.rollback()
             return 0
 
-    def bidirectional_sync(self, user: User, db: Session) -> Dict[str, int]:
+    def bidirectional_sync(
+        self,
+        user: User,
+        db: Session,
+        pages: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, int]:
         """
         Perform bidirectional sync between Notion and database.
 
+        The pull merges Notion edits into local tasks (see _upsert_tasks); the
+        push then only writes tasks whose digest differs from what Notion
+        holds, i.e. local edits that survived the merge. Rows just pulled
+        unchanged are never written back.
+
         Args:
             user: User object
             db: Database session
+            pages: Pages already fetched from the user's database (optional)
 
         Returns:
             Sync statistics
         """
-        from_notion = self.sync_from_notion_to_db(user, db)
+        from_notion = self.sync_from_notion_to_db(user, db, pages=pages)
         to_notion = self.sync_from_db_to_notion(user, db)
 
         return {
@@ -13,17 +13,41 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from notion_client import Client
 from src.config.settings import settings
+from src.integrations.notion_gateway import NotionGateway, notion_client_options
+from src.integrations.notion_schema import NotionSchemaResolver
+from src.utils.cache import cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Logical task fields -> candidate property names (English and Portuguese)
+TASK_PROPERTY_CANDIDATES = {
+    'title': ['Task Name', 'Nome', 'Name', 'Title'],
+    'status': ['Status'],
+    'priority': ['Priority', 'Prioridade'],
+    'progress': ['Progress', 'Progresso'],
+    'effort_hours': ['Effort Hours', 'Esforço', 'Horas Estimadas'],
+    'due_date': ['Due Date', 'Prazo', 'Data'],
+    'description': ['Description', 'Descrição'],
+    'category': ['Category', 'Categoria'],
+    'tags': ['Tags', 'Etiquetas'],
+    'assignees': [
+        'Responsável',
+        'Responsavel',
+        'Owner',
+        'Assignee',
+        'Assigned To',
+        'Assigned'
+    ],
+}
+
 
 class NotionTaskReader:
     """Read and manage tasks from Notion database for Groq."""
 
     def __init__(self):
         """Initialize Notion client and database ID."""
-        self.client = Client(auth=settings.NOTION_API_KEY)
+        self.client = NotionGateway(Client(**notion_client_options()))
         self.db_id = (
             os.getenv('NOTION_GROQ_TASKS_DB_ID')
             or settings.NOTION_GROQ_TASKS_DB_ID
@@ -43,6 +67,19 @@ class NotionTaskReader:
                 "since NOTION_GROQ_TASKS_DB_ID is not set"
             )
 
+        self._schema: Optional[NotionSchemaResolver] = None
+        # Parsed query results, invalidated by the update methods below
+        self.cache = cache.namespace("notion_tasks", default_ttl=settings.CACHE_NOTION_TTL_SECONDS)
+
+    @property
+    def schema(self) -> NotionSchemaResolver:
+        """Property-name resolver bound to the current client."""
+        if self._schema is None or self._schema.client is not self.client:
+            self._schema = NotionSchemaResolver(
+                self.client, TASK_PROPERTY_CANDIDATES, name="notion_task_reader_schema"
+            )
+        return self._schema
+
     def get_all_tasks(self) -> List[Dict[str, Any]]:
         """
         Get all tasks from Notion database.
@@ -55,19 +92,13 @@ class NotionTaskReader:
             return []
 
         try:
-            response = self.client.databases.query(database_id=self.db_id)
-            tasks = []
-
-            for page in response.get('results', []):
-                task = self._parse_task_page(page)
-                if task:
-                    tasks.append(task)
+            tasks = self._query_tasks("all")
 
-            logger.info(f"Retrieved {len(tasks)} tasks from Notion")
+            logger.info("Retrieved %s tasks from Notion", len(tasks))
             return tasks
 
         except Exception as e:
-            logger.error(f"Error retrieving tasks from Notion: {e}")
+            logger.error("Error retrieving tasks from Notion: %s", e)
             return []
 
     def get_tasks_by_status(self, status: str) -> List[Dict[str, Any]]:
@@ -84,25 +115,19 @@ class NotionTaskReader:
             return []
 
         try:
-            response = self.client.databases.query(
-                database_id=self.db_id,
+            tasks = self._query_tasks(
+                f"status:{status}",
                 filter={
                     "property": "Status",
                     "status": {"equals": status}
                 }
             )
 
-            tasks = []
-            for page in response.get('results', []):
-                task = self._parse_task_page(page)
-                if task:
-                    tasks.append(task)
-
-            logger.info(f"Retrieved {len(tasks)} tasks with status '{status}'")
+            logger.info("Retrieved %s tasks with status '%s'", len(tasks), status)
             return tasks
 
         except Exception as e:
-            logger.error(f"Error retrieving tasks with status '{status}': {e}")
+            logger.error("Error retrieving tasks with status '%s': %s", status, e)
             return []
 
     def get_high_priority_tasks(self) -> List[Dict[str, Any]]:
@@ -116,8 +141,8 @@ class NotionTaskReader:
             return []
 
         try:
-            response = self.client.databases.query(
-                database_id=self.db_id,
+            tasks = self._query_tasks(
+                "high_priority",
                 filter={
                     "or": [
                         {"property": "Priority", "select": {"equals": "High"}},
@@ -126,18 +151,35 @@ class NotionTaskReader:
                 }
             )
 
+            logger.info("Retrieved %s high priority tasks", len(tasks))
+            return tasks
+
+        except Exception as e:
+            logger.error("Error retrieving high priority tasks: %s", e)
+            return []
+
+    def _query_tasks(self, cache_key: str, **query) -> List[Dict[str, Any]]:
+        """
+        Query the database and parse its pages, cached per query.
+
+        Args:
+            cache_key: Identifies the query within the database
+            **query: Extra databases.query arguments (e.g. filter)
+
+        Returns:
+            Parsed tasks
+        """
+        def load() -> List[Dict[str, Any]]:
+            response = self.client.databases.query(database_id=self.db_id, **query)
             tasks = []
             for page in response.get('results', []):
                 task = self._parse_task_page(page)
                 if task:
                     tasks.append(task)
-
-            logger.info(f"Retrieved {len(tasks)} high priority tasks")
             return tasks
 
-        except Exception as e:
-            logger.error(f"Error retrieving high priority tasks: {e}")
-            return []
+        # Copy so callers never mutate the cached list
+        return list(self.cache.get_or_set(f"{self.db_id}:{cache_key}", load))
 
     def update_task_status(self, task_id: str, new_status: str) -> bool:
         """
@@ -159,11 +201,12 @@ class NotionTaskReader:
                     }
                 }
             )
-            logger.info(f"Updated task {task_id} status to '{new_status}'")
+            self.cache.clear()
+            logger.info("Updated task %s status to '%s'", task_id, new_status)
             return True
 
         except Exception as e:
-            logger.error(f"Error updating task status: {e}")
+            logger.error("Error updating task status: %s", e)
             return False
 
     def update_task_progress(self, task_id: str, progress_percent: float) -> bool:
@@ -190,11 +233,12 @@ class NotionTaskReader:
                     }
                 }
             )
-            logger.info(f"Updated task {task_id} progress to {progress}%")
+            self.cache.clear()
+            logger.info("Updated task %s progress to %s%%", task_id, progress)
             return True
 
         except Exception as e:
-            logger.error(f"Error updating task progress: {e}")
+            logger.error("Error updating task progress: %s", e)
             return False
 
     def format_for_groq(self, tasks: List[Dict[str, Any]]) -> str:
@@ -302,7 +346,7 @@ class NotionTaskReader:
             Dictionary with task properties or None if parsing fails
         """
         try:
-            properties = page.get('properties', {})
+            fields = self.schema.extract(page, self.db_id)
 
             task = {
                 'id': page.get('id'),
@@ -310,74 +354,61 @@ class NotionTaskReader:
                 'updated': page.get('last_edited_time')
             }
 
-            def _get_property(names: List[str]) -> Dict[str, Any]:
-                for name in names:
-                    if name in properties:
-                        return properties.get(name, {})
-                return {}
-
             # Extract title (supports English and Portuguese property names)
-            title_prop = _get_property(['Task Name', 'Nome', 'Name', 'Title'])
+            title_prop = fields.get('title') or {}
             if title_prop.get('type') == 'title':
                 title_text = title_prop.get('title', [])
                 task['title'] = title_text[0]['text']['content'] if title_text else 'Untitled'
 
             # Extract status
-            status_prop = _get_property(['Status'])
+            status_prop = fields.get('status') or {}
             if status_prop.get('type') in {'status', 'select'}:
                 status_value = status_prop.get(status_prop.get('type'), {})
                 if isinstance(status_value, dict):
                     task['status'] = status_value.get('name', 'Not Started')
 
             # Extract priority
-            priority_prop = _get_property(['Priority', 'Prioridade'])
+            priority_prop = fields.get('priority') or {}
             if priority_prop.get('type') == 'select':
                 task['priority'] = priority_prop.get('select', {}).get('name', 'Medium')
 
             # Extract progress
-            progress_prop = _get_property(['Progress', 'Progresso'])
+            progress_prop = fields.get('progress') or {}
             if progress_prop.get('type') == 'number':
                 progress_value = progress_prop.get('number', 0) or 0
                 task['progress'] = progress_value
 
             # Extract effort hours
-            effort_prop = _get_property(['Effort Hours', 'Esforço', 'Horas Estimadas'])
+            effort_prop = fields.get('effort_hours') or {}
             if effort_prop.get('type') == 'number':
                 task['effort_hours'] = effort_prop.get('number')
 
             # Extract due date
-            due_prop = _get_property(['Due Date', 'Prazo', 'Data'])
+            due_prop = fields.get('due_date') or {}
             if due_prop.get('type') == 'date':
                 date_obj = due_prop.get('date', {})
                 if date_obj:
                     task['due_date'] = date_obj.get('start')
 
             # Extract description
-            desc_prop = _get_property(['Description', 'Descrição'])
+            desc_prop = fields.get('description') or {}
             if desc_prop.get('type') == 'rich_text':
                 desc_text = desc_prop.get('rich_text', [])
                 task['description'] = desc_text[0]['text']['content'] if desc_text else None
 
             # Extract category
-            category_prop = _get_property(['Category', 'Categoria'])
+            category_prop = fields.get('category') or {}
             if category_prop.get('type') == 'select':
                 task['category'] = category_prop.get('select', {}).get('name')
 
             # Extract tags
-            tags_prop = _get_property(['Tags', 'Etiquetas'])
+            tags_prop = fields.get('tags') or {}
             if tags_prop.get('type') == 'multi_select':
                 tags = tags_prop.get('multi_select', [])
                 task['tags'] = [tag['name'] for tag in tags]
 
             # Extract assignees / responsáveis
-            assignee_prop = _get_property([
-                'Responsável',
-                'Responsavel',
-                'Owner',
-                'Assignee',
-                'Assigned To',
-                'Assigned'
-            ])
+            assignee_prop = fields.get('assignees') or {}
             assignees: List[str] = []
             if assignee_prop.get('type') == 'people':
                 people = assignee_prop.get('people', [])
@@ -403,7 +434,7 @@ class NotionTaskReader:
             return task
 
         except Exception as e:
-            logger.error(f"Error parsing task page: {e}")
+            logger.error("Error parsing task page: %s", e)
             return None
 
 
@@ -1,13 +1,18 @@
 """Notion user profile and onboarding management."""
 import os
 from notion_client import Client
+from notion_client.errors import APIResponseError, APIErrorCode
 from typing import Dict, Any, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from src.config.settings import settings
+from src.integrations.notion_gateway import NotionGateway, query_all_pages, notion_client_options
 from src.database.models import User
+from src.utils.cache import cache
+from src.utils.helpers import normalize_phone_number
 from src.utils.logger import logger
+from src.utils.notion_hash import properties_digest
 
 
 class NotionUserManager:
@@ -15,17 +20,23 @@ class NotionUserManager:
 
     def __init__(self):
         """Initialize Notion client."""
-        self.client = Client(auth=settings.NOTION_API_KEY)
+        self.client = NotionGateway(Client(**notion_client_options()))
         # Users database ID - should be set via environment variable
         self.users_db_id = os.getenv('NOTION_USERS_DATABASE_ID')
 
         if not self.users_db_id:
             logger.warning("NOTION_USERS_DATABASE_ID not configured")
 
+        # User pages by phone, shared across workers when the cache is Redis
+        self.cache = cache.namespace("notion_users", default_ttl=settings.CACHE_NOTION_TTL_SECONDS)
+
     def get_user_by_phone(self, phone_number: str) -> Optional[Dict[str, Any]]:
         """
         Find user in Notion by phone number.
 
+        Pages are cached per phone number; writes through this manager
+        invalidate the entry.
+
         Args:
             phone_number: User phone number
 
@@ -36,31 +47,96 @@ class NotionUserManager:
             return None
 
         try:
-            response = self.client.databases.query(
-                database_id=self.users_db_id,
-                filter={
-                    "property": "Phone",  # Adjust property name as needed
-                    "phone_number": {
-                        "equals": phone_number
-                    }
+            return self.cache.get_or_set(phone_number, lambda: self._query_user_page(phone_number))
+
+        except Exception as e:
+            logger.error("Error querying user in Notion: %s", e)
+            return None
+
+    def _query_user_page(self, phone_number: str) -> Optional[Dict[str, Any]]:
+        response = self.client.databases.query(
+            database_id=self.users_db_id,
+            filter={
+                "property": "Phone",  # Adjust property name as needed
+                "phone_number": {
+                    "equals": phone_number
                 }
-            )
+            }
+        )
+
+        if response.get("results"):
+            return response["results"][0]
+
+        return None
+
+    @staticmethod
+    def _stage_of(page: Dict[str, Any]) -> str:
+        """Onboarding stage name of a Notion user page."""
+        props = page.get("properties", {}) or {}
+        select_option = (props.get("Onboarding_Stage") or {}).get("select") or {}
+        return select_option.get("name") or "not_started"
 
-            if response.get("results"):
-                return response["results"][0]
+    def _remember_page(self, user: User, page: Dict[str, Any]):
+        """Store the page id and onboarding stage on the local user (no commit)."""
+        user.notion_page_id = page["id"]
+        user.onboarding_stage = self._stage_of(page)
+        user.notion_synced_at = datetime.utcnow()
 
+    def _resolve_page_id(self, phone_number: str, user: Optional[User] = None) -> Optional[str]:
+        """User page id: from the local row when known, else looked up in Notion."""
+        if user is not None and user.notion_page_id:
+            return user.notion_page_id
+
+        page = self.get_user_by_phone(phone_number)
+        if not page:
             return None
+        if user is not None:
+            self._remember_page(user, page)
+        return page["id"]
 
-        except Exception as e:
-            logger.error(f"Error querying user in Notion: {e}")
+    def _update_user_page(
+        self,
+        phone_number: str,
+        properties: Dict[str, Any],
+        user: Optional[User] = None
+    ) -> Optional[str]:
+        """
+        Update the user's Notion page.
+
+        Goes straight to pages.update when the page id is stored locally; a
+        stale id (page deleted in Notion) is dropped and looked up once.
+
+        Returns:
+            Updated page id, or None if the user has no page
+        """
+        page_id = self._resolve_page_id(phone_number, user)
+        if not page_id:
             return None
 
-    def mark_onboarding_complete(self, phone_number: str) -> bool:
+        try:
+            self.client.pages.update(page_id=page_id, properties=properties)
+        except APIResponseError as e:
+            if user is None or e.code != APIErrorCode.ObjectNotFound:
+                raise
+            logger.warning("Stored Notion page %s of %s not found, looking it up", page_id, phone_number)
+            user.notion_page_id = None
+            self.cache.delete(phone_number)
+            page_id = self._resolve_page_id(phone_number, user)
+            if not page_id:
+                return None
+            self.client.pages.update(page_id=page_id, properties=properties)
+
+        self.cache.delete(phone_number)
+        return page_id
+
+    def mark_onboarding_complete(self, phone_number: str, user: Optional[User] = None) -> bool:
         """
         Mark user as completed onboarding in Notion.
 
         Args:
             phone_number: User phone number
+            user: Local user; its stored page id skips the Notion lookup and
+                its onboarding stage is updated (caller commits)
 
         Returns:
             Success status
@@ -70,16 +146,9 @@ class NotionUserManager:
             return False
 
         try:
-            # Find user in Notion
-            user_page = self.get_user_by_phone(phone_number)
-            if not user_page:
-                logger.warning(f"User {phone_number} not found in Notion")
-                return False
-
-            # Update properties
-            self.client.pages.update(
-                page_id=user_page["id"],
-                properties={
+            page_id = self._update_user_page(
+                phone_number,
+                {
                     "Onboarding_Stage": {  # Actual property name from Notion
                         "select": {
                             "name": "completed"  # Use actual option from Notion
@@ -90,22 +159,34 @@ class NotionUserManager:
                             "start": datetime.utcnow().isoformat()
                         }
                     }
-                }
+                },
+                user=user
             )
+            if not page_id:
+                logger.warning("User %s not found in Notion", phone_number)
+                return False
+
+            if user is not None:
+                user.onboarding_stage = "completed"
+                user.notion_synced_at = datetime.utcnow()
 
-            logger.info(f"User {phone_number} marked as onboarded in Notion")
+            logger.info("User %s marked as onboarded in Notion", phone_number)
             return True
 
         except Exception as e:
-            logger.error(f"Error marking onboarding in Notion: {e}")
+            logger.error("Error marking onboarding in Notion: %s", e)
             return False
 
-    def get_onboarding_status(self, phone_number: str) -> bool:
+    def get_onboarding_status(self, phone_number: str, user: Optional[User] = None) -> bool:
         """
         Check if user has completed onboarding.
 
+        With a local user whose stage is known, no Notion call is made; the
+        reconciler keeps that stage in line with Notion.
+
         Args:
             phone_number: User phone number
+            user: Local user (stage read from and stored on it; caller commits)
 
         Returns:
             Onboarding status
@@ -113,29 +194,31 @@ class NotionUserManager:
         if not self.users_db_id:
             return False
 
+        if user is not None and user.onboarding_stage:
+            return user.onboarding_stage == "completed"
+
         try:
             user_page = self.get_user_by_phone(phone_number)
             if not user_page:
                 return False
 
-            # Check onboarding property
-            props = user_page.get("properties", {})
-            onboarding_prop = props.get("Onboarding_Stage", {})
-
-            # Check if status is "completed"
-            select_option = onboarding_prop.get("select", {})
-            stage_name = select_option.get("name", "")
+            if user is not None:
+                self._remember_page(user, user_page)
 
-            return stage_name == "completed"
+            return self._stage_of(user_page) == "completed"
 
         except Exception as e:
-            logger.error(f"Error getting onboarding status: {e}")
+            logger.error("Error getting onboarding status: %s", e)
             return False
 
     def sync_user_to_notion(self, user: User) -> Optional[str]:
         """
         Create or update user in Notion.
 
+        The update is skipped when the profile digest matches the one stored
+        on ``user.notion_hash`` by the previous write; callers commit the user
+        to persist the new digest.
+
         Args:
             user: User object
 
@@ -147,8 +230,13 @@ class NotionUserManager:
             return None
 
         try:
-            # Check if user exists
-            existing_page = self.get_user_by_phone(user.phone_number)
+            # Known page ids skip the lookup
+            page_id = user.notion_page_id
+            if not page_id:
+                existing_page = self.get_user_by_phone(user.phone_number)
+                if existing_page:
+                    self._remember_page(user, existing_page)
+                    page_id = existing_page["id"]
 
             properties = {
                 "Name": {
@@ -170,25 +258,35 @@ class NotionUserManager:
                 }
             }
 
-            if existing_page:
+            digest = properties_digest(properties)
+
+            if page_id:
+                if digest == user.notion_hash:
+                    logger.debug("User %s unchanged, skipping Notion update", user.phone_number)
+                    return page_id
+
                 # Update existing
-                self.client.pages.update(
-                    page_id=existing_page["id"],
-                    properties=properties
-                )
-                logger.info(f"User {user.phone_number} updated in Notion")
-                return existing_page["id"]
-            else:
-                # Create new
-                response = self.client.pages.create(
-                    parent={"database_id": self.users_db_id},
-                    properties=properties
-                )
-                logger.info(f"User {user.phone_number} created in Notion")
-                return response["id"]
+                page_id = self._update_user_page(user.phone_number, properties, user=user)
+                if page_id:
+                    user.notion_hash = digest
+                    logger.info("User %s updated in Notion", user.phone_number)
+                    return page_id
+
+            # Create new
+            response = self.client.pages.create(
+                parent={"database_id": self.users_db_id},
+                properties=properties
+            )
+            user.notion_hash = digest
+            user.notion_page_id = response["id"]
+            user.onboarding_stage = user.onboarding_stage or "not_started"
+            user.notion_synced_at = datetime.utcnow()
+            self.cache.delete(user.phone_number)
+            logger.info("User %s created in Notion", user.phone_number)
+            return response["id"]
 
         except Exception as e:
-            logger.error(f"Error syncing user to Notion: {e}")
+            logger.error("Error syncing user to Notion: %s", e)
             return None
 
     def get_all_active_users(self) -> list:
@@ -215,14 +313,15 @@ class NotionUserManager:
             return response.get("results", [])
 
         except Exception as e:
-            logger.error(f"Error getting active users from Notion: {e}")
+            logger.error("Error getting active users from Notion: %s", e)
             return []
 
     def update_user_notion_field(
         self,
         phone_number: str,
         field_name: str,
-        field_value: Any
+        field_value: Any,
+        user: Optional[User] = None
     ) -> bool:
         """
         Update a specific field for user in Notion.
@@ -231,6 +330,7 @@ class NotionUserManager:
             phone_number: User phone number
             field_name: Field name in Notion
             field_value: New value
+            user: Local user; its stored page id skips the Notion lookup
 
         Returns:
             Success status
@@ -239,10 +339,6 @@ class NotionUserManager:
             return False
 
         try:
-            user_page = self.get_user_by_phone(phone_number)
-            if not user_page:
-                return False
-
             # Generic update for simple text fields
             properties = {
                 field_name: {
@@ -256,18 +352,59 @@ class NotionUserManager:
                 }
             }
 
-            self.client.pages.update(
-                page_id=user_page["id"],
-                properties=properties
-            )
+            if not self._update_user_page(phone_number, properties, user=user):
+                return False
 
-            logger.info(f"User {phone_number} field '{field_name}' updated in Notion")
+            logger.info("User %s field '%s' updated in Notion", phone_number, field_name)
             return True
 
         except Exception as e:
-            logger.error(f"Error updating user field in Notion: {e}")
+            logger.error("Error updating user field in Notion: %s", e)
             return False
 
+    def reconcile_users(self, db: Session) -> Dict[str, int]:
+        """
+        Refresh page ids and onboarding stages of local users from Notion.
+
+        Reads the users database once (all pages) and matches pages to users
+        by normalized phone number.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Counts of matched, changed and missing users
+        """
+        if not self.users_db_id:
+            return {}
+
+        by_phone: Dict[str, Dict[str, Any]] = {}
+        for page in query_all_pages(self.client, self.users_db_id):
+            phone = ((page.get("properties") or {}).get("Phone") or {}).get("phone_number")
+            if phone:
+                by_phone[normalize_phone_number(phone)] = page
+
+        stats = {"matched": 0, "changed": 0, "missing": 0}
+        for user in db.query(User).all():
+            page = by_phone.get(user.phone_number)
+            if page is None:
+                stats["missing"] += 1
+                if user.notion_page_id or user.onboarding_stage:
+                    # Unknown again: the next check looks the user up
+                    user.notion_page_id = None
+                    user.onboarding_stage = None
+                    stats["changed"] += 1
+                continue
+
+            stats["matched"] += 1
+            if user.notion_page_id != page["id"] or user.onboarding_stage != self._stage_of(page):
+                stats["changed"] += 1
+            self._remember_page(user, page)
+
+        db.commit()
+        logger.info("Notion users reconciled: %s", stats)
+        return stats
+
 
 # Global instance
 import os
@@ -0,0 +1,229 @@
+"""Database-polling reminder dispatcher.
+
+Instead of keeping one in-memory scheduler job per reminder, due reminders are
+claimed from the database in batches with ``SELECT ... FOR UPDATE SKIP LOCKED``,
+sent through a bounded thread pool and marked as sent with a single bulk
+UPDATE. Several replicas can poll at the same time: rows locked by one replica
+are skipped by the others, so every reminder is delivered once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.session import SessionLocal
+from src.database.models import Reminder, Task, User
+from src.utils.logger import logger
+
+
+PRIORITY_EMOJI = {
+    "low": "🔵",
+    "medium": "🟡",
+    "high": "🟠",
+    "urgent": "🔴"
+}
+
+
+def build_reminder_message(task: Task, reminder: Reminder) -> str:
+    """
+    Build the WhatsApp text for a reminder.
+
+    Args:
+        task: Task the reminder refers to
+        reminder: Reminder object
+
+    Returns:
+        Formatted reminder message
+    """
+    message = f"⏰ *Lembrete*\n\n"
+    message += f"📋 *Tarefa:* {task.title}\n"
+
+    if task.description:
+        message += f"📝 *Descrição:* {task.description}\n"
+
+    if task.due_date:
+        due_str = task.due_date.strftime("%d/%m/%Y às %H:%M")
+        message += f"📅 *Prazo:* {due_str}\n"
+
+    priority_emoji = PRIORITY_EMOJI.get(task.priority, "⚪")
+    message += f"{priority_emoji} *Prioridade:* {task.priority.upper()}\n"
+
+    if reminder.message:
+        message += f"\n💬 {reminder.message}"
+
+    return message
+
+
+class ReminderDispatcher:
+    """Poll due reminders in batches and deliver them concurrently."""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_batches_per_run: Optional[int] = None,
+        sender: Optional[Callable[[str, str], object]] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            batch_size: Reminders claimed per transaction
+            max_workers: Concurrent Evolution API senders
+            max_batches_per_run: Upper bound of batches drained per poll
+            sender: Callable(phone_number, message); defaults to Evolution API
+            session_factory: Factory returning a new database session
+        """
+        self.batch_size = batch_size or settings.REMINDER_BATCH_SIZE
+        self.max_workers = max_workers or settings.REMINDER_SENDER_WORKERS
+        self.max_batches_per_run = max_batches_per_run or settings.REMINDER_MAX_BATCHES_PER_RUN
+        self.session_factory = session_factory
+        self._sender = sender
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="reminder-sender"
+        )
+
+    def _send(self, phone_number: str, message: str) -> object:
+        if self._sender is None:
+            from src.integrations.evolution_api import evolution_client
+            self._sender = evolution_client.send_text_message
+        return self._sender(phone_number, message)
+
+    def _claim_due(
+        self,
+        db: Session,
+        now: datetime,
+        exclude_ids: Set[int]
+    ) -> List[Tuple[Reminder, Task, User]]:
+        """Lock a batch of due reminders, skipping rows claimed by other workers."""
+        query = (
+            db.query(Reminder, Task, User)
+            .join(Task, Task.id == Reminder.task_id)
+            .join(User, User.id == Reminder.user_id)
+            .filter(
+                Reminder.sent == False,  # noqa: E712
+                Reminder.scheduled_time <= now
+            )
+        )
+        if exclude_ids:
+            query = query.filter(Reminder.id.notin_(exclude_ids))
+
+        return (
+            query
+            .order_by(Reminder.scheduled_time)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True, of=Reminder)
+            .all()
+        )
+
+    def _deliver(self, job: Tuple[int, str, str]) -> Tuple[int, bool]:
+        reminder_id, phone_number, message = job
+        try:
+            self._send(phone_number, message)
+            return reminder_id, True
+        except Exception as e:
+            logger.error("Error sending reminder %s to %s: %s", reminder_id, phone_number, e)
+            return reminder_id, False
+
+    def dispatch_batch(
+        self,
+        now: Optional[datetime] = None,
+        failed_ids: Optional[Set[int]] = None
+    ) -> Dict[str, int]:
+        """
+        Claim, send and mark one batch of due reminders.
+
+        Args:
+            now: Reference time (UTC); defaults to current time
+            failed_ids: Reminders that already failed in this run; they are
+                skipped and new failures are added to the set
+
+        Returns:
+            Batch statistics (claimed, sent, failed)
+        """
+        now = now or datetime.utcnow()
+        failed_ids = failed_ids if failed_ids is not None else set()
+        stats = {"claimed": 0, "sent": 0, "failed": 0}
+
+        db = self.session_factory()
+        try:
+            rows = self._claim_due(db, now, failed_ids)
+            stats["claimed"] = len(rows)
+            if not rows:
+                db.rollback()
+                return stats
+
+            jobs = [
+                (reminder.id, user.phone_number, build_reminder_message(task, reminder))
+                for reminder, task, user in rows
+            ]
+
+            # Locks are held until commit, so other replicas skip these rows
+            results = list(self._pool.map(self._deliver, jobs))
+            sent_ids = [reminder_id for reminder_id, ok in results if ok]
+            failed_ids.update(reminder_id for reminder_id, ok in results if not ok)
+
+            if sent_ids:
+                db.query(Reminder).filter(Reminder.id.in_(sent_ids)).update(
+                    {Reminder.sent: True, Reminder.sent_at: datetime.utcnow()},
+                    synchronize_session=False
+                )
+            db.commit()
+
+            stats["sent"] = len(sent_ids)
+            stats["failed"] = len(rows) - len(sent_ids)
+            return stats
+
+        except Exception as e:
+            logger.error("Error dispatching reminders: %s", e, exc_info=True)
+            db.rollback()
+            return stats
+        finally:
+            db.close()
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Drain due reminders batch by batch.
+
+        Stops when a batch comes back partially filled or after
+        ``max_batches_per_run`` batches. Failed reminders stay pending and are
+        retried on the next poll, not within the same run.
+
+        Args:
+            now: Reference time (UTC); defaults to current time
+
+        Returns:
+            Aggregated statistics for this run
+        """
+        totals = {"batches": 0, "claimed": 0, "sent": 0, "failed": 0}
+        failed_ids: Set[int] = set()
+
+        for _ in range(self.max_batches_per_run):
+            stats = self.dispatch_batch(now, failed_ids)
+            if not stats["claimed"]:
+                break
+
+            totals["batches"] += 1
+            for key in ("claimed", "sent", "failed"):
+                totals[key] += stats[key]
+
+            if stats["claimed"] < self.batch_size:
+                break
+
+        if totals["claimed"]:
+            logger.info(
+                "Reminder dispatch: %s sent, %s failed in %s batch(es)",
+                totals["sent"],
+                totals["failed"],
+                totals["batches"]
+            )
+
+        return totals
+
+    def shutdown(self):
+        """Stop the sender pool."""
+        self._pool.shutdown(wait=True)
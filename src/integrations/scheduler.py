@@ -1,148 +1,144 @@
 """Task scheduler for reminders using APScheduler."""
+import asyncio
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.date import DateTrigger
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-import pytz
+from apscheduler.triggers.interval import IntervalTrigger
 
 from src.config.settings import settings
-from src.database.session import get_db_context
-from src.database.models import Reminder, Task, User
-from src.integrations.evolution_api import evolution_client
+from src.database.leader import LeaderLock
+from src.integrations.reminder_dispatcher import ReminderDispatcher
 from src.utils.logger import logger
 
 
 class ReminderScheduler:
-    """Scheduler for managing task reminders."""
+    """Scheduler for periodic jobs: reminder dispatch and Notion sync."""
 
     def __init__(self):
         self.scheduler = AsyncIOScheduler(timezone=settings.TIMEZONE)
+        self.dispatcher = ReminderDispatcher()
+        self.leader = LeaderLock()
+        self.leading = False
+
+    def start(self):
+        """
+        Start the scheduler and the reminder polling job.
+        Must be called from a running event loop (application startup).
+        """
+        if self.scheduler.running:
+            return
+
         self.scheduler.start()
+        self.schedule_reminder_dispatch()
         logger.info("Reminder scheduler started")
 
-    def schedule_reminder(self, reminder_id: int, scheduled_time: datetime):
+    def schedule_reminder_dispatch(self):
         """
-        Schedule a reminder to be sent.
+        Poll the database for due reminders at a fixed interval.
 
-        Args:
-            reminder_id: Reminder ID
-            scheduled_time: When to send the reminder
+        Reminders are not kept as individual jobs: one polling job per process
+        claims due rows, so memory does not grow with pending reminders and
+        replicas share the work through row locks.
         """
-        # Convert to timezone-aware datetime
-        tz = pytz.timezone(settings.TIMEZONE)
-        if scheduled_time.tzinfo is None:
-            scheduled_time = tz.localize(scheduled_time)
-
-        # Schedule job
         self.scheduler.add_job(
-            func=self._send_reminder,
-            trigger=DateTrigger(run_date=scheduled_time),
-            args=[reminder_id],
-            id=f"reminder_{reminder_id}",
-            replace_existing=True
+            func=self._poll_reminders,
+            trigger=IntervalTrigger(seconds=settings.REMINDER_POLL_INTERVAL_SECONDS),
+            id="reminder_dispatch",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
 
-        logger.info(f"Reminder {reminder_id} scheduled for {scheduled_time}")
+        logger.info(
+            "Reminder dispatch scheduled every %ss (batch=%s, workers=%s)",
+            settings.REMINDER_POLL_INTERVAL_SECONDS,
+            self.dispatcher.batch_size,
+            self.dispatcher.max_workers
+        )
 
-    def cancel_reminder(self, reminder_id: int):
+    async def _poll_reminders(self):
         """
-        Cancel a scheduled reminder.
+        Check for due reminders with the async engine and dispatch if any.
 
-        Args:
-            reminder_id: Reminder ID
+        Idle polls cost one COUNT on the event loop; the claiming dispatcher
+        (row locks, sender pool) runs in a thread only when there is work.
         """
         try:
-            self.scheduler.remove_job(f"reminder_{reminder_id}")
-            logger.info(f"Reminder {reminder_id} cancelled")
+            from src.database.session import get_async_db_context
+            from src.database.async_queries import count_due_reminders
+
+            async with get_async_db_context() as session:
+                due = await count_due_reminders(session)
+            if not due:
+                return
         except Exception as e:
-            logger.warning(f"Could not cancel reminder {reminder_id}: {e}")
+            logger.warning("Async reminder check failed, dispatching anyway: %s", e)
 
-    async def _send_reminder(self, reminder_id: int):
+        await asyncio.to_thread(self.dispatcher.dispatch_due)
+
+    async def schedule_leader_jobs(self):
         """
-        Send a reminder notification.
+        Run the Notion user reconciliation and the nightly sync on one process.
 
-        Args:
-            reminder_id: Reminder ID
+        Every worker and replica takes part in the election; only the one
+        holding the leader lock schedules the jobs. The election is re-run
+        periodically, so another process takes over when the leader dies.
+        The first election connects to the database, so it runs in a thread.
         """
-        with get_db_context() as db:
-            try:
-                # Get reminder with related data
-                reminder = db.query(Reminder).filter(
-                    Reminder.id == reminder_id
-                ).first()
-
-                if not reminder or reminder.sent:
-                    logger.warning(f"Reminder {reminder_id} not found or already sent")
-                    return
-
-                # Get task and user
-                task = db.query(Task).filter(Task.id == reminder.task_id).first()
-                user = db.query(User).filter(User.id == reminder.user_id).first()
-
-                if not task or not user:
-                    logger.error(f"Task or user not found for reminder {reminder_id}")
-                    return
-
-                # Build reminder message
-                message = f"⏰ *Lembrete*\n\n"
-                message += f"📋 *Tarefa:* {task.title}\n"
-
-                if task.description:
-                    message += f"📝 *Descrição:* {task.description}\n"
-
-                if task.due_date:
-                    due_str = task.due_date.strftime("%d/%m/%Y às %H:%M")
-                    message += f"📅 *Prazo:* {due_str}\n"
-
-                priority_emoji = {
-                    "low": "🔵",
-                    "medium": "🟡",
-                    "high": "🟠",
-                    "urgent": "🔴"
-                }.get(task.priority, "⚪")
-                message += f"{priority_emoji} *Prioridade:* {task.priority.upper()}\n"
-
-                if reminder.message:
-                    message += f"\n💬 {reminder.message}"
-
-                # Send via Evolution API
-                evolution_client.send_text_message(
-                    phone_number=user.phone_number,
-                    message=message
-                )
-
-                # Mark as sent
-                reminder.sent = True
-                reminder.sent_at = datetime.utcnow()
-                db.commit()
-
-                logger.info(f"Reminder {reminder_id} sent to {user.phone_number}")
-
-            except Exception as e:
-                logger.error(f"Error sending reminder {reminder_id}: {e}", exc_info=True)
-                db.rollback()
-
-    def load_pending_reminders(self):
+        await asyncio.to_thread(self._check_leadership)
+        self.scheduler.add_job(
+            func=self._check_leadership,
+            trigger=IntervalTrigger(seconds=settings.SCHEDULER_LEADER_CHECK_SECONDS),
+            id="leader_election",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+
+    def _check_leadership(self):
+        """Acquire or confirm leadership and (un)schedule the singleton jobs."""
+        leader = self.leader.acquire()
+        if leader and not self.leading:
+            self.leading = True
+            self.schedule_user_reconciliation()
+            self.schedule_daily_sync()
+        elif not leader and self.leading:
+            self.leading = False
+            for job_id in ("notion_user_reconcile", "daily_notion_sync"):
+                if self.scheduler.get_job(job_id):
+                    self.scheduler.remove_job(job_id)
+            logger.warning("Lost scheduler leadership, singleton jobs removed")
+        elif not leader:
+            logger.debug("Not the scheduler leader, singleton jobs skipped")
+
+    def schedule_user_reconciliation(self):
         """
-        Load all pending reminders from database and schedule them.
-        Call this on startup.
+        Refresh Notion page ids and onboarding stages stored on local users.
+
+        Onboarding checks read the local stage, so this job is what picks up
+        changes made directly in the Notion users database.
         """
-        with get_db_context() as db:
-            try:
-                # Get all pending reminders
-                now = datetime.utcnow()
-                pending_reminders = db.query(Reminder).filter(
-                    Reminder.sent == False,
-                    Reminder.scheduled_time > now
-                ).all()
+        self.scheduler.add_job(
+            func=self._reconcile_notion_users,
+            trigger=IntervalTrigger(minutes=settings.NOTION_USER_RECONCILE_MINUTES),
+            id="notion_user_reconcile",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+
+        logger.info("Notion user reconciliation scheduled every %s min", settings.NOTION_USER_RECONCILE_MINUTES)
 
-                for reminder in pending_reminders:
-                    self.schedule_reminder(reminder.id, reminder.scheduled_time)
+    def _reconcile_notion_users(self):
+        """Run one reconciliation (APScheduler thread pool)."""
+        try:
+            from src.database.jobs import job_sessions
+            from src.integrations.notion_users import notion_user_manager
 
-                logger.info(f"Loaded {len(pending_reminders)} pending reminders")
+            with job_sessions.session("notion_user_reconcile") as db:
+                notion_user_manager.reconcile_users(db)
 
-            except Exception as e:
-                logger.error(f"Error loading pending reminders: {e}")
+        except Exception as e:
+            logger.error("Error reconciling Notion users: %s", e)
 
     def schedule_daily_sync(self):
         """
@@ -163,31 +159,25 @@ class ReminderScheduler:
     async def _daily_notion_sync(self):
         """
         Perform daily Notion sync for all active users.
-        """
-        with get_db_context() as db:
-            try:
-                from src.integrations.notion_sync import notion_sync
-
-                users = db.query(User).filter(
-                    User.is_active == True,
-                    User.notion_database_id.isnot(None)
-                ).all()
 
-                for user in users:
-                    try:
-                        stats = notion_sync.bidirectional_sync(user, db)
-                        logger.info(f"Daily sync for user {user.id}: {stats}")
-                    except Exception as e:
-                        logger.error(f"Error syncing user {user.id}: {e}")
+        Users are fanned out over the orchestrator's worker pool in a thread,
+        so the event loop keeps serving webhooks while the sync runs.
+        """
+        try:
+            from src.integrations.sync_orchestrator import notion_sync_orchestrator
 
-                logger.info(f"Daily sync completed for {len(users)} users")
+            await notion_sync_orchestrator.run_async()
 
-            except Exception as e:
-                logger.error(f"Error in daily sync: {e}")
+        except Exception as e:
+            logger.error("Error in daily sync: %s", e)
 
     def shutdown(self):
         """Shutdown the scheduler."""
-        self.scheduler.shutdown()
+        if self.scheduler.running:
+            self.scheduler.shutdown()
+        self.dispatcher.shutdown()
+        self.leader.release()
+        self.leading = False
         logger.info("Reminder scheduler shutdown")
 
 
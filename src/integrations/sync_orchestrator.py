@@ -0,0 +1,216 @@
+"""Parallel Notion sync across users.
+
+The nightly sync fans users out over a bounded thread pool. Each worker uses
+its own database session, all workers share the process-wide Notion rate
+limiter (see ``notion_gateway``), and a Notion database shared by many users
+(typically ``NOTION_DATABASE_ID``) is fetched and indexed by assignee once per
+run; each user then receives only their pages from that index.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.session import SessionLocal
+from src.database.models import User
+from src.utils.logger import logger
+
+
+class DatabasePageCache:
+    """Fetch each Notion database at most once per sync run."""
+
+    def __init__(self, fetch: Callable[[str], Any]):
+        """
+        Initialize cache.
+
+        Args:
+            fetch: Callable(database_id) loading the database contents
+        """
+        self._fetch = fetch
+        self._pages: Dict[str, Any] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.fetches = 0
+
+    def get(self, database_id: str) -> Any:
+        """Return the contents of a database, fetching them on first use."""
+        with self._guard:
+            lock = self._locks.setdefault(database_id, threading.Lock())
+
+        # Workers needing the same database wait for a single fetch
+        with lock:
+            if database_id in self._errors:
+                raise self._errors[database_id]
+
+            if database_id not in self._pages:
+                with self._guard:
+                    self.fetches += 1
+                try:
+                    self._pages[database_id] = self._fetch(database_id)
+                except Exception as e:
+                    self._errors[database_id] = e
+                    raise
+            return self._pages[database_id]
+
+
+class SyncProgress:
+    """Thread-safe progress counters for a sync run."""
+
+    def __init__(self, total_users: int):
+        self.total_users = total_users
+        self.completed = 0
+        self.failed = 0
+        self.from_notion = 0
+        self.to_notion = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, stats: Optional[Dict[str, int]] = None, failed: bool = False):
+        """Record the outcome of one user."""
+        with self._lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self.from_notion += (stats or {}).get("from_notion", 0)
+                self.to_notion += (stats or {}).get("to_notion", 0)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Snapshot of the counters."""
+        with self._lock:
+            return {
+                "total_users": self.total_users,
+                "completed": self.completed,
+                "failed": self.failed,
+                "from_notion": self.from_notion,
+                "to_notion": self.to_notion,
+                "elapsed_seconds": round(time.monotonic() - self.started_at, 2)
+            }
+
+
+class NotionSyncOrchestrator:
+    """Run bidirectional Notion sync for many users concurrently."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        sync: Optional[Any] = None,
+        progress_every: int = 25
+    ):
+        """
+        Initialize orchestrator.
+
+        Args:
+            max_workers: Size of the worker pool
+            session_factory: Factory returning a new database session
+            sync: ``NotionSync`` instance (defaults to the global one)
+            progress_every: Log progress every N processed users
+        """
+        self.max_workers = max_workers or settings.NOTION_SYNC_WORKERS
+        self.session_factory = session_factory
+        self._sync = sync
+        self.progress_every = progress_every
+        self.last_progress: Optional[Dict[str, Any]] = None
+
+    @property
+    def sync(self):
+        if self._sync is None:
+            from src.integrations.notion_sync import notion_sync
+            self._sync = notion_sync
+        return self._sync
+
+    def _load_targets(self) -> List[Tuple[int, str]]:
+        """Active users paired with the Notion database they sync against."""
+        db = self.session_factory()
+        try:
+            users = db.query(User).filter(User.is_active == True).all()  # noqa: E712
+            targets = []
+            for user in users:
+                database_id = self.sync._resolve_database_id(user)
+                if database_id:
+                    targets.append((user.id, database_id))
+            return targets
+        finally:
+            db.close()
+
+    def _fetch_index(self, database_id: str):
+        return self.sync.build_assignee_index(self.sync.fetch_database_pages(database_id))
+
+    def _sync_user(
+        self,
+        user_id: int,
+        database_id: str,
+        pages: DatabasePageCache
+    ) -> Dict[str, int]:
+        db = self.session_factory()
+        try:
+            user = db.get(User, user_id)
+            if not user:
+                return {"from_notion": 0, "to_notion": 0, "total": 0}
+            index = pages.get(database_id)
+            return self.sync.bidirectional_sync(user, db, pages=index.pages_for(user.name))
+        finally:
+            db.close()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Sync every active user. Blocking; call from a worker thread.
+
+        Returns:
+            Final progress snapshot
+        """
+        targets = self._load_targets()
+        progress = SyncProgress(len(targets))
+        pages = DatabasePageCache(self._fetch_index)
+
+        logger.info(
+            "Notion sync started for %s users across %s databases with %s workers",
+            len(targets),
+            len({db_id for _, db_id in targets}),
+            self.max_workers
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="notion-sync"
+        ) as pool:
+            futures = {
+                pool.submit(self._sync_user, user_id, database_id, pages): user_id
+                for user_id, database_id in targets
+            }
+
+            for future in as_completed(futures):
+                user_id = futures[future]
+                try:
+                    progress.record(future.result())
+                except Exception as e:
+                    logger.error("Error syncing user %s: %s", user_id, e)
+                    progress.record(failed=True)
+
+                if progress.processed % self.progress_every == 0:
+                    logger.info("Notion sync progress: %s", progress.as_dict())
+
+        result = progress.as_dict()
+        result["databases_fetched"] = pages.fetches
+        self.last_progress = result
+
+        logger.info("Notion sync completed: %s", result)
+        return result
+
+    async def run_async(self) -> Dict[str, Any]:
+        """Run the sync without blocking the event loop."""
+        return await asyncio.to_thread(self.run)
+
+
+# Global orchestrator instance
+notion_sync_orchestrator = NotionSyncOrchestrator()
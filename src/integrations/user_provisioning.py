@@ -0,0 +1,274 @@
+"""Background provisioning of local users into the Notion users database.
+
+New WhatsApp users are created locally and answered right away; their Notion
+page is created by a small pool of worker threads. Failed attempts are
+retried with exponential backoff, each attempt in its own database session.
+``provision_many`` provisions a whole set of collaborators concurrently.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.session import SessionLocal
+from src.database.models import User
+from src.utils.logger import logger
+
+
+class UserProvisioner:
+    """Queue of user ids whose Notion page must be created or refreshed."""
+
+    def __init__(
+        self,
+        manager: Any = None,
+        workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        """
+        Initialize provisioner.
+
+        Args:
+            manager: NotionUserManager (default: the global instance)
+            workers: Background worker threads
+            max_retries: Retries after the first failed attempt
+            retry_base_seconds: First retry delay, doubled on every retry
+            session_factory: Factory returning a new database session
+        """
+        self._manager = manager
+        self.workers = workers or settings.USER_PROVISIONING_WORKERS
+        self.max_retries = settings.USER_PROVISIONING_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_base_seconds = (
+            settings.USER_PROVISIONING_RETRY_BASE_SECONDS if retry_base_seconds is None else retry_base_seconds
+        )
+        self.session_factory = session_factory
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: Set[int] = set()
+        self._timers: Set[threading.Timer] = set()
+        self._threads: List[threading.Thread] = []
+        self.enqueued = 0
+        self.provisioned = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def manager(self) -> Any:
+        if self._manager is None:
+            from src.integrations.notion_users import notion_user_manager
+            self._manager = notion_user_manager
+        return self._manager
+
+    def start(self):
+        """Start the worker threads (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f"user-provisioner-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        logger.info("User provisioner started with %s workers", self.workers)
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Stop the workers after the jobs already queued.
+
+        Retries still waiting for their backoff are dropped; those users keep
+        no Notion page and are picked up by the next bulk provisioning.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+            for timer in self._timers:
+                timer.cancel()
+            self._timers.clear()
+
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def enqueue(self, user_id: int) -> bool:
+        """
+        Schedule the Notion provisioning of a user.
+
+        Args:
+            user_id: Local user ID
+
+        Returns:
+            True if queued, False if the user was already waiting
+        """
+        with self._lock:
+            if user_id in self._pending:
+                return False
+            self._pending.add(user_id)
+            self.enqueued += 1
+
+        self.start()
+        self._queue.put((user_id, 0))
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Users queued or waiting for a retry."""
+        return len(self._pending)
+
+    def join(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until no user is pending (used by tests and scripts).
+
+        Returns:
+            True if everything was processed before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._pending:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def provision(self, user_id: int) -> bool:
+        """
+        Create or refresh one user's Notion page in a dedicated session.
+
+        Args:
+            user_id: Local user ID
+
+        Returns:
+            True on success (or nothing to do), False if it should be retried
+        """
+        db = self.session_factory()
+        try:
+            user = db.get(User, user_id)
+            if user is None:
+                logger.warning("User %s no longer exists, skipping Notion provisioning", user_id)
+                return True
+
+            if not self.manager.sync_user_to_notion(user):
+                db.rollback()
+                return False
+
+            db.commit()
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.error("Error provisioning user %s in Notion: %s", user_id, e)
+            return False
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            user_id, attempt = job
+            if self.provision(user_id):
+                with self._lock:
+                    self._pending.discard(user_id)
+                    self.provisioned += 1
+                continue
+
+            if attempt >= self.max_retries or not self.manager.users_db_id:
+                with self._lock:
+                    self._pending.discard(user_id)
+                    self.failed += 1
+                logger.error("Giving up Notion provisioning of user %s after %s attempts", user_id, attempt + 1)
+                continue
+
+            self._schedule_retry(user_id, attempt + 1)
+
+    def _schedule_retry(self, user_id: int, attempt: int):
+        delay = self.retry_base_seconds * (2 ** (attempt - 1))
+
+        def requeue():
+            with self._lock:
+                self._timers.discard(timer)
+            self._queue.put((user_id, attempt))
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        with self._lock:
+            self._timers.add(timer)
+            self.retried += 1
+        logger.warning("Notion provisioning of user %s failed, retry %s in %.1fs", user_id, attempt, delay)
+        timer.start()
+
+    def provision_many(
+        self,
+        user_ids: Optional[Iterable[int]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Provision many users concurrently (bulk onboarding of collaborators).
+
+        Args:
+            user_ids: Users to provision (default: active users without a
+                Notion page)
+            max_workers: Concurrent Notion writers
+
+        Returns:
+            Statistics (total, provisioned, failed, failed_ids)
+        """
+        if user_ids is None:
+            db = self.session_factory()
+            try:
+                rows = (
+                    db.query(User.id)
+                    .filter(User.is_active == True, User.notion_page_id.is_(None))  # noqa: E712
+                    .order_by(User.id)
+                    .all()
+                )
+                user_ids = [row.id for row in rows]
+            finally:
+                db.close()
+
+        user_ids = list(dict.fromkeys(user_ids))
+        stats: Dict[str, Any] = {"total": len(user_ids), "provisioned": 0, "failed": 0, "failed_ids": []}
+        if not user_ids:
+            return stats
+
+        workers = min(max_workers or settings.USER_PROVISIONING_BULK_WORKERS, len(user_ids))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="user-provision-bulk") as pool:
+            futures = {pool.submit(self.provision, user_id): user_id for user_id in user_ids}
+            for future in as_completed(futures):
+                if future.result():
+                    stats["provisioned"] += 1
+                else:
+                    stats["failed"] += 1
+                    stats["failed_ids"].append(futures[future])
+
+        stats["failed_ids"].sort()
+        logger.info(
+            "Bulk Notion provisioning: %s/%s users, %s failed",
+            stats["provisioned"],
+            stats["total"],
+            stats["failed"]
+        )
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "workers": len(self._threads),
+            "pending": self.pending,
+            "enqueued": self.enqueued,
+            "provisioned": self.provisioned,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+# Global provisioner instance
+user_provisioner = UserProvisioner()
@@ -1,14 +1,24 @@
 """Main FastAPI application."""
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from src.config.settings import settings
-from src.api.webhooks import router as webhook_router
+from src.api.webhooks import router as webhook_router, notion_database_debouncer, notion_page_debouncer
 from src.api.collaborators import router as collaborators_router
-from src.api.notion_webhook import router as notion_router
-from src.database.session import init_db
+from src.api.notion_webhook import router as notion_router, mirror_debouncer
+from src.api.admin import router as admin_router
+from src.database.jobs import job_sessions
+from src.database.session import init_db, dispose_async_engine, log_pool_layout
+from src.integrations.scheduler import reminder_scheduler
+from src.integrations.user_provisioning import user_provisioner
+from src.utils.cache import cache, connect_cache
 from src.utils.logger import logger
+from src.utils.loop_watchdog import loop_watchdog
+from src.utils.metrics import RequestMetricsMiddleware, check_worker_setup, register_stats
+from src.utils.tracing import setup_tracing, shutdown_tracing
 
 
 @asynccontextmanager
@@ -19,20 +29,50 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting Pangeia Agent...")
+    setup_tracing()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+
+    # Shared cache backend (pings Redis, so off the event loop)
+    await asyncio.to_thread(connect_cache)
 
     # Initialize database
+    log_pool_layout()
+    check_worker_setup(settings.WEB_CONCURRENCY)
     try:
         init_db()
         logger.info("Database initialized")
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.error("Database initialization failed: %s", e)
+
+    # Start reminder polling; the leader process also runs Notion user reconciliation and the nightly sync
+    try:
+        reminder_scheduler.start()
+        await reminder_scheduler.schedule_leader_jobs()
+    except Exception as e:
+        logger.error("Scheduler startup failed: %s", e)
 
-    logger.info(f"Pangeia Agent started on {settings.APP_HOST}:{settings.APP_PORT}")
+    # Background Notion provisioning of new users
+    try:
+        user_provisioner.start()
+    except Exception as e:
+        logger.error("User provisioner startup failed: %s", e)
+
+    logger.info("Pangeia Agent started on %s:%s", settings.APP_HOST, settings.APP_PORT)
 
     yield
 
     # Shutdown
     logger.info("Shutting down Pangeia Agent...")
+    # Webhooks were already acknowledged: run events still inside their debounce window
+    await notion_page_debouncer.flush()
+    await notion_database_debouncer.flush()
+    await mirror_debouncer.flush()
+    reminder_scheduler.shutdown()
+    user_provisioner.shutdown()
+    await dispose_async_engine()
+    loop_watchdog.shutdown()
+    shutdown_tracing()
     logger.info("Pangeia Agent stopped")
 
 
@@ -58,10 +98,23 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# Request latency (webhook ack time) for /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
+# Component counters exported as gauges on /metrics
+register_stats("db", job_sessions.stats)
+register_stats("cache", cache.stats)
+register_stats("user_provisioner", user_provisioner.stats)
+register_stats("notion_page_debouncer", notion_page_debouncer.stats)
+register_stats("notion_database_debouncer", notion_database_debouncer.stats)
+register_stats("mirror_debouncer", mirror_debouncer.stats)
+register_stats("loop_watchdog", loop_watchdog.stats)
+
 # Include routers
 app.include_router(webhook_router, tags=["webhooks"])
 app.include_router(collaborators_router, tags=["collaborators"])
 app.include_router(notion_router, tags=["notion"])
+app.include_router(admin_router, tags=["admin"])
 
 
 @app.get("/")
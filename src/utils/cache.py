@@ -0,0 +1,395 @@
+"""Shared cache with an in-process LRU/TTL backend and a Redis backend.
+
+Backend calls are synchronous (redis-py with a 1s socket timeout): use the
+cache from worker threads (function executor, scheduler jobs), not from
+coroutines on the event loop. The global ``cache`` starts in-process; the
+configured backend is connected at application startup (``connect_cache``).
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from src.config.settings import settings
+from src.utils.logger import logger
+
+try:
+    import redis
+except ModuleNotFoundError:  # pragma: no cover
+    redis = None  # type: ignore
+
+# Errors meaning the backend is unreachable (as opposed to a bad value)
+CONNECTION_ERRORS: Tuple[type, ...] = (OSError,) + (
+    (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) if redis is not None else ()
+)
+
+
+class CacheBackend(ABC):
+    """Storage interface used by Cache. Values must be JSON-serializable."""
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value)."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, expiring after ``ttl`` seconds if given."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Delete a key (missing keys are ignored)."""
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with prefix; returns the number deleted."""
+
+
+class InMemoryCache(CacheBackend):
+    """Thread-safe LRU cache with per-entry expiry (per process)."""
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize backend.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._data if key.startswith(prefix)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+
+class RedisCache(CacheBackend):
+    """
+    Backend for Redis or any server speaking its protocol.
+
+    Works with any client exposing ``get``, ``set(ex=)``, ``delete`` and
+    ``scan_iter`` (redis-py and compatible stand-ins). Values are stored as
+    JSON so every process reads the same representation.
+    """
+
+    def __init__(self, client: Any):
+        """
+        Initialize backend.
+
+        Args:
+            client: redis.Redis (or compatible) client
+        """
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        """
+        Create a backend from a redis:// URL (requires the redis package).
+
+        The client connects lazily, so the server is pinged here: an
+        unreachable Redis fails now instead of on every lookup.
+        """
+        if redis is None:
+            raise RuntimeError("redis package is not installed")
+        client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        client.ping()
+        return cls(client)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        raw = self.client.get(key)
+        if raw is None:
+            return False, None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return True, json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        if ttl:
+            self.client.set(key, payload, ex=max(1, int(ttl)))
+        else:
+            self.client.set(key, payload)
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def _scan(self, prefix: str) -> Iterator[Any]:
+        return self.client.scan_iter(match=f"{prefix}*", count=500)
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = list(self._scan(prefix))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+
+class CacheNamespace:
+    """
+    Keys of one logical area (e.g. "users"), with metrics and single-flight.
+
+    ``get_or_set`` lets one caller load a missing key while concurrent callers
+    for the same key wait for its result instead of hitting the source too.
+    Backend errors are logged and treated as misses: the cache never breaks
+    the code path it accelerates. After a connection error the backend is
+    skipped altogether for a while (see ``Cache.available``), so an outage
+    costs one timeout rather than one per lookup.
+    """
+
+    def __init__(self, cache: "Cache", name: str, default_ttl: Optional[float]):
+        self.cache = cache
+        self.name = name
+        self.default_ttl = default_ttl
+        self.prefix = f"{cache.prefix}:{name}:"
+        self._flights: Dict[str, threading.Lock] = {}
+        self._flights_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.loads = 0
+        self.waits = 0
+        self.errors = 0
+        self.skipped = 0
+
+    def _key(self, key: Any) -> str:
+        return f"{self.prefix}{key}"
+
+    def _call(self, operation: str, key: Any, func: Callable[[], Any], default: Any = None) -> Any:
+        """Run a backend operation, degrading to ``default`` on errors or while it is down."""
+        if not self.cache.available():
+            self.skipped += 1
+            return default
+        try:
+            return func()
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Cache %s failed (%s:%s): %s", operation, self.name, key, e)
+            self.cache.record_failure(e)
+            return default
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        found, value = self._lookup(key)
+        return value if found else default
+
+    def _lookup(self, key: Any) -> Tuple[bool, Any]:
+        found, value = self._call("get", key, lambda: self.cache.backend.get(self._key(key)), (False, None))
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found, value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        def store() -> bool:
+            self.cache.backend.set(self._key(key), value, ttl if ttl is not None else self.default_ttl)
+            return True
+
+        if self._call("set", key, store, False):
+            self.sets += 1
+
+    def delete(self, key: Any):
+        self._call("delete", key, lambda: self.cache.backend.delete(self._key(key)))
+
+    def clear(self):
+        """Delete every key of this namespace."""
+        self._call("clear", "*", lambda: self.cache.backend.delete_prefix(self.prefix))
+
+    def get_or_set(
+        self,
+        key: Any,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        cache_none: bool = False
+    ) -> Any:
+        """
+        Return the cached value or load, store and return it.
+
+        Args:
+            key: Key within the namespace
+            loader: Called on a miss; its exceptions propagate and nothing is cached
+            ttl: Lifetime in seconds (default: namespace TTL)
+            cache_none: Whether a None result is cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.setdefault(str(key), threading.Lock())
+
+        if not flight.acquire(blocking=False):
+            # Another thread is loading this key: wait for it and reuse the result
+            self.waits += 1
+            flight.acquire()
+        try:
+            found, value = self._lookup(key)
+            if found:
+                return value
+
+            self.loads += 1
+            value = loader()
+            if value is not None or cache_none:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            flight.release()
+            with self._flights_lock:
+                if self._flights.get(str(key)) is flight and not flight.locked():
+                    del self._flights[str(key)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "loads": self.loads,
+            "single_flight_waits": self.waits,
+            "errors": self.errors,
+            "skipped": self.skipped,
+        }
+
+
+class Cache:
+    """Entry point: a backend plus named namespaces sharing a key prefix."""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        prefix: str = "pangeia",
+        default_ttl: Optional[float] = 300,
+        retry_after: Optional[float] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            backend: Storage backend
+            prefix: Prefix of every key (isolates apps sharing a Redis)
+            default_ttl: Default lifetime in seconds for namespaces
+            retry_after: Seconds the backend is skipped after a connection
+                error (0 never skips it)
+        """
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.retry_after = settings.CACHE_RETRY_AFTER_SECONDS if retry_after is None else retry_after
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self.trips = 0
+
+    def available(self) -> bool:
+        """Whether the backend may be used (False for a while after a connection error)."""
+        return time.monotonic() >= self._down_until
+
+    def record_failure(self, error: Exception):
+        """
+        Skip the backend for ``retry_after`` seconds if ``error`` means it is unreachable.
+
+        Args:
+            error: Exception raised by a backend operation
+        """
+        if not isinstance(error, CONNECTION_ERRORS) or self.retry_after <= 0:
+            return
+        with self._lock:
+            if not self.available():
+                return
+            self._down_until = time.monotonic() + self.retry_after
+            self.trips += 1
+        logger.warning("Cache backend unreachable, skipping it for %.0fs", self.retry_after)
+
+    def namespace(self, name: str, default_ttl: Optional[float] = None) -> CacheNamespace:
+        """Get (or create) a namespace."""
+        with self._lock:
+            namespace = self._namespaces.get(name)
+            if namespace is None:
+                ttl = default_ttl if default_ttl is not None else self.default_ttl
+                namespace = CacheNamespace(self, name, ttl)
+                self._namespaces[name] = namespace
+            return namespace
+
+    def clear(self):
+        """Delete every key under this cache's prefix."""
+        self.backend.delete_prefix(f"{self.prefix}:")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters per namespace and backend."""
+        return {
+            "backend": type(self.backend).__name__,
+            "backend_available": self.available(),
+            "backend_trips": self.trips,
+            "namespaces": {name: ns.stats() for name, ns in self._namespaces.items()},
+        }
+
+
+def build_backend() -> CacheBackend:
+    """Create the backend configured by settings, falling back to in-process."""
+    if settings.CACHE_BACKEND == "redis" and settings.REDIS_URL:
+        try:
+            backend = RedisCache.from_url(settings.REDIS_URL)
+            logger.info("Cache backend: redis")
+            return backend
+        except Exception as e:
+            logger.warning("Redis cache unavailable (%s), using in-process cache", e)
+    return InMemoryCache(settings.CACHE_MAX_ENTRIES)
+
+
+def connect_cache(target: Optional[Cache] = None) -> Cache:
+    """
+    Attach the configured backend to a cache (blocking: pings Redis).
+
+    Called once at application startup, off the event loop.
+
+    Args:
+        target: Cache to configure (default: the global cache)
+
+    Returns:
+        The configured cache
+    """
+    target = target or cache
+    target.backend = build_backend()
+    return target
+
+
+# Global cache instance (in-process until connect_cache runs)
+cache = Cache(
+    InMemoryCache(settings.CACHE_MAX_ENTRIES),
+    prefix=settings.CACHE_KEY_PREFIX,
+    default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS
+)
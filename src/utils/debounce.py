@@ -0,0 +1,139 @@
+"""Keyed debouncing for bursty webhook events."""
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Union
+
+from src.utils.logger import logger
+
+
+Handler = Callable[[str, Any], Union[Awaitable[Any], Any]]
+
+
+class KeyedDebouncer:
+    """
+    Collapse bursts of events with the same key into a single handler call.
+
+    The first event for a key schedules the handler after ``window_seconds``;
+    every further event for that key within the window pushes the deadline
+    back (trailing edge) and replaces the payload, up to ``max_wait_seconds``
+    after the first event so a constant stream still gets processed.
+    Synchronous handlers run in a worker thread so they never block the loop.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        window_seconds: float,
+        max_wait_seconds: Optional[float] = None,
+        name: str = "debouncer"
+    ):
+        """
+        Initialize debouncer.
+
+        Args:
+            handler: Callable(key, payload), sync or async
+            window_seconds: Quiet period before the handler runs
+            max_wait_seconds: Upper bound between first event and handler call
+            name: Name used in logs
+        """
+        self.handler = handler
+        self.window_seconds = window_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.name = name
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.received = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.failed = 0
+        self.handler_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    def submit(self, key: str, payload: Any = None) -> bool:
+        """
+        Register an event. Must be called from the running event loop.
+
+        Args:
+            key: Coalescing key (e.g. Notion page id)
+            payload: Latest event data passed to the handler
+
+        Returns:
+            True if a new handler call was scheduled, False if coalesced
+        """
+        self.received += 1
+        now = time.monotonic()
+        entry = self._pending.get(key)
+
+        if entry:
+            self.coalesced += 1
+            entry["payload"] = payload
+            entry["deadline"] = now + self.window_seconds
+            if self.max_wait_seconds is not None:
+                entry["deadline"] = min(entry["deadline"], entry["first_seen"] + self.max_wait_seconds)
+            return False
+
+        entry = {
+            "payload": payload,
+            "first_seen": now,
+            "deadline": now + self.window_seconds,
+        }
+        self._pending[key] = entry
+        task = asyncio.get_running_loop().create_task(self._run(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, key: str):
+        entry = self._pending[key]
+        while True:
+            delay = entry["deadline"] - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        # Events arriving from now on schedule a new call
+        self._pending.pop(key, None)
+
+        started = time.monotonic()
+        try:
+            if inspect.iscoroutinefunction(self.handler):
+                await self.handler(key, entry["payload"])
+            else:
+                await asyncio.to_thread(self.handler, key, entry["payload"])
+            self.executed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error("%s: handler failed for %s: %s", self.name, key, e, exc_info=True)
+        finally:
+            self.handler_seconds += time.monotonic() - started
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def flush(self):
+        """Wait for every scheduled or running handler call to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for monitoring.
+
+        ``coalescing_ratio`` is the share of received events absorbed into an
+        already scheduled call; throughput figures are averaged since creation.
+        """
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        completed = self.executed + self.failed
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "executed": self.executed,
+            "failed": self.failed,
+            "pending": self.pending,
+            "coalescing_ratio": round(self.coalesced / self.received, 4) if self.received else 0.0,
+            "events_per_second": round(self.received / uptime, 4),
+            "executions_per_second": round(completed / uptime, 4),
+            "avg_handler_seconds": round(self.handler_seconds / completed, 4) if completed else 0.0,
+        }
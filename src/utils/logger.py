@@ -1,31 +1,139 @@
-"""Logging configuration."""
+"""Logging configuration.
+
+The calling thread only merges a record's arguments into its message and
+puts it on a queue; a listener thread adds the JSON/text layout, redacts and
+writes to stdout, so handling a message never waits on formatting or I/O.
+Call sites pass arguments instead of f-strings
+(``logger.debug("Payload: %s", payload)``) so disabled levels cost nothing,
+and bursts of identical INFO/DEBUG records are sampled.
+"""
+import atexit
+import copy
 import logging
+import queue
+import random
+import re
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Tuple
+
 from pythonjsonlogger import jsonlogger
 
 from src.config.settings import settings
+from src.utils.tracing import TraceContextFilter
 
 
-def setup_logger(name: str = "pangeia_agent") -> logging.Logger:
+# Phone numbers (WhatsApp ids included), e-mails and credentials in log output
+_PHONE = re.compile(r"(?<![\w.*-])\+?\d{6,11}(\d{4})(?![\w.-])")
+_EMAIL = re.compile(r"[\w.+-]+@([\w-]+\.[\w.-]+)")
+_SECRET = re.compile(r"\b(?:sk-[\w-]{16,}|secret_\w{20,}|ntn_\w{20,}|xox[abprs]-[\w-]{10,})")
+_BEARER = re.compile(r"(Bearer\s+)[\w.~+/=-]+", re.IGNORECASE)
+_SECRET_FIELD = re.compile(
+    r"""((?:api_?key|token|authorization|password|secret)["']?\s*[:=]\s*["']?)[^\s"',}]+""",
+    re.IGNORECASE
+)
+
+
+def redact(text: str) -> str:
     """
-    Setup and configure logger.
+    Mask personal data and credentials in a log line.
+
+    Phone numbers keep their last four digits, e-mails their domain.
 
     Args:
-        name: Logger name
+        text: Formatted log line
 
     Returns:
-        Configured logger instance
+        Redacted line
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
+    text = _PHONE.sub(lambda m: "*" * (len(m.group(0)) - 4) + m.group(1), text)
+    text = _EMAIL.sub(r"***@\1", text)
+    text = _SECRET.sub("[REDACTED]", text)
+    text = _BEARER.sub(r"\1[REDACTED]", text)
+    return _SECRET_FIELD.sub(r"\1[REDACTED]", text)
 
-    # Remove existing handlers
-    logger.handlers = []
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
+class RedactingFormatter(logging.Formatter):
+    """Formatter wrapper redacting the fully formatted record (message, extras, traceback)."""
+
+    def __init__(self, inner: logging.Formatter):
+        super().__init__()
+        self.inner = inner
+
+    def format(self, record: logging.LogRecord) -> str:
+        return redact(self.inner.format(record))
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps the first ``burst`` INFO/DEBUG records per call site and window,
+    then only a ``rate`` fraction of them. Warnings and errors always pass.
+    """
+
+    MAX_KEYS = 10000
+
+    def __init__(self, burst: int, rate: float, window_seconds: float = 1.0):
+        super().__init__()
+        self.burst = burst
+        self.rate = rate
+        self.window_seconds = window_seconds
+        self.sampled_out = 0
+        self._windows: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                if len(self._windows) >= self.MAX_KEYS:
+                    self._windows.clear()
+                window = self._windows[key] = [now, 0]
+            window[1] += 1
+            if window[1] <= self.burst or random.random() < self.rate:
+                return True
+            self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that does not block the calling thread.
+
+    Only the message is rendered before queueing, so arguments (mutable
+    objects, ORM instances bound to this thread's session) are never read by
+    the listener; layout and redaction happen there. When the queue is full
+    the record is dropped and counted instead of blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
 
+# Listener thread per configured logger
+_listeners: Dict[str, QueueListener] = {}
+
+
+def _formatter() -> logging.Formatter:
     # JSON formatter for production
     if not settings.DEBUG:
         formatter = jsonlogger.JsonFormatter(
@@ -39,11 +147,70 @@ def setup_logger(name: str = "pangeia_agent") -> logging.Logger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
 
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    if settings.LOG_REDACT_PII:
+        return RedactingFormatter(formatter)
+    return formatter
+
 
+def setup_logger(name: str = "pangeia_agent") -> logging.Logger:
+    """
+    Setup and configure logger.
+
+    Args:
+        name: Logger name
+
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+    level = getattr(logging, settings.LOG_LEVEL.upper())
+    logger.setLevel(level)
+
+    # Remove existing handlers
+    shutdown_logging(name)
+    logger.handlers = []
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
+    console_handler.setFormatter(_formatter())
+
+    if settings.LOG_ASYNC:
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        handler: logging.Handler = NonBlockingQueueHandler(log_queue)
+        listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+    else:
+        handler = console_handler
+
+    # Filters run on the calling thread: sampling first, so dropped records cost least
+    if settings.LOG_SAMPLE_RATE < 1.0:
+        handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_BURST, settings.LOG_SAMPLE_RATE))
+    # trace_id/span_id of the active span, for correlating logs with traces
+    handler.addFilter(TraceContextFilter())
+
+    logger.addHandler(handler)
     return logger
 
 
+def shutdown_logging(name: str = "pangeia_agent") -> None:
+    """
+    Stop a logger's listener thread after writing out queued records.
+
+    Args:
+        name: Logger name
+    """
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    for name in list(_listeners):
+        shutdown_logging(name)
+
+
 # Global logger instance
 logger = setup_logger()
@@ -0,0 +1,224 @@
+"""Event-loop watchdog.
+
+Much of what the async handlers call is synchronous (OpenAI, ``requests``,
+Notion, database drivers). While such a call runs on the event loop, no other
+request, webhook ack or timer makes progress. The watchdog finds those calls:
+
+* a heartbeat callback on the loop re-arms itself every ``interval`` and
+  records how late it ran (``pangeia_event_loop_lag_seconds``);
+* a monitor thread checks the heartbeat and, once it is overdue by more than
+  ``threshold``, captures the loop thread's stack. The innermost public
+  function of our own code (e.g. ``EvolutionAPIClient.send_text_message``
+  rather than its ``_send`` helper) is the culprit; the innermost frame
+  overall is the blocking call itself;
+* when the heartbeat runs again the block is reported: counted per culprit
+  in ``pangeia_event_loop_blocks_total`` and
+  ``pangeia_event_loop_blocked_seconds_total``, and logged with its stack, at
+  most once per culprit per ``log_interval`` (repeats are counted in the
+  next log line).
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+from src.utils.logger import logger
+from src.utils.metrics import event_loop_blocked_seconds, event_loop_blocks, event_loop_lag
+from src.utils.profiler import format_frame
+
+
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+# Frames logged per block, innermost last
+STACK_DEPTH = 15
+# Distinct culprit labels before the rest are counted as "other"
+MAX_CULPRITS = 200
+UNKNOWN = "unknown"
+
+
+def _is_own_code(frame: Any) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.startswith(SRC_ROOT) and filename != __file__
+
+
+def _qualname(frame: Any) -> str:
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+class LoopWatchdog:
+    """Detects callbacks blocking the event loop and reports what blocked it."""
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        interval: Optional[float] = None,
+        log_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the watchdog.
+
+        Args:
+            threshold: Seconds the heartbeat may be overdue before a block is reported
+            interval: Heartbeat period in seconds
+            log_interval: Minimum seconds between two logs for the same culprit
+        """
+        self.threshold = settings.LOOP_WATCHDOG_THRESHOLD_SECONDS if threshold is None else threshold
+        self.interval = settings.LOOP_WATCHDOG_INTERVAL_SECONDS if interval is None else interval
+        self.log_interval = settings.LOOP_WATCHDOG_LOG_INTERVAL_SECONDS if log_interval is None else log_interval
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Loop time the next heartbeat is due; written by the loop, read by the monitor
+        self._due = 0.0
+        # Stack captured by the monitor for the current block: (due, culprit, call, stack)
+        self._capture: Optional[tuple] = None
+
+        self._last_logged: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._culprits: set = set()
+        self.recent: "deque[Dict[str, Any]]" = deque(maxlen=20)
+        self.heartbeats = 0
+        self.blocks = 0
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._monitor is not None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start watching a loop (idempotent).
+
+        Args:
+            loop: Loop to watch (default: the running loop); must be called
+                from the loop's thread
+        """
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._schedule()
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+        logger.info(
+            "Event-loop watchdog started (threshold %.0fms, heartbeat %.0fms)",
+            self.threshold * 1000, self.interval * 1000,
+        )
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """Stop the heartbeat and the monitor thread."""
+        monitor, self._monitor = self._monitor, None
+        if monitor is None:
+            return
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        monitor.join(timeout)
+
+    # --- On the event loop ----------------------------------------------------
+
+    def _schedule(self) -> None:
+        self._due = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(self._due, self._heartbeat)
+
+    def _heartbeat(self) -> None:
+        lag = max(0.0, self._loop.time() - self._due)
+        self.heartbeats += 1
+        self.max_lag = max(self.max_lag, lag)
+        event_loop_lag.observe(lag)
+
+        capture, self._capture = self._capture, None
+        if lag > self.threshold:
+            self._report(lag, capture if capture and capture[0] == self._due else None)
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _report(self, lag: float, capture: Optional[tuple]) -> None:
+        _, culprit, call, stack = capture or (None, UNKNOWN, UNKNOWN, [])
+        label = self._label(culprit)
+        self.blocks += 1
+        self.blocked_seconds += lag
+        event_loop_blocks.labels(culprit=label).inc()
+        event_loop_blocked_seconds.labels(culprit=label).inc(lag)
+        self.recent.append({
+            "at": time.time(),
+            "blocked_seconds": round(lag, 4),
+            "culprit": culprit,
+            "call": call,
+            "stack": stack,
+        })
+
+        now = time.monotonic()
+        if now - self._last_logged.get(culprit, float("-inf")) < self.log_interval:
+            self._suppressed[culprit] = self._suppressed.get(culprit, 0) + 1
+            return
+        self._last_logged[culprit] = now
+        suppressed = self._suppressed.pop(culprit, 0)
+        logger.warning(
+            "Event loop blocked for %.0fms by %s in %s (%d more since last report)\n  %s",
+            lag * 1000, culprit, call, suppressed, "\n  ".join(stack) or "(stack not captured)",
+        )
+
+    def _label(self, culprit: str) -> str:
+        if culprit in self._culprits:
+            return culprit
+        if len(self._culprits) >= MAX_CULPRITS:
+            return "other"
+        self._culprits.add(culprit)
+        return culprit
+
+    # --- On the monitor thread --------------------------------------------------
+
+    def _watch(self) -> None:
+        check_every = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(check_every):
+            due = self._due
+            if self._capture is not None and self._capture[0] == due:
+                continue  # this block is already captured
+            if self._loop.time() - due > self.threshold:
+                capture = self._capture_stack(due)
+                # Keep it only if the loop is still stuck on the same heartbeat
+                if capture is not None and self._due == due:
+                    self._capture = capture
+
+    def _capture_stack(self, due: float) -> Optional[tuple]:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+
+        frames: List[Any] = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        # frames[0] is the innermost
+        own = [f for f in frames if _is_own_code(f)]
+        public = [f for f in own if not f.f_code.co_name.startswith("_")]
+        culprit = _qualname((public or own or frames)[0])
+        stack = [format_frame(f) for f in reversed(frames[:STACK_DEPTH])]
+        return due, culprit, format_frame(frames[0]), stack
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "running": int(self.running),
+            "heartbeats": self.heartbeats,
+            "blocks": self.blocks,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "max_lag_seconds": round(self.max_lag, 4),
+        }
+
+
+# Global watchdog instance
+loop_watchdog = LoopWatchdog()
@@ -21,10 +21,10 @@ class MessageHumanizer:
                 data = yaml.safe_load(f)
                 return data or {}
         except FileNotFoundError:
-            logger.warning(f"Response templates not found at {path}")
+            logger.warning("Response templates not found at %s", path)
             return {}
         except yaml.YAMLError as exc:
-            logger.error(f"Could not parse response templates: {exc}")
+            logger.error("Could not parse response templates: %s", exc)
             return {}
 
     def _choose_template(self, category: str) -> Optional[str]:
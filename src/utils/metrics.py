@@ -0,0 +1,361 @@
+"""Prometheus metrics.
+
+Latency histograms for each stage a WhatsApp message goes through (webhook
+ack, command matching, OpenAI calls, function execution, Notion and Evolution
+API calls, database queries), event-loop lag and blocking calls, plus the
+counters the components already keep in their ``stats()`` methods, exported
+as gauges at scrape time.
+
+All metrics live in ``registry`` and are served by ``GET /metrics``.
+
+With several uvicorn workers (WEB_CONCURRENCY > 1) each process has its own
+values, so a scrape would only see the worker that answered. Set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable directory shared by the
+workers (cleared at every start): prometheus_client then keeps the values in
+files there and ``render()`` aggregates all workers. Component stats are then
+labelled with the worker ``pid``, and the process/platform collectors, which
+only describe the answering process, are left out.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,  # noqa: F401  (content type of render(), used by /metrics)
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    PlatformCollector,
+    ProcessCollector,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+
+from src.utils.logger import logger
+
+
+NAMESPACE = "pangeia"
+
+# Read by prometheus_client when it is imported, so fixed for the process lifetime
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+registry = CollectorRegistry()
+if not MULTIPROC_DIR:
+    ProcessCollector(registry=registry)
+    PlatformCollector(registry=registry)
+
+# Buckets (seconds) for remote APIs, whose latency spans ms to tens of seconds
+API_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+# Buckets (seconds) for database statements
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Buckets (seconds) for event-loop lag, healthy well under 10ms
+LOOP_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response is started (webhook ack time)",
+    ["method", "route", "status"],
+    namespace=NAMESPACE,
+    registry=registry,
+)
+message_stage_duration = Histogram(
+    "message_stage_duration_seconds",
+    "Time spent in each stage of processing an incoming message",
+    ["stage", "outcome"],
+    namespace=NAMESPACE,
+    buckets=API_BUCKETS,
+    registry=registry,
+)
+llm_request_duration = Histogram(
+    "llm_request_duration_seconds",
+    "OpenAI chat completion latency, including retries",
+    ["model", "outcome"],
+    namespace=NAMESPACE,
+    buckets=API_BUCKETS,
+    registry=registry,
+)
+llm_tokens = Counter(
+    "llm_tokens",
+    "Tokens used by OpenAI chat completions",
+    ["model", "kind"],
+    namespace=NAMESPACE,
+    registry=registry,
+)
+llm_retries = Counter(
+    "llm_retries",
+    "Retried OpenAI chat completion attempts",
+    ["model", "reason"],
+    namespace=NAMESPACE,
+    registry=registry,
+)
+function_duration = Histogram(
+    "function_duration_seconds",
+    "Function executor latency per function",
+    ["function", "outcome"],
+    namespace=NAMESPACE,
+    buckets=API_BUCKETS,
+    registry=registry,
+)
+notion_request_duration = Histogram(
+    "notion_request_duration_seconds",
+    "Notion API call latency per endpoint, including rate-limit waits and retries",
+    ["endpoint", "outcome"],
+    namespace=NAMESPACE,
+    buckets=API_BUCKETS,
+    registry=registry,
+)
+notion_retries = Counter(
+    "notion_retries",
+    "Notion API calls retried after HTTP 429",
+    ["endpoint"],
+    namespace=NAMESPACE,
+    registry=registry,
+)
+evolution_request_duration = Histogram(
+    "evolution_request_duration_seconds",
+    "Evolution API (WhatsApp) call latency",
+    ["operation", "outcome"],
+    namespace=NAMESPACE,
+    buckets=API_BUCKETS,
+    registry=registry,
+)
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran the watchdog heartbeat",
+    namespace=NAMESPACE,
+    buckets=LOOP_BUCKETS,
+    registry=registry,
+)
+event_loop_blocks = Counter(
+    "event_loop_blocks",
+    "Callbacks that blocked the event loop past the watchdog threshold, by blocking function",
+    ["culprit"],
+    namespace=NAMESPACE,
+    registry=registry,
+)
+event_loop_blocked_seconds = Counter(
+    "event_loop_blocked_seconds",
+    "Time the event loop spent blocked past the watchdog threshold, by blocking function",
+    ["culprit"],
+    namespace=NAMESPACE,
+    registry=registry,
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ["engine", "statement"],
+    namespace=NAMESPACE,
+    buckets=DB_BUCKETS,
+    registry=registry,
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """
+    Observe the duration of a block, labelled ``outcome=success|error``.
+
+    Args:
+        histogram: Histogram with an ``outcome`` label
+        **labels: Remaining label values
+    """
+    started = time.perf_counter()
+    outcome = "success"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(time.perf_counter() - started)
+
+
+def render() -> bytes:
+    """Current metrics in the Prometheus text format (``CONTENT_TYPE_LATEST``)."""
+    if not MULTIPROC_DIR:
+        return generate_latest(registry)
+
+    # Counters and histograms of every worker, read from the shared directory
+    scrape = CollectorRegistry()
+    multiprocess.MultiProcessCollector(scrape, path=MULTIPROC_DIR)
+    scrape.register(component_stats)
+    return generate_latest(scrape)
+
+
+def check_worker_setup(workers: int) -> bool:
+    """
+    Warn when several workers would each export their own metrics.
+
+    Args:
+        workers: Worker processes (WEB_CONCURRENCY)
+
+    Returns:
+        Whether /metrics covers every worker
+    """
+    if workers > 1 and not MULTIPROC_DIR:
+        logger.warning(
+            "WEB_CONCURRENCY=%s without PROMETHEUS_MULTIPROC_DIR: /metrics only reports the worker that answers",
+            workers
+        )
+        return False
+    return True
+
+
+# --- Database statements ----------------------------------------------------
+
+_STATEMENT_KINDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def _statement_kind(statement: str) -> str:
+    head = statement.lstrip()[:6].upper()
+    for kind in _STATEMENT_KINDS:
+        if head.startswith(kind):
+            return kind
+    return "OTHER"
+
+
+def instrument_engine(engine: Any, name: str) -> None:
+    """
+    Record the execution time of every statement run on an engine.
+
+    Args:
+        engine: Engine (for an AsyncEngine pass ``engine.sync_engine``)
+        name: Engine label (e.g. ``sync`` or ``async``)
+    """
+    if getattr(engine, "_pangeia_metrics", False):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        db_query_duration.labels(engine=name, statement=_statement_kind(statement)).observe(
+            time.perf_counter() - started
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+    engine._pangeia_metrics = True
+
+
+# --- HTTP requests ----------------------------------------------------------
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing requests until the response starts.
+
+    For webhooks that is the ack time seen by the caller; background work
+    queued by the handler is measured separately.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        observed = False
+
+        def observe(status: int) -> None:
+            nonlocal observed
+            observed = True
+            # Route template keeps the label set bounded (never the raw path)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_duration.labels(
+                method=scope["method"], route=route, status=str(status)
+            ).observe(time.perf_counter() - started)
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and not observed:
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if not observed:
+                observe(500)
+            raise
+
+
+# --- Component stats --------------------------------------------------------
+
+class StatsCollector:
+    """Exports ``stats()`` dictionaries of registered components as gauges."""
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Export a component's counters.
+
+        Args:
+            component: Component label (e.g. ``db_jobs``)
+            stats: Callable returning a (possibly nested) dict of numbers
+        """
+        self._sources[component] = stats
+
+    def collect(self):
+        # Per-process values: tell the workers apart when they are scraped together
+        worker = [str(os.getpid())] if MULTIPROC_DIR else []
+        family = GaugeMetricFamily(
+            f"{NAMESPACE}_component_stat",
+            "Counters reported by component stats() methods",
+            labels=["component", "stat"] + (["pid"] if worker else []),
+        )
+        for component, stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                logger.warning("Metrics: stats of %s unavailable: %s", component, e)
+                continue
+            for stat, value in _flatten(values):
+                family.add_metric([component, stat] + worker, value)
+        yield family
+
+
+def _flatten(values: Dict[str, Any], prefix: str = "") -> Iterator[tuple]:
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)):
+            yield name, float(value)
+
+
+component_stats = StatsCollector()
+registry.register(component_stats)
+
+
+def register_stats(component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Shortcut for ``component_stats.register``."""
+    component_stats.register(component, stats)
+
+
+def observe_llm_usage(model: str, usage: Optional[Dict[str, Any]]) -> None:
+    """
+    Count the tokens of one chat completion.
+
+    Args:
+        model: Model name
+        usage: ``usage`` dict of the completion (prompt/completion tokens)
+    """
+    if not usage:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            llm_tokens.labels(model=model, kind=kind).inc(tokens)
@@ -0,0 +1,125 @@
+"""Canonical serialization and digests of Notion property payloads."""
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+# Property types whose value is a list of rich text fragments
+_TEXT_TYPES = ("title", "rich_text")
+# Property types whose value is a scalar
+_SCALAR_TYPES = ("number", "checkbox", "url", "email", "phone_number")
+
+
+def _plain_text(fragments: List[Dict[str, Any]]) -> str:
+    parts = []
+    for fragment in fragments or []:
+        text = fragment.get("plain_text")
+        if text is None:
+            text = (fragment.get("text") or {}).get("content", "")
+        parts.append(text or "")
+    return "".join(parts)
+
+
+def _normalize_date(value: Optional[str]) -> Optional[str]:
+    """Render ISO dates in UTC without offset so read and write forms match."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _property_type(prop: Dict[str, Any]) -> Optional[str]:
+    prop_type = prop.get("type")
+    if prop_type:
+        return prop_type
+    # Write payloads carry a single key named after the type
+    keys = [key for key in prop if key != "id"]
+    return keys[0] if len(keys) == 1 else None
+
+
+def canonical_value(prop: Any) -> Any:
+    """
+    Reduce a Notion property to the value it carries.
+
+    Read payloads (``plain_text``, annotations, ids, ``type``) and write
+    payloads (``text.content``) of the same content give the same result.
+
+    Args:
+        prop: Notion property object
+
+    Returns:
+        JSON-serializable canonical value
+    """
+    if not isinstance(prop, dict):
+        return prop
+
+    prop_type = _property_type(prop)
+    value = prop.get(prop_type) if prop_type else None
+
+    if prop_type in _TEXT_TYPES:
+        return _plain_text(value)
+    if prop_type in ("select", "status"):
+        return (value or {}).get("name")
+    if prop_type == "multi_select":
+        return sorted(option.get("name", "") for option in value or [])
+    if prop_type == "people":
+        return sorted(person.get("id") or person.get("name") or "" for person in value or [])
+    if prop_type == "relation":
+        return sorted(item.get("id", "") for item in value or [])
+    if prop_type == "date":
+        if not value:
+            return None
+        return [_normalize_date(value.get("start")), _normalize_date(value.get("end"))]
+    if prop_type in _SCALAR_TYPES:
+        return value
+
+    # Unknown types: keep the payload without volatile identifiers
+    return {key: val for key, val in prop.items() if key not in ("id", "type")}
+
+
+def canonicalize_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Canonical form of a property set: name -> canonical value.
+
+    Empty values are dropped, so an omitted property and an empty one hash
+    the same.
+
+    Args:
+        properties: Notion properties dictionary
+
+    Returns:
+        Canonical properties dictionary
+    """
+    canonical = {}
+    for name, prop in (properties or {}).items():
+        value = canonical_value(prop)
+        if value in (None, "", []):
+            continue
+        canonical[name] = value
+    return canonical
+
+
+def properties_digest(properties: Dict[str, Any]) -> str:
+    """
+    Stable SHA-256 digest of a Notion property set.
+
+    Args:
+        properties: Notion properties dictionary
+
+    Returns:
+        Hex digest (64 chars)
+    """
+    payload = json.dumps(
+        canonicalize_properties(properties),
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
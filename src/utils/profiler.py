@@ -0,0 +1,389 @@
+"""Sampling profiler and asyncio diagnostics for the admin endpoints.
+
+``SamplingProfiler`` samples the stack of every thread from its own thread
+(``sys._current_frames``) for a fixed duration. In ``wall`` mode a sample
+weighs the wall time since the previous one, so threads waiting on I/O or
+locks show up as much as busy ones; in ``cpu`` mode it weighs the CPU time
+the thread used in between, so only code that actually runs does. Profiles
+export as collapsed stacks (flamegraph.pl, speedscope, inferno) or as a
+speedscope JSON document with one profile per thread.
+
+``dump_tasks`` lists the asyncio tasks with where each is suspended and what
+it awaits, ``dump_threads`` the current stack of every thread, and
+``measure_loop_lag`` how late the event loop runs a periodic timer.
+
+Nothing runs until called, so there is no cost when not profiling.
+"""
+import asyncio
+import os
+import reprlib
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.logger import logger
+
+
+MODES = ("wall", "cpu")
+
+# (function, file, first line): samples aggregate per function, not per line
+Frame = Tuple[str, str, int]
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_PROC_TASKS = "/proc/self/task"
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# One profile at a time per process
+_profile_lock = threading.Lock()
+
+_repr = reprlib.Repr()
+_repr.maxstring = 160
+_repr.maxother = 160
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@lru_cache(maxsize=512)
+def short_path(filename: str) -> str:
+    """Path relative to the longest ``sys.path`` entry containing it."""
+    best = ""
+    for entry in sys.path:
+        root = os.path.abspath(entry or os.curdir).rstrip(os.sep) + os.sep
+        if filename.startswith(root) and len(root) > len(best):
+            best = root
+    return filename[len(best):] if best else filename
+
+
+@lru_cache(maxsize=8192)
+def _frame_key(code: Any) -> Frame:
+    return getattr(code, "co_qualname", code.co_name), short_path(code.co_filename), code.co_firstlineno
+
+
+def _stack(frame: Any) -> Tuple[Frame, ...]:
+    """Frames of a stack, outermost first."""
+    stack = []
+    while frame is not None:
+        stack.append(_frame_key(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def format_frame(frame: Any) -> str:
+    """``function (file:line)`` label of a frame at its current line."""
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({short_path(code.co_filename)}:{frame.f_lineno})"
+
+
+def _thread_cpu_seconds(native_id: int) -> Optional[float]:
+    """
+    CPU time used so far by a thread of this process (Linux only).
+
+    Args:
+        native_id: Kernel thread id (``Thread.native_id``)
+
+    Returns:
+        Seconds of CPU time, or None when the thread is gone
+    """
+    try:
+        # On-CPU nanoseconds; needs schedstats in the kernel
+        with open(f"{_PROC_TASKS}/{native_id}/schedstat") as f:
+            return int(f.read().split()[0]) / 1e9
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        # utime + stime, in clock ticks
+        with open(f"{_PROC_TASKS}/{native_id}/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the stacks of all threads at a fixed interval."""
+
+    def __init__(self, mode: str = "wall", interval: float = 0.01):
+        """
+        Initialize the profiler.
+
+        Args:
+            mode: ``wall`` (wall-clock time) or ``cpu`` (CPU time)
+            interval: Seconds between samples
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r} (expected one of {', '.join(MODES)})")
+        if mode == "cpu" and not os.path.isdir(_PROC_TASKS):
+            raise ValueError("CPU profiling needs per-thread CPU times from /proc (Linux)")
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+
+        self.mode = mode
+        self.interval = interval
+        # thread name -> stack -> weight in seconds
+        self.stacks: Dict[str, Dict[Tuple[Frame, ...], float]] = {}
+        self.samples = 0
+        self.duration = 0.0
+        self._cpu_times: Dict[int, float] = {}
+
+    def run(self, seconds: float) -> "SamplingProfiler":
+        """
+        Sample for ``seconds``, blocking the calling thread (which is not sampled).
+
+        Args:
+            seconds: Profiling duration
+
+        Returns:
+            The profiler, for chaining
+        """
+        sampler = threading.get_ident()
+        started = last = next_sample = time.perf_counter()
+        deadline = started + seconds
+        if self.mode == "cpu":
+            self._sample(0.0, sampler)  # CPU baselines; weighs nothing
+
+        while last < deadline:
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.perf_counter()  # fell behind: don't burst to catch up
+            now = time.perf_counter()
+            self._sample(now - last, sampler)
+            last = now
+
+        self.duration = last - started
+        return self
+
+    def _sample(self, elapsed: float, sampler: int) -> None:
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == sampler:
+                continue
+            thread = threads.get(ident)
+            if self.mode == "cpu":
+                weight = self._cpu_delta(thread)
+            else:
+                weight = elapsed
+            if weight <= 0:
+                continue
+            stacks = self.stacks.setdefault(thread.name if thread else f"Thread-{ident}", {})
+            stack = _stack(frame)
+            stacks[stack] = stacks.get(stack, 0.0) + weight
+        self.samples += 1
+
+    def _cpu_delta(self, thread: Optional[threading.Thread]) -> float:
+        native_id = getattr(thread, "native_id", None)
+        if native_id is None:
+            return 0.0
+        now = _thread_cpu_seconds(native_id)
+        if now is None:
+            return 0.0
+        previous = self._cpu_times.get(native_id)
+        self._cpu_times[native_id] = now
+        return 0.0 if previous is None else now - previous
+
+    def to_collapsed(self) -> str:
+        """
+        Collapsed stacks, one ``thread;outer;...;inner weight`` line per stack.
+
+        Returns:
+            Text for flamegraph.pl, inferno or speedscope; weights are microseconds
+        """
+        lines = []
+        for thread, stacks in sorted(self.stacks.items()):
+            for stack, weight in stacks.items():
+                frames = ";".join([thread] + [f"{name} ({path}:{line})" for name, path, line in stack])
+                lines.append(f"{frames} {max(1, round(weight * 1e6))}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str = "pangeia-agent") -> Dict[str, Any]:
+        """
+        Speedscope document (sampled profiles, one per thread).
+
+        Args:
+            name: Document name shown by speedscope
+
+        Returns:
+            JSON-serializable dict following the speedscope file format
+        """
+        frames: List[Dict[str, Any]] = []
+        index: Dict[Frame, int] = {}
+
+        def frame_index(frame: Frame) -> int:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            return index[frame]
+
+        profiles = []
+        for thread, stacks in sorted(self.stacks.items(), key=lambda item: -sum(item[1].values())):
+            samples = [[frame_index(frame) for frame in stack] for stack in stacks]
+            weights = list(stacks.values())
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": f"{name} ({self.mode}, {self.duration:.1f}s)",
+            "exporter": name,
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+async def profile(seconds: float, mode: str = "wall", interval: float = 0.01) -> SamplingProfiler:
+    """
+    Profile the process without blocking the event loop.
+
+    Sampling runs in a dedicated thread, not the default executor, so a long
+    profile does not hold one of the workers ``asyncio.to_thread`` relies on.
+
+    Args:
+        seconds: Profiling duration
+        mode: ``wall`` or ``cpu``
+        interval: Seconds between samples
+
+    Returns:
+        The finished profiler
+
+    Raises:
+        ProfilerBusyError: Another profile is running
+        ValueError: Invalid mode or interval
+    """
+    profiler = SamplingProfiler(mode=mode, interval=interval)
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def run() -> None:
+        try:
+            profiler.run(seconds)
+        except BaseException as e:
+            logger.error("Profiler: sampling failed: %s", e)
+            loop.call_soon_threadsafe(lambda error=e: done.done() or done.set_exception(error))
+        else:
+            loop.call_soon_threadsafe(lambda: done.done() or done.set_result(profiler))
+        finally:
+            _profile_lock.release()
+
+    logger.info("Profiler: sampling %s time for %.1fs every %.1fms", mode, seconds, interval * 1000)
+    threading.Thread(target=run, name="profiler", daemon=True).start()
+    return await done
+
+
+def dump_threads() -> Dict[str, List[str]]:
+    """
+    Current stack of every thread.
+
+    Returns:
+        Thread name -> frames, outermost first, as ``function (file:line)``
+    """
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    threads = {}
+    for ident, frame in sys._current_frames().items():
+        stack = []
+        while frame is not None:
+            stack.append(format_frame(frame))
+            frame = frame.f_back
+        threads[names.get(ident, f"Thread-{ident}")] = stack[::-1]
+    return threads
+
+
+def _awaited(coro: Any) -> Any:
+    """Innermost object a coroutine chain is suspended on (a future, usually)."""
+    awaited = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    while awaited is not None:
+        inner = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None)
+        if inner is None:
+            break
+        awaited = inner
+    return awaited
+
+
+def dump_tasks() -> List[Dict[str, Any]]:
+    """
+    Snapshot of the asyncio tasks of the running loop.
+
+    Returns:
+        One dict per task: name, coroutine, state, the frames it is suspended
+        in (outermost first) and what it awaits
+    """
+    current = asyncio.current_task()
+    tasks = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        # The future the task is parked on; the coroutine chain only reaches an iterator over it
+        awaited = getattr(task, "_fut_waiter", None) or _awaited(coro)
+        if task.done():
+            state = "done"
+        elif task is current:
+            state = "running"
+        else:
+            state = "suspended"
+        tasks.append({
+            "name": task.get_name(),
+            "coroutine": getattr(coro, "__qualname__", type(coro).__name__),
+            "state": state,
+            "cancelling": bool(getattr(task, "cancelling", lambda: 0)()),
+            "stack": [format_frame(frame) for frame in task.get_stack()],
+            "awaiting": _repr.repr(awaited) if awaited is not None else None,
+        })
+    tasks.sort(key=lambda task: (task["coroutine"], task["name"]))
+    return tasks
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure_loop_lag(seconds: float, interval: float = 0.05) -> Dict[str, Any]:
+    """
+    Measure how late the event loop wakes a periodic timer.
+
+    A healthy loop fires the timer within a millisecond or so; anything more
+    is time the loop spent running other callbacks, typically blocking calls.
+
+    Args:
+        seconds: Measurement duration
+        interval: Seconds between timer wake-ups
+
+    Returns:
+        Sample count and lag statistics (mean, p50, p90, p99, max) in seconds
+    """
+    loop = asyncio.get_running_loop()
+    lags: List[float] = []
+    deadline = loop.time() + seconds
+    while loop.time() < deadline:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+    lags.sort()
+    return {
+        "samples": len(lags),
+        "interval_seconds": interval,
+        "lag_seconds": {
+            "mean": sum(lags) / len(lags),
+            "p50": _quantile(lags, 0.5),
+            "p90": _quantile(lags, 0.9),
+            "p99": _quantile(lags, 0.99),
+            "max": lags[-1],
+        } if lags else None,
+    }
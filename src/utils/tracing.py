@@ -0,0 +1,182 @@
+"""Distributed tracing (OpenTelemetry).
+
+An incoming message produces one trace: ``process_incoming_message`` at the
+root, then ``process_with_openai``, each OpenAI call, the executed function,
+the Notion calls it makes and the WhatsApp sends. The active trace and span
+ids are added to every log record, so the log lines of one slow message can
+be found from its trace and the other way round.
+
+Tracing is optional. It is off unless TRACING_ENABLED is set, and without the
+opentelemetry packages every span is a no-op.
+"""
+import functools
+import inspect
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from src.config.settings import settings
+
+try:
+    from opentelemetry import trace
+except ModuleNotFoundError:
+    trace = None  # type: ignore
+
+# Not src.utils.logger: the logger installs TraceContextFilter from this module
+_logger = logging.getLogger("pangeia_agent")
+
+# Resolves to the configured provider once setup_tracing() has run
+_tracer = trace.get_tracer("pangeia_agent") if trace is not None else None
+_provider = None
+
+
+def _exporter(config: Any) -> Any:
+    if config.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=config.TRACING_OTLP_ENDPOINT)
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+    return ConsoleSpanExporter()
+
+
+def setup_tracing(config: Any = settings) -> bool:
+    """
+    Install the tracer provider and exporter configured by settings.
+
+    Args:
+        config: Settings object
+
+    Returns:
+        Whether spans are now exported
+    """
+    global _provider
+    if not config.TRACING_ENABLED:
+        return False
+    if _provider is not None:
+        return True
+    if trace is None:
+        _logger.warning("TRACING_ENABLED is set but opentelemetry is not installed; tracing disabled")
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        exporter = _exporter(config)
+    except ModuleNotFoundError as e:
+        _logger.warning("Tracing disabled, missing package: %s", e.name)
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(config.TRACING_SAMPLE_RATIO)),
+    )
+    # Spans are exported from a background thread, never on the request path
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _logger.info("Tracing enabled: exporter=%s", config.TRACING_EXPORTER)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans (application shutdown)."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Run a block inside a child span of the current one.
+
+    Exceptions are recorded on the span and re-raised.
+
+    Args:
+        name: Span name
+        attributes: Span attributes (None values are dropped)
+
+    Yields:
+        The span, or None when tracing is unavailable
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    clean = {key: value for key, value in (attributes or {}).items() if value is not None}
+    with _tracer.start_as_current_span(name, attributes=clean) as current:
+        yield current
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator running a function (sync or async) inside a span.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def set_attributes(current: Any, attributes: Dict[str, Any]) -> None:
+    """Set attributes on a span returned by ``span`` (no-op without tracing)."""
+    if current is None or not current.is_recording():
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value)
+
+
+def add_event(name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Add an event (e.g. a retry) to the current span."""
+    if trace is None:
+        return
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.add_event(name, attributes=attributes or {})
+
+
+def current_trace_ids() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Ids of the active span.
+
+    Returns:
+        (trace_id, span_id) as hex strings, or (None, None) outside a trace
+    """
+    if trace is None:
+        return None, None
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid:
+        return None, None
+    return format(context.trace_id, "032x"), format(context.span_id, "016x")
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds ``trace_id`` and ``span_id`` to records logged inside a span."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id, span_id = current_trace_ids()
+        if trace_id is not None:
+            record.trace_id = trace_id
+            record.span_id = span_id
+        return True
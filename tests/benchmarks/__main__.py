@@ -0,0 +1,55 @@
+"""
+Run the text pipeline benchmarks against the stored JSON baseline.
+
+Usage:
+    python -m tests.benchmarks                  # fail on a >25% regression
+    python -m tests.benchmarks --threshold 10   # stricter gate
+    python -m tests.benchmarks --save           # record a new baseline
+
+Baselines are pytest-benchmark JSON files in ``tests/benchmarks/baselines``,
+one directory per platform and interpreter (timings only compare on the same
+kind of machine). Record one on the CI runner before gating on it; without a
+baseline for the platform the run only reports. The gate compares each
+benchmark's fastest round, the statistic least affected by a noisy host.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import get_machine_id
+
+
+BENCHMARKS = Path(__file__).resolve().parent
+BASELINES = BENCHMARKS / "baselines"
+
+
+def main(argv=None) -> int:
+    """Parse arguments and run pytest with the benchmark options."""
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=int, default=25, choices=range(1, 100), metavar="1-99",
+                        help="allowed regression, in percent")
+    parser.add_argument("--compare", metavar="RUN", default="", help="baseline run id to compare with (default: latest)")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    options = [
+        str(BENCHMARKS),
+        "--benchmark-only",
+        f"--benchmark-storage=file://{BASELINES}",
+        "--benchmark-columns=min,median,mean,stddev,rounds",
+        "--benchmark-sort=name",
+    ]
+    if args.save:
+        options.append("--benchmark-save=baseline")
+    elif args.compare or any((BASELINES / get_machine_id()).glob("*.json")):
+        options.append(f"--benchmark-compare={args.compare}" if args.compare else "--benchmark-compare")
+        options.append(f"--benchmark-compare-fail=min:{args.threshold}%")
+    else:
+        print(f"No baseline for {get_machine_id()} in {BASELINES}; reporting only (record one with --save)")
+
+    return pytest.main(options + pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Fixtures for the text pipeline benchmarks.
+"""
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from tests.benchmarks.corpus import TASK_DATABASE_ID, notion_database, single_quoted_intents
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="session")
+def command_matcher(tmp_path_factory):
+    """CommandMatcher loaded with the production intents."""
+    from src.ai.command_matcher import CommandMatcher
+
+    intents = tmp_path_factory.mktemp("intents") / "intents.yaml"
+    intents.write_text(single_quoted_intents((ROOT / "config" / "intents.yaml").read_text(encoding="utf-8")), encoding="utf-8")
+    matcher = CommandMatcher(str(intents))
+    assert matcher.intents, "no intents loaded"
+    return matcher
+
+
+@pytest.fixture(scope="session")
+def message_humanizer():
+    """MessageHumanizer with the production templates."""
+    from src.utils.message_humanizer import MessageHumanizer
+
+    return MessageHumanizer(str(ROOT / "config" / "response_templates.yaml"))
+
+
+@pytest.fixture
+def notion_task_reader():
+    """NotionTaskReader whose database schema is already resolved (steady state)."""
+    from src.integrations.notion_tasks import NotionTaskReader
+
+    reader = NotionTaskReader()
+    reader.client = Mock()
+    reader.client.databases.retrieve.return_value = notion_database()
+    reader.db_id = TASK_DATABASE_ID
+    reader.schema.get(TASK_DATABASE_ID)
+    return reader
@@ -0,0 +1,180 @@
+"""
+Benchmark corpus: Portuguese WhatsApp messages, LLM replies and Notion pages.
+
+The messages mirror what users actually send the bot (commands in several
+phrasings, written numbers, accents, emojis, chit-chat and long dictated
+notes); the replies include the function-call leakage formats the cleaners
+exist for; the Notion pages carry every property the task reader parses.
+"""
+import copy
+import re
+from typing import Any, Dict, List
+
+
+MESSAGES: List[str] = [
+    "minhas tarefas",
+    "quais são minhas tarefas pra hoje?",
+    "Mostrar tarefas pendentes",
+    "ver minhas tarefas em andamento",
+    "listar tarefas concluídas por favor",
+    "criar tarefa: revisar contrato com o fornecedor",
+    "Adicionar tarefa ligar pro cliente da Bahia amanhã às 10h",
+    "nova tarefa enviar relatório semanal até sexta",
+    "anota aí: comprar cartucho de impressora",
+    "terminei a tarefa três",
+    "concluí a dois e a cinco",
+    "marcar 1, 2 e 4 como feitas",
+    "feito a número sete",
+    "comecei a tarefa quatro",
+    "estou fazendo a um e a nove",
+    "em andamento: tarefa seis",
+    "como está meu progresso?",
+    "quanto eu já fiz essa semana",
+    "progresso",
+    "ajuda",
+    "o que você consegue fazer?",
+    "Oi! Bom dia 😊",
+    "boa tarde, tudo bem?",
+    "obrigado!! 🙏🙏",
+    "valeu, até amanhã",
+    "Preciso organizar a reunião de equipe, conferir as notas fiscais de outubro, "
+    "responder os e-mails pendentes do jurídico e ainda publicar o post no Instagram "
+    "antes das 18h. Consegue criar essas tarefas pra mim e me lembrar às 17h?",
+    "me lembra de pagar o boleto do aluguel dia dez às nove da manhã",
+    "muda a prioridade da tarefa oito para alta",
+    "qual o prazo da apresentação do trimestre?",
+    "ÉÉÉ finalmente terminei tudo!!! 🎉🎉",
+    "tarefa 12 concluída, tarefa 13 em andamento",
+    "Sincronizar com o Notion",
+    "cria uma categoria Financeiro 💰",
+    "coloca a tarefa dois na categoria Marketing",
+    "não entendi, pode repetir?",
+    "123",
+    "",
+    "   ",
+    "Você pode me mandar a lista de novo? Não recebi a última mensagem, acho que "
+    "o WhatsApp travou aqui. Obrigado desde já e desculpa o incômodo!",
+    "duas tarefas novas: atualizar a planilha de custos e agendar a manutenção do servidor",
+]
+
+LLM_RESPONSES: List[str] = [
+    "Oi, Ana! 😊 Aqui estão suas tarefas de hoje:\n\n1. Revisar contrato ⏳\n2. Enviar relatório ✅",
+    "Pronto! ✅ Criei a tarefa \"Revisar contrato com o fornecedor\" para você.",
+    '=create_task>{"title": "Ligar para o cliente da Bahia", "priority": "high"}',
+    'Vou criar isso agora.\n<function=create_task>{"title": "Enviar relatório semanal"}</function>\nFeito! 🆕',
+    'Claro! =mark_done>{"task_numbers": [1, 2, 4]}\nMarquei como concluídas 🎉🎉',
+    "<view_tasks> Deixa eu ver suas tarefas...",
+    "Você concluiu 7 de 10 tarefas (70%). Continue assim! 🚀🚀 Falta pouco 💪",
+    "Bom dia! 😊☀️ Como posso ajudar hoje?",
+    "Perfeito, já atualizei a prioridade da tarefa 8 para Alta 🔥 e avisei o time no Slack 📣.",
+    '<function=set_reminder>{"task_number": 3,\n "reminder_datetime": "2026-10-20T17:00:00"}</function>',
+    "Entendi! Vou te lembrar às 17h. ⏰ Enquanto isso, que tal começar pela reunião de equipe? 😊",
+    "",
+    "Sem tarefas pendentes por aqui 🎉 Aproveite o resto do dia!\n\n\n\nAté amanhã 👋",
+    "📋 Suas tarefas:\n" + "\n".join(
+        f"{i}. Tarefa de exemplo número {i} com uma descrição um pouco mais longa ({'⏳' if i % 2 else '✅'})"
+        for i in range(1, 16)
+    ),
+]
+
+# Replies long enough to be split for WhatsApp
+LONG_REPLIES: List[str] = [reply for reply in LLM_RESPONSES if len(reply) > 160] + [
+    " ".join(MESSAGES) * 2,
+    "Resumo da semana: " + " ".join(
+        f"Tarefa {i} '{title}' está {status}." for i, (title, status) in enumerate(
+            [("Revisar contrato", "concluída"), ("Enviar relatório", "em andamento"),
+             ("Atualizar planilha", "a fazer"), ("Preparar apresentação", "atrasada")] * 6, 1
+        )
+    ),
+]
+
+# config/intents.yaml writes regexes in double quotes ("\b..."), which YAML
+# rejects, so the matcher loads no intents from it; the benchmark matches
+# against the same patterns single-quoted, as the file intends.
+_DOUBLE_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+def single_quoted_intents(source: str) -> str:
+    """Rewrite the double-quoted scalars of an intents file as single-quoted."""
+    return _DOUBLE_QUOTED.sub(lambda m: "'" + m.group(1).replace("'", "''") + "'", source)
+
+
+TASK_DATABASE_ID = "bench-tasks-db"
+
+TASK_SCHEMA: Dict[str, Dict[str, Any]] = {
+    "Nome": {"id": "title", "type": "title"},
+    "Status": {"id": "s%3Ast", "type": "status"},
+    "Prioridade": {"id": "p%3Apr", "type": "select"},
+    "Progresso": {"id": "p%3Apg", "type": "number"},
+    "Esforço": {"id": "e%3Aes", "type": "number"},
+    "Prazo": {"id": "d%3Apz", "type": "date"},
+    "Descrição": {"id": "d%3Ade", "type": "rich_text"},
+    "Categoria": {"id": "c%3Aca", "type": "select"},
+    "Tags": {"id": "t%3Atg", "type": "multi_select"},
+    "Responsável": {"id": "r%3Ars", "type": "people"},
+}
+
+_TITLES = [
+    "Revisar contrato com fornecedor", "Enviar relatório semanal", "Atualizar planilha de custos",
+    "Preparar apresentação do trimestre", "Ligar para o cliente da Bahia", "Organizar reunião de equipe",
+    "Conferir notas fiscais", "Responder e-mails pendentes", "Publicar post no Instagram",
+]
+_STATUSES = ["Não iniciado", "Em andamento", "Concluído"]
+_PRIORITIES = ["Alta", "Média", "Baixa"]
+_PEOPLE = ["Ana Souza", "Bruno Lima", "Carla Mendes", "Estevão"]
+
+
+def _text(content: str) -> List[Dict[str, Any]]:
+    return [{
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {"bold": False, "italic": False, "strikethrough": False,
+                        "underline": False, "code": False, "color": "default"},
+        "plain_text": content,
+        "href": None,
+    }]
+
+
+def notion_task_page(index: int) -> Dict[str, Any]:
+    """A task page as returned by ``databases.query``, all properties set."""
+    def prop(name: str, value: Any) -> Dict[str, Any]:
+        return {"id": TASK_SCHEMA[name]["id"], "type": TASK_SCHEMA[name]["type"], TASK_SCHEMA[name]["type"]: value}
+
+    people = _PEOPLE[index % len(_PEOPLE)], _PEOPLE[(index + 1) % len(_PEOPLE)]
+    return {
+        "object": "page",
+        "id": f"1a2b3c4d-0000-4000-8000-{index:012d}",
+        "created_time": "2026-10-01T12:00:00.000Z",
+        "last_edited_time": "2026-10-18T09:30:00.000Z",
+        "archived": False,
+        "parent": {"type": "database_id", "database_id": TASK_DATABASE_ID},
+        "properties": {
+            "Nome": prop("Nome", _text(f"{_TITLES[index % len(_TITLES)]} #{index}")),
+            "Status": prop("Status", {"id": "s1", "name": _STATUSES[index % 3], "color": "blue"}),
+            "Prioridade": prop("Prioridade", {"id": "p1", "name": _PRIORITIES[index % 3], "color": "red"}),
+            "Progresso": prop("Progresso", round((index % 11) / 10, 1)),
+            "Esforço": prop("Esforço", (index % 8) + 1),
+            "Prazo": prop("Prazo", {"start": f"2026-11-{(index % 28) + 1:02d}", "end": None, "time_zone": None}),
+            "Descrição": prop("Descrição", _text("Detalhes combinados na reunião de segunda; ver anexo no Drive.")),
+            "Categoria": prop("Categoria", {"id": "c1", "name": ["Financeiro", "Marketing", "Operações"][index % 3]}),
+            "Tags": prop("Tags", [{"id": "t1", "name": "cliente"}, {"id": "t2", "name": "urgente"}][: index % 3]),
+            "Responsável": prop("Responsável", [
+                {"object": "user", "id": f"user-{name}", "name": name, "type": "person"} for name in people
+            ]),
+        },
+        "url": f"https://www.notion.so/bench-{index}",
+    }
+
+
+def notion_task_pages(count: int = 100) -> List[Dict[str, Any]]:
+    """``count`` distinct task pages."""
+    return [notion_task_page(index) for index in range(1, count + 1)]
+
+
+def notion_database() -> Dict[str, Any]:
+    """The tasks database as returned by ``databases.retrieve``."""
+    return {
+        "object": "database",
+        "id": TASK_DATABASE_ID,
+        "properties": {name: {"name": name, **copy.deepcopy(prop)} for name, prop in TASK_SCHEMA.items()},
+    }
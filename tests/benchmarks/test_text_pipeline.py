@@ -0,0 +1,103 @@
+"""
+Micro-benchmarks for the CPU-side message text pipeline.
+
+Each benchmark runs one hot function over the whole corpus per round, so the
+reported times are per corpus pass. Run and compare against the stored
+baseline with ``python -m tests.benchmarks`` (see ``__main__.py``).
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.api.webhooks import clean_response_text, enforce_emoji_policy, parse_text_function_call  # noqa: E402
+from src.ai.conversation_manager import conversation_manager  # noqa: E402
+from src.utils.text_normalizer import TextNormalizer  # noqa: E402
+from tests.benchmarks.corpus import LLM_RESPONSES, LONG_REPLIES, MESSAGES, notion_task_pages  # noqa: E402
+
+
+class TestCommandMatchingBenchmarks:
+    """Benchmarks for command matching and text normalization"""
+
+    @pytest.mark.benchmark(group="command_match")
+    def test_command_matcher_match(self, benchmark, command_matcher):
+        """Benchmark CommandMatcher.match over the message corpus"""
+        results = benchmark(lambda: [command_matcher.match(message) for message in MESSAGES])
+
+        assert any(result and result["function"] == "view_tasks" for result in results)
+
+    @pytest.mark.benchmark(group="normalize")
+    def test_remove_accents(self, benchmark):
+        """Benchmark TextNormalizer.remove_accents over the message corpus"""
+        results = benchmark(lambda: [TextNormalizer.remove_accents(message) for message in MESSAGES])
+
+        assert "quais sao minhas tarefas pra hoje?" in results
+
+    @pytest.mark.benchmark(group="normalize")
+    def test_convert_written_numbers(self, benchmark):
+        """Benchmark TextNormalizer.convert_written_numbers over the message corpus"""
+        results = benchmark(lambda: [TextNormalizer.convert_written_numbers(message) for message in MESSAGES])
+
+        assert "terminei a tarefa 3" in results
+
+
+class TestResponseBenchmarks:
+    """Benchmarks for LLM reply post-processing"""
+
+    @pytest.mark.benchmark(group="response")
+    def test_clean_response_text(self, benchmark):
+        """Benchmark clean_response_text over the reply corpus"""
+        results = benchmark(lambda: [clean_response_text(reply) for reply in LLM_RESPONSES])
+
+        assert not any("=create_task>" in result or "<function=" in result for result in results)
+
+    @pytest.mark.benchmark(group="response")
+    def test_parse_text_function_call(self, benchmark):
+        """Benchmark parse_text_function_call over the reply corpus"""
+        results = benchmark(lambda: [parse_text_function_call(reply) for reply in LLM_RESPONSES])
+
+        assert {result["name"] for result in results if result} >= {"create_task", "mark_done", "set_reminder"}
+
+    @pytest.mark.benchmark(group="response")
+    def test_enforce_emoji_policy(self, benchmark):
+        """Benchmark enforce_emoji_policy with a 20-message assistant history"""
+        user_id = "benchmark-user"
+        messages = conversation_manager.get_or_create_conversation(user_id)
+        for reply in LLM_RESPONSES[:20]:
+            messages.append({"role": "assistant", "content": reply})
+
+        try:
+            results = benchmark(lambda: [enforce_emoji_policy(user_id, reply) for reply in LLM_RESPONSES])
+        finally:
+            conversation_manager.conversations.pop(user_id, None)
+
+        assert len(results) == len(LLM_RESPONSES)
+
+    @pytest.mark.benchmark(group="response")
+    def test_chunk_long_message(self, benchmark, message_humanizer):
+        """Benchmark MessageHumanizer.chunk_long_message over long replies"""
+        results = benchmark(lambda: [message_humanizer.chunk_long_message(reply) for reply in LONG_REPLIES])
+
+        assert all(len(chunk) <= 160 for chunks in results for chunk in chunks)
+
+
+class TestNotionBenchmarks:
+    """Benchmarks for Notion task parsing and formatting"""
+
+    PAGES = notion_task_pages(100)
+
+    @pytest.mark.benchmark(group="notion")
+    def test_parse_task_page(self, benchmark, notion_task_reader):
+        """Benchmark NotionTaskReader._parse_task_page over 100 pages"""
+        tasks = benchmark(lambda: [notion_task_reader._parse_task_page(page) for page in self.PAGES])
+
+        assert tasks[0]["title"] == "Enviar relatório semanal #1"
+        assert tasks[0]["assignees"] == ["Bruno Lima", "Carla Mendes"]
+
+    @pytest.mark.benchmark(group="notion")
+    def test_format_for_groq(self, benchmark, notion_task_reader):
+        """Benchmark NotionTaskReader.format_for_groq for 100 parsed tasks"""
+        tasks = [notion_task_reader._parse_task_page(page) for page in self.PAGES]
+
+        formatted = benchmark(notion_task_reader.format_for_groq, tasks)
+
+        assert formatted.count("Responsável:") == 100
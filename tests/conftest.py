@@ -0,0 +1,14 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    """Isolate tests from values cached by previous tests."""
+    from src.utils.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
@@ -0,0 +1,80 @@
+"""
+Run a load test against the app with all external APIs faked locally.
+
+Usage:
+    python -m tests.load --rate 20 --duration 30
+    python -m tests.load --messages 200 --notion-rate-limit 0.1 --json report.json
+    python -m tests.load --rate 50 --env NOTION_RATE_LIMIT_PER_SECOND=20
+"""
+import argparse
+import json
+import sys
+
+from tests.load.harness import LoadProfile, format_report, run_load_test
+
+
+def _env_pair(value: str):
+    key, sep, setting = value.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {value!r}")
+    return key, setting
+
+
+def main(argv=None) -> int:
+    """Parse arguments, run the load test and print the report."""
+    parser = argparse.ArgumentParser(prog="python -m tests.load", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, default=10.0, help="incoming messages per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of traffic")
+    parser.add_argument("--messages", type=int, help="exact number of messages (overrides --duration)")
+    parser.add_argument("--users", type=int, default=50, help="distinct WhatsApp senders")
+    parser.add_argument("--arrival", choices=("poisson", "uniform"), default="poisson")
+    parser.add_argument("--openai-latency", type=float, default=0.3, help="fake OpenAI latency (s)")
+    parser.add_argument("--openai-jitter", type=float, default=0.2, help="fake OpenAI extra random latency (s)")
+    parser.add_argument("--notion-latency", type=float, default=0.1, help="fake Notion latency (s)")
+    parser.add_argument("--notion-jitter", type=float, default=0.05, help="fake Notion extra random latency (s)")
+    parser.add_argument("--notion-rate-limit", type=float, default=0.0, help="fraction of Notion requests answered 429")
+    parser.add_argument("--notion-pages", type=int, default=150, help="pages in the fake Notion tasks database")
+    parser.add_argument("--evolution-latency", type=float, default=0.05, help="fake Evolution API latency (s)")
+    parser.add_argument("--evolution-jitter", type=float, default=0.02, help="fake Evolution API extra random latency (s)")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="seconds to wait for outstanding replies")
+    parser.add_argument("--database-url", help="app database (default: a temporary SQLite file)")
+    parser.add_argument("--env", type=_env_pair, action="append", default=[], metavar="KEY=VALUE",
+                        help="extra app setting, repeatable")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument("--max-error-rate", type=float, help="exit with status 1 above this error rate")
+    args = parser.parse_args(argv)
+
+    profile = LoadProfile(
+        rate=args.rate,
+        duration=args.duration,
+        messages=args.messages,
+        users=args.users,
+        arrival=args.arrival,
+        openai_latency=args.openai_latency,
+        openai_jitter=args.openai_jitter,
+        notion_latency=args.notion_latency,
+        notion_jitter=args.notion_jitter,
+        notion_rate_limit=args.notion_rate_limit,
+        notion_pages=args.notion_pages,
+        evolution_latency=args.evolution_latency,
+        evolution_jitter=args.evolution_jitter,
+        drain_timeout=args.drain_timeout,
+        database_url=args.database_url,
+        env=dict(args.env),
+        seed=args.seed,
+    )
+    report = run_load_test(profile)
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+
+    if args.max_error_rate is not None and report["messages"]["error_rate"] > args.max_error_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
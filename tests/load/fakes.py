@@ -0,0 +1,478 @@
+"""
+Local stand-ins for the external APIs the bot calls.
+
+Each fake is a small JSON HTTP server on a free loopback port, served from a
+daemon thread (one thread per connection, like the real APIs serve concurrent
+clients). Latency is configurable per fake so a load run can model slow
+upstreams without any network access:
+
+- ``FakeEvolutionAPI``: accepts ``/message/sendText/<instance>`` and hands
+  every outgoing WhatsApp message to a callback (the harness measures
+  end-to-end latency there).
+- ``FakeOpenAI``: ``/v1/chat/completions`` returning canned completions,
+  including tool calls for task creation and listing.
+- ``FakeNotion``: in-memory databases with ``databases.retrieve``,
+  cursor-paginated ``databases.query`` and page create/retrieve/update, plus
+  optional HTTP 429 injection with ``Retry-After``.
+"""
+import json
+import random
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+Response = Tuple[int, Any, Dict[str, str]]
+
+
+class FakeService:
+    """JSON HTTP server with per-request latency and route dispatch."""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Initialize fake.
+
+        Args:
+            latency: Base delay added to every response (seconds)
+            jitter: Extra uniformly distributed delay, 0..jitter (seconds)
+            error_rate: Fraction of requests answered with HTTP 500
+            seed: Random seed, for reproducible runs
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[str, re.Pattern, Callable[..., Response]]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def route(self, method: str, pattern: str, handler: Callable[..., Response]) -> None:
+        """Register a handler, called with the body and the pattern's groups."""
+        self._routes.append((method, re.compile(pattern + r"/?(?:\?.*)?$"), handler))
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """
+        Start serving.
+
+        Returns:
+            Base URL of the fake
+        """
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self):
+                service.dispatch(self)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"{self.name}-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self.random.random() < rate
+
+    def dispatch(self, request: BaseHTTPRequestHandler) -> None:
+        length = int(request.headers.get("Content-Length") or 0)
+        raw = request.rfile.read(length) if length else b""
+        with self._lock:
+            self.requests += 1
+
+        time.sleep(self.delay())
+
+        status, payload, headers = self.handle(request.command, request.path, raw)
+        if status >= 400:
+            with self._lock:
+                self.errors += 1
+
+        body = json.dumps(payload).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(body)
+
+    def handle(self, method: str, path: str, raw: bytes) -> Response:
+        if self.chance(self.error_rate):
+            return self.error(500, "internal_server_error", "Injected failure")
+
+        body = json.loads(raw) if raw else {}
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                return handler(body, *match.groups())
+        return self.error(404, "not_found", f"No route for {method} {path}")
+
+    def error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        return status, {"error": {"code": code, "message": message}}, headers or {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the load report."""
+        return {"requests": self.requests, "errors": self.errors}
+
+
+class FakeEvolutionAPI(FakeService):
+    """Evolution API (WhatsApp) stand-in recording outgoing messages."""
+
+    name = "evolution"
+
+    def __init__(self, on_message: Optional[Callable[[str, str], None]] = None, **kwargs):
+        """
+        Initialize fake.
+
+        Args:
+            on_message: Called with (number, text) for every message sent
+            **kwargs: FakeService options
+        """
+        super().__init__(**kwargs)
+        self.on_message = on_message
+        self.sent = 0
+        self.route("POST", r"/message/sendText/([^/?]+)", self._send_text)
+
+    def _send_text(self, body: Dict[str, Any], instance: str) -> Response:
+        number, text = str(body.get("number", "")), body.get("text", "")
+        with self._lock:
+            self.sent += 1
+        if self.on_message is not None:
+            self.on_message(number, text)
+        return 201, {
+            "key": {"remoteJid": f"{number}@s.whatsapp.net", "fromMe": True, "id": uuid.uuid4().hex[:20].upper()},
+            "message": {"extendedTextMessage": {"text": text}},
+            "status": "PENDING",
+        }, {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "sent": self.sent}
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+class FakeOpenAI(FakeService):
+    """
+    OpenAI chat completions stand-in.
+
+    Replies are picked from the last message: after a tool result it answers
+    with a short confirmation; task creation and listing requests get a
+    ``create_task`` / ``view_tasks`` tool call; anything else a short text.
+    Replies stay short so each incoming message produces one WhatsApp send.
+    """
+
+    name = "openai"
+
+    CREATE = re.compile(r"\b(criar|crie|cria|adicionar|adiciona|nova tarefa|anota|lembrar de)\b")
+    LIST = re.compile(r"\b(tarefas|pendencias|lista|o que tenho)\b")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tool_calls = 0
+        self.route("POST", r"(?:/v1)?/chat/completions", self._chat_completion)
+
+    def _completion(self, model: str, message: Dict[str, Any], finish_reason: str, prompt: str) -> Dict[str, Any]:
+        completion_tokens = max(1, len(json.dumps(message)) // 4)
+        prompt_tokens = max(1, len(prompt) // 4)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def reply(self, messages: List[Dict[str, Any]], tools_offered: bool) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Canned reply for a conversation.
+
+        Args:
+            messages: Request messages
+            tools_offered: Whether the request carried tool definitions
+
+        Returns:
+            (text, tool_call) with exactly one of them set
+        """
+        last = messages[-1] if messages else {}
+        if last.get("role") == "tool":
+            return "Pronto! ✅ Já atualizei suas tarefas.", None
+
+        text = _fold(last.get("content") or "")
+        if tools_offered and self.CREATE.search(text):
+            title = (last.get("content") or "").split(":", 1)[-1].strip()[:80] or "Nova tarefa"
+            return None, {"name": "create_task", "arguments": {"title": title, "priority": "medium"}}
+        if tools_offered and self.LIST.search(text):
+            return None, {"name": "view_tasks", "arguments": {"filter_status": "all"}}
+        return "Oi! Estou aqui para ajudar com suas tarefas. O que você precisa?", None
+
+    def _chat_completion(self, body: Dict[str, Any]) -> Response:
+        messages = body.get("messages") or []
+        model = body.get("model", "gpt-4o-mini")
+        prompt = json.dumps(messages, ensure_ascii=False)
+        text, tool_call = self.reply(messages, bool(body.get("tools") or body.get("functions")))
+
+        if tool_call is None:
+            message = {"role": "assistant", "content": text}
+            return 200, self._completion(model, message, "stop", prompt), {}
+
+        with self._lock:
+            self.tool_calls += 1
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": tool_call["name"], "arguments": json.dumps(tool_call["arguments"])},
+            }],
+        }
+        return 200, self._completion(model, message, "tool_calls", prompt), {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "tool_calls": self.tool_calls}
+
+
+TASK_TITLES = [
+    "Revisar contrato com fornecedor", "Enviar relatório semanal", "Atualizar planilha de custos",
+    "Preparar apresentação do trimestre", "Ligar para o cliente da Bahia", "Organizar reunião de equipe",
+    "Conferir notas fiscais", "Responder e-mails pendentes", "Publicar post no Instagram",
+    "Fechar orçamento da obra", "Agendar manutenção do servidor", "Revisar proposta comercial",
+]
+STATUSES = ["A Fazer", "Em Andamento", "Concluído"]
+PRIORITIES = ["Alta", "Média", "Baixa"]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _rich_text(content: str) -> List[Dict[str, Any]]:
+    return [{
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {"bold": False, "italic": False, "strikethrough": False,
+                        "underline": False, "code": False, "color": "default"},
+        "plain_text": content,
+        "href": None,
+    }]
+
+
+class FakeNotion(FakeService):
+    """
+    Notion API stand-in backed by in-memory databases.
+
+    Queries return every page of the database (filters and sorts are not
+    evaluated), in pages of ``page_size`` (max 100) with ``next_cursor``,
+    like the real API. With ``rate_limit_rate`` set, that fraction of requests
+    is answered with HTTP 429 and a ``Retry-After`` header.
+    """
+
+    name = "notion"
+
+    SCHEMA = {
+        "Nome": {"id": "title", "type": "title", "title": {}},
+        "Status": {"id": "st", "type": "select", "select": {"options": [{"name": s} for s in STATUSES]}},
+        "Prioridade": {"id": "pr", "type": "select", "select": {"options": [{"name": p} for p in PRIORITIES]}},
+        "Assignees": {"id": "as", "type": "multi_select", "multi_select": {"options": []}},
+        "Descrição": {"id": "de", "type": "rich_text", "rich_text": {}},
+        "Prazo": {"id": "pz", "type": "date", "date": {}},
+    }
+
+    def __init__(self, rate_limit_rate: float = 0.0, retry_after: float = 0.2, **kwargs):
+        """
+        Initialize fake.
+
+        Args:
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            retry_after: Retry-After value of injected 429s (seconds)
+            **kwargs: FakeService options
+        """
+        super().__init__(**kwargs)
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rate_limited = 0
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+
+        self.route("GET", r"/v1/databases/([\w-]+)", self._retrieve_database)
+        self.route("POST", r"/v1/databases/([\w-]+)/query", self._query_database)
+        self.route("POST", r"/v1/pages", self._create_page)
+        self.route("GET", r"/v1/pages/([\w-]+)", self._retrieve_page)
+        self.route("PATCH", r"/v1/pages/([\w-]+)", self._update_page)
+
+    def add_database(self, database_id: str, pages: int = 0, assignees: Optional[List[str]] = None) -> None:
+        """
+        Create a tasks database.
+
+        Args:
+            database_id: Database id
+            pages: Number of task pages to seed it with
+            assignees: Names to assign seeded pages to, round robin
+        """
+        with self._lock:
+            self.databases[database_id] = {"id": database_id, "pages": []}
+        for index in range(pages):
+            assignee = assignees[index % len(assignees)] if assignees else None
+            self._insert_page(database_id, {
+                "Nome": {"title": _rich_text(f"{TASK_TITLES[index % len(TASK_TITLES)]} #{index + 1}")},
+                "Status": {"select": {"name": STATUSES[index % len(STATUSES)]}},
+                "Prioridade": {"select": {"name": PRIORITIES[index % len(PRIORITIES)]}},
+                "Assignees": {"multi_select": [{"name": assignee}] if assignee else []},
+            })
+
+    def _empty_properties(self) -> Dict[str, Any]:
+        # Real pages carry every database property, empty ones included
+        empty = {"title": [], "rich_text": [], "multi_select": [], "select": None, "date": None}
+        return {
+            name: {"id": prop["id"], "type": prop["type"], prop["type"]: empty[prop["type"]]}
+            for name, prop in self.SCHEMA.items()
+        }
+
+    def _typed(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        typed = {}
+        for name, value in properties.items():
+            prop_type = self.SCHEMA.get(name, {}).get("type") or next(iter(value), "rich_text")
+            prop_id = self.SCHEMA.get(name, {}).get("id", name[:4])
+            content = value.get(prop_type)
+            if prop_type in ("title", "rich_text"):
+                content = [
+                    item if "plain_text" in item else _rich_text((item.get("text") or {}).get("content", ""))[0]
+                    for item in content or []
+                ]
+            typed[name] = {"id": prop_id, "type": prop_type, prop_type: content}
+        return typed
+
+    def _insert_page(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now_iso()
+        page_id = str(uuid.uuid4())
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "in_trash": False,
+            "parent": {"type": "database_id", "database_id": database_id},
+            "properties": {**self._empty_properties(), **self._typed(properties)},
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        }
+        with self._lock:
+            self.pages[page_id] = page
+            self.databases[database_id]["pages"].append(page)
+        return page
+
+    def handle(self, method: str, path: str, raw: bytes) -> Response:
+        if self.chance(self.rate_limit_rate):
+            with self._lock:
+                self.rate_limited += 1
+            return self.error(429, "rate_limited", "You have been rate limited.", {"Retry-After": str(self.retry_after)})
+        return super().handle(method, path, raw)
+
+    def error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        payload = {"object": "error", "status": status, "code": code, "message": message}
+        return status, payload, headers or {}
+
+    def _database(self, database_id: str) -> Optional[Dict[str, Any]]:
+        return self.databases.get(database_id) or self.databases.get(database_id.replace("-", ""))
+
+    def _retrieve_database(self, body: Dict[str, Any], database_id: str) -> Response:
+        database = self._database(database_id)
+        if database is None:
+            return self.error(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        properties = {name: {"name": name, **prop} for name, prop in self.SCHEMA.items()}
+        return 200, {
+            "object": "database",
+            "id": database["id"],
+            "title": _rich_text("Tarefas"),
+            "properties": properties,
+            "archived": False,
+        }, {}
+
+    def _query_database(self, body: Dict[str, Any], database_id: str) -> Response:
+        database = self._database(database_id)
+        if database is None:
+            return self.error(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+
+        page_size = min(int(body.get("page_size") or 100), 100)
+        start = int(body.get("start_cursor") or 0)
+        with self._lock:
+            pages = [page for page in database["pages"] if not page["archived"]]
+        results = pages[start:start + page_size]
+        has_more = start + page_size < len(pages)
+        return 200, {
+            "object": "list",
+            "results": results,
+            "next_cursor": str(start + page_size) if has_more else None,
+            "has_more": has_more,
+            "type": "page_or_database",
+            "page_or_database": {},
+        }, {}
+
+    def _create_page(self, body: Dict[str, Any]) -> Response:
+        database_id = (body.get("parent") or {}).get("database_id", "")
+        database = self._database(database_id)
+        if database is None:
+            return self.error(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        return 200, self._insert_page(database["id"], body.get("properties") or {}), {}
+
+    def _retrieve_page(self, body: Dict[str, Any], page_id: str) -> Response:
+        page = self.pages.get(page_id)
+        if page is None:
+            return self.error(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        return 200, page, {}
+
+    def _update_page(self, body: Dict[str, Any], page_id: str) -> Response:
+        page = self.pages.get(page_id)
+        if page is None:
+            return self.error(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        with self._lock:
+            page["properties"].update(self._typed(body.get("properties") or {}))
+            if "archived" in body:
+                page["archived"] = bool(body["archived"])
+            page["last_edited_time"] = _now_iso()
+        return 200, page, {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "rate_limited": self.rate_limited, "pages": len(self.pages)}
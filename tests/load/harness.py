@@ -0,0 +1,643 @@
+"""
+End-to-end load harness.
+
+Starts the FastAPI app in this process (uvicorn, on a loopback port) with
+Evolution API, OpenAI and Notion replaced by the local fakes in
+``tests.load.fakes``, replays ``messages.upsert`` webhooks at a configured
+arrival rate and reports:
+
+- webhook ack latency and end-to-end latency (webhook POST until the reply
+  reaches the fake Evolution API), p50/p95/p99;
+- offered and achieved throughput, ack errors, error replies and timeouts;
+- per-stage latency and error rate (command matching, OpenAI, each function,
+  each Notion endpoint, WhatsApp sends, DB statements) from the app's own
+  ``/metrics`` histograms, as the difference between two scrapes.
+
+Settings are read when ``src`` is first imported, so the harness must run in a
+fresh process (``python -m tests.load``); it refuses to start otherwise.
+Replies are matched to messages per phone number in arrival order, which
+holds because the fake OpenAI keeps replies to one WhatsApp message.
+"""
+import asyncio
+import math
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from tests.load.fakes import FakeEvolutionAPI, FakeNotion, FakeOpenAI
+
+
+DATABASE_ID = "load-tasks-db"
+
+# Replies the app sends when processing a message failed
+ERROR_MARKERS = ("Desculpe, ocorreu um erro", "Tente novamente em instantes")
+
+# Incoming traffic mix: (weight, message)
+MESSAGES = [
+    (4, "oi, tudo bem?"),
+    (3, "quais são minhas tarefas?"),
+    (1, "me mostra a lista de pendências"),
+    (3, "criar tarefa: enviar relatório para o financeiro"),
+    (2, "adiciona: ligar para o fornecedor amanhã às 10h"),
+    (1, "nova tarefa: revisar contrato número três"),
+    (2, "bom dia! o que tenho pra hoje?"),
+    (1, "obrigado 🙏"),
+]
+NAMES = ["Ana Souza", "Bruno Lima", "Carla Mendes", "Diego Rocha", "Estevão", "Fernanda Alves"]
+
+# /metrics histograms reported per stage: metric name -> (report prefix, label keyed on)
+STAGE_METRICS = {
+    "pangeia_http_request_duration_seconds": ("http", "route"),
+    "pangeia_message_stage_duration_seconds": ("message", "stage"),
+    "pangeia_llm_request_duration_seconds": ("llm", "model"),
+    "pangeia_function_duration_seconds": ("function", "function"),
+    "pangeia_notion_request_duration_seconds": ("notion", "endpoint"),
+    "pangeia_evolution_request_duration_seconds": ("evolution", "operation"),
+    "pangeia_db_query_duration_seconds": ("db", "statement"),
+}
+
+
+class LoadProfile:
+    """Traffic and fake-upstream settings of one load run."""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        duration: float = 10.0,
+        messages: Optional[int] = None,
+        users: int = 50,
+        arrival: str = "poisson",
+        openai_latency: float = 0.3,
+        openai_jitter: float = 0.2,
+        notion_latency: float = 0.1,
+        notion_jitter: float = 0.05,
+        notion_rate_limit: float = 0.0,
+        notion_pages: int = 150,
+        evolution_latency: float = 0.05,
+        evolution_jitter: float = 0.02,
+        drain_timeout: float = 60.0,
+        database_url: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = 1,
+    ):
+        """
+        Initialize profile.
+
+        Args:
+            rate: Incoming messages per second
+            duration: Seconds of traffic (ignored when ``messages`` is set)
+            messages: Exact number of messages to send
+            users: Distinct WhatsApp senders
+            arrival: "poisson" (exponential gaps) or "uniform" (fixed gaps)
+            openai_latency: Fake OpenAI base latency (seconds)
+            openai_jitter: Fake OpenAI extra random latency (seconds)
+            notion_latency: Fake Notion base latency (seconds)
+            notion_jitter: Fake Notion extra random latency (seconds)
+            notion_rate_limit: Fraction of Notion requests answered with 429
+            notion_pages: Pages seeded in the Notion tasks database
+            evolution_latency: Fake Evolution API base latency (seconds)
+            evolution_jitter: Fake Evolution API extra random latency (seconds)
+            drain_timeout: Seconds to wait for outstanding replies after the last message
+            database_url: App database (default: a fresh SQLite file)
+            env: Extra app settings, e.g. {"NOTION_RATE_LIMIT_PER_SECOND": "10"}
+            seed: Random seed for arrivals, traffic mix and fakes
+        """
+        if arrival not in ("poisson", "uniform"):
+            raise ValueError(f"Unknown arrival process: {arrival}")
+        self.rate = rate
+        self.duration = duration
+        self.messages = messages
+        self.users = users
+        self.arrival = arrival
+        self.openai_latency = openai_latency
+        self.openai_jitter = openai_jitter
+        self.notion_latency = notion_latency
+        self.notion_jitter = notion_jitter
+        self.notion_rate_limit = notion_rate_limit
+        self.notion_pages = notion_pages
+        self.evolution_latency = evolution_latency
+        self.evolution_jitter = evolution_jitter
+        self.drain_timeout = drain_timeout
+        self.database_url = database_url
+        self.env = dict(env or {})
+        self.seed = seed
+
+    @property
+    def total_messages(self) -> int:
+        if self.messages is not None:
+            return self.messages
+        return max(1, int(round(self.rate * self.duration)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in vars(self).items() if key != "database_url"}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    Percentile of exact samples, linearly interpolated.
+
+    Args:
+        values: Samples
+        q: Quantile in [0, 1]
+
+    Returns:
+        The percentile, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    """Count, p50/p95/p99 and max of latency samples (seconds)."""
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None,
+    }
+
+
+def histogram_quantile(buckets: List[Tuple[float, float]], q: float) -> Optional[float]:
+    """
+    Quantile estimated from cumulative histogram buckets (as PromQL does).
+
+    Args:
+        buckets: (upper bound, cumulative count) sorted by bound, +Inf last
+        q: Quantile in [0, 1]
+
+    Returns:
+        Estimated quantile, or None for an empty histogram
+    """
+    if not buckets or buckets[-1][1] <= 0:
+        return None
+    rank = q * buckets[-1][1]
+    previous_bound, previous_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if math.isinf(bound):
+                return previous_bound
+            if count == previous_count:
+                return bound
+            return previous_bound + (bound - previous_bound) * (rank - previous_count) / (count - previous_count)
+        previous_bound, previous_count = bound, count
+    return previous_bound
+
+
+def parse_histograms(text: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Stage histograms from a /metrics scrape.
+
+    Args:
+        text: Prometheus exposition text
+
+    Returns:
+        (report prefix, stage) -> {"buckets": {bound: count}, "count", "errors"}
+    """
+    from prometheus_client.parser import text_string_to_metric_families
+
+    stages: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for family in text_string_to_metric_families(text):
+        if family.name not in STAGE_METRICS:
+            continue
+        prefix, key = STAGE_METRICS[family.name]
+        for sample in family.samples:
+            labels = sample.labels
+            stage = labels.get(key, "")
+            if prefix == "http":
+                if stage == "/metrics":
+                    continue
+                stage = f"{labels.get('method')} {stage}"
+            entry = stages.setdefault((prefix, stage), {"buckets": {}, "count": 0.0, "errors": 0.0})
+            failed = labels.get("outcome") == "error" or labels.get("status", "").startswith("5")
+
+            if sample.name.endswith("_bucket"):
+                bound = float(labels["le"])
+                entry["buckets"][bound] = entry["buckets"].get(bound, 0.0) + sample.value
+            elif sample.name.endswith("_count"):
+                entry["count"] += sample.value
+                if failed:
+                    entry["errors"] += sample.value
+    return stages
+
+
+def stage_report(before: str, after: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-stage latency and error rate between two /metrics scrapes.
+
+    Args:
+        before: Scrape taken before the run
+        after: Scrape taken after the run
+
+    Returns:
+        "prefix.stage" -> {"count", "errors", "error_rate", "p50", "p95", "p99"}
+    """
+    start, end = parse_histograms(before), parse_histograms(after)
+    report = {}
+    for (prefix, stage), entry in sorted(end.items()):
+        base = start.get((prefix, stage), {"buckets": {}, "count": 0.0, "errors": 0.0})
+        count = entry["count"] - base["count"]
+        if count <= 0:
+            continue
+        errors = entry["errors"] - base["errors"]
+        buckets = sorted(
+            (bound, value - base["buckets"].get(bound, 0.0)) for bound, value in entry["buckets"].items()
+        )
+        report[f"{prefix}.{stage}"] = {
+            "count": int(count),
+            "errors": int(errors),
+            "error_rate": errors / count,
+            "p50": histogram_quantile(buckets, 0.50),
+            "p95": histogram_quantile(buckets, 0.95),
+            "p99": histogram_quantile(buckets, 0.99),
+        }
+    return report
+
+
+def retry_report(before: str, after: str) -> Dict[str, int]:
+    """
+    Retries between two /metrics scrapes.
+
+    Args:
+        before: Scrape taken before the run
+        after: Scrape taken after the run
+
+    Returns:
+        "notion.<endpoint>" / "llm.<reason>" -> retried calls
+    """
+    from prometheus_client.parser import text_string_to_metric_families
+
+    def totals(text: str) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        for family in text_string_to_metric_families(text):
+            if family.name == "pangeia_notion_retries":
+                key, label = "notion", "endpoint"
+            elif family.name == "pangeia_llm_retries":
+                key, label = "llm", "reason"
+            else:
+                continue
+            for sample in family.samples:
+                if sample.name.endswith("_total"):
+                    name = f"{key}.{sample.labels.get(label)}"
+                    counts[name] = counts.get(name, 0.0) + sample.value
+        return counts
+
+    start, end = totals(before), totals(after)
+    return {
+        name: int(value - start.get(name, 0.0))
+        for name, value in sorted(end.items())
+        if value > start.get(name, 0.0)
+    }
+
+
+class ReplyTracker:
+    """Matches replies seen by the fake Evolution API to the messages that caused them."""
+
+    def __init__(self):
+        self.pending: Dict[str, Deque[float]] = {}
+        self.latencies: List[float] = []
+        self.error_replies = 0
+        self.unexpected = 0
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def expect(self, phone: str) -> None:
+        with self._lock:
+            self.pending.setdefault(phone, deque()).append(time.perf_counter())
+            self._outstanding += 1
+            self._idle.clear()
+
+    def cancel(self, phone: str) -> None:
+        """Forget the latest message of a phone (its webhook was rejected)."""
+        with self._lock:
+            if self.pending.get(phone):
+                self.pending[phone].pop()
+                self._outstanding -= 1
+                if self._outstanding == 0:
+                    self._idle.set()
+
+    def on_message(self, number: str, text: str) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            queue = self.pending.get(number)
+            if not queue:
+                self.unexpected += 1
+                return
+            self.latencies.append(now - queue.popleft())
+            if any(marker in text for marker in ERROR_MARKERS):
+                self.error_replies += 1
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._idle.set()
+
+    def wait(self, timeout: float) -> int:
+        """
+        Wait for outstanding replies.
+
+        Returns:
+            Messages still unanswered after the timeout
+        """
+        self._idle.wait(timeout)
+        with self._lock:
+            return self._outstanding
+
+
+def _free_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+class LoadHarness:
+    """Runs the app against the fakes and replays webhook traffic."""
+
+    def __init__(self, profile: LoadProfile):
+        """
+        Initialize harness.
+
+        Args:
+            profile: Traffic and upstream settings
+        """
+        self.profile = profile
+        self.random = random.Random(profile.seed)
+        self.tracker = ReplyTracker()
+        self.evolution = FakeEvolutionAPI(
+            on_message=self.tracker.on_message,
+            latency=profile.evolution_latency, jitter=profile.evolution_jitter, seed=profile.seed,
+        )
+        self.openai = FakeOpenAI(latency=profile.openai_latency, jitter=profile.openai_jitter, seed=profile.seed)
+        self.notion = FakeNotion(
+            rate_limit_rate=profile.notion_rate_limit,
+            latency=profile.notion_latency, jitter=profile.notion_jitter, seed=profile.seed,
+        )
+        self.app_url: Optional[str] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._tempdir: Optional[tempfile.TemporaryDirectory] = None
+
+    def app_env(self) -> Dict[str, str]:
+        """Settings pointing the app at the fakes."""
+        database_url = self.profile.database_url
+        if database_url is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix="pangeia-load-")
+            database_url = f"sqlite:///{self._tempdir.name}/load.db"
+
+        env = {
+            "DATABASE_URL": database_url,
+            "EVOLUTION_API_URL": self.evolution.url,
+            "EVOLUTION_API_KEY": "load-test",
+            "EVOLUTION_INSTANCE_NAME": "pangeia_load",
+            "NOTION_API_KEY": "secret_load_test",
+            "NOTION_API_BASE_URL": self.notion.url,
+            "NOTION_DATABASE_ID": DATABASE_ID,
+            "OPENAI_API_KEY": "sk-load-test",
+            "OPENAI_BASE_URL": f"{self.openai.url}/v1",
+            "LOG_LEVEL": "WARNING",
+            "TRACING_ENABLED": "false",
+        }
+        env.update(self.profile.env)
+        return env
+
+    def start(self) -> str:
+        """
+        Start the fakes and the app.
+
+        Returns:
+            Base URL of the app
+        """
+        if "src.config.settings" in sys.modules:
+            raise RuntimeError("The load harness configures the app itself; run it in a fresh process")
+
+        self.evolution.start()
+        self.openai.start()
+        self.notion.start()
+        self.notion.add_database(DATABASE_ID, pages=self.profile.notion_pages, assignees=NAMES)
+        os.environ.update(self.app_env())
+
+        import uvicorn
+        from src.main import app
+
+        sock = _free_socket()
+        config = uvicorn.Config(app, log_level="warning", access_log=False, lifespan="on")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, name="app-server", daemon=True
+        )
+        self._thread.start()
+
+        deadline = time.monotonic() + 60
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("The app did not start")
+            time.sleep(0.05)
+
+        host, port = sock.getsockname()[:2]
+        self.app_url = f"http://{host}:{port}"
+        return self.app_url
+
+    def stop(self) -> None:
+        """Stop the app and the fakes."""
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=30)
+            self._server = None
+        for fake in (self.evolution, self.openai, self.notion):
+            fake.stop()
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    def traffic(self) -> Iterator[Tuple[float, str, str, str]]:
+        """
+        Messages to send.
+
+        Yields:
+            (send offset in seconds, phone, sender name, text)
+        """
+        weights = [weight for weight, _ in MESSAGES]
+        texts = [text for _, text in MESSAGES]
+        phones = [f"55119{80000000 + index:08d}" for index in range(self.profile.users)]
+        offset = 0.0
+        for _ in range(self.profile.total_messages):
+            user = self.random.randrange(self.profile.users)
+            text = self.random.choices(texts, weights=weights, k=1)[0]
+            yield offset, phones[user], NAMES[user % len(NAMES)], text
+            if self.profile.arrival == "poisson":
+                offset += self.random.expovariate(self.profile.rate)
+            else:
+                offset += 1.0 / self.profile.rate
+
+    @staticmethod
+    def webhook_payload(phone: str, name: str, text: str) -> Dict[str, Any]:
+        """Evolution API ``messages.upsert`` event for an incoming text message."""
+        return {
+            "event": "messages.upsert",
+            "instance": "pangeia_load",
+            "data": {
+                "key": {"remoteJid": f"{phone}@s.whatsapp.net", "fromMe": False, "id": os.urandom(10).hex().upper()},
+                "pushName": name,
+                "message": {"conversation": text},
+                "messageType": "conversation",
+                "messageTimestamp": int(time.time()),
+            },
+        }
+
+    async def _send(self, client: Any, phone: str, name: str, text: str, acks: List[float], failures: List[str]) -> None:
+        self.tracker.expect(phone)
+        started = time.perf_counter()
+        try:
+            response = await client.post("/webhook/evolution", json=self.webhook_payload(phone, name, text))
+            acks.append(time.perf_counter() - started)
+            if response.status_code != 200 or response.json().get("status") != "success":
+                failures.append(f"HTTP {response.status_code}: {response.text[:200]}")
+                self.tracker.cancel(phone)
+        except Exception as e:
+            failures.append(f"{type(e).__name__}: {e}")
+            self.tracker.cancel(phone)
+
+    async def _replay(self, acks: List[float], failures: List[str]) -> None:
+        import httpx
+
+        limits = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+        async with httpx.AsyncClient(base_url=self.app_url, timeout=30.0, limits=limits) as client:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            sends = []
+            for offset, phone, name, text in self.traffic():
+                delay = started + offset - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                sends.append(asyncio.create_task(self._send(client, phone, name, text, acks, failures)))
+            await asyncio.gather(*sends)
+
+    def _scrape(self) -> str:
+        import httpx
+
+        return httpx.get(f"{self.app_url}/metrics", timeout=30.0).text
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Replay the profile's traffic against the running app.
+
+        Returns:
+            Load report (see ``format_report``)
+        """
+        before = self._scrape()
+        acks: List[float] = []
+        failures: List[str] = []
+
+        started = time.perf_counter()
+        asyncio.run(self._replay(acks, failures))
+        sent_seconds = time.perf_counter() - started
+        unanswered = self.tracker.wait(self.profile.drain_timeout)
+        elapsed = time.perf_counter() - started
+
+        after = self._scrape()
+        sent = self.profile.total_messages
+        answered = len(self.tracker.latencies)
+        failed = len(failures) + self.tracker.error_replies + unanswered
+        return {
+            "profile": self.profile.to_dict(),
+            "elapsed_seconds": elapsed,
+            "messages": {
+                "sent": sent,
+                "acked": sent - len(failures),
+                "answered": answered,
+                "ack_errors": len(failures),
+                "error_replies": self.tracker.error_replies,
+                "timeouts": unanswered,
+                "unexpected_replies": self.tracker.unexpected,
+                "error_rate": failed / sent,
+                "sample_failures": failures[:5],
+            },
+            "throughput": {
+                "offered_per_second": sent / sent_seconds if sent_seconds else None,
+                "answered_per_second": answered / elapsed if elapsed else None,
+            },
+            "latency": {
+                "ack": summarize(acks),
+                "end_to_end": summarize(self.tracker.latencies),
+            },
+            "stages": stage_report(before, after),
+            "retries": retry_report(before, after),
+            "fakes": {
+                "evolution": self.evolution.stats(),
+                "openai": self.openai.stats(),
+                "notion": self.notion.stats(),
+            },
+        }
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}"
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Human-readable load report.
+
+    Args:
+        report: Report returned by ``LoadHarness.run``
+
+    Returns:
+        Text table
+    """
+    messages, throughput = report["messages"], report["throughput"]
+    lines = [
+        f"Messages: {messages['sent']} sent, {messages['answered']} answered in {report['elapsed_seconds']:.1f}s "
+        f"({messages['ack_errors']} ack errors, {messages['error_replies']} error replies, "
+        f"{messages['timeouts']} timeouts; error rate {messages['error_rate']:.2%})",
+        f"Throughput: {throughput['offered_per_second'] or 0:.2f} msg/s offered, "
+        f"{throughput['answered_per_second'] or 0:.2f} msg/s answered",
+        "",
+        f"{'stage':<48}{'count':>8}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for name, latency in report["latency"].items():
+        lines.append(
+            f"{'client.' + name:<48}{latency['count']:>8}{'':>8}"
+            f"{_ms(latency['p50']):>10}{_ms(latency['p95']):>10}{_ms(latency['p99']):>10}"
+        )
+    for name, stage in report["stages"].items():
+        lines.append(
+            f"{name[:47]:<48}{stage['count']:>8}{stage['error_rate'] * 100:>7.1f}%"
+            f"{_ms(stage['p50']):>10}{_ms(stage['p95']):>10}{_ms(stage['p99']):>10}"
+        )
+    lines.append("")
+    if report["retries"]:
+        lines.append("Retries: " + ", ".join(f"{name} {count}" for name, count in report["retries"].items()))
+    lines.append("Fakes: " + ", ".join(
+        f"{name} {stats}" for name, stats in report["fakes"].items()
+    ))
+    return "\n".join(lines)
+
+
+def run_load_test(profile: LoadProfile) -> Dict[str, Any]:
+    """
+    Start everything, replay the traffic and stop.
+
+    Args:
+        profile: Traffic and upstream settings
+
+    Returns:
+        Load report
+    """
+    harness = LoadHarness(profile)
+    try:
+        harness.start()
+        return harness.run()
+    finally:
+        harness.stop()
@@ -0,0 +1,178 @@
+"""
+Tests for the load-testing harness and its fake upstream APIs.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from notion_client import Client
+
+from src.integrations.notion_gateway import NotionGateway, RateLimiter, query_all_pages
+from tests.load.fakes import FakeEvolutionAPI, FakeNotion, FakeOpenAI
+from tests.load.harness import histogram_quantile, percentile, stage_report
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def notion():
+    fake = FakeNotion()
+    fake.start()
+    fake.add_database("db-1", pages=230, assignees=["Ana Souza"])
+    yield fake
+    fake.stop()
+
+
+class TestFakes:
+    """Test suite for the fake Notion, OpenAI and Evolution API servers"""
+
+    def test_notion_query_is_paginated(self, notion):
+        """Test the real Notion client walks every page of the fake database"""
+        client = Client(auth="secret_test", base_url=notion.url)
+
+        pages = query_all_pages(client, "db-1")
+
+        assert len(pages) == 230
+        assert notion.requests == 3
+        assert pages[0]["properties"]["Nome"]["title"][0]["plain_text"].startswith("Revisar contrato")
+
+    def test_notion_rate_limits_are_retried_by_the_gateway(self, notion):
+        """Test injected 429s carry Retry-After and are retried, not surfaced"""
+        notion.rate_limit_rate = 0.5
+        notion.retry_after = 0.01
+        gateway = NotionGateway(
+            Client(auth="secret_test", base_url=notion.url),
+            rate_limiter=RateLimiter(rate=1000, burst=1000),
+            max_retries=20,
+        )
+
+        created = [
+            gateway.pages.create(parent={"database_id": "db-1"}, properties={"Nome": {"title": [{"text": {"content": f"T{i}"}}]}})
+            for i in range(10)
+        ]
+
+        assert notion.rate_limited > 0
+        assert len({page["id"] for page in created}) == 10
+        assert created[0]["properties"]["Nome"]["title"][0]["plain_text"] == "T0"
+
+    def test_openai_returns_tool_calls_then_text(self):
+        """Test task requests get a tool call and tool results a text reply"""
+        from openai import OpenAI
+
+        fake = FakeOpenAI()
+        fake.start()
+        try:
+            client = OpenAI(api_key="sk-test", base_url=f"{fake.url}/v1", max_retries=0)
+            tools = [{"type": "function", "function": {"name": "create_task", "parameters": {}}}]
+
+            first = client.chat.completions.create(
+                model="gpt-4o-mini", tools=tools,
+                messages=[{"role": "user", "content": "criar tarefa: pagar o aluguel"}],
+            )
+            call = first.choices[0].message.tool_calls[0]
+            second = client.chat.completions.create(
+                model="gpt-4o-mini", tools=tools,
+                messages=[{"role": "tool", "tool_call_id": call.id, "content": "{}"}],
+            )
+        finally:
+            fake.stop()
+
+        assert call.function.name == "create_task"
+        assert json.loads(call.function.arguments)["title"] == "pagar o aluguel"
+        assert second.choices[0].message.content
+        assert first.usage.total_tokens > 0
+
+    def test_evolution_hands_sent_messages_to_callback(self):
+        """Test every sendText call reaches the callback"""
+        import requests
+
+        received = []
+        fake = FakeEvolutionAPI(on_message=lambda number, text: received.append((number, text)))
+        fake.start()
+        try:
+            response = requests.post(
+                f"{fake.url}/message/sendText/bot", json={"number": "5511999990000", "text": "oi"}, timeout=5
+            )
+        finally:
+            fake.stop()
+
+        assert response.status_code == 201
+        assert received == [("5511999990000", "oi")]
+
+
+class TestReport:
+    """Test suite for report statistics"""
+
+    def test_percentile_interpolates(self):
+        """Test exact percentiles interpolate between samples"""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 0.5) == pytest.approx(50.5)
+        assert percentile(values, 0.99) == pytest.approx(99.01)
+        assert percentile([], 0.5) is None
+
+    def test_histogram_quantile_matches_promql(self):
+        """Test bucket quantiles interpolate inside the matching bucket"""
+        buckets = [(0.1, 50.0), (0.5, 90.0), (1.0, 100.0), (float("inf"), 100.0)]
+
+        assert histogram_quantile(buckets, 0.5) == pytest.approx(0.1)
+        assert histogram_quantile(buckets, 0.7) == pytest.approx(0.3)
+        assert histogram_quantile([(0.1, 0.0), (float("inf"), 0.0)], 0.5) is None
+
+    def test_stage_report_uses_scrape_deltas(self):
+        """Test only observations between the two scrapes are reported"""
+        def scrape(fast, slow, errors):
+            return (
+                "# TYPE pangeia_notion_request_duration_seconds histogram\n"
+                f'pangeia_notion_request_duration_seconds_bucket{{endpoint="pages.create",outcome="success",le="0.1"}} {fast}\n'
+                f'pangeia_notion_request_duration_seconds_bucket{{endpoint="pages.create",outcome="success",le="1.0"}} {fast + slow}\n'
+                f'pangeia_notion_request_duration_seconds_bucket{{endpoint="pages.create",outcome="success",le="+Inf"}} {fast + slow}\n'
+                f'pangeia_notion_request_duration_seconds_count{{endpoint="pages.create",outcome="success"}} {fast + slow}\n'
+                f'pangeia_notion_request_duration_seconds_sum{{endpoint="pages.create",outcome="success"}} 1.0\n'
+                f'pangeia_notion_request_duration_seconds_bucket{{endpoint="pages.create",outcome="error",le="0.1"}} 0\n'
+                f'pangeia_notion_request_duration_seconds_bucket{{endpoint="pages.create",outcome="error",le="1.0"}} {errors}\n'
+                f'pangeia_notion_request_duration_seconds_bucket{{endpoint="pages.create",outcome="error",le="+Inf"}} {errors}\n'
+                f'pangeia_notion_request_duration_seconds_count{{endpoint="pages.create",outcome="error"}} {errors}\n'
+                f'pangeia_notion_request_duration_seconds_sum{{endpoint="pages.create",outcome="error"}} 1.0\n'
+            )
+
+        report = stage_report(scrape(100, 0, 0), scrape(100, 9, 1))
+
+        stage = report["notion.pages.create"]
+        assert stage["count"] == 10
+        assert stage["errors"] == 1
+        assert stage["error_rate"] == pytest.approx(0.1)
+        assert 0.1 < stage["p50"] <= 1.0
+
+
+class TestLoadRun:
+    """Test suite for an end-to-end load run"""
+
+    def test_small_run_answers_every_message(self, tmp_path):
+        """Test a short offline run answers all messages and reports every stage"""
+        output = tmp_path / "report.json"
+        result = subprocess.run(
+            [
+                sys.executable, "-m", "tests.load",
+                "--messages", "12", "--users", "12", "--rate", "4", "--arrival", "uniform",
+                "--openai-latency", "0.02", "--openai-jitter", "0",
+                "--notion-latency", "0.01", "--notion-jitter", "0", "--notion-pages", "120",
+                "--notion-rate-limit", "0.2", "--drain-timeout", "60",
+                "--json", str(output),
+            ],
+            cwd=ROOT, env=dict(os.environ), capture_output=True, text=True, timeout=300,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+
+        report = json.loads(output.read_text())
+        assert report["messages"]["answered"] == 12
+        assert report["messages"]["ack_errors"] == 0
+        assert report["messages"]["timeouts"] == 0
+        assert report["latency"]["end_to_end"]["p99"] is not None
+        for stage in ("message.total", "message.reply", "llm.gpt-4o-mini", "evolution.send_text", "notion.databases.query"):
+            assert report["stages"][stage]["count"] > 0, stage
+        assert report["fakes"]["notion"]["rate_limited"] > 0
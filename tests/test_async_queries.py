@@ -0,0 +1,91 @@
+"""
+Tests for the async session layer and the queries run on it.
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database import async_queries
+from src.database.session import Base, async_database_url
+from src.database.models import Reminder, Task, TaskStatus, User
+
+
+NOW = datetime(2025, 11, 10, 12, 0, 0)
+
+
+async def _session_factory():
+    """In-memory aiosqlite session factory with the full schema."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _seed(factory):
+    async with factory() as session:
+        user = User(phone_number="5511999999999", name="Ana")
+        other = User(phone_number="5511888888888", name="Bia")
+        session.add_all([user, other])
+        await session.flush()
+        tasks = [
+            Task(user_id=user.id, title="Relatório", status=TaskStatus.PENDING),
+            Task(user_id=user.id, title="Planilha", status=TaskStatus.COMPLETED),
+            Task(user_id=other.id, title="Outro", status=TaskStatus.PENDING),
+        ]
+        session.add_all(tasks)
+        await session.flush()
+        session.add_all([
+            Reminder(task_id=tasks[0].id, user_id=user.id, scheduled_time=NOW - timedelta(minutes=5)),
+            Reminder(task_id=tasks[0].id, user_id=user.id, scheduled_time=NOW + timedelta(hours=1)),
+            Reminder(task_id=tasks[1].id, user_id=user.id, scheduled_time=NOW - timedelta(hours=1), sent=True),
+        ])
+        await session.commit()
+        return user.id, other.id, [task.id for task in tasks]
+
+
+class TestAsyncDatabaseUrl:
+    """Test suite for async_database_url"""
+
+    def test_postgres_urls_use_asyncpg(self):
+        """Test postgres schemes map to asyncpg and sslmode to ssl"""
+        assert async_database_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert (
+            async_database_url("postgresql+psycopg2://u:p@h/db?sslmode=require")
+            == "postgresql+asyncpg://u:p@h/db?ssl=require"
+        )
+
+    def test_sqlite_uses_aiosqlite(self):
+        """Test sqlite URLs map to aiosqlite"""
+        assert async_database_url("sqlite:////tmp/x.db") == "sqlite+aiosqlite:////tmp/x.db"
+
+
+@pytest.mark.asyncio
+class TestAsyncQueries:
+    """Test suite for the async queries"""
+
+    async def test_user_lookup_and_create(self):
+        """Test lookup by phone and creation"""
+        engine, factory = await _session_factory()
+        await _seed(factory)
+
+        async with factory() as session:
+            user = await async_queries.get_user_by_phone(session, "5511999999999")
+            assert user.name == "Ana"
+            assert await async_queries.get_user_by_phone(session, "5500000000000") is None
+
+            created = await async_queries.create_user(session, "5500000000000", "Caio")
+            assert created.id is not None
+
+        await engine.dispose()
+
+    async def test_due_reminders(self):
+        """Test only unsent reminders due at now are counted"""
+        engine, factory = await _session_factory()
+        await _seed(factory)
+
+        async with factory() as session:
+            count = await async_queries.count_due_reminders(session, NOW)
+
+        assert count == 1
+        await engine.dispose()
@@ -0,0 +1,196 @@
+"""
+Tests for the cache layer: in-process LRU/TTL, Redis backend and single-flight.
+"""
+import fnmatch
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from src.utils.cache import Cache, CacheBackend, InMemoryCache, RedisCache
+
+
+class FakeRedis:
+    """Minimal stand-in for the subset of the Redis API the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        if key in self.expiry and self.expiry[key] <= time.monotonic():
+            self.data.pop(key, None)
+        value = self.data.get(key)
+        return value.encode("utf-8") if value is not None else None
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        if ex:
+            self.expiry[key] = time.monotonic() + ex
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*", count=None):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    """Cache over each backend."""
+    backend = InMemoryCache(max_entries=100) if request.param == "memory" else RedisCache(FakeRedis())
+    return Cache(backend, prefix="test", default_ttl=60)
+
+
+class TestCache:
+    """Test suite for Cache and CacheNamespace"""
+
+    def test_namespaces_are_isolated(self, cache):
+        """Test the same key in two namespaces holds different values"""
+        users, pages = cache.namespace("users"), cache.namespace("pages")
+        users.set("k", {"id": 1})
+        pages.set("k", [1, 2])
+
+        users.clear()
+
+        assert users.get("k") is None
+        assert pages.get("k") == [1, 2]
+
+    def test_get_or_set_loads_once(self, cache):
+        """Test the loader runs on the first miss only"""
+        namespace = cache.namespace("users")
+        loader = Mock(return_value={"id": 7})
+
+        assert namespace.get_or_set("+55", loader) == {"id": 7}
+        assert namespace.get_or_set("+55", loader) == {"id": 7}
+
+        loader.assert_called_once()
+        stats = namespace.stats()
+        assert stats["loads"] == 1
+        assert stats["hits"] >= 1
+
+    def test_none_and_errors_are_not_cached(self, cache):
+        """Test failed or empty loads are retried next time"""
+        namespace = cache.namespace("users")
+        loader = Mock(side_effect=[RuntimeError("down"), None, "ok"])
+
+        with pytest.raises(RuntimeError):
+            namespace.get_or_set("k", loader)
+        assert namespace.get_or_set("k", loader) is None
+        assert namespace.get_or_set("k", loader) == "ok"
+
+    def test_single_flight_under_concurrency(self, cache):
+        """Test concurrent misses for one key share a single load"""
+        namespace = cache.namespace("pages")
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "page"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(namespace.get_or_set("p1", loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["page"] * 8
+        assert len(calls) == 1
+
+
+class TestInMemoryCache:
+    """Test suite for the in-process backend"""
+
+    def test_ttl_expiry(self):
+        """Test entries disappear after their TTL"""
+        backend = InMemoryCache()
+        backend.set("k", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert backend.get("k") == (False, None)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        backend = InMemoryCache(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+
+        assert backend.get("b") == (False, None)
+        assert backend.get("a") == (True, 1)
+        assert backend.evictions == 1
+
+
+class TestBackendFailures:
+    """Test suite for cache backend outages"""
+
+    def test_backend_errors_degrade_to_misses(self):
+        """Test a broken backend falls through to the loader"""
+        client = Mock()
+        client.get.side_effect = ConnectionError("redis down")
+        client.set.side_effect = ConnectionError("redis down")
+        namespace = Cache(RedisCache(client), prefix="test", retry_after=0).namespace("users")
+
+        assert namespace.get_or_set("k", lambda: "value") == "value"
+        assert namespace.stats()["errors"] >= 2
+
+    def test_connection_errors_skip_the_backend_for_a_while(self):
+        """Test an unreachable backend is bypassed instead of timing out on every call"""
+        client = Mock()
+        client.get.side_effect = ConnectionError("redis down")
+        cache = Cache(RedisCache(client), prefix="test", retry_after=0.2)
+        users, notion = cache.namespace("users"), cache.namespace("notion")
+
+        assert users.get_or_set("k", lambda: "value") == "value"
+        assert notion.get("k") is None
+        users.set("k", "value")
+
+        assert client.get.call_count == 1
+        assert client.set.call_count == 0
+        assert users.stats()["skipped"] == 3 and notion.stats()["skipped"] == 1
+        assert cache.stats()["backend_trips"] == 1
+
+        time.sleep(0.25)
+        client.get.side_effect = None
+        client.get.return_value = b'"cached"'
+
+        assert users.get("k") == "cached"
+
+    def test_value_errors_do_not_skip_the_backend(self):
+        """Test errors unrelated to connectivity keep using the backend"""
+        client = Mock()
+        client.get.return_value = b"not json"
+        cache = Cache(RedisCache(client), prefix="test", retry_after=60)
+        namespace = cache.namespace("users")
+
+        assert namespace.get("a") is None
+        assert namespace.get("b") is None
+        assert client.get.call_count == 2
+        assert cache.available()
+
+    def test_unreachable_redis_falls_back_at_startup(self, monkeypatch):
+        """Test connect_cache pings Redis and keeps an in-process backend when it is down"""
+        pytest.importorskip("redis")
+        from src.utils import cache as cache_module
+
+        monkeypatch.setattr(cache_module.settings, "CACHE_BACKEND", "redis")
+        monkeypatch.setattr(cache_module.settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+
+        target = cache_module.connect_cache(Cache(RedisCache(Mock()), prefix="test"))
+        assert isinstance(target.backend, InMemoryCache)
+
+    def test_backend_interface_is_abstract(self):
+        """Test a backend missing operations cannot be instantiated"""
+        class GetOnly(CacheBackend):
+            def get(self, key):
+                return False, None
+
+        with pytest.raises(TypeError):
+            GetOnly()
@@ -0,0 +1,125 @@
+"""
+Tests for KeyedDebouncer: coalescing of bursty webhook events per key.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.utils.debounce import KeyedDebouncer
+
+
+@pytest.mark.asyncio
+class TestKeyedDebouncer:
+    """Test suite for KeyedDebouncer"""
+
+    async def test_burst_for_same_key_runs_handler_once(self):
+        """Test several events for one page collapse into one call"""
+        calls = []
+
+        async def handler(key, payload):
+            calls.append((key, payload))
+
+        debouncer = KeyedDebouncer(handler, window_seconds=0.05)
+
+        assert debouncer.submit("page-1", {"v": 1}) is True
+        assert debouncer.submit("page-1", {"v": 2}) is False
+        assert debouncer.submit("page-1", {"v": 3}) is False
+        await debouncer.flush()
+
+        assert calls == [("page-1", {"v": 3})]
+        assert debouncer.stats()["coalesced"] == 2
+        assert debouncer.stats()["executed"] == 1
+
+    async def test_distinct_keys_run_independently(self):
+        """Test different pages are not coalesced together"""
+        calls = []
+        debouncer = KeyedDebouncer(lambda key, payload: calls.append(key), window_seconds=0.01)
+
+        debouncer.submit("a")
+        debouncer.submit("b")
+        await debouncer.flush()
+
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_event_after_window_schedules_new_call(self):
+        """Test an event after the handler ran triggers another call"""
+        calls = []
+        debouncer = KeyedDebouncer(lambda key, payload: calls.append(key), window_seconds=0.01)
+
+        debouncer.submit("a")
+        await debouncer.flush()
+        debouncer.submit("a")
+        await debouncer.flush()
+
+        assert calls == ["a", "a"]
+
+    async def test_max_wait_bounds_continuous_stream(self):
+        """Test a steady stream still flushes after max_wait"""
+        calls = []
+        debouncer = KeyedDebouncer(
+            lambda key, payload: calls.append(payload),
+            window_seconds=0.05,
+            max_wait_seconds=0.08
+        )
+
+        for i in range(10):
+            debouncer.submit("a", i)
+            await asyncio.sleep(0.02)
+        await debouncer.flush()
+
+        assert len(calls) >= 2
+        assert calls[-1] == 9
+
+    async def test_handler_failure_is_counted(self):
+        """Test handler errors do not escape and are tracked"""
+        def handler(key, payload):
+            raise RuntimeError("Notion down")
+
+        debouncer = KeyedDebouncer(handler, window_seconds=0.01)
+        debouncer.submit("a")
+        await debouncer.flush()
+
+        assert debouncer.stats()["failed"] == 1
+        assert debouncer.pending == 0
+
+    async def test_stats_report_coalescing_ratio_and_throughput(self):
+        """Test stats expose the coalescing ratio and throughput figures"""
+        debouncer = KeyedDebouncer(lambda key, payload: None, window_seconds=0.01)
+
+        for _ in range(4):
+            debouncer.submit("a")
+        await debouncer.flush()
+        stats = debouncer.stats()
+
+        assert stats["coalescing_ratio"] == 0.75
+        assert stats["events_per_second"] > 0
+        assert stats["executions_per_second"] > 0
+
+
+@pytest.mark.asyncio
+class TestShutdownFlush:
+    """Test suite for debounced webhook events at application shutdown"""
+
+    async def test_pending_events_run_before_shutdown(self, monkeypatch):
+        """Test events still inside their debounce window are handled, not dropped"""
+        from src import main
+
+        for name in ("user_provisioner", "init_db", "connect_cache", "log_pool_layout",
+                     "setup_tracing", "shutdown_tracing"):
+            monkeypatch.setattr(main, name, Mock())
+        monkeypatch.setattr(main, "reminder_scheduler", Mock(schedule_leader_jobs=AsyncMock()))
+        monkeypatch.setattr(main, "dispose_async_engine", AsyncMock())
+        monkeypatch.setattr(main.settings, "LOOP_WATCHDOG_ENABLED", False)
+
+        calls = []
+        for debouncer in (main.notion_page_debouncer, main.notion_database_debouncer, main.mirror_debouncer):
+            monkeypatch.setattr(debouncer, "handler", lambda key, payload, name=debouncer.name: calls.append(name))
+            monkeypatch.setattr(debouncer, "window_seconds", 0.05)
+
+        async with main.lifespan(main.app):
+            main.notion_page_debouncer.submit("page-1")
+            main.notion_database_debouncer.submit("db-1")
+            main.mirror_debouncer.submit("page-2")
+
+        assert sorted(calls) == ["notion_database_change", "notion_mirror", "notion_page_change"]
+        main.dispose_async_engine.assert_awaited_once()
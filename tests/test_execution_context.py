@@ -0,0 +1,206 @@
+"""
+Tests for ExecutionContext: one session, one user load and shared lookups per message.
+"""
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.ai.execution_context import ExecutionContext
+from src.ai.function_executor import FunctionExecutor
+from src.api import webhooks
+from src.database.session import Base
+from src.database.models import Reminder, Task, TaskStatus, User
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with the full schema and statement/checkout counters."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    engine.checkouts = 0
+    engine.checkins = 0
+    engine.statements = []
+
+    @event.listens_for(engine, "checkout")
+    def count_checkout(*args):
+        engine.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def count_checkin(*args):
+        engine.checkins += 1
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record_statement(conn, cursor, statement, *args):
+        engine.statements.append(statement)
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def user_id(session_factory, engine):
+    db = session_factory()
+    user = User(phone_number="5511999999999", name="Ana")
+    db.add(user)
+    db.flush()
+    db.add_all([
+        Task(user_id=user.id, title="Relatório"),
+        Task(user_id=user.id, title="Planilha"),
+    ])
+    db.commit()
+    user_id = user.id
+    db.close()
+    engine.checkouts = 0
+    engine.checkins = 0
+    engine.statements.clear()
+    return user_id
+
+
+def _user_selects(engine):
+    return [s for s in engine.statements if s.lstrip().startswith("SELECT") and "FROM users" in s]
+
+
+class TestExecutionContext:
+    """Test suite for ExecutionContext"""
+
+    def test_functions_of_one_message_share_one_checkout(self, engine, session_factory, user_id):
+        """Test several executor calls with one context check out one connection"""
+        executor = FunctionExecutor()
+
+        with ExecutionContext(user_id, session_factory=session_factory, engine=engine) as context:
+            done = json.loads(executor.execute("mark_done", {"task_numbers": [1]}, str(user_id), context))
+            progress = json.loads(executor.execute("view_progress", {}, str(user_id), context))
+            reminders = json.loads(executor.execute("list_reminders", {}, str(user_id), context))
+
+        assert done["success"] and progress["success"] and reminders["success"]
+        assert progress["data"]["completed"] == 1
+        assert engine.checkouts == 1
+        assert len(_user_selects(engine)) == 1
+
+    def test_failed_function_does_not_break_the_next_one(self, engine, session_factory, user_id):
+        """Test a function whose flush fails is rolled back before the next call"""
+        executor = FunctionExecutor()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def fail_task_insert(conn, cursor, statement, *args):
+            if statement.lstrip().startswith("INSERT INTO tasks"):
+                raise RuntimeError("disk I/O error")
+
+        with ExecutionContext(user_id, session_factory=session_factory, engine=engine) as context:
+            created = json.loads(executor.execute("create_task", {"title": "Boleto"}, str(user_id), context))
+            done = json.loads(executor.execute("mark_done", {"task_numbers": [1]}, str(user_id), context))
+
+        db = session_factory()
+        tasks = db.query(Task).order_by(Task.id).all()
+        db.close()
+
+        assert not created["success"]
+        assert done["success"]
+        assert [t.title for t in tasks] == ["Relatório", "Planilha"]
+        assert tasks[0].status == TaskStatus.COMPLETED
+
+    def test_reminders_are_listed_in_local_time(self, engine, session_factory, user_id, monkeypatch):
+        """Test reminders stored in UTC are shown in the configured timezone"""
+        monkeypatch.setattr("src.ai.function_executor.settings.TIMEZONE", "America/Sao_Paulo")
+        db = session_factory()
+        task = db.query(Task).filter(Task.user_id == user_id).order_by(Task.id).first()
+        db.add(Reminder(task_id=task.id, user_id=user_id, scheduled_time=datetime(2025, 11, 10, 12, 0)))
+        db.commit()
+        db.close()
+
+        with ExecutionContext(user_id, session_factory=session_factory, engine=engine) as context:
+            reminders = json.loads(FunctionExecutor().execute("list_reminders", {}, str(user_id), context))
+
+        assert reminders["data"] == "• Relatório @ 10/11/2025 09:00"
+
+    def test_connection_is_released_before_the_follow_up_llm_call(self, engine, session_factory, user_id):
+        """Test the message's connection is back in the pool while the model writes the reply"""
+        held_during_reply = []
+
+        def chat_completion(messages, user_id, user_name=None, function_call=None):
+            if function_call:
+                return {"function_call": {"name": "view_progress", "arguments": {"period": "all"}}}
+            held_during_reply.append(engine.checkouts - engine.checkins)
+            return {"content": "Tudo certo"}
+
+        context = ExecutionContext(user_id, session_factory=session_factory, engine=engine)
+        with patch.object(webhooks.command_matcher, "match", return_value=None), \
+                patch.object(webhooks.openai_client, "chat_completion", side_effect=chat_completion):
+            payload = asyncio.run(webhooks.process_with_openai(str(user_id), "como estou?", context=context))
+
+        assert payload["message"]
+        assert engine.checkouts == 1
+        assert held_during_reply == [0]
+
+    def test_invalid_user_id_is_reported_as_failure(self):
+        """Test a non-numeric user id gives a JSON error instead of raising"""
+        result = json.loads(FunctionExecutor().execute("view_progress", {}, "not-a-number"))
+
+        assert not result["success"]
+
+    def test_task_list_is_memoized(self, engine, session_factory, user_id):
+        """Test the user's tasks are loaded once per context"""
+        with ExecutionContext(user_id, session_factory=session_factory, engine=engine) as context:
+            first = context.tasks()
+            second = context.tasks()
+            context.invalidate("tasks")
+            third = context.tasks()
+
+        task_selects = [s for s in engine.statements if "FROM tasks" in s]
+        assert first is second
+        assert [t.title for t in third] == ["Relatório", "Planilha"]
+        assert len(task_selects) == 2
+
+    def test_preloaded_user_is_attached_without_query(self, engine, session_factory, user_id):
+        """Test a user loaded by the caller is merged without a SELECT"""
+        db = session_factory()
+        user = db.get(User, user_id)
+        db.expunge(user)
+        db.close()
+        engine.statements.clear()
+
+        with ExecutionContext(user_id, user=user, session_factory=session_factory, engine=engine) as context:
+            attached = context.user
+            assert attached.phone_number == "5511999999999"
+            assert attached in context.session
+
+        assert _user_selects(engine) == []
+
+    def test_commits_keep_the_connection(self, engine, session_factory, user_id):
+        """Test writes are committed while the connection stays checked out"""
+        with ExecutionContext(user_id, session_factory=session_factory, engine=engine) as context:
+            context.tasks()[0].status = TaskStatus.COMPLETED
+            context.session.commit()
+            context.tasks()[1].status = TaskStatus.IN_PROGRESS
+            context.session.commit()
+
+        db = session_factory()
+        statuses = [t.status for t in db.query(Task).order_by(Task.id).all()]
+        db.close()
+
+        assert statuses == [TaskStatus.COMPLETED, TaskStatus.IN_PROGRESS]
+
+    def test_caller_session_is_not_closed(self, session_factory, user_id):
+        """Test a context built on an existing session leaves it open"""
+        db = session_factory()
+        context = ExecutionContext(user_id, session=db)
+
+        assert context.user.name == "Ana"
+        context.close()
+
+        assert db.get(User, user_id) is not None
+        db.close()
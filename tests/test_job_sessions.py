@@ -0,0 +1,156 @@
+"""
+Tests for background job sessions and connection pool metrics.
+"""
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+
+from src.api import webhooks
+from src.database.jobs import JobSessionManager
+from src.database.models import User
+from src.database.pool_metrics import MeteredQueuePool, pool_stats
+from src.database.session import Base
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed SQLite engine with a small metered pool."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.2
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def manager(engine):
+    return JobSessionManager(sessionmaker(autocommit=False, autoflush=False, bind=engine), bind=engine)
+
+
+class TestJobSessionManager:
+    """Test suite for JobSessionManager"""
+
+    def test_session_commits_and_returns_connection(self, manager, engine):
+        """Test a job commits its work and releases its connection"""
+        with manager.session("create_user") as db:
+            db.add(User(phone_number="5511999999999", name="Ana"))
+
+        with manager.session() as db:
+            assert db.query(User).count() == 1
+
+        stats = manager.stats()
+        assert stats["jobs"]["opened"] == 2
+        assert stats["jobs"]["active"] == 0
+        assert stats["pool"]["checked_out"] == 0
+
+    def test_failed_job_rolls_back(self, manager):
+        """Test an exception rolls back the job and is counted"""
+        with pytest.raises(RuntimeError):
+            with manager.session() as db:
+                db.add(User(phone_number="5511999999999"))
+                db.flush()
+                raise RuntimeError("boom")
+
+        with manager.session() as db:
+            assert db.query(User).count() == 0
+        assert manager.stats()["jobs"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_run_uses_a_session_in_a_worker_thread(self, manager):
+        """Test async jobs get their own session off the event loop"""
+        loop_thread = threading.get_ident()
+
+        def job(db, phone):
+            db.add(User(phone_number=phone))
+            return threading.get_ident()
+
+        job_thread = await manager.run(job, "5511888888888")
+
+        assert job_thread != loop_thread
+        assert manager.run_sync(lambda db: db.query(User).count()) == 1
+
+
+class TestPoolMetrics:
+    """Test suite for pool saturation metrics"""
+
+    def test_reports_checked_out_and_overflow(self, engine):
+        """Test checked-out and overflow connections are reported"""
+        first = engine.connect()
+        second = engine.connect()
+        try:
+            stats = pool_stats(engine)
+            assert stats["checked_out"] == 2
+            assert stats["overflow"] == 1
+            assert stats["saturation"] == 1.0
+        finally:
+            first.close()
+            second.close()
+
+        assert pool_stats(engine)["checked_out"] == 0
+
+    def test_records_wait_time_and_timeouts(self, engine):
+        """Test exhausted pools record the wait and the timeout"""
+        held = [engine.connect(), engine.connect()]
+        try:
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        finally:
+            for connection in held:
+                connection.close()
+
+        stats = pool_stats(engine)
+        assert stats["timeouts"] == 1
+        assert stats["wait_max_ms"] >= 150
+
+    def test_idle_acquisitions_do_not_count_as_waits(self, engine):
+        """Test connections served from the pool are not counted as waits"""
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        stats = pool_stats(engine)
+        assert stats["acquisitions"] >= 3
+        assert stats["timeouts"] == 0
+
+
+class TestWebhookSessions:
+    """Test suite for webhook background work"""
+
+    def test_evolution_webhook_does_not_pass_request_session(self, monkeypatch):
+        """Test the background task receives no request-scoped session"""
+        queued = []
+        monkeypatch.setattr(webhooks, "process_incoming_message", lambda **kwargs: queued.append(kwargs))
+        app = FastAPI()
+        app.include_router(webhooks.router)
+
+        response = TestClient(app).post("/webhook/evolution", json={
+            "event": "messages.upsert",
+            "data": {
+                "key": {"remoteJid": "5511999999999@s.whatsapp.net", "fromMe": False},
+                "pushName": "Ana",
+                "message": {"conversation": "minhas tarefas"}
+            }
+        })
+
+        assert response.json()["status"] == "success"
+        assert queued == [{"phone_number": "5511999999999", "message_text": "minhas tarefas", "user_name": "Ana"}]
+
+    def test_database_health_reports_pool(self):
+        """Test /health/db exposes pool and job counters"""
+        app = FastAPI()
+        app.include_router(webhooks.router)
+
+        body = TestClient(app).get("/health/db").json()
+
+        assert body["pool"]["pool"] == "MeteredQueuePool"
+        assert "active" in body["jobs"]
@@ -0,0 +1,148 @@
+"""
+Tests for scheduler leader election and the singleton jobs it guards.
+"""
+from unittest.mock import Mock, patch
+
+import asyncio
+import threading
+
+import pytest
+
+from src.database.leader import LeaderLock
+from src.integrations.scheduler import ReminderScheduler
+
+
+def postgres_lock(acquired=True, forced=None, pgbouncer=False):
+    """LeaderLock on a fake PostgreSQL engine whose try-lock returns ``acquired``."""
+    connection = Mock()
+    connection.execute.return_value.scalar.return_value = acquired
+    engine = Mock()
+    engine.dialect.name = "postgresql"
+    engine.connect.return_value = connection
+    lock = LeaderLock(database_url="postgresql://db/pangeia", pgbouncer=pgbouncer)
+    lock.forced = forced
+    lock._engine = engine
+    return lock, engine, connection
+
+
+class TestLeaderLock:
+    """Test suite for LeaderLock"""
+
+    def test_sqlite_process_always_leads(self, tmp_path):
+        """Test a single-process database needs no election"""
+        lock = LeaderLock(database_url=f"sqlite:///{tmp_path / 'leader.db'}", pgbouncer=False)
+        lock.forced = None
+
+        assert lock.acquire() is True
+        lock.release()
+
+    def test_forced_setting_skips_the_election(self):
+        """Test SCHEDULER_LEADER true/false answers without touching the database"""
+        leader, engine, _ = postgres_lock(forced=True)
+        follower, _, _ = postgres_lock(forced=False)
+
+        assert leader.acquire() is True and leader.is_leader
+        assert follower.acquire() is False and not follower.is_leader
+        engine.connect.assert_not_called()
+
+    def test_lock_holder_keeps_its_connection(self):
+        """Test the winner keeps the lock connection open and re-confirms on it"""
+        lock, engine, connection = postgres_lock(acquired=True)
+
+        assert lock.acquire() is True
+        assert lock.acquire() is True
+
+        engine.connect.assert_called_once()
+        # Both the election and the liveness check end their transaction
+        assert connection.commit.call_count == 2
+        assert "pg_try_advisory_lock" in str(connection.execute.call_args_list[0].args[0])
+        connection.close.assert_not_called()
+
+        lock.release()
+        connection.close.assert_called_once()
+        assert not lock.is_leader
+
+    def test_loser_closes_its_connection(self):
+        """Test a process that does not get the lock is not the leader"""
+        lock, _, connection = postgres_lock(acquired=False)
+
+        assert lock.acquire() is False
+        assert not lock.is_leader
+        connection.close.assert_called_once()
+
+    def test_failed_election_closes_its_connection(self):
+        """Test a connection whose try-lock query fails is not leaked"""
+        lock, _, connection = postgres_lock()
+        connection.execute.side_effect = OSError("server closed the connection")
+
+        assert lock.acquire() is False
+        connection.close.assert_called_once()
+
+    def test_lost_connection_steps_down(self):
+        """Test the leader re-runs the election once its lock connection is gone"""
+        lock, engine, connection = postgres_lock(acquired=True)
+        assert lock.acquire() is True
+
+        connection.execute.side_effect = OSError("server closed the connection")
+        engine.connect.return_value = Mock(**{"execute.return_value.scalar.return_value": False})
+
+        assert lock.acquire() is False
+        assert not lock.is_leader
+        assert engine.connect.call_count == 2
+
+    def test_pgbouncer_disables_the_election(self):
+        """Test no process elects itself behind PgBouncer, with a single warning"""
+        lock, engine, _ = postgres_lock(pgbouncer=True)
+
+        with patch("src.database.leader.logger") as logger:
+            assert lock.acquire() is False
+            assert lock.acquire() is False
+
+        engine.connect.assert_not_called()
+        assert logger.warning.call_count == 1
+        assert "SCHEDULER_LEADER" in logger.warning.call_args.args[0]
+
+
+class TestSchedulerLeadership:
+    """Test suite for leader-gated scheduling in ReminderScheduler"""
+
+    @pytest.fixture
+    def scheduler(self):
+        scheduler = ReminderScheduler()
+        scheduler.leader = Mock()
+        return scheduler
+
+    def _job_ids(self, scheduler):
+        return {job.id for job in scheduler.scheduler.get_jobs()}
+
+    def test_follower_does_not_schedule_singleton_jobs(self, scheduler):
+        """Test a non-leader only schedules the election"""
+        scheduler.leader.acquire.return_value = False
+
+        asyncio.run(scheduler.schedule_leader_jobs())
+
+        assert self._job_ids(scheduler) == {"leader_election"}
+
+    def test_first_election_runs_off_the_event_loop(self, scheduler):
+        """Test the blocking connect of the first election is not done on the loop thread"""
+        threads = []
+        scheduler.leader.acquire.side_effect = lambda: threads.append(threading.get_ident()) or False
+
+        asyncio.run(scheduler.schedule_leader_jobs())
+
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_leader_schedules_and_drops_singleton_jobs(self, scheduler):
+        """Test the jobs follow leadership as it is won and lost"""
+        scheduler.leader.acquire.return_value = True
+        asyncio.run(scheduler.schedule_leader_jobs())
+        assert self._job_ids(scheduler) == {"leader_election", "notion_user_reconcile", "daily_notion_sync"}
+
+        scheduler.leader.acquire.return_value = False
+        scheduler._check_leadership()
+        assert self._job_ids(scheduler) == {"leader_election"}
+        assert not scheduler.leading
+
+        scheduler.leader.acquire.return_value = True
+        scheduler._check_leadership()
+        assert self._job_ids(scheduler) == {"leader_election", "notion_user_reconcile", "daily_notion_sync"}
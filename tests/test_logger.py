@@ -0,0 +1,110 @@
+"""
+Tests for the logging pipeline.
+"""
+import io
+import logging
+import queue
+import threading
+
+from src.utils import logger as logger_module
+from src.utils.logger import NonBlockingQueueHandler, SamplingFilter, redact, setup_logger, shutdown_logging
+
+
+def _record(msg="event %s", args=("x",), level=logging.INFO, lineno=10):
+    return logging.LogRecord("test", level, "/app/module.py", lineno, msg, args, None)
+
+
+class TestRedaction:
+    """Test suite for PII and credential redaction"""
+
+    def test_masks_phone_numbers_keeping_last_digits(self):
+        """Test phone numbers and WhatsApp ids keep only their last four digits"""
+        line = redact("Message sent to 5511999998888 (jid 5511999998888@s.whatsapp.net)")
+
+        assert "5511999998888" not in line
+        assert "*********8888" in line
+
+    def test_masks_emails_and_credentials(self):
+        """Test e-mails, API keys and bearer tokens are masked"""
+        line = redact(
+            'user ana.silva@example.com key=sk-abcdefghijklmnop1234 '
+            '{"apikey": "evo-123"} Authorization: Bearer abc.def.ghi'
+        )
+
+        assert "ana.silva" not in line and "***@example.com" in line
+        assert "sk-abcdefghijklmnop1234" not in line
+        assert "evo-123" not in line
+        assert "abc.def.ghi" not in line
+
+    def test_leaves_ordinary_numbers_alone(self):
+        """Test ids, durations and dates are not mistaken for phone numbers"""
+        line = "Task 1234 synced in 250ms on 2026-10-19 12:00:00 (page 1a2b3c4d5e6f7a8b9c0d)"
+
+        assert redact(line) == line
+
+
+class TestSamplingFilter:
+    """Test suite for SamplingFilter"""
+
+    def test_keeps_burst_then_samples(self):
+        """Test records beyond the burst are dropped at rate 0"""
+        sampler = SamplingFilter(burst=3, rate=0.0)
+
+        kept = [sampler.filter(_record()) for _ in range(10)]
+
+        assert kept == [True] * 3 + [False] * 7
+        assert sampler.sampled_out == 7
+
+    def test_call_sites_and_warnings_are_independent(self):
+        """Test each call site has its own budget and warnings always pass"""
+        sampler = SamplingFilter(burst=1, rate=0.0)
+
+        assert sampler.filter(_record(lineno=1))
+        assert sampler.filter(_record(lineno=2))
+        assert not sampler.filter(_record(lineno=1))
+        assert all(sampler.filter(_record(level=logging.WARNING, lineno=1)) for _ in range(5))
+
+
+class TestQueueHandler:
+    """Test suite for the non-blocking queue handler"""
+
+    def test_message_is_rendered_before_queueing(self):
+        """Test arguments are merged on the calling thread and not shared with the listener"""
+        log_queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        payload = ["a", 1]
+
+        handler.handle(_record("payload %s", (payload,)))
+        payload.append("changed later")
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "payload ['a', 1]"
+        assert queued.args is None
+        assert queued.getMessage() == "payload ['a', 1]"
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test a full queue drops and counts records"""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        handler.handle(_record())
+        handler.handle(_record())
+
+        assert handler.dropped == 1
+
+    def test_listener_writes_redacted_records(self, monkeypatch):
+        """Test records are formatted and written by the listener thread"""
+        stream = io.StringIO()
+        writers = []
+        monkeypatch.setattr(logger_module.sys, "stdout", stream)
+        monkeypatch.setattr(logger_module.settings, "LOG_SAMPLE_RATE", 1.0)
+        test_logger = setup_logger("pangeia_test_pipeline")
+        test_logger.propagate = False
+        console = logger_module._listeners["pangeia_test_pipeline"].handlers[0]
+        original_emit = console.emit
+        monkeypatch.setattr(console, "emit", lambda record: (writers.append(threading.get_ident()), original_emit(record)))
+
+        test_logger.info("New user created: %s", "5511999998888")
+        shutdown_logging("pangeia_test_pipeline")
+
+        assert "*********8888" in stream.getvalue()
+        assert writers and writers[0] != threading.get_ident()
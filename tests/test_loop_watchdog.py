@@ -0,0 +1,101 @@
+"""
+Tests for the event-loop watchdog.
+"""
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+from src.integrations.evolution_api import EvolutionAPIClient
+from src.utils import metrics
+from src.utils.loop_watchdog import LoopWatchdog
+
+
+def slow_post(*args, **kwargs):
+    """requests.post stand-in that holds the calling thread."""
+    time.sleep(0.2)
+    return Mock(status_code=201, json=Mock(return_value={"status": "sent"}))
+
+
+def _blocks(culprit):
+    return metrics.registry.get_sample_value("pangeia_event_loop_blocks_total", {"culprit": culprit}) or 0.0
+
+
+def watch(scenario, **options):
+    """Run ``scenario()`` on a fresh loop with a watchdog started on it."""
+    watchdog = LoopWatchdog(**{"threshold": 0.05, "interval": 0.01, "log_interval": 60, **options})
+
+    async def main():
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            await scenario()
+            await asyncio.sleep(0.05)
+        finally:
+            watchdog.shutdown()
+
+    asyncio.run(main())
+    return watchdog
+
+
+class TestLoopWatchdog:
+    """Test suite for LoopWatchdog"""
+
+    def test_healthy_loop_reports_nothing(self):
+        """Test a loop that only awaits records lag samples but no blocks"""
+        watchdog = watch(lambda: asyncio.sleep(0.2))
+
+        assert watchdog.heartbeats >= 10
+        assert watchdog.blocks == 0
+        assert not watchdog.running
+
+    def test_sync_call_on_the_loop_is_attributed(self):
+        """Test a blocking Evolution API call is reported under the public client method"""
+        client = EvolutionAPIClient()
+        culprit = "EvolutionAPIClient.send_text_message"
+        before = _blocks(culprit)
+
+        async def scenario():
+            client.send_text_message("5511999990000", "oi")
+            await asyncio.sleep(0.03)
+            client.send_text_message("5511999990000", "tudo bem?")
+
+        with patch("src.integrations.evolution_api.requests.post", side_effect=slow_post), \
+                patch("src.utils.loop_watchdog.logger") as logger:
+            watchdog = watch(scenario)
+
+        assert watchdog.blocks == 2
+        block = watchdog.recent[0]
+        assert block["culprit"] == culprit
+        assert block["call"].startswith("slow_post (")
+        assert block["blocked_seconds"] >= 0.1
+        assert any("EvolutionAPIClient._send" in frame for frame in block["stack"])
+        assert _blocks(culprit) == before + 2
+
+        # Rate-limited: the second block of the same culprit is only counted
+        assert logger.warning.call_count == 1
+        assert culprit in logger.warning.call_args.args[2]
+
+    def test_repeats_are_counted_in_the_next_log(self):
+        """Test blocks suppressed by the rate limit are counted in the next log line"""
+        watchdog = LoopWatchdog(log_interval=60)
+        capture = (0.0, "NotionTaskReader.get_tasks", "recv (ssl.py:1)", ["get_tasks (src/x.py:1)"])
+
+        with patch("src.utils.loop_watchdog.logger") as logger:
+            for _ in range(3):
+                watchdog._report(0.2, capture)
+            watchdog._last_logged["NotionTaskReader.get_tasks"] -= 61
+            watchdog._report(0.3, capture)
+
+        counts = [call.args[4] for call in logger.warning.call_args_list]
+        assert counts == [0, 2]
+        assert watchdog.stats()["blocks"] == 4
+        assert watchdog.stats()["blocked_seconds"] == 0.9
+
+    def test_culprit_labels_are_bounded(self, monkeypatch):
+        """Test metric labels collapse to "other" past the culprit limit"""
+        monkeypatch.setattr("src.utils.loop_watchdog.MAX_CULPRITS", 1)
+        watchdog = LoopWatchdog()
+
+        assert watchdog._label("first") == "first"
+        assert watchdog._label("second") == "other"
+        assert watchdog._label("first") == "first"
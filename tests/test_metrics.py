@@ -0,0 +1,163 @@
+"""
+Tests for Prometheus metrics.
+"""
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.ai.function_executor import FunctionExecutor
+from src.api import webhooks
+from src.integrations.notion_gateway import NotionGateway
+from src.utils import metrics
+from src.utils.metrics import RequestMetricsMiddleware, StatsCollector, instrument_engine, timed
+
+
+def _sample(name, **labels):
+    return metrics.registry.get_sample_value(name, labels) or 0.0
+
+
+def _run_worker(code, multiproc_dir):
+    """Run ``code`` in a fresh interpreter with multiprocess metrics enabled."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=root, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+class TestTimed:
+    """Test suite for the timed helper"""
+
+    def test_records_success_and_error_outcomes(self):
+        """Test the outcome label follows whether the block raised"""
+        name = "pangeia_message_stage_duration_seconds_count"
+        success = _sample(name, stage="test_stage", outcome="success")
+        error = _sample(name, stage="test_stage", outcome="error")
+
+        with timed(metrics.message_stage_duration, stage="test_stage"):
+            pass
+        with pytest.raises(ValueError):
+            with timed(metrics.message_stage_duration, stage="test_stage"):
+                raise ValueError("boom")
+
+        assert _sample(name, stage="test_stage", outcome="success") == success + 1
+        assert _sample(name, stage="test_stage", outcome="error") == error + 1
+
+
+class TestInstrumentation:
+    """Test suite for per-stage instrumentation"""
+
+    def test_engine_records_statements_by_kind(self):
+        """Test every statement is timed and labelled by its kind"""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine, "test")
+        instrument_engine(engine, "test")  # idempotent
+
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER)"))
+            connection.execute(text("INSERT INTO items VALUES (1)"))
+            connection.execute(text("SELECT * FROM items")).all()
+            connection.execute(text("SELECT * FROM items")).all()
+
+        name = "pangeia_db_query_duration_seconds_count"
+        assert _sample(name, engine="test", statement="SELECT") == 2
+        assert _sample(name, engine="test", statement="INSERT") == 1
+        assert _sample(name, engine="test", statement="OTHER") == 1
+
+    def test_request_metrics_use_the_route_template(self):
+        """Test requests are labelled by route template, not raw path"""
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        name = "pangeia_http_request_duration_seconds_count"
+        assert _sample(name, method="GET", route="/items/{item_id}", status="200") >= 2
+        assert _sample(name, method="GET", route="unmatched", status="404") >= 1
+
+    def test_function_latency_per_function(self):
+        """Test functions are timed by name and unknown names are bucketed"""
+        executor = FunctionExecutor()
+        name = "pangeia_function_duration_seconds_count"
+        before = _sample(name, function="unknown", outcome="error")
+
+        executor.execute("made_up_function", {}, "1", context=Mock())
+
+        assert _sample(name, function="unknown", outcome="error") == before + 1
+
+    def test_notion_calls_per_endpoint(self):
+        """Test gateway calls are timed by endpoint"""
+        gateway = NotionGateway(client=Mock(), rate_limiter=Mock())
+        name = "pangeia_notion_request_duration_seconds_count"
+        before = _sample(name, endpoint="pages.retrieve", outcome="success")
+
+        gateway.pages.retrieve(page_id="abc")
+
+        assert _sample(name, endpoint="pages.retrieve", outcome="success") == before + 1
+
+
+class TestStatsCollector:
+    """Test suite for component stats export"""
+
+    def test_exports_nested_numeric_stats(self):
+        """Test nested numbers become gauges and failing sources are skipped"""
+        collector = StatsCollector()
+        collector.register("jobs", lambda: {"active": 2, "pool": {"saturation": 0.5, "pool": "QueuePool"}})
+        collector.register("broken", Mock(side_effect=RuntimeError("down")))
+
+        family = list(collector.collect())[0]
+        samples = {(s.labels["component"], s.labels["stat"]): s.value for s in family.samples}
+
+        assert samples == {("jobs", "active"): 2.0, ("jobs", "pool.saturation"): 0.5}
+
+    def test_metrics_endpoint(self):
+        """Test /metrics serves the Prometheus text format"""
+        app = FastAPI()
+        app.include_router(webhooks.router)
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "pangeia_llm_request_duration_seconds" in response.text
+
+
+class TestMultiprocess:
+    """Test suite for metrics across several worker processes"""
+
+    def test_scrape_aggregates_every_worker(self, tmp_path):
+        """Test counters incremented in two workers are summed by any worker's /metrics"""
+        increment = (
+            "from src.utils import metrics; "
+            "metrics.notion_retries.labels(endpoint='pages.update').inc()"
+        )
+        _run_worker(increment, tmp_path)
+        _run_worker(increment, tmp_path)
+
+        output = _run_worker("from src.utils import metrics; print(metrics.render().decode())", tmp_path)
+
+        assert 'pangeia_notion_retries_total{endpoint="pages.update"} 2.0' in output
+        assert "process_cpu_seconds_total" not in output
+
+    def test_several_workers_without_shared_directory_warn(self):
+        """Test a multi-worker setup without PROMETHEUS_MULTIPROC_DIR is reported"""
+        with patch.object(metrics, "MULTIPROC_DIR", None), patch.object(metrics, "logger") as logger:
+            assert metrics.check_worker_setup(1) is True
+            assert metrics.check_worker_setup(4) is False
+
+        logger.warning.assert_called_once()
@@ -0,0 +1,138 @@
+"""
+Tests for schema migrations and the indexes behind the hot queries.
+"""
+from datetime import datetime
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, select, text
+
+from src.database.migrate import alembic_config, current_revision, upgrade_to_head
+from src.database.models import Category, ConversationHistory, Reminder, Task, TaskStatus
+from src.database.session import Base
+
+
+HEAD = "0002"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Empty file-backed SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def migrated(engine):
+    """Database built by the migrations alone."""
+    upgrade_to_head(engine)
+    return engine
+
+
+def _plan(connection, statement) -> str:
+    """EXPLAIN QUERY PLAN of an ORM statement, one detail string per step."""
+    compiled = statement.compile(connection)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+class TestMigrations:
+    """Test suite for the Alembic revisions"""
+
+    def test_upgrade_builds_the_model_schema(self, migrated):
+        """Test an empty database is migrated to the schema the models declare"""
+        inspector = inspect(migrated)
+
+        assert current_revision(migrated) == HEAD
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            assert columns == set(table.columns.keys()), table.name
+            index_names = {index["name"] for index in inspector.get_indexes(table.name)}
+            assert {index.name for index in table.indexes} <= index_names, table.name
+
+    def test_unversioned_database_is_stamped_and_upgraded(self, engine):
+        """Test a pre-migration database keeps its rows and gains the new schema"""
+        cfg = alembic_config()
+        with engine.begin() as connection:
+            cfg.attributes["connection"] = connection
+            command.upgrade(cfg, "0001")
+            connection.execute(text("DROP TABLE alembic_version"))
+            connection.execute(text("INSERT INTO users (phone_number, is_active) VALUES ('5511999999999', 1)"))
+
+        upgrade_to_head(engine)
+
+        inspector = inspect(engine)
+        assert current_revision(engine) == HEAD
+        assert "notion_last_edited_at" in {column["name"] for column in inspector.get_columns("tasks")}
+        assert "ix_tasks_user_status" in {index["name"] for index in inspector.get_indexes("tasks")}
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM users")).scalar() == 1
+
+    def test_create_all_database_is_brought_under_migrations(self, engine):
+        """Test a database already matching the models upgrades without errors"""
+        Base.metadata.create_all(bind=engine)
+
+        upgrade_to_head(engine)
+        upgrade_to_head(engine)
+
+        assert current_revision(engine) == HEAD
+
+    def test_downgrade_restores_the_baseline(self, migrated):
+        """Test the revision can be rolled back"""
+        cfg = alembic_config()
+        with migrated.begin() as connection:
+            cfg.attributes["connection"] = connection
+            command.downgrade(cfg, "0001")
+
+        inspector = inspect(migrated)
+        assert "notion_mirrors" not in inspector.get_table_names()
+        assert "ix_tasks_user_status" not in {index["name"] for index in inspector.get_indexes("tasks")}
+
+
+class TestQueryPlans:
+    """Test suite checking the hot queries use their indexes"""
+
+    def test_tasks_by_user_and_status(self, migrated):
+        """Test task lists filtered by status use ix_tasks_user_status"""
+        statement = select(Task).where(Task.user_id == 1, Task.status == TaskStatus.PENDING)
+
+        with migrated.connect() as connection:
+            assert "USING INDEX ix_tasks_user_status (user_id=? AND status=?)" in _plan(connection, statement)
+
+    def test_due_reminders(self, migrated):
+        """Test due-reminder polling uses the partial index on unsent reminders"""
+        statement = (
+            select(Reminder)
+            .where(Reminder.sent == False, Reminder.scheduled_time <= datetime.utcnow())  # noqa: E712
+            .order_by(Reminder.scheduled_time)
+        )
+
+        with migrated.connect() as connection:
+            plan = _plan(connection, statement)
+
+        assert "USING INDEX ix_reminders_pending_scheduled (scheduled_time<?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_category_by_user_and_name(self, migrated):
+        """Test category lookup uses ix_categories_user_name"""
+        statement = select(Category).where(Category.user_id == 1, Category.name == "Work")
+
+        with migrated.connect() as connection:
+            assert "USING INDEX ix_categories_user_name (user_id=? AND name=?)" in _plan(connection, statement)
+
+    def test_conversation_history_in_time_order(self, migrated):
+        """Test recent history per user is read from ix_conversation_history_user_created"""
+        statement = (
+            select(ConversationHistory)
+            .where(ConversationHistory.user_id == 1)
+            .order_by(ConversationHistory.created_at.desc())
+            .limit(20)
+        )
+
+        with migrated.connect() as connection:
+            plan = _plan(connection, statement)
+
+        assert "USING INDEX ix_conversation_history_user_created (user_id=?)" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,46 @@
+"""
+Tests for canonical Notion property serialization and digests.
+"""
+from src.utils.notion_hash import canonicalize_properties, properties_digest
+
+
+class TestPropertiesDigest:
+    """Test suite for properties_digest"""
+
+    def test_read_and_write_forms_hash_equal(self):
+        """Test a page read from Notion hashes like the payload that wrote it"""
+        written = {
+            "Nome": {"title": [{"text": {"content": "Deploy"}}]},
+            "Status": {"select": {"name": "A Fazer"}},
+            "Prazo": {"date": {"start": "2025-01-10T12:00:00"}},
+        }
+        read = {
+            "Status": {"id": "abc", "type": "select", "select": {"id": "x", "name": "A Fazer", "color": "red"}},
+            "Nome": {
+                "id": "title",
+                "type": "title",
+                "title": [{"type": "text", "plain_text": "Deploy", "annotations": {"bold": False},
+                           "text": {"content": "Deploy", "link": None}}]
+            },
+            "Prazo": {"id": "d", "type": "date", "date": {"start": "2025-01-10T12:00:00.000+00:00", "end": None}},
+        }
+
+        assert properties_digest(written) == properties_digest(read)
+
+    def test_digest_changes_with_content(self):
+        """Test any value change yields a different digest"""
+        base = {"Status": {"select": {"name": "A Fazer"}}}
+        changed = {"Status": {"select": {"name": "Concluído"}}}
+
+        assert properties_digest(base) != properties_digest(changed)
+
+    def test_order_and_empty_values_are_ignored(self):
+        """Test list order and empty properties do not affect the digest"""
+        left = {
+            "Tags": {"multi_select": [{"name": "b"}, {"name": "a"}]},
+            "Notes": {"rich_text": []},
+        }
+        right = {"Tags": {"multi_select": [{"name": "a"}, {"name": "b"}]}}
+
+        assert canonicalize_properties(left) == {"Tags": ["a", "b"]}
+        assert properties_digest(left) == properties_digest(right)
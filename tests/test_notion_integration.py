@@ -5,7 +5,12 @@ Tests user profile sync, onboarding tracking, and data retrieval
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
+from notion_client.errors import APIResponseError, APIErrorCode
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from src.integrations.notion_users import NotionUserManager
+from src.database.session import Base
 from src.database.models import User
 
 
@@ -35,6 +40,9 @@ def mock_user():
     user.phone_number = '+5511987654321'
     user.name = 'Estevao Antunes'
     user.created_at = datetime.utcnow()
+    user.notion_hash = None
+    user.notion_page_id = None
+    user.onboarding_stage = None
     return user
 
 
@@ -90,6 +98,23 @@ class TestNotionUserManager:
         assert result['id'] == 'page-id-123'
         notion_manager.client.databases.query.assert_called_once()
 
+    def test_get_user_by_phone_is_cached_until_write(self, notion_manager, mock_notion_page):
+        """Test repeated lookups hit Notion once and writes invalidate them"""
+        # Arrange
+        phone_number = '+5511987654321'
+        notion_manager.client.databases.query.return_value = {
+            'results': [mock_notion_page]
+        }
+
+        # Act
+        notion_manager.get_user_by_phone(phone_number)
+        notion_manager.get_user_by_phone(phone_number)
+        notion_manager.mark_onboarding_complete(phone_number)
+        notion_manager.get_user_by_phone(phone_number)
+
+        # Assert
+        assert notion_manager.client.databases.query.call_count == 2
+
     def test_get_user_by_phone_not_found(self, notion_manager):
         """Test user lookup when user does not exist"""
         # Arrange
@@ -253,6 +278,21 @@ class TestNotionUserManager:
         notion_manager.client.pages.update.assert_called_once()
         notion_manager.client.pages.create.assert_not_called()
 
+    def test_sync_user_to_notion_unchanged_skips_update(self, notion_manager, mock_user, mock_notion_page):
+        """Test re-syncing an unchanged profile does not write to Notion"""
+        # Arrange
+        notion_manager.client.databases.query.return_value = {
+            'results': [mock_notion_page]
+        }
+        notion_manager.sync_user_to_notion(mock_user)
+
+        # Act
+        result = notion_manager.sync_user_to_notion(mock_user)
+
+        # Assert
+        assert result == 'page-id-123'
+        notion_manager.client.pages.update.assert_called_once()
+
     def test_sync_user_to_notion_api_error(self, notion_manager, mock_user):
         """Test syncing user when Notion API fails"""
         # Arrange
@@ -308,3 +348,81 @@ class TestNotionUserManager:
                 assert manager.get_onboarding_status('+1234567890') is False
                 assert manager.mark_onboarding_complete('+1234567890') is False
                 assert manager.update_user_notion_field('+1234567890', 'field', 'value') is False
+
+
+class TestLocalOnboardingState:
+    """Test suite for page ids and onboarding stages stored on local users"""
+
+    def _user(self, **fields):
+        return User(phone_number='+5511987654321', name='Estevao Antunes', **fields)
+
+    def test_known_stage_needs_no_notion_call(self, notion_manager):
+        """Test onboarding check reads the local stage only"""
+        user = self._user(notion_page_id='page-id-123', onboarding_stage='completed')
+
+        assert notion_manager.get_onboarding_status(user.phone_number, user=user) is True
+        notion_manager.client.databases.query.assert_not_called()
+
+    def test_first_check_stores_page_and_stage(self, notion_manager, mock_notion_page):
+        """Test a lookup records page id and stage for later checks"""
+        user = self._user()
+        notion_manager.client.databases.query.return_value = {'results': [mock_notion_page]}
+
+        assert notion_manager.get_onboarding_status(user.phone_number, user=user) is False
+        assert (user.notion_page_id, user.onboarding_stage) == ('page-id-123', 'not_started')
+
+    def test_mark_complete_updates_stored_page_directly(self, notion_manager):
+        """Test updates go straight to pages.update with the stored id"""
+        user = self._user(notion_page_id='page-id-123', onboarding_stage='not_started')
+
+        assert notion_manager.mark_onboarding_complete(user.phone_number, user=user) is True
+        notion_manager.client.databases.query.assert_not_called()
+        assert notion_manager.client.pages.update.call_args.kwargs['page_id'] == 'page-id-123'
+        assert user.onboarding_stage == 'completed'
+
+    def test_stale_page_id_is_looked_up_again(self, notion_manager, mock_notion_page):
+        """Test a page deleted in Notion falls back to a phone lookup"""
+        user = self._user(notion_page_id='deleted-page')
+        notion_manager.client.pages.update.side_effect = [
+            APIResponseError(Mock(status_code=404), 'Could not find page', APIErrorCode.ObjectNotFound),
+            {'id': 'page-id-123'},
+        ]
+        notion_manager.client.databases.query.return_value = {'results': [mock_notion_page]}
+
+        assert notion_manager.update_user_notion_field(user.phone_number, 'Role', 'Dev', user=user) is True
+        assert user.notion_page_id == 'page-id-123'
+
+    def test_reconcile_users_refreshes_local_rows(self, notion_manager):
+        """Test the reconciler matches users database pages by phone"""
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        db.add_all([
+            User(phone_number='+5511987654321', name='Ana'),
+            User(phone_number='+5511900000000', name='Gone', notion_page_id='old', onboarding_stage='completed'),
+        ])
+        db.commit()
+        notion_manager.client.databases.query.return_value = {
+            'results': [{
+                'id': 'page-ana',
+                'properties': {
+                    'Phone': {'phone_number': '(11) 98765-4321'},
+                    'Onboarding_Stage': {'select': {'name': 'completed'}},
+                }
+            }],
+            'has_more': False
+        }
+
+        stats = notion_manager.reconcile_users(db)
+
+        ana = db.query(User).filter(User.name == 'Ana').one()
+        gone = db.query(User).filter(User.name == 'Gone').one()
+        assert (ana.notion_page_id, ana.onboarding_stage) == ('page-ana', 'completed')
+        assert (gone.notion_page_id, gone.onboarding_stage) == (None, None)
+        assert stats == {'matched': 1, 'changed': 2, 'missing': 1}
+        db.close()
+        engine.dispose()
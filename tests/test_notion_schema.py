@@ -0,0 +1,96 @@
+"""
+Tests for NotionSchemaResolver: cached per-database property resolution.
+"""
+from unittest.mock import Mock
+
+from src.integrations.notion_schema import NotionSchemaResolver
+
+
+RULES = {
+    "title": ["Nome", "Name"],
+    "status": ["Status"],
+}
+
+
+def _page(properties, database_id="db-1"):
+    return {
+        "id": "p",
+        "parent": {"type": "database_id", "database_id": database_id},
+        "properties": properties,
+    }
+
+
+def _client(properties):
+    client = Mock()
+    client.databases.retrieve.return_value = {"id": "db-1", "properties": properties}
+    return client
+
+
+class TestNotionSchemaResolver:
+    """Test suite for NotionSchemaResolver"""
+
+    def test_schema_retrieved_once_per_database(self):
+        """Test many pages of a database share one retrieve call"""
+        client = _client({
+            "Name": {"id": "title", "type": "title"},
+            "Status": {"id": "s1", "type": "status"},
+        })
+        resolver = NotionSchemaResolver(client, RULES, ttl_seconds=60)
+        page = _page({
+            "Name": {"type": "title", "title": []},
+            "Status": {"type": "status", "status": {"name": "Done"}},
+        })
+
+        for _ in range(5):
+            fields = resolver.extract(page)
+
+        client.databases.retrieve.assert_called_once_with(database_id="db-1")
+        assert fields["status"]["status"]["name"] == "Done"
+        assert resolver.for_page(page).fields == {"title": "Name", "status": "Status"}
+
+    def test_drift_falls_back_to_page_and_refreshes(self):
+        """Test a renamed property is reported and the page still parses"""
+        client = _client({"Name": {"id": "title", "type": "title"}})
+        resolver = NotionSchemaResolver(client, RULES, ttl_seconds=60)
+        renamed = _page({"Nome": {"type": "title", "title": [{"plain_text": "x"}]}})
+
+        fields = resolver.extract(renamed)
+
+        assert fields["title"] is renamed["properties"]["Nome"]
+        assert resolver.stats()["drift_events"] == 1
+        # The stale schema was dropped, so the next page refreshes it
+        resolver.extract(renamed)
+        assert client.databases.retrieve.call_count == 2
+
+    def test_expired_schema_is_refetched(self):
+        """Test the schema cache honours its TTL"""
+        client = _client({"Name": {"id": "title", "type": "title"}})
+        resolver = NotionSchemaResolver(client, RULES, ttl_seconds=0)
+
+        resolver.get("db-1")
+        resolver.get("db-1")
+
+        assert client.databases.retrieve.call_count == 2
+
+    def test_retrieve_failure_uses_page_properties(self):
+        """Test pages parse from their own properties when retrieve fails"""
+        client = Mock()
+        client.databases.retrieve.side_effect = RuntimeError("restricted")
+        resolver = NotionSchemaResolver(client, RULES, ttl_seconds=60)
+        page = _page({"Nome": {"type": "title", "title": []}})
+
+        assert resolver.extract(page)["title"] is page["properties"]["Nome"]
+        resolver.extract(page)
+        client.databases.retrieve.assert_called_once()
+
+    def test_retrieve_failure_is_retried_after_failure_ttl(self):
+        """Test a failed retrieve is not cached for the full schema TTL"""
+        client = _client({"Name": {"id": "title", "type": "title"}})
+        client.databases.retrieve.side_effect = [RuntimeError("timeout"), client.databases.retrieve.return_value]
+        resolver = NotionSchemaResolver(client, RULES, ttl_seconds=60, failure_ttl_seconds=0)
+
+        assert resolver.get("db-1") is None
+        assert resolver.get("db-1").fields == {"title": "Name"}
+        resolver.get("db-1")
+
+        assert client.databases.retrieve.call_count == 2
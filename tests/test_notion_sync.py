@@ -0,0 +1,368 @@
+"""
+Tests for NotionSync: assignee indexing, multi-tenant pull and single-page sync.
+"""
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.session import Base
+from src.database.models import User, Task, TaskStatus
+from src.integrations.notion_sync import NotionSync, AssigneeIndex, merge_fields
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with the full schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def sync():
+    """NotionSync with a mocked Notion client."""
+    instance = NotionSync()
+    instance.client = Mock()
+    instance.default_database_id = "shared-db"
+    return instance
+
+
+def _page(page_id, title, assignees=(), status="A Fazer", edited=None, due=None):
+    page = {
+        "id": page_id,
+        "properties": {
+            "Nome": {"title": [{"text": {"content": title}}]},
+            "Status": {"select": {"name": status}},
+            "Assignees": {"multi_select": [{"name": name} for name in assignees]},
+        }
+    }
+    if edited:
+        page["last_edited_time"] = edited
+    if due:
+        page["properties"]["Prazo"] = {"date": {"start": due}}
+    return page
+
+
+def _users(db, names):
+    users = []
+    for i, name in enumerate(names):
+        user = User(phone_number=f"+5511988800{i:03d}", name=name)
+        db.add(user)
+        users.append(user)
+    db.commit()
+    return users
+
+
+class TestAssigneeIndex:
+    """Test suite for AssigneeIndex"""
+
+    def test_pages_for_user_include_unassigned(self, sync):
+        """Test a user gets their pages plus pages without assignees"""
+        pages = [
+            _page("p1", "Deploy", ["Ana Souza"]),
+            _page("p2", "Review", ["Bruno"]),
+            _page("p3", "Backlog"),
+        ]
+        index = sync.build_assignee_index(pages)
+
+        assert [p["id"] for p in index.pages_for("Ana")] == ["p3", "p1"]
+        assert [p["id"] for p in index.pages_for("bruno")] == ["p3", "p2"]
+
+    def test_page_with_two_matching_names_returned_once(self):
+        """Test a page is not duplicated when several assignee names match"""
+        pages = [_page("p1", "Pair", ["Ana", "Ana Souza"])]
+        index = AssigneeIndex(pages, lambda page: ["Ana", "Ana Souza"])
+
+        assert [p["id"] for p in index.pages_for("Ana")] == ["p1"]
+
+    def test_user_without_name_only_sees_unassigned(self, sync):
+        """Test users without a name only receive unassigned pages"""
+        pages = [_page("p1", "Deploy", ["Ana"]), _page("p2", "Backlog")]
+        index = sync.build_assignee_index(pages)
+
+        assert [p["id"] for p in index.pages_for(None)] == ["p2"]
+
+
+class TestMultiTenantPull:
+    """Test suite for reading a shared database once and fanning out"""
+
+    def test_database_queried_once_for_all_users(self, sync, db):
+        """Test one query serves every user of the database"""
+        ana, bruno = _users(db, ["Ana", "Bruno"])
+        sync.client.databases.query.return_value = {
+            "results": [
+                _page("p1", "Deploy", ["Ana"]),
+                _page("p2", "Review", ["Bruno"]),
+                _page("p3", "Shared", ["Ana", "Bruno"]),
+            ],
+            "has_more": False
+        }
+
+        synced = sync.sync_all_users_from_notion(db)
+
+        sync.client.databases.query.assert_called_once()
+        assert synced == {ana.id: 2, bruno.id: 2}
+        # The shared page becomes one task per assignee
+        assert db.query(Task).filter(Task.notion_id == "p3").count() == 2
+
+    def test_existing_tasks_are_updated(self, sync, db):
+        """Test re-sync updates tasks instead of duplicating them"""
+        (ana,) = _users(db, ["Ana"])
+        pages = [_page("p1", "Deploy", ["Ana"])]
+        sync.sync_database_to_users("shared-db", [ana], db, pages=pages)
+
+        pages = [_page("p1", "Deploy v2", ["Ana"], status="Concluído")]
+        sync.sync_database_to_users("shared-db", [ana], db, pages=pages)
+
+        tasks = db.query(Task).filter(Task.user_id == ana.id).all()
+        assert len(tasks) == 1
+        assert tasks[0].title == "Deploy v2"
+        assert tasks[0].status == TaskStatus.COMPLETED
+        sync.client.databases.query.assert_not_called()
+
+    def test_single_user_pull_filters_by_assignee(self, sync, db):
+        """Test sync_from_notion_to_db keeps only the user's pages"""
+        (ana,) = _users(db, ["Ana"])
+        pages = [_page("p1", "Deploy", ["Ana"]), _page("p2", "Review", ["Bruno"])]
+
+        assert sync.sync_from_notion_to_db(ana, db, pages=pages) == 1
+        assert db.query(Task).one().notion_id == "p1"
+
+
+class TestSinglePageSync:
+    """Test suite for incremental sync of one changed page"""
+
+    def test_only_assignees_of_page_database_are_updated(self, sync, db):
+        """Test the changed page is upserted for its assignees only"""
+        ana, bruno, carla = _users(db, ["Ana", "Bruno", "Carla"])
+        carla.notion_database_id = "other-db"
+        db.commit()
+        page = _page("p1", "Deploy", ["Ana", "Carla"])
+        page["parent"] = {"type": "database_id", "database_id": "shared-db"}
+        sync.client.pages.retrieve.return_value = page
+
+        synced = sync.sync_page("p1", db)
+
+        sync.client.pages.retrieve.assert_called_once_with(page_id="p1")
+        sync.client.databases.query.assert_not_called()
+        assert synced == {ana.id: 1}
+        assert db.query(Task).one().user_id == ana.id
+
+    def test_archived_page_cancels_tasks(self, sync, db):
+        """Test archiving a page in Notion cancels its mirrored tasks"""
+        (ana,) = _users(db, ["Ana"])
+        sync.sync_database_to_users("shared-db", [ana], db, pages=[_page("p1", "Deploy", ["Ana"])])
+        sync.client.pages.retrieve.return_value = {"id": "p1", "archived": True}
+
+        assert sync.sync_page("p1", db) == {}
+        assert db.query(Task).one().status == TaskStatus.CANCELLED
+
+
+class TestDigestChangeDetection:
+    """Test suite for content-hash based skipping of no-op writes"""
+
+    def test_pulled_tasks_are_not_pushed_back(self, sync, db):
+        """Test tasks just pulled from Notion are not written back"""
+        (ana,) = _users(db, ["Ana"])
+        sync.sync_database_to_users("shared-db", [ana], db, pages=[_page("p1", "Deploy", ["Ana"])])
+
+        assert sync.sync_from_db_to_notion(ana, db) == 0
+        sync.client.pages.update.assert_not_called()
+
+    def test_only_changed_tasks_are_pushed(self, sync, db):
+        """Test a local edit is pushed once and then skipped"""
+        (ana,) = _users(db, ["Ana"])
+        sync.sync_database_to_users(
+            "shared-db", [ana], db,
+            pages=[_page("p1", "Deploy", ["Ana"]), _page("p2", "Review", ["Ana"])]
+        )
+        task = db.query(Task).filter(Task.notion_id == "p1").one()
+        task.status = TaskStatus.COMPLETED
+        db.commit()
+
+        assert sync.sync_from_db_to_notion(ana, db) == 1
+        assert sync.sync_from_db_to_notion(ana, db) == 0
+        sync.client.pages.update.assert_called_once()
+        assert sync.client.pages.update.call_args.kwargs["page_id"] == "p1"
+
+    def test_due_date_with_offset_is_not_pushed_back(self, sync, db):
+        """Test a due date pulled with a UTC offset is stored in UTC and not re-pushed"""
+        (ana,) = _users(db, ["Ana"])
+        ana.notion_database_id = "shared-db"
+        db.commit()
+        pages = [_page("p1", "Deploy", ["Ana"], due="2025-11-10T15:00:00.000-03:00")]
+
+        for _ in range(2):
+            stats = sync.bidirectional_sync(ana, db, pages=pages)
+            db.expire_all()
+            assert stats["to_notion"] == 0
+
+        assert db.query(Task).one().due_date == datetime(2025, 11, 10, 18, 0)
+        sync.client.pages.update.assert_not_called()
+
+    def test_unchanged_page_keeps_local_edits(self, sync, db):
+        """Test re-pulling an unchanged page does not overwrite unpushed edits"""
+        (ana,) = _users(db, ["Ana"])
+        pages = [_page("p1", "Deploy", ["Ana"])]
+        sync.sync_database_to_users("shared-db", [ana], db, pages=pages)
+        task = db.query(Task).one()
+        task.title = "Deploy (edited)"
+        db.commit()
+
+        sync.sync_database_to_users("shared-db", [ana], db, pages=pages)
+
+        assert db.query(Task).one().title == "Deploy (edited)"
+
+
+class TestConcurrentPush:
+    """Test suite for the concurrent Notion pusher"""
+
+    def _local_tasks(self, db, user, count):
+        for i in range(count):
+            db.add(Task(user_id=user.id, title=f"Task {i}"))
+        db.commit()
+        return db.query(Task).order_by(Task.id).all()
+
+    def test_requests_run_concurrently(self, sync, db):
+        """Test creates are issued in parallel by the worker pool"""
+        (ana,) = _users(db, ["Ana"])
+        tasks = self._local_tasks(db, ana, 4)
+        barrier = threading.Barrier(4, timeout=5)
+
+        def create(parent, properties):
+            barrier.wait()  # Only passes if 4 requests are in flight at once
+            return {"id": "page-" + properties["Nome"]["title"][0]["text"]["content"]}
+
+        sync.client.pages.create.side_effect = create
+
+        result = sync.push_tasks(tasks, "shared-db", db, max_workers=4)
+
+        assert result["pushed"] == 4
+        assert {t.notion_id for t in db.query(Task)} == {f"page-Task {i}" for i in range(4)}
+
+    def test_failures_are_accounted_per_task(self, sync, db):
+        """Test one failing request does not affect the other tasks"""
+        (ana,) = _users(db, ["Ana"])
+        tasks = self._local_tasks(db, ana, 3)
+        failing_id = tasks[1].id
+
+        def create(parent, properties):
+            if properties["Nome"]["title"][0]["text"]["content"] == "Task 1":
+                raise RuntimeError("validation_error")
+            return {"id": "page-" + properties["Nome"]["title"][0]["text"]["content"]}
+
+        sync.client.pages.create.side_effect = create
+
+        result = sync.push_tasks(tasks, "shared-db", db, max_workers=2)
+
+        assert result["pushed"] == 2
+        assert result["failed"] == 1
+        assert "validation_error" in result["errors"][failing_id]
+        assert db.get(Task, failing_id).notion_id is None
+
+    def test_results_committed_in_chunks(self, sync, db):
+        """Test progress is committed every commit_every tasks"""
+        (ana,) = _users(db, ["Ana"])
+        tasks = self._local_tasks(db, ana, 5)
+        sync.client.pages.create.side_effect = lambda parent, properties: {"id": properties["Nome"]["title"][0]["text"]["content"]}
+        commits = []
+        original_commit = db.commit
+        db.commit = lambda: (commits.append(1), original_commit())
+
+        sync.push_tasks(tasks, "shared-db", db, max_workers=1, commit_every=2)
+
+        # Two full chunks plus the final commit
+        assert len(commits) == 3
+
+
+class TestConflictAwareSync:
+    """Test suite for three-way merge between Notion and local edits"""
+
+    def _pull(self, sync, db, user, page):
+        sync.sync_database_to_users("shared-db", [user], db, pages=[page])
+        return db.query(Task).one()
+
+    def test_edits_to_different_fields_are_merged(self, sync, db):
+        """Test a local title edit and a Notion status edit both survive"""
+        (ana,) = _users(db, ["Ana"])
+        task = self._pull(sync, db, ana, _page("p1", "Deploy", ["Ana"], edited="2025-01-01T10:00:00.000Z"))
+        task.title = "Deploy v2"
+        db.commit()
+
+        task = self._pull(sync, db, ana, _page(
+            "p1", "Deploy", ["Ana"], status="Concluído", edited="2025-01-01T11:00:00.000Z"
+        ))
+
+        assert task.title == "Deploy v2"
+        assert task.status == TaskStatus.COMPLETED
+        # The local title still has to reach Notion
+        assert sync.sync_from_db_to_notion(ana, db) == 1
+        pushed = sync.client.pages.update.call_args.kwargs["properties"]
+        assert pushed["Nome"]["title"][0]["text"]["content"] == "Deploy v2"
+        assert sync.sync_from_db_to_notion(ana, db) == 0
+
+    @pytest.mark.parametrize("remote_edited, expected", [
+        ("2025-01-01T11:00:00.000Z", "Local title"),
+        ("2025-01-01T13:00:00.000Z", "Notion title"),
+    ])
+    def test_conflict_resolved_by_latest_edit(self, sync, db, remote_edited, expected):
+        """Test the later of the two edits wins a same-field conflict"""
+        (ana,) = _users(db, ["Ana"])
+        task = self._pull(sync, db, ana, _page("p1", "Deploy", ["Ana"], edited="2025-01-01T10:00:00.000Z"))
+        task.title = "Local title"
+        task.updated_at = datetime(2025, 1, 1, 12, 0)
+        db.commit()
+
+        task = self._pull(sync, db, ana, _page("p1", "Notion title", ["Ana"], edited=remote_edited))
+
+        assert task.title == expected
+
+    def test_remote_due_date_with_offset_merges_with_local_edit(self, sync, db):
+        """Test an offset due date is not mistaken for a local change during the merge"""
+        (ana,) = _users(db, ["Ana"])
+        self._pull(sync, db, ana, _page(
+            "p1", "Deploy", ["Ana"], edited="2025-01-01T10:00:00.000Z", due="2025-11-10T15:00:00.000-03:00"
+        ))
+        db.expire_all()
+        task = db.query(Task).one()
+        task.title = "Deploy v2"
+        task.updated_at = datetime(2025, 1, 1, 12, 0)
+        db.commit()
+        db.expire_all()
+
+        task = self._pull(sync, db, ana, _page(
+            "p1", "Deploy", ["Ana"], edited="2025-01-01T11:00:00.000Z", due="2025-11-12T15:00:00.000-03:00"
+        ))
+
+        assert task.title == "Deploy v2"
+        assert task.due_date == datetime(2025, 11, 12, 18, 0)
+
+    def test_page_not_edited_since_last_pull_is_skipped(self, sync, db):
+        """Test an unchanged last_edited_time short-circuits the pull"""
+        (ana,) = _users(db, ["Ana"])
+        self._pull(sync, db, ana, _page("p1", "Deploy", ["Ana"], edited="2025-01-01T10:00:00.000Z"))
+
+        task = self._pull(sync, db, ana, _page("p1", "Other", ["Ana"], edited="2025-01-01T10:00:00.000Z"))
+
+        assert task.title == "Deploy"
+
+    def test_merge_without_base_treats_differences_as_conflicts(self):
+        """Test fields are conflicts when no merge base is known"""
+        local = {"title": "a", "status": "pending"}
+        remote = {"title": "b", "status": "pending"}
+
+        sides, conflicts = merge_fields(None, local, remote, local_wins_conflicts=False)
+
+        assert conflicts == ["title"]
+        assert sides["title"] == "remote"
@@ -0,0 +1,166 @@
+"""
+Tests for the Notion mirroring webhook: immediate ack, per-page coalescing
+and the local source -> mirror page index.
+"""
+import pytest
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from notion_client.errors import APIResponseError, APIErrorCode
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api import notion_webhook
+from src.database.session import Base
+from src.database.models import NotionMirror
+from src.utils.debounce import KeyedDebouncer
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with the full schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def notion(db):
+    """Mocked Notion gateway used by the mirror operation."""
+    client = Mock()
+    client.pages.retrieve.return_value = {
+        "id": "src-1",
+        "url": "https://notion.so/src-1",
+        "properties": {
+            "Name": {"type": "title", "title": [{"plain_text": "Deploy"}]},
+        }
+    }
+    client.databases.query.return_value = {"results": [{"id": "mirror-1"}]}
+    client.pages.create.return_value = {"id": "mirror-new"}
+
+    @contextmanager
+    def db_context(*args):
+        yield db
+
+    with patch.object(notion_webhook, "_ensure_configuration", return_value=(client, "target-db")), \
+            patch.object(notion_webhook.job_sessions, "session", db_context), \
+            patch.object(notion_webhook, "_send_slack_notification"):
+        yield client
+
+
+@pytest.fixture
+def app(notion):
+    """App with the webhook router and a short debounce window."""
+    debouncer = KeyedDebouncer(notion_webhook._on_mirror_event, window_seconds=0.05)
+    application = FastAPI()
+    application.include_router(notion_webhook.router)
+    with patch.object(notion_webhook, "mirror_debouncer", debouncer), \
+            patch.object(notion_webhook.settings, "NOTION_WEBHOOK_TOKEN", None):
+        yield application, debouncer
+
+
+class TestNotionMirrorWebhook:
+    """Test suite for the Notion mirroring webhook"""
+
+    def test_burst_for_same_page_mirrors_once(self, app, notion):
+        """Test a burst of events is acknowledged and mirrored once"""
+        application, debouncer = app
+
+        with TestClient(application) as client:
+            responses = [
+                client.post("/notion/webhook", json={"page_id": "src-1"})
+                for _ in range(5)
+            ]
+            assert notion.pages.retrieve.call_count == 0
+            client.portal.call(debouncer.flush)
+
+        assert all(r.status_code == 200 for r in responses)
+        assert responses[0].json()["coalesced"] is False
+        assert all(r.json()["coalesced"] for r in responses[1:])
+        notion.pages.retrieve.assert_called_once_with(page_id="src-1")
+        notion.pages.update.assert_called_once()
+        assert debouncer.stats()["coalescing_ratio"] == 0.8
+
+    def test_missing_page_id_is_not_queued(self, app, notion):
+        """Test events without a page id are acknowledged and skipped"""
+        application, debouncer = app
+
+        with TestClient(application) as client:
+            response = client.post("/notion/webhook", json={"data": {}})
+
+        assert response.json() == {"ok": True, "skipped": "missing_page_id"}
+        assert debouncer.stats()["received"] == 0
+
+
+
+class TestMirrorIndex:
+    """Test suite for the local source -> mirror page index"""
+
+    def test_create_records_mapping(self, notion, db):
+        """Test a new source page gets a mirror and an index entry"""
+        notion.databases.query.return_value = {"results": []}
+
+        assert notion_webhook.mirror_page("src-1", db) == {"ok": True, "created": True}
+        properties = notion.pages.create.call_args.kwargs["properties"]
+        assert properties["origin_page_id"]["rich_text"][0]["text"]["content"] == "src-1"
+        mirror = db.query(NotionMirror).one()
+        assert (mirror.source_page_id, mirror.mirror_page_id) == ("src-1", "mirror-new")
+        assert mirror.content_hash
+
+    def test_indexed_page_skips_remote_lookup_and_unchanged_update(self, notion, db):
+        """Test indexed pages use the local index and identical content is not pushed"""
+        db.add(NotionMirror(source_page_id="src-1", mirror_page_id="mirror-1"))
+        db.commit()
+
+        assert notion_webhook.mirror_page("src-1", db) == {"ok": True, "updated": "mirror-1"}
+        assert notion_webhook.mirror_page("src-1", db) == {"ok": True, "unchanged": "mirror-1"}
+
+        notion.databases.query.assert_not_called()
+        notion.pages.update.assert_called_once()
+
+    def test_unindexed_existing_mirror_is_adopted(self, notion, db):
+        """Test a mirror found remotely is stored so later events stay local"""
+        notion_webhook.mirror_page("src-1", db)
+
+        assert db.query(NotionMirror).one().mirror_page_id == "mirror-1"
+        notion.pages.create.assert_not_called()
+
+    def test_deleted_mirror_is_recreated(self, notion, db):
+        """Test a stale mapping is replaced when the mirror page is gone"""
+        db.add(NotionMirror(source_page_id="src-1", mirror_page_id="gone"))
+        db.commit()
+        notion.pages.update.side_effect = APIResponseError(
+            Mock(status_code=404), "Could not find page", APIErrorCode.ObjectNotFound
+        )
+
+        assert notion_webhook.mirror_page("src-1", db) == {"ok": True, "created": True}
+        assert db.query(NotionMirror).one().mirror_page_id == "mirror-new"
+
+    def test_backfill_indexes_existing_mirrors(self, db):
+        """Test the backfill scan maps origin_page_id to mirror pages"""
+        def origin(value):
+            return {"origin_page_id": {"rich_text": [{"plain_text": value}]}} if value else {}
+
+        client = Mock()
+        client.databases.query.return_value = {
+            "results": [
+                {"id": "m1", "properties": origin("s1")},
+                {"id": "m2", "properties": origin("s2")},
+                {"id": "m3", "properties": origin(None)},
+            ],
+            "has_more": False
+        }
+
+        assert notion_webhook.backfill_mirror_index(client, "target-db", db) == 2
+        assert notion_webhook.backfill_mirror_index(client, "target-db", db) == 0
+        mapping = {m.source_page_id: m.mirror_page_id for m in db.query(NotionMirror).all()}
+        assert mapping == {"s1": "m1", "s2": "m2"}
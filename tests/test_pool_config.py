@@ -0,0 +1,114 @@
+"""
+Tests for connection pool sizing and engine options.
+"""
+from types import SimpleNamespace
+
+from sqlalchemy.pool import NullPool
+
+from src.database.pool_config import PoolLayout, describe_engine, engine_options, pool_layout
+from src.database.pool_metrics import MeteredQueuePool
+
+
+def _config(**overrides):
+    values = dict(
+        DEBUG=False,
+        DB_MAX_CONNECTIONS=40,
+        WEB_CONCURRENCY=1,
+        DB_ASYNC_POOL_SHARE=0.25,
+        DB_POOL_SIZE=None,
+        DB_MAX_OVERFLOW=None,
+        DB_POOL_TIMEOUT=10.0,
+        DB_POOL_RECYCLE=1800,
+        DB_POOL_PRE_PING=True,
+        DB_PGBOUNCER=False,
+        DB_STATEMENT_TIMEOUT_MS=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+PG_URL = "postgresql://u:p@db/app"
+ASYNC_PG_URL = "postgresql+asyncpg://u:p@db/app"
+
+
+class TestPoolLayout:
+    """Test suite for PoolLayout"""
+
+    def test_budget_is_divided_across_workers(self):
+        """Test peak connections of all workers stay within the budget"""
+        for workers in (1, 2, 4, 8):
+            layout = PoolLayout(max_connections=40, workers=workers)
+            assert layout.total <= 40
+            assert layout.sync.pool_size >= 1
+            assert layout.async_.pool_size >= 1
+
+    def test_single_worker_split(self):
+        """Test a single worker splits its budget between sync and async"""
+        layout = PoolLayout(max_connections=40, workers=1, async_share=0.25)
+
+        assert layout.per_worker == 40
+        assert layout.async_.max_connections == 10
+        assert layout.sync.max_connections == 30
+        assert layout.sync.pool_size == 20
+
+    def test_explicit_sizes_override_derived_ones(self):
+        """Test DB_POOL_SIZE/DB_MAX_OVERFLOW take precedence"""
+        layout = pool_layout(_config(DB_POOL_SIZE=5, DB_MAX_OVERFLOW=0))
+
+        assert (layout.sync.pool_size, layout.sync.max_overflow) == (5, 0)
+
+    def test_tiny_budget_keeps_one_connection_per_engine(self):
+        """Test more workers than connections still yields usable pools"""
+        layout = PoolLayout(max_connections=4, workers=8)
+
+        assert layout.sync.max_connections >= 1
+        assert layout.async_.max_connections >= 1
+
+
+class TestEngineOptions:
+    """Test suite for engine_options"""
+
+    def test_queue_pool_options(self):
+        """Test the sync engine gets a metered, recycled, bounded pool"""
+        layout = pool_layout(_config())
+        options = engine_options(_config(), PG_URL, layout.sync)
+
+        assert options["poolclass"] is MeteredQueuePool
+        assert options["pool_size"] == layout.sync.pool_size
+        assert options["pool_recycle"] == 1800
+        assert options["pool_timeout"] == 10.0
+        assert "connect_args" not in options
+
+    def test_pgbouncer_mode_disables_pooling_and_prepared_statements(self):
+        """Test PgBouncer mode uses NullPool and no asyncpg statement cache"""
+        config = _config(DB_PGBOUNCER=True, DB_STATEMENT_TIMEOUT_MS=5000)
+        layout = pool_layout(config)
+
+        sync_options = engine_options(config, PG_URL, layout.sync)
+        async_options = engine_options(config, ASYNC_PG_URL, layout.async_, async_engine=True)
+
+        assert sync_options["poolclass"] is NullPool
+        assert "pool_size" not in sync_options
+        assert async_options["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        assert "role" in describe_engine(config, layout)
+
+    def test_statement_timeout_per_driver(self):
+        """Test the timeout is sent as libpq options or asyncpg server settings"""
+        config = _config(DB_STATEMENT_TIMEOUT_MS=5000)
+        layout = pool_layout(config)
+
+        sync_options = engine_options(config, PG_URL, layout.sync)
+        async_options = engine_options(config, ASYNC_PG_URL, layout.async_, async_engine=True)
+
+        assert sync_options["connect_args"] == {"options": "-c statement_timeout=5000"}
+        assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    def test_sqlite_ignores_statement_timeout(self):
+        """Test SQLite engines get no Postgres-only options"""
+        config = _config(DB_STATEMENT_TIMEOUT_MS=5000)
+        layout = pool_layout(config)
+
+        options = engine_options(config, "sqlite+aiosqlite:///x.db", layout.async_, async_engine=True)
+
+        assert "connect_args" not in options
+        assert "pool_size" not in options
@@ -0,0 +1,213 @@
+"""
+Tests for the sampling profiler, asyncio diagnostics and the admin endpoints.
+"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import admin
+from src.utils import profiler
+from src.utils.profiler import SamplingProfiler, dump_tasks, measure_loop_lag
+
+
+def busy_loop(stop):
+    """Burn CPU until ``stop`` is set."""
+    total = 0
+    while not stop.is_set():
+        total += sum(range(200))
+    return total
+
+
+def idle_wait(ready, stop):
+    """Sleep until ``stop`` is set."""
+    ready.set()
+    stop.wait()
+
+
+@pytest.fixture
+def workers():
+    """One CPU-bound and one idle thread, stopped after the test."""
+    ready, stop = threading.Event(), threading.Event()
+    threads = [
+        threading.Thread(target=busy_loop, args=(stop,), name="busy"),
+        threading.Thread(target=idle_wait, args=(ready, stop), name="idle"),
+    ]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    time.sleep(0.05)  # let the idle thread settle in wait()
+    yield
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+def _functions(result, thread):
+    return {frame[0] for stack in result.stacks.get(thread, {}) for frame in stack}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """App with the admin router and an admin token configured."""
+    monkeypatch.setattr(admin.settings, "ADMIN_TOKEN", "s3cret")
+    app = FastAPI()
+    app.include_router(admin.router)
+    return TestClient(app)
+
+
+AUTH = {"Authorization": "Bearer s3cret"}
+
+
+class TestSamplingProfiler:
+    """Test suite for SamplingProfiler"""
+
+    def test_wall_mode_samples_busy_and_idle_threads(self, workers):
+        """Test wall-clock profiles include waiting threads"""
+        result = SamplingProfiler(mode="wall", interval=0.005).run(0.3)
+
+        assert result.samples > 10
+        assert "busy_loop" in _functions(result, "busy")
+        assert "idle_wait" in _functions(result, "idle")
+        # Each thread is weighed by wall time, about the profile duration
+        assert sum(result.stacks["idle"].values()) == pytest.approx(result.duration, rel=0.2)
+
+    def test_cpu_mode_skips_idle_threads(self, workers):
+        """Test CPU profiles only weigh threads that used the CPU"""
+        result = SamplingProfiler(mode="cpu", interval=0.005).run(0.5)
+
+        assert "busy_loop" in _functions(result, "busy")
+        assert "idle" not in result.stacks
+
+    def test_sampler_thread_is_not_sampled(self):
+        """Test the sampling thread never appears in its own profile"""
+        result = SamplingProfiler(interval=0.005).run(0.05)
+
+        assert "_sample" not in {frame[0] for stacks in result.stacks.values() for stack in stacks for frame in stack}
+
+    def test_rejects_unknown_mode(self):
+        """Test invalid modes and intervals raise ValueError"""
+        with pytest.raises(ValueError):
+            SamplingProfiler(mode="memory")
+        with pytest.raises(ValueError):
+            SamplingProfiler(interval=0)
+
+    def test_exports(self, workers):
+        """Test collapsed stacks and the speedscope document describe the same samples"""
+        result = SamplingProfiler(interval=0.005).run(0.1)
+
+        collapsed = result.to_collapsed().splitlines()
+        document = json.loads(json.dumps(result.to_speedscope()))
+
+        busy = [line for line in collapsed if line.startswith("busy;")]
+        assert busy and all(line.rsplit(" ", 1)[1].isdigit() for line in busy)
+        assert "busy_loop (tests/test_profiler.py:" in busy[0]
+
+        assert document["$schema"] == profiler.SPEEDSCOPE_SCHEMA
+        profiles = {p["name"]: p for p in document["profiles"]}
+        frames = document["shared"]["frames"]
+        assert "busy_loop" in {frames[i]["name"] for sample in profiles["busy"]["samples"] for i in sample}
+        assert len(profiles["busy"]["samples"]) == len(profiles["busy"]["weights"])
+
+
+class TestAsyncioDiagnostics:
+    """Test suite for the task dump and loop lag measurement"""
+
+    def test_dump_tasks_shows_await_points(self):
+        """Test suspended tasks report their frames and awaited future"""
+        async def waiter(event):
+            await event.wait()
+
+        async def scenario():
+            event = asyncio.Event()
+            task = asyncio.create_task(waiter(event), name="waiter-task")
+            await asyncio.sleep(0)
+            tasks = {entry["name"]: entry for entry in dump_tasks()}
+            event.set()
+            await task
+            return tasks
+
+        tasks = asyncio.run(scenario())
+
+        entry = tasks["waiter-task"]
+        assert entry["state"] == "suspended"
+        assert entry["coroutine"].endswith("waiter")
+        assert "waiter" in entry["stack"][0]
+        assert entry["awaiting"].startswith("<Future pending")
+        assert any(task["state"] == "running" for task in tasks.values())
+
+    def test_loop_lag_reports_blocking(self):
+        """Test a blocking callback shows up as event-loop lag"""
+        async def scenario():
+            asyncio.get_running_loop().call_later(0.05, time.sleep, 0.2)
+            return await measure_loop_lag(0.4, interval=0.02)
+
+        result = asyncio.run(scenario())
+
+        assert result["samples"] > 5
+        assert result["lag_seconds"]["max"] >= 0.15
+        assert result["lag_seconds"]["p50"] < 0.05
+
+
+class TestAdminEndpoints:
+    """Test suite for the admin diagnostics endpoints"""
+
+    def test_disabled_without_token(self, monkeypatch):
+        """Test endpoints pretend not to exist when no ADMIN_TOKEN is set"""
+        monkeypatch.setattr(admin.settings, "ADMIN_TOKEN", None)
+        app = FastAPI()
+        app.include_router(admin.router)
+
+        response = TestClient(app).get("/admin/tasks", headers=AUTH)
+
+        assert response.status_code == 404
+
+    def test_rejects_wrong_token(self, client):
+        """Test a missing or wrong bearer token is rejected"""
+        assert client.get("/admin/tasks").status_code == 401
+        assert client.get("/admin/tasks", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    def test_profile_returns_speedscope_and_collapsed(self, client):
+        """Test the profile endpoint serves both output formats"""
+        speedscope = client.get("/admin/profile", params={"seconds": 0.1, "interval_ms": 5}, headers=AUTH)
+        collapsed = client.get(
+            "/admin/profile", params={"seconds": 0.1, "mode": "cpu", "format": "collapsed"}, headers=AUTH
+        )
+
+        assert speedscope.status_code == 200
+        assert speedscope.json()["$schema"] == profiler.SPEEDSCOPE_SCHEMA
+        assert "speedscope.json" in speedscope.headers["content-disposition"]
+        assert collapsed.status_code == 200
+        assert collapsed.headers["content-type"].startswith("text/plain")
+
+    def test_profile_validates_arguments(self, client, monkeypatch):
+        """Test overlong durations, bad modes and formats are rejected"""
+        monkeypatch.setattr(admin.settings, "ADMIN_PROFILE_MAX_SECONDS", 5)
+
+        assert client.get("/admin/profile", params={"seconds": 6}, headers=AUTH).status_code == 400
+        assert client.get("/admin/profile", params={"seconds": 0.1, "mode": "memory"}, headers=AUTH).status_code == 400
+        assert client.get("/admin/profile", params={"seconds": 0.1, "format": "pstats"}, headers=AUTH).status_code == 400
+
+    def test_one_profile_at_a_time(self, client):
+        """Test a profile requested while another runs gets 409"""
+        assert profiler._profile_lock.acquire(blocking=False)
+        try:
+            response = client.get("/admin/profile", params={"seconds": 0.1}, headers=AUTH)
+        finally:
+            profiler._profile_lock.release()
+
+        assert response.status_code == 409
+
+    def test_tasks_and_loop_lag(self, client):
+        """Test the task dump and loop lag endpoints"""
+        tasks = client.get("/admin/tasks", headers=AUTH).json()
+        lag = client.get("/admin/loop-lag", params={"seconds": 0.1, "interval_ms": 10}, headers=AUTH).json()
+
+        assert tasks["count"] == len(tasks["tasks"]) >= 1
+        assert "MainThread" in tasks["threads"]
+        assert lag["samples"] > 0
+        assert lag["lag_seconds"]["max"] >= 0
@@ -0,0 +1,148 @@
+"""
+Tests for ReminderDispatcher: batched polling, concurrent delivery and bulk marking.
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.session import Base
+from src.database.models import User, Task, Reminder, TaskPriority
+from src.integrations.reminder_dispatcher import ReminderDispatcher, build_reminder_message
+
+
+NOW = datetime(2025, 11, 10, 12, 0, 0)
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite session factory with the full schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _seed(session_factory, offsets_minutes):
+    """Create one user/task and a reminder per offset (relative to NOW)."""
+    db = session_factory()
+    user = User(phone_number="+5511999999999", name="Ana")
+    db.add(user)
+    db.flush()
+    task = Task(user_id=user.id, title="Enviar relatório", priority=TaskPriority.HIGH)
+    db.add(task)
+    db.flush()
+    for offset in offsets_minutes:
+        db.add(Reminder(
+            task_id=task.id,
+            user_id=user.id,
+            scheduled_time=NOW + timedelta(minutes=offset),
+            sent=False
+        ))
+    db.commit()
+    db.close()
+
+
+def _sent_flags(session_factory):
+    db = session_factory()
+    try:
+        return [r.sent for r in db.query(Reminder).order_by(Reminder.id).all()]
+    finally:
+        db.close()
+
+
+class TestReminderDispatcher:
+    """Test suite for ReminderDispatcher"""
+
+    def test_sends_only_due_reminders(self, session_factory):
+        """Test due reminders are sent and marked, future ones untouched"""
+        _seed(session_factory, [-10, -1, 30])
+        sender = Mock()
+        dispatcher = ReminderDispatcher(batch_size=10, max_workers=2, sender=sender,
+                                        session_factory=session_factory)
+
+        stats = dispatcher.dispatch_due(now=NOW)
+
+        assert stats["sent"] == 2
+        assert stats["failed"] == 0
+        assert sender.call_count == 2
+        assert _sent_flags(session_factory) == [True, True, False]
+        dispatcher.shutdown()
+
+    def test_drains_multiple_batches(self, session_factory):
+        """Test dispatcher keeps claiming until a partial batch"""
+        _seed(session_factory, [-5] * 7)
+        sender = Mock()
+        dispatcher = ReminderDispatcher(batch_size=3, max_workers=3, sender=sender,
+                                        session_factory=session_factory)
+
+        stats = dispatcher.dispatch_due(now=NOW)
+
+        assert stats["batches"] == 3
+        assert stats["sent"] == 7
+        assert all(_sent_flags(session_factory))
+        dispatcher.shutdown()
+
+    def test_failed_send_stays_pending_and_is_not_retried_in_same_run(self, session_factory):
+        """Test failed deliveries remain unsent for the next poll"""
+        _seed(session_factory, [-3, -2])
+        calls = []
+
+        def flaky_sender(phone_number, message):
+            calls.append(phone_number)
+            if len(calls) == 1:
+                raise RuntimeError("Evolution API down")
+
+        dispatcher = ReminderDispatcher(batch_size=1, max_workers=1, sender=flaky_sender,
+                                        session_factory=session_factory)
+
+        stats = dispatcher.dispatch_due(now=NOW)
+
+        assert stats["sent"] == 1
+        assert stats["failed"] == 1
+        assert len(calls) == 2
+        assert _sent_flags(session_factory) == [False, True]
+
+        # Next poll retries the failed reminder
+        stats = dispatcher.dispatch_due(now=NOW)
+        assert stats["sent"] == 1
+        assert all(_sent_flags(session_factory))
+        dispatcher.shutdown()
+
+    def test_no_due_reminders(self, session_factory):
+        """Test nothing is sent when no reminder is due"""
+        _seed(session_factory, [15])
+        sender = Mock()
+        dispatcher = ReminderDispatcher(sender=sender, session_factory=session_factory)
+
+        stats = dispatcher.dispatch_due(now=NOW)
+
+        assert stats["claimed"] == 0
+        sender.assert_not_called()
+        dispatcher.shutdown()
+
+
+class TestBuildReminderMessage:
+    """Test suite for reminder message formatting"""
+
+    def test_message_contains_task_details(self):
+        """Test message includes title, priority and custom note"""
+        task = Mock(spec=Task)
+        task.title = "Enviar relatório"
+        task.description = None
+        task.due_date = None
+        task.priority = TaskPriority.URGENT
+        reminder = Mock(spec=Reminder)
+        reminder.message = "Não esquece!"
+
+        message = build_reminder_message(task, reminder)
+
+        assert "Enviar relatório" in message
+        assert "🔴" in message
+        assert "Não esquece!" in message
@@ -0,0 +1,205 @@
+"""
+Tests for the parallel Notion sync orchestrator and the shared Notion gateway.
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.session import Base
+from src.database.models import User
+from src.integrations.sync_orchestrator import NotionSyncOrchestrator, DatabasePageCache
+from src.integrations import notion_gateway
+from src.integrations.notion_gateway import NotionGateway, RateLimiter, query_all_pages
+from src.integrations.notion_sync import AssigneeIndex
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite session factory with the full schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def fake_sync():
+    """NotionSync stand-in recording fetches and synced users."""
+    sync = Mock()
+    sync.fetch_calls = []
+    sync.synced_users = []
+    lock = threading.Lock()
+
+    def fetch(database_id):
+        with lock:
+            sync.fetch_calls.append(database_id)
+        return [{"id": f"{database_id}-page"}]
+
+    def bidirectional(user, db, pages=None):
+        with lock:
+            sync.synced_users.append(user.id)
+        if user.name == "broken":
+            raise RuntimeError("boom")
+        return {"from_notion": len(pages), "to_notion": 0, "total": len(pages)}
+
+    sync.fetch_database_pages.side_effect = fetch
+    sync.build_assignee_index.side_effect = lambda pages: AssigneeIndex(pages, lambda page: [])
+    sync.bidirectional_sync.side_effect = bidirectional
+    sync._resolve_database_id.side_effect = lambda user: user.notion_database_id or "shared-db"
+    return sync
+
+
+def _add_users(session_factory, specs):
+    db = session_factory()
+    for i, (name, database_id, active) in enumerate(specs):
+        db.add(User(
+            phone_number=f"+55119000000{i:02d}",
+            name=name,
+            notion_database_id=database_id,
+            is_active=active
+        ))
+    db.commit()
+    db.close()
+
+
+class TestNotionSyncOrchestrator:
+    """Test suite for NotionSyncOrchestrator"""
+
+    def test_shared_database_fetched_once(self, session_factory, fake_sync):
+        """Test users sharing the global database trigger a single fetch"""
+        _add_users(session_factory, [("u%d" % i, None, True) for i in range(10)])
+        orchestrator = NotionSyncOrchestrator(
+            max_workers=4, session_factory=session_factory, sync=fake_sync
+        )
+
+        result = orchestrator.run()
+
+        assert fake_sync.fetch_calls == ["shared-db"]
+        assert result["completed"] == 10
+        assert result["from_notion"] == 10
+        assert result["databases_fetched"] == 1
+
+    def test_one_fetch_per_distinct_database(self, session_factory, fake_sync):
+        """Test each distinct database is fetched exactly once"""
+        _add_users(session_factory, [
+            ("a", "db-a", True), ("b", "db-a", True),
+            ("c", "db-b", True), ("d", None, True)
+        ])
+        orchestrator = NotionSyncOrchestrator(
+            max_workers=3, session_factory=session_factory, sync=fake_sync
+        )
+
+        orchestrator.run()
+
+        assert sorted(fake_sync.fetch_calls) == ["db-a", "db-b", "shared-db"]
+
+    def test_inactive_users_skipped_and_failures_counted(self, session_factory, fake_sync):
+        """Test inactive users are ignored and a failing user does not stop the run"""
+        _add_users(session_factory, [
+            ("ok", None, True), ("broken", None, True), ("gone", None, False)
+        ])
+        orchestrator = NotionSyncOrchestrator(
+            max_workers=2, session_factory=session_factory, sync=fake_sync
+        )
+
+        result = orchestrator.run()
+
+        assert result["total_users"] == 2
+        assert result["completed"] == 1
+        assert result["failed"] == 1
+        assert orchestrator.last_progress == result
+
+
+class TestDatabasePageCache:
+    """Test suite for DatabasePageCache"""
+
+    def test_fetch_error_is_not_retried_within_run(self):
+        """Test a failing database fetch is attempted once per run"""
+        fetch = Mock(side_effect=RuntimeError("Notion down"))
+        cache = DatabasePageCache(fetch)
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                cache.get("db")
+
+        assert fetch.call_count == 1
+
+
+class TestNotionGateway:
+    """Test suite for the rate-limited Notion gateway"""
+
+    def test_calls_pass_through_rate_limiter(self):
+        """Test every endpoint call acquires a token"""
+        client = Mock()
+        client.pages.retrieve.return_value = {"id": "p1"}
+        limiter = Mock()
+        gateway = NotionGateway(client, rate_limiter=limiter)
+
+        assert gateway.pages.retrieve(page_id="p1") == {"id": "p1"}
+        client.pages.retrieve.assert_called_once_with(page_id="p1")
+        limiter.acquire.assert_called_once()
+
+    def test_query_all_pages_follows_cursors(self):
+        """Test pagination collects every result page"""
+        client = Mock()
+        client.databases.query.side_effect = [
+            {"results": [{"id": 1}], "has_more": True, "next_cursor": "c1"},
+            {"results": [{"id": 2}], "has_more": False, "next_cursor": None},
+        ]
+
+        pages = query_all_pages(client, "db")
+
+        assert [p["id"] for p in pages] == [1, 2]
+        assert client.databases.query.call_args_list[1].kwargs["start_cursor"] == "c1"
+
+    def test_rate_limiter_waits_when_bucket_empty(self):
+        """Test token bucket blocks once burst is exhausted"""
+        limiter = RateLimiter(rate=10, burst=2)
+
+        with patch("src.integrations.notion_gateway.time.sleep") as sleep:
+            assert limiter.acquire() == 0
+            assert limiter.acquire() == 0
+            sleep.side_effect = lambda delay: setattr(limiter, "_tokens", 1.0)
+            assert limiter.acquire() > 0
+
+    def test_calls_on_the_event_loop_are_reported(self, monkeypatch):
+        """Test a gateway call made on an event loop thread is logged once per endpoint"""
+        monkeypatch.setattr(notion_gateway, "_loop_warned", set())
+        gateway = NotionGateway(Mock(), rate_limiter=Mock())
+
+        async def scenario():
+            await asyncio.to_thread(gateway.pages.retrieve, page_id="p1")
+            gateway.pages.retrieve(page_id="p1")
+            gateway.pages.retrieve(page_id="p2")
+
+        with patch("src.integrations.notion_gateway.logger") as logger:
+            asyncio.run(scenario())
+            gateway.pages.retrieve(page_id="p3")
+
+        assert logger.warning.call_count == 1
+        assert logger.warning.call_args.args[1] == "pages.retrieve"
+
+    def test_async_webhook_paths_call_notion_off_the_loop(self):
+        """Test the Notion webhook handlers run the gateway in a worker thread"""
+        from src.api import webhooks
+
+        on_loop = []
+
+        def record(*args, **kwargs):
+            on_loop.append(notion_gateway._on_event_loop())
+            return {}
+
+        with patch("src.integrations.notion_sync.notion_sync.sync_page", side_effect=record), \
+                patch("src.integrations.notion_sync.notion_sync.sync_all_users_from_notion", side_effect=record):
+            asyncio.run(webhooks.process_notion_page_change("page-1", db=Mock()))
+            asyncio.run(webhooks.sync_all_notion_tasks(db=Mock()))
+
+        assert on_loop == [False, False]
@@ -0,0 +1,102 @@
+"""
+Tests for distributed tracing.
+"""
+import asyncio
+import logging
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from src.ai.function_executor import FunctionExecutor
+from src.integrations.notion_gateway import NotionGateway
+from src.utils import tracing
+from src.utils.tracing import TraceContextFilter, current_trace_ids, setup_tracing, span, traced
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Spans recorded in memory by a provider local to the test."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("test"))
+    yield exporter
+    provider.shutdown()
+
+
+def _by_name(exporter):
+    return {recorded.name: recorded for recorded in exporter.get_finished_spans()}
+
+
+class TestSpans:
+    """Test suite for span creation"""
+
+    def test_function_and_notion_spans_share_the_message_trace(self, exporter):
+        """Test spans opened while handling a message are children of its root"""
+        gateway = NotionGateway(client=Mock(), rate_limiter=Mock())
+
+        with span("process_incoming_message"):
+            FunctionExecutor().execute("made_up_function", {}, "1", context=Mock())
+            gateway.pages.retrieve(page_id="abc")
+
+        spans = _by_name(exporter)
+        root = spans["process_incoming_message"]
+        for name in ("function.unknown", "notion.pages.retrieve"):
+            assert spans[name].context.trace_id == root.context.trace_id
+            assert spans[name].parent.span_id == root.context.span_id
+        assert spans["function.unknown"].attributes["function.outcome"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_context_follows_work_moved_to_threads(self, exporter):
+        """Test asyncio.to_thread work stays in the caller's trace"""
+        @traced("process_with_openai")
+        async def handler():
+            with span("inner"):
+                return await asyncio.to_thread(current_trace_ids)
+
+        thread_trace_id, _ = await handler()
+
+        spans = _by_name(exporter)
+        assert thread_trace_id == format(spans["process_with_openai"].context.trace_id, "032x")
+        assert spans["inner"].parent.span_id == spans["process_with_openai"].context.span_id
+
+    def test_exceptions_are_recorded(self, exporter):
+        """Test a failing block marks its span as an error"""
+        with pytest.raises(RuntimeError):
+            with span("failing"):
+                raise RuntimeError("boom")
+
+        recorded = _by_name(exporter)["failing"]
+        assert recorded.status.status_code == StatusCode.ERROR
+        assert recorded.events[0].name == "exception"
+
+
+class TestLogCorrelation:
+    """Test suite for trace ids in log records"""
+
+    def test_records_inside_a_span_carry_its_ids(self, exporter):
+        """Test the filter adds trace_id/span_id only inside a span"""
+        log_filter = TraceContextFilter()
+        outside = logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+
+        with span("message") as current:
+            inside = logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+            log_filter.filter(inside)
+        log_filter.filter(outside)
+
+        assert inside.trace_id == format(current.get_span_context().trace_id, "032x")
+        assert inside.span_id == format(current.get_span_context().span_id, "016x")
+        assert not hasattr(outside, "trace_id")
+
+    def test_setup_is_a_no_op_when_disabled(self):
+        """Test nothing is installed unless TRACING_ENABLED is set"""
+        assert setup_tracing(SimpleNamespace(TRACING_ENABLED=False)) is False
+        assert current_trace_ids() == (None, None)
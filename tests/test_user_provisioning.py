@@ -0,0 +1,181 @@
+"""
+Tests for UserProvisioner: background Notion provisioning with retries and bulk mode.
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.session import Base
+from src.database.models import User
+from src.integrations.user_provisioning import UserProvisioner
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """File-backed SQLite session factory with the full schema.
+
+    Bulk provisioning runs on worker threads; each needs its own connection,
+    which a shared in-memory StaticPool connection cannot provide.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'provisioning.db'}",
+        connect_args={"check_same_thread": False, "timeout": 10}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _seed(session_factory, count, **fields):
+    db = session_factory()
+    users = [User(phone_number=f"55119000000{i:02d}", name=f"User {i}", **fields) for i in range(count)]
+    db.add_all(users)
+    db.commit()
+    ids = [user.id for user in users]
+    db.close()
+    return ids
+
+
+def _manager(sync=None):
+    manager = Mock()
+    manager.users_db_id = "users-db"
+
+    def default_sync(user):
+        user.notion_page_id = f"page-{user.id}"
+        return user.notion_page_id
+
+    manager.sync_user_to_notion.side_effect = sync or default_sync
+    return manager
+
+
+def _page_ids(session_factory):
+    db = session_factory()
+    try:
+        return [user.notion_page_id for user in db.query(User).order_by(User.id).all()]
+    finally:
+        db.close()
+
+
+class TestUserProvisioner:
+    """Test suite for UserProvisioner"""
+
+    def test_enqueued_user_is_provisioned_in_background(self, session_factory):
+        """Test the worker syncs the user and commits its Notion page id"""
+        user_id = _seed(session_factory, 1)[0]
+        provisioner = UserProvisioner(manager=_manager(), workers=1, session_factory=session_factory)
+
+        try:
+            assert provisioner.enqueue(user_id) is True
+            assert provisioner.join(2.0)
+        finally:
+            provisioner.shutdown()
+
+        assert _page_ids(session_factory) == [f"page-{user_id}"]
+        assert provisioner.stats()["provisioned"] == 1
+
+    def test_enqueue_returns_before_notion_responds(self, session_factory):
+        """Test enqueue never waits for the Notion call"""
+        user_id = _seed(session_factory, 1)[0]
+        release = threading.Event()
+
+        def slow_sync(user):
+            release.wait(2.0)
+            return "page"
+
+        provisioner = UserProvisioner(manager=_manager(slow_sync), workers=1, session_factory=session_factory)
+        try:
+            assert provisioner.enqueue(user_id) is True
+            assert provisioner.enqueue(user_id) is False  # Already pending
+            assert provisioner.pending == 1
+            release.set()
+            assert provisioner.join(2.0)
+        finally:
+            provisioner.shutdown()
+
+    def test_failed_attempt_is_retried(self, session_factory):
+        """Test a failed sync is retried with backoff until it succeeds"""
+        user_id = _seed(session_factory, 1)[0]
+        results = iter([None, None, "page"])
+        manager = _manager(lambda user: next(results))
+        provisioner = UserProvisioner(
+            manager=manager, workers=1, max_retries=3,
+            retry_base_seconds=0.01, session_factory=session_factory
+        )
+
+        try:
+            provisioner.enqueue(user_id)
+            assert provisioner.join(2.0)
+        finally:
+            provisioner.shutdown()
+
+        assert manager.sync_user_to_notion.call_count == 3
+        assert provisioner.stats()["retried"] == 2
+        assert provisioner.stats()["failed"] == 0
+
+    def test_gives_up_after_max_retries(self, session_factory):
+        """Test a user failing every attempt is dropped and counted"""
+        user_id = _seed(session_factory, 1)[0]
+        manager = _manager(lambda user: None)
+        provisioner = UserProvisioner(
+            manager=manager, workers=1, max_retries=2,
+            retry_base_seconds=0.01, session_factory=session_factory
+        )
+
+        try:
+            provisioner.enqueue(user_id)
+            assert provisioner.join(2.0)
+        finally:
+            provisioner.shutdown()
+
+        assert manager.sync_user_to_notion.call_count == 3
+        assert provisioner.stats()["failed"] == 1
+
+    def test_unconfigured_users_database_is_not_retried(self, session_factory):
+        """Test no retries are scheduled when Notion users are not configured"""
+        user_id = _seed(session_factory, 1)[0]
+        manager = _manager(lambda user: None)
+        manager.users_db_id = None
+        provisioner = UserProvisioner(manager=manager, workers=1, session_factory=session_factory)
+
+        try:
+            provisioner.enqueue(user_id)
+            assert provisioner.join(2.0)
+        finally:
+            provisioner.shutdown()
+
+        assert manager.sync_user_to_notion.call_count == 1
+        assert provisioner.stats()["retried"] == 0
+
+    def test_provision_many_defaults_to_users_without_page(self, session_factory):
+        """Test bulk mode provisions only active users missing a Notion page"""
+        ids = _seed(session_factory, 5)
+        db = session_factory()
+        db.get(User, ids[0]).notion_page_id = "existing"
+        db.get(User, ids[1]).is_active = False
+        db.commit()
+        db.close()
+
+        manager = _manager()
+        provisioner = UserProvisioner(manager=manager, session_factory=session_factory)
+        stats = provisioner.provision_many(max_workers=3)
+
+        assert stats == {"total": 3, "provisioned": 3, "failed": 0, "failed_ids": []}
+        assert _page_ids(session_factory)[2:] == [f"page-{i}" for i in ids[2:]]
+
+    def test_provision_many_runs_concurrently_and_reports_failures(self, session_factory):
+        """Test bulk syncs overlap and failures are listed"""
+        ids = _seed(session_factory, 4)
+        barrier = threading.Barrier(2, timeout=2.0)
+
+        def sync(user):
+            if user.id in ids[:2]:
+                barrier.wait()  # Deadlocks unless two syncs run at once
+            return None if user.id == ids[3] else "page"
+
+        provisioner = UserProvisioner(manager=_manager(sync), session_factory=session_factory)
+        stats = provisioner.provision_many(ids, max_workers=2)
+
+        assert stats["provisioned"] == 3
+        assert stats["failed_ids"] == [ids[3]]